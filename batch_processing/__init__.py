@@ -0,0 +1 @@
+# 批量处理工具（流式报表管道等），在分析模块之上组合运行多个分析工具
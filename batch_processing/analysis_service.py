@@ -0,0 +1,239 @@
+# ==============================================
+# 【分析服务·异步微批】v1.0
+# 独特性：asyncio 本地 HTTP/JSON 服务 + 同一工具的并发请求在时间窗口/数量上限内合并为一批
+#         → 一次向量化计算（batch_kernels）→ 结果逐条回传给各自的请求
+# 开发者：Kiwi_hazel
+# 用法：python -m batch_processing.analysis_service [--port 8765] [--max-batch 256] [--window-ms 1]
+#       POST /analyze/<工具名>  请求体：单条参数 JSON（或参数数组）→ 结果 JSON（格式同 common.cli）
+#       GET  /analyzers 工具列表 | GET /stats 各工具请求数/批次数/平均批大小
+#       GET  /metrics Prometheus 文本格式指标（--metrics 或 FAT_METRICS=1 开启埋点）
+# 仅依赖标准库（HTTP/1.1 keep-alive，无第三方 Web 框架）
+# ==============================================
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from batch_processing.batch_kernels import run_batch
+from common.cli import ANALYZERS
+from common.instrumentation import CONTENT_TYPE, METRICS, enable as enable_metrics
+
+DEFAULT_MAX_BATCH = 256
+DEFAULT_WINDOW_MS = 1.0
+MAX_BODY_BYTES = 1 << 20
+JSON_CONTENT_TYPE = "application/json; charset=utf-8"
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+            500: "Internal Server Error"}
+
+
+class MicroBatcher:
+    """
+    单个分析工具的微批队列：收到第一条请求后最多再等 window 秒或凑满 max_batch 条，合并为一批计算
+    window=0 时不主动等待，只合并同一轮事件循环中已到达的请求
+    """
+
+    def __init__(self, name, max_batch=DEFAULT_MAX_BATCH, window=DEFAULT_WINDOW_MS / 1000):
+        self.name = name
+        self.max_batch = max_batch
+        self.window = window
+        self.queue = asyncio.Queue()
+        self.requests = 0
+        self.batches = 0
+        self.compute_seconds = 0.0
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, record):
+        """提交一条记录，等待所在批次计算完成后返回该条结果"""
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((record, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.window
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self.queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                await asyncio.sleep(0)  # 让出一次事件循环，收下已就绪连接的请求
+                if self.queue.empty():
+                    break
+                continue
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            start = time.perf_counter()
+            try:
+                results = run_batch(self.name, [record for record, _future in batch])
+            except Exception as exc:  # 兜底：run_batch 已逐条隔离数据异常，这里只防止队列任务退出
+                results = [{"error": f"⚠️ 计算失败：{exc}"} for _ in batch]
+            self.compute_seconds += time.perf_counter() - start
+            self.requests += len(batch)
+            self.batches += 1
+            for (_record, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch": round(self.requests / self.batches, 2) if self.batches else 0,
+            "compute_ms": round(self.compute_seconds * 1000, 1),
+        }
+
+
+class AnalysisService:
+    """HTTP/JSON 服务：路由 + 每个分析工具一个微批队列（首次请求时创建）"""
+
+    def __init__(self, max_batch=DEFAULT_MAX_BATCH, window_ms=DEFAULT_WINDOW_MS):
+        self.max_batch = max_batch
+        self.window = window_ms / 1000
+        self.batchers = {}
+        self.server = None
+
+    def batcher(self, name):
+        batcher = self.batchers.get(name)
+        if batcher is None:
+            batcher = self.batchers[name] = MicroBatcher(name, self.max_batch, self.window)
+            batcher.start()
+        return batcher
+
+    async def dispatch(self, method, path, body):
+        """路由：返回（状态码, JSON 可序列化对象）"""
+        path = path.split("?", 1)[0].rstrip("/")
+        if path == "/analyzers" and method == "GET":
+            return 200, {name: {"title": spec["title"], "example": spec["example"]} for name, spec in ANALYZERS.items()}
+        if path == "/stats" and method == "GET":
+            return 200, {name: batcher.stats() for name, batcher in self.batchers.items()}
+        if path == "/metrics" and method == "GET":
+            return 200, METRICS.render()  # 字符串载荷按纯文本返回
+        if path.startswith("/analyze/"):
+            name = path[len("/analyze/"):]
+            if name not in ANALYZERS:
+                return 404, {"error": f"⚠️ 未知分析工具：{name}（GET /analyzers 查看全部）"}
+            if method != "POST":
+                return 405, {"error": "⚠️ 请使用 POST 提交参数 JSON"}
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                return 400, {"error": "⚠️ 请求体不是合法JSON"}
+            records = payload if isinstance(payload, list) else [payload]
+            if not all(isinstance(record, dict) for record in records):
+                return 400, {"error": "⚠️ 请求体需为参数对象或参数对象数组"}
+            batcher = self.batcher(name)
+            if isinstance(payload, list):
+                return 200, list(await asyncio.gather(*(batcher.submit(record) for record in payload)))
+            return 200, await batcher.submit(payload)
+        return 404, {"error": f"⚠️ 未知路径：{path}"}
+
+    async def handle(self, reader, writer):
+        """单个 TCP 连接：循环处理 keep-alive 请求"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _version = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    status, payload = 413, {"error": "⚠️ 请求体过大"}
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    try:
+                        status, payload = await self.dispatch(method.upper(), path, body)
+                    except Exception as exc:
+                        status, payload = 500, {"error": f"⚠️ 服务内部错误：{exc}"}
+                if isinstance(payload, str):
+                    data, content_type = payload.encode("utf-8"), CONTENT_TYPE
+                else:
+                    data, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), JSON_CONTENT_TYPE
+                keep_alive = headers.get("connection", "").lower() != "close" and status != 413
+                writer.write(f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                             f"Content-Type: {content_type}\r\n"
+                             f"Content-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass  # 客户端断开或请求格式错误：直接关闭连接
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8765):
+        self.server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for batcher in self.batchers.values():
+            await batcher.stop()
+
+
+async def serve(host, port, max_batch, window_ms):
+    service = AnalysisService(max_batch, window_ms)
+    actual_port = await service.start(host, port)
+    print(f"分析服务已启动：http://{host}:{actual_port}（微批上限{max_batch}条，时间窗口{window_ms}ms）", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m batch_processing.analysis_service",
+                                     description="财务分析工具本地 HTTP/JSON 服务（异步微批）")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="0 表示由系统分配空闲端口")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="每批最多合并的请求数（1=不合并）")
+    parser.add_argument("--window-ms", type=float, default=DEFAULT_WINDOW_MS, help="收到首条请求后最多等待的毫秒数")
+    parser.add_argument("--metrics", action="store_true", help="开启运行指标埋点（GET /metrics 导出）")
+    args = parser.parse_args(argv)
+    if args.metrics:
+        enable_metrics()
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_batch, args.window_ms))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
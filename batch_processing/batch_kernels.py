@@ -0,0 +1,275 @@
+# ==============================================
+# 【批量计算内核】v1.0
+# 独特性：同一分析工具的一批记录 → 一次向量化计算 → 逐条还原为与单公司函数完全相同的结果 dict
+# 开发者：Kiwi_hazel
+# 全部工具均向量化：cash_ratio / dupont / pe_safety_margin / eva（NumPy 内核 + compact_results 紧凑记录渲染）
+#                   current_ratio / quick_ratio / roce / capital_structure / interest_coverage / inventory
+#                   （共享指标依赖图 metric_graph 的节点）、roi_ri（capital_budget.score_projects）
+# 数据错误行（及单公司函数会抛异常的行）交回单公司函数，错误提示与 common.cli.run_analyzer 逐字一致
+# 用法：run_batch("dupont", [{"net_profit": 1200, ...}, ...]) → [结果dict, ...]
+# ==============================================
+
+from common.cli import ANALYZERS, coerce_params, load_analyzer, normalize_result
+from common.instrumentation import METRICS
+
+
+def _column(calls, name):
+    return [kwargs[name] for kwargs in calls]
+
+
+def _run_row(function, name, kwargs):
+    """逐条计算；单公司函数的算术/数值异常（如周转率取整为0）只记为该条的错误"""
+    try:
+        return normalize_result(name, function(**kwargs))
+    except (ArithmeticError, ValueError) as exc:
+        return {"error": f"⚠️ 计算失败：{exc}"}
+
+
+def _scalar_rows(name, calls, rows):
+    """数据错误行交回单公司函数（错误提示与单公司版本逐字一致）"""
+    function = load_analyzer(name)
+    return [row if row is not None else _run_row(function, name, kwargs) for kwargs, row in zip(calls, rows)]
+
+
+def _graph(name, calls, *nodes):
+    """用共享指标依赖图计算一个工具（及所需的中间量节点），输入列即该工具的参数列"""
+    from batch_processing.metric_graph import evaluate
+
+    columns = {param: _column(calls, param) for param, _cast, _default in ANALYZERS[name]["params"]}
+    return evaluate(columns, (name, *nodes))
+
+
+def _value_kernel(name):
+    """只返回一个数值的工具（current_ratio / quick_ratio / roce）：依赖图输出列 → {result_key: 值}"""
+    def kernel(calls):
+        output = _graph(name, calls)[name]
+        key = ANALYZERS[name]["result_key"]
+        rows = [{key: value} if ok else None for ok, value in zip(output["valid"].tolist(), output[key].tolist())]
+        return _scalar_rows(name, calls, rows)
+    return kernel
+
+
+def _capital_structure_kernel(calls):
+    from profitability_analysis.roce_calculator import STRUCTURE_MESSAGES
+
+    output = _graph("capital_structure", calls)["capital_structure"]
+    rows = []
+    for ok, code, capital_employed, equity, debt in zip(
+            output["valid"].tolist(), output["structure_code"].tolist(), _column(calls, "capital_employed"),
+            _column(calls, "equity"), _column(calls, "debt")):
+        if not ok or equity != equity or debt != debt:  # 权益/负债为 NaN：依赖图按 0 处理，交回单公司函数
+            rows.append(None)
+        elif code == 2:
+            message = STRUCTURE_MESSAGES[2].format(capital_employed=capital_employed, total=equity + debt)
+            rows.append({"capital_structure": message})
+        else:
+            rows.append({"capital_structure": STRUCTURE_MESSAGES[code]})
+    return _scalar_rows("capital_structure", calls, rows)
+
+
+def _interest_coverage_kernel(calls):
+    import numpy as np
+
+    from common.benchmark_registry import get_registry
+    from common.compact_results import InterestCoverageRecord
+    from common.numeric import py_round
+
+    values = _graph("interest_coverage", calls, "cycle_code", "recession_drop")
+    output, cycle_code = values["interest_coverage"], values["cycle_code"]
+    table = get_registry().table("recession_drop")
+    ebit_drop = {code: round(table.rows[code]["drop"] * 100, 1) for code in set(cycle_code.tolist())}
+    ebit = np.asarray(_column(calls, "ebit"), dtype=float)
+    interest = np.asarray(_column(calls, "interest_expense"), dtype=float)
+    # 衰退EBIT ≤0 时单公司版本返回整数 0（不是 0.0）
+    stress_positive = (ebit * (1 - values["recession_drop"]) > 0).tolist()
+    short_term = _column(calls, "short_term_interest")
+    # 未提供或为 0 → 不做结构分析（nan）；提供了 NaN 的行交回单公司函数
+    provided = np.asarray([v if v else np.nan for v in short_term], dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        short_term_ratio = py_round(provided / interest * 100, 1).tolist()
+    rows = []
+    for ok, normal, stress, positive, code, risk, ratio, short, cycle in zip(
+            output["valid"].tolist(), output["normal_coverage"].tolist(), output["stress_coverage"].tolist(),
+            stress_positive, cycle_code.tolist(), output["risk_code"].tolist(), short_term_ratio, short_term,
+            _column(calls, "industry_cycle")):
+        if not ok or (short is not None and short != short):
+            rows.append(None)
+            continue
+        rows.append(InterestCoverageRecord(normal, stress if positive else 0, ebit_drop[code], ratio, risk,
+                                           cycle or "中性行业").to_dict())
+    return _scalar_rows("interest_coverage", calls, rows)
+
+
+def _inventory_kernel(calls):
+    import numpy as np
+
+    from common.benchmark_registry import get_registry
+    from common.numeric import py_round
+    from operation_efficiency.inventory_turnover_days import CARRYING_COST_RATE, HEALTH_GRADES, HIDDEN_COST_NOTES
+
+    values = _graph("inventory", calls, "inventory_turnover", "subtype_code")
+    output = values["inventory"]
+    days = output["turnover_days"]
+    good = get_registry().table("inventory_days").lookup(values["subtype_code"], "良好")
+    avg_inventory = np.asarray(_column(calls, "avg_inventory"), dtype=float)
+    hidden_cost = py_round(avg_inventory * CARRYING_COST_RATE * (days / good - 1), 2).tolist()
+    rows = []
+    for ok, rate, day, code, cost, subtype in zip(
+            output["valid"].tolist(), values["inventory_turnover"].tolist(), days.tolist(),
+            output["grade_code"].tolist(), hidden_cost, _column(calls, "industry_subtype")):
+        if not ok:  # 含周转率取整为0的行：单公司版本除零，交回逐条计算记为错误
+            rows.append(None)
+            continue
+        score, note = HEALTH_GRADES[code]
+        rows.append({"turnover_rate": rate, "turnover_days": day, "industry_subtype": subtype, "health_score": score,
+                     "health_note": note, "hidden_cost_note": HIDDEN_COST_NOTES[0].format(hidden_cost=cost)
+                     if cost > 0 else HIDDEN_COST_NOTES[1]})
+    return _scalar_rows("inventory", calls, rows)
+
+
+def _roi_ri_kernel(calls):
+    from common.benchmark_registry import get_registry
+    from investment_valuation.capital_budget import encode_industries, score_projects
+    from investment_valuation.roi_ri_calculator import ANALYSIS_NOTES
+
+    industry = _column(calls, "industry")
+    codes = encode_industries(industry)
+    scored = score_projects(_column(calls, "profit"), _column(calls, "investment"), codes)
+    table = get_registry().table("cost_of_capital")
+    rate = {code: table.rows[code]["rate"] for code in set(codes.tolist())}  # 原值（同单公司版本，不转 float）
+    rows = [{"roi": roi, "ri": ri, "cost_of_capital": rate[code], "analysis": ANALYSIS_NOTES[analysis],
+             "industry": name} if ok else None
+            for ok, roi, ri, code, analysis, name in zip(
+                scored["valid"].tolist(), scored["roi"].tolist(), scored["ri"].tolist(), codes.tolist(),
+                scored["analysis_code"].tolist(), industry)]
+    return _scalar_rows("roi_ri", calls, rows)
+
+
+def _cash_ratio_kernel(calls):
+    import numpy as np
+
+    from common.compact_results import CashRatioRecord
+    from solvency_analysis.cash_ratio_batch import cash_ratio_stress_batch, encode_industries
+
+    industry_type = _column(calls, "industry_type")
+    batch = cash_ratio_stress_batch(_column(calls, "cash_eq"), _column(calls, "short_term_debt"),
+                                    _column(calls, "daily_cash_burn"), encode_industries(industry_type))
+    shortfall = np.where(batch["stress_covered"], np.nan, batch["stress_shortfall"]).tolist()
+    rows = [CashRatioRecord(*values).to_dict() if ok else None for ok, values in zip(
+        batch["valid"].tolist(),
+        zip(batch["cash_ratio"].tolist(), batch["survival_days"].tolist(), shortfall,
+            batch["quadrant_code"].tolist(), industry_type))]
+    return _scalar_rows("cash_ratio", calls, rows)
+
+
+def _dupont_kernel(calls):
+    from common.compact_results import DupontRecord
+    from common.numeric import py_round
+    from profitability_analysis.dupont_panel import dupont_panel, encode_industries
+
+    industry = _column(calls, "industry")
+    panel = dupont_panel([[v] for v in _column(calls, "net_profit")], [[v] for v in _column(calls, "revenue")],
+                         [[v] for v in _column(calls, "avg_assets")], [[v] for v in _column(calls, "avg_equity")],
+                         encode_industries(industry))
+    # 单公司版本口径：三因素先各取2位小数，ROE 由取整后的因素合成
+    margin = py_round(panel["net_margin"][:, 0], 2)
+    turnover = py_round(panel["asset_turnover"][:, 0], 2)
+    leverage = py_round(panel["equity_multiplier"][:, 0], 2)
+    roe = py_round(margin * turnover * leverage / 100, 2)
+    rows = [DupontRecord(*values).to_dict() if ok else None for ok, values in zip(
+        panel["valid"][:, 0].tolist(),
+        zip(roe.tolist(), margin.tolist(), turnover.tolist(), leverage.tolist(),
+            panel["trend_code"][:, 0].tolist(), panel["strategy_code"][:, 0].tolist(), industry))]
+    return _scalar_rows("dupont", calls, rows)
+
+
+def _pe_safety_kernel(calls):
+    from investment_valuation.pe_safety_margin_batch import pe_safety_margin_batch
+    from investment_valuation.pe_valuation_safety_margin import MARGIN_STATUSES, VALUATION_DRIVERS
+
+    batch = pe_safety_margin_batch(*(_column(calls, name) for name in (
+        "stock_price", "eps_ttm", "eps_forecast", "industry_pe", "historical_pe_75th")))
+    rows = []
+    for ok, pe_static, pe_dynamic, margin, status, driver, upper in zip(
+            batch["valid"].tolist(), batch["pe_static"].tolist(), batch["pe_dynamic"].tolist(),
+            batch["safety_margin"].tolist(), batch["status_code"].tolist(), batch["driver_code"].tolist(),
+            batch["safety_pe_upper"].tolist()):
+        if not ok or pe_static == 0:  # 静态PE取整为0：单公司版本除零，交回逐条计算记为错误
+            rows.append(None)
+            continue
+        driver_label, driver_note = VALUATION_DRIVERS[driver]
+        rows.append({"pe_static": pe_static, "pe_dynamic": pe_dynamic, "safety_margin": margin,
+                     "margin_status": MARGIN_STATUSES[status], "driver": driver_label, "driver_note": driver_note,
+                     "safety_pe_upper": upper})
+    return _scalar_rows("pe_safety_margin", calls, rows)
+
+
+def _eva_kernel(calls):
+    from common.compact_results import EvaRecord
+    from investment_valuation.eva_history import eva_bulk
+
+    company_type = _column(calls, "company_type")
+    last = [v if v is not None else float("nan") for v in _column(calls, "eva_last_year")]
+    batch = eva_bulk(_column(calls, "nopat"), _column(calls, "capital_employed"), company_type, last)
+    rows = [EvaRecord(*values).to_dict() if ok else None for ok, values in zip(
+        batch["valid"].tolist(),
+        zip(batch["eva"].tolist(), batch["eva_yield"].tolist(), batch["wacc"].tolist(),
+            batch["nopat_yield"].tolist(), batch["value_code"].tolist(), company_type))]
+    return _scalar_rows("eva", calls, rows)
+
+
+# 分析工具名 → 向量化内核（参数为已转换类型的关键字参数列表）
+KERNELS = {
+    "current_ratio": _value_kernel("current_ratio"),
+    "quick_ratio": _value_kernel("quick_ratio"),
+    "cash_ratio": _cash_ratio_kernel,
+    "interest_coverage": _interest_coverage_kernel,
+    "roce": _value_kernel("roce"),
+    "capital_structure": _capital_structure_kernel,
+    "dupont": _dupont_kernel,
+    "inventory": _inventory_kernel,
+    "roi_ri": _roi_ri_kernel,
+    "pe_safety_margin": _pe_safety_kernel,
+    "eva": _eva_kernel,
+}
+
+
+def run_batch(name, records):
+    """
+    对一批记录运行同一分析工具（逐条结果与 run_analyzer 一致，参数错误也以 {"error": ...} 返回）
+    :param name: 分析工具名（见 common.cli.ANALYZERS）
+    :param records: 参数 dict 列表
+    """
+    if name not in ANALYZERS:
+        raise ValueError(f"⚠️ 未知分析工具：{name}")
+    if METRICS.enabled:
+        return METRICS.call(name, "batch", ANALYZERS[name].get("level_field"), _run_batch, name, records)
+    return _run_batch(name, records)
+
+
+def _run_batch(name, records):
+    results = [None] * len(records)
+    positions, calls = [], []
+    for i, record in enumerate(records):
+        if not isinstance(record, dict):
+            results[i] = {"error": "⚠️ 参数需为JSON对象（字段名: 值）"}
+            continue
+        try:
+            calls.append(coerce_params(name, record))
+            positions.append(i)
+        except ValueError as exc:
+            results[i] = {"error": str(exc)}
+    if calls:
+        function = load_analyzer(name)
+        kernel = KERNELS.get(name)
+        computed = None
+        if kernel is not None:
+            try:
+                computed = kernel(calls)
+            except (ArithmeticError, ValueError):
+                computed = None  # 个别行触发单公司函数异常：整批改为逐条计算，只有异常行记为错误
+        if computed is None:
+            computed = [_run_row(function, name, kwargs) for kwargs in calls]
+        for i, result in zip(positions, computed):
+            results[i] = result
+    return results
@@ -0,0 +1,358 @@
+# ==============================================
+# 【共享指标依赖图】v1.0
+# 独特性：各分析工具共用的中间量（资本总额、NOPAT、流动负债校验、行业编码……）登记为依赖图节点，
+#         每批公司-期间每个节点只算一次（整列向量化），全部分析工具从同一张图取数；
+#         只计算被请求的分析工具的祖先节点（未请求的分支整段跳过），最后一次使用后立即释放中间列
+# 开发者：Kiwi_hazel
+# 图：输入列 → 可推导输入（资本总额=总资产-流动负债 / NOPAT=EBIT×0.75 / 平均总资产≈总资产）
+#     → 公共中间量（NODES）→ 分析工具节点（ANALYZER_NODES，11个工具）
+# 用法：compute_metrics({"operating_profit": [...], "total_assets": [...], ...}, ["roce", "eva"])
+#       → {分析工具: {数值列/等级代码列/valid}}（列同 universe_screener.screen_universe，另含 capital_structure）
+#       evaluate(columns, ["capital_employed", "nopat"]) 可直接取任意中间量
+# 每条记录的数值与单公司函数（common.cli.run_analyzer）一致
+# ==============================================
+
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from batch_processing.universe_screener import CODE_MISSING
+from common.benchmark_registry import get_registry
+from common.cli import ANALYZERS, TEXT_FIELDS
+from common.numeric import py_round, safe_divide
+from investment_valuation.capital_budget import score_projects
+from investment_valuation.eva_history import HIGH_GROWTH
+from investment_valuation.pe_safety_margin_batch import pe_safety_margin_batch
+from solvency_analysis.cash_ratio_batch import grade_quadrants
+from solvency_analysis.interest_coverage_monte_carlo import grade_risk_levels
+
+NOPAT_RATE = 0.75  # NOPAT = EBIT ×（1 - 25%税率），同 eva 模块的输入提示
+
+# 资本结构校验结论代码（下标即 structure_code），对应 capital_structure_check 的三种结论
+STRUCTURE_STATUSES = ("未提供权益/负债", "数据一致", "差异>10%")
+
+
+def _coalesce_assets(total_assets):
+    """未提供期初期末平均总资产时，以期末总资产代替"""
+    return total_assets
+
+
+# 可推导输入：列名 → （推导所需列, 公式）
+# 输入中已有该列时直接使用，只有缺失行（NaN）按公式补齐；没有该列时整列按公式推导
+DERIVED_INPUTS = {
+    "capital_employed": (("total_assets", "current_liabilities"), lambda total_assets, current_liabilities:
+                         total_assets - current_liabilities),
+    "nopat": (("ebit",), lambda ebit: ebit * NOPAT_RATE),
+    "avg_assets": (("total_assets",), _coalesce_assets),
+}
+
+
+def _encoder(table_name, analyzer, param):
+    """
+    字典编码的文字列 → 注册表行业代码：只编码词表（几个到几十个名称），再按列代码取值
+    缺失值（-1）按分析工具的参数默认值补齐（与 coerce_params 一致）
+    """
+    default = next(d for p, _cast, d in ANALYZERS[analyzer]["params"] if p == param)
+
+    def encode(text):
+        codes, vocab = text
+        return get_registry().table(table_name).encode([*vocab, default])[codes]  # -1 → 末位的默认值
+    return encode
+
+
+def _lookup(table_name, field):
+    return lambda codes: get_registry().table(table_name).lookup(codes, field)
+
+
+def _stress_coverage(ebit, interest_expense, drop):
+    """衰退情景倍数：EBIT 按行业周期降幅打折，打折后 ≤0 记为 0（同单公司版本）"""
+    stress_ebit = ebit * (1 - drop)
+    return np.where(stress_ebit > 0, py_round(stress_ebit / interest_expense, 2), 0.0)
+
+
+def _equity_plus_debt(equity, debt):
+    """权益 + 非流动负债（可选参数，缺失按 0）"""
+    return np.where(np.isnan(equity), 0.0, equity) + np.where(np.isnan(debt), 0.0, debt)
+
+
+# 公共中间量：节点名 → （输入节点/列, 向量化函数）；多个分析工具引用同一节点时只算一次
+NODES = {
+    "liabilities_ok": (("current_liabilities",), lambda current_liabilities: current_liabilities > 0),
+    "capital_ok": (("capital_employed",), lambda capital_employed: capital_employed > 0),
+    "equity_plus_debt": (("equity", "debt"), _equity_plus_debt),
+    # 行业/类型编码（同一文字列按不同基准表各编码一次）
+    "cash_industry_code": (("industry_type",), _encoder("cash_crisis", "cash_ratio", "industry_type")),
+    "cycle_code": (("industry_cycle",), _encoder("recession_drop", "interest_coverage", "industry_cycle")),
+    "dupont_industry_code": (("industry",), _encoder("dupont", "dupont", "industry")),
+    "subtype_code": (("industry_subtype",), _encoder("inventory_days", "inventory", "industry_subtype")),
+    "roi_industry_code": (("industry",), _encoder("cost_of_capital", "roi_ri", "industry")),
+    "company_type_code": (("company_type",), _encoder("wacc", "eva", "company_type")),
+    # 现金比率
+    "cash_ok": (("cash_eq", "short_term_debt", "daily_cash_burn"), lambda cash_eq, short_term_debt, daily_cash_burn:
+                (cash_eq >= 0) & (short_term_debt >= 0) & (daily_cash_burn >= 0)),
+    "cash_ratio_value": (("cash_eq", "short_term_debt"), lambda cash_eq, short_term_debt:
+                         py_round(safe_divide(cash_eq, short_term_debt), 2)),
+    "survival_days_value": (("cash_eq", "daily_cash_burn"), lambda cash_eq, daily_cash_burn:
+                            py_round(safe_divide(cash_eq, daily_cash_burn), 1)),
+    # 利息保障倍数
+    "recession_drop": (("cycle_code",), _lookup("recession_drop", "drop")),
+    "normal_coverage": (("ebit", "interest_expense"), lambda ebit, interest_expense:
+                        py_round(ebit / interest_expense, 2)),
+    "stress_coverage": (("ebit", "interest_expense", "recession_drop"), _stress_coverage),
+    # 杜邦三因素（先各取2位小数，同单公司版本）
+    "dupont_ok": (("net_profit", "revenue", "avg_assets", "avg_equity"), lambda net_profit, revenue, avg_assets,
+                  avg_equity: (net_profit > 0) & (revenue > 0) & (avg_assets > 0) & (avg_equity > 0)),
+    "net_margin": (("net_profit", "revenue"), lambda net_profit, revenue: py_round((net_profit / revenue) * 100, 2)),
+    "asset_turnover": (("revenue", "avg_assets"), lambda revenue, avg_assets: py_round(revenue / avg_assets, 2)),
+    "equity_multiplier": (("avg_assets", "avg_equity"), lambda avg_assets, avg_equity:
+                          py_round(avg_assets / avg_equity, 2)),
+    # 存货周转率（取整为0的行单公司版本会除零，按数据错误处理）
+    "inventory_turnover": (("cogs", "avg_inventory"), lambda cogs, avg_inventory:
+                           py_round(safe_divide(cogs, avg_inventory), 2)),
+    # EVA
+    "wacc": (("company_type_code",), lambda codes: get_registry().table("wacc").lookup(codes, "rate") / 100),
+}
+
+
+def _masked(valid, values=None, codes=None):
+    """分析工具输出：无效行数值置 NaN、等级代码置 -1（列顺序同 screen_universe）"""
+    out = {}
+    for column, value in (values or {}).items():
+        out[column] = np.where(valid, value, np.nan)
+    for column, code in (codes or {}).items():
+        out[column] = np.where(valid, code, CODE_MISSING).astype(np.int8)
+    out["valid"] = valid
+    return out
+
+
+def _current_ratio(current_assets, current_liabilities, liabilities_ok):
+    valid = liabilities_ok & (current_assets >= 0)
+    return _masked(valid, {"current_ratio": py_round(safe_divide(current_assets, current_liabilities), 2)})
+
+
+def _quick_ratio(quick_assets, current_liabilities, liabilities_ok):
+    valid = liabilities_ok & (quick_assets >= 0)
+    return _masked(valid, {"quick_ratio": py_round(safe_divide(quick_assets, current_liabilities), 2)})
+
+
+def _cash_ratio(cash_ok, cash_ratio, survival_days, industry_code):
+    return _masked(cash_ok, {"cash_ratio": cash_ratio, "survival_days": survival_days},
+                   {"quadrant_code": grade_quadrants(cash_ratio, survival_days, industry_code)})
+
+
+def _interest_coverage(ebit, interest_expense, normal_coverage, stress_coverage):
+    valid = (ebit > 0) & (interest_expense > 0)
+    return _masked(valid, {"normal_coverage": normal_coverage, "stress_coverage": stress_coverage},
+                   {"risk_code": grade_risk_levels(normal_coverage, stress_coverage)})
+
+
+def _roce(operating_profit, capital_employed, capital_ok):
+    valid = (operating_profit > 0) & capital_ok & (capital_employed >= operating_profit)
+    return _masked(valid, {"roce": py_round((operating_profit / capital_employed) * 100, 2)})
+
+
+def _capital_structure(capital_employed, equity_plus_debt):
+    consistent = (0.9 * capital_employed <= equity_plus_debt) & (equity_plus_debt <= 1.1 * capital_employed)
+    code = np.select([equity_plus_debt == 0, consistent], [0, 1], default=2)
+    return _masked(~np.isnan(capital_employed), {"equity_plus_debt": equity_plus_debt}, {"structure_code": code})
+
+
+def _dupont(dupont_ok, net_margin, asset_turnover, equity_multiplier, industry_code):
+    table = get_registry().table("dupont")
+    strategy_code = np.select([net_margin > table.lookup(industry_code, "净利率") * 1.5,
+                               asset_turnover > table.lookup(industry_code, "资产周转率") * 1.5,
+                               equity_multiplier > table.lookup(industry_code, "权益乘数") * 1.5], [0, 1, 2], default=3)
+    roe = py_round(net_margin * asset_turnover * equity_multiplier / 100, 2)
+    return _masked(dupont_ok, {"roe": roe}, {"strategy_code": strategy_code})
+
+
+def _inventory(cogs, avg_inventory, turnover, subtype_code):
+    valid = (cogs > 0) & (avg_inventory > 0) & (turnover != 0)
+    days = py_round(safe_divide(365, turnover), 1)
+    table = get_registry().table("inventory_days")
+    grade_code = np.select([days <= table.lookup(subtype_code, "优秀"), days <= table.lookup(subtype_code, "良好"),
+                            days <= table.lookup(subtype_code, "警戒")], [0, 1, 2], default=3)
+    return _masked(valid, {"turnover_days": days}, {"grade_code": grade_code})
+
+
+def _roi_ri(profit, investment, industry_code):
+    scored = score_projects(profit, investment, industry_code)
+    return _masked(scored["valid"], {"roi": scored["roi"], "ri": scored["ri"]})
+
+
+def _pe_safety_margin(stock_price, eps_ttm, eps_forecast, industry_pe, historical_pe_75th):
+    batch = pe_safety_margin_batch(stock_price, eps_ttm, eps_forecast, industry_pe, historical_pe_75th)
+    # 预测增速为必填项；静态PE取整为0的行单公司版本会除零，均按数据错误处理
+    valid = batch["valid"] & ~np.isnan(eps_forecast) & (batch["pe_static"] != 0)
+    return _masked(valid, {"pe_static": batch["pe_static"], "safety_margin": batch["safety_margin"]},
+                   {"status_code": batch["status_code"]})
+
+
+def _eva(nopat, capital_employed, capital_ok, wacc, eva_last_year):
+    valid = (nopat > 0) & capital_ok
+    eva = py_round(nopat - (capital_employed * wacc), 2)
+    eva_yield = py_round(eva / capital_employed * 100, 2)
+    has_base = ~np.isnan(eva_last_year) & (eva_last_year != 0)
+    growth = np.where(has_base, (eva - eva_last_year) / np.abs(eva_last_year), np.nan)
+    value_code = np.select([(eva > 0) & has_base & (growth > HIGH_GROWTH), eva > 0, eva == 0], [0, 1, 2], default=3)
+    return _masked(valid, {"eva": eva, "eva_yield": eva_yield}, {"value_code": value_code})
+
+
+# 分析工具节点：工具名（同 common.cli.ANALYZERS）→ （输入节点/列, 函数），函数返回该工具的输出列 dict
+ANALYZER_NODES = {
+    "current_ratio": (("current_assets", "current_liabilities", "liabilities_ok"), _current_ratio),
+    "quick_ratio": (("quick_assets", "current_liabilities", "liabilities_ok"), _quick_ratio),
+    "cash_ratio": (("cash_ok", "cash_ratio_value", "survival_days_value", "cash_industry_code"), _cash_ratio),
+    "interest_coverage": (("ebit", "interest_expense", "normal_coverage", "stress_coverage"), _interest_coverage),
+    "roce": (("operating_profit", "capital_employed", "capital_ok"), _roce),
+    "capital_structure": (("capital_employed", "equity_plus_debt"), _capital_structure),
+    "dupont": (("dupont_ok", "net_margin", "asset_turnover", "equity_multiplier", "dupont_industry_code"), _dupont),
+    "inventory": (("cogs", "avg_inventory", "inventory_turnover", "subtype_code"), _inventory),
+    "roi_ri": (("profit", "investment", "roi_industry_code"), _roi_ri),
+    "pe_safety_margin": (("stock_price", "eps_ttm", "eps_forecast", "industry_pe", "historical_pe_75th"),
+                         _pe_safety_margin),
+    "eva": (("nopat", "capital_employed", "capital_ok", "wacc", "eva_last_year"), _eva),
+}
+
+
+@lru_cache(maxsize=64)
+def _plan(targets, available):
+    """
+    目标节点 → 计算步骤（依赖在前，只含目标的祖先节点）
+    :param available: 输入中已有的列名（决定可推导输入是直接读取、补齐还是整列推导）
+    :return: （(节点名, 类型, 输入, 函数, 本步后可释放的节点), ...），类型：input/derive/node
+    """
+    steps, state = [], {}
+
+    def visit(name, path):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"⚠️ 指标循环依赖：{' → '.join(path + (name,))}")
+        state[name] = "visiting"
+        if name in ANALYZER_NODES or name in NODES:
+            inputs, function = ANALYZER_NODES.get(name) or NODES[name]
+            kind = "node"
+        elif name in DERIVED_INPUTS and all(field in available for field in DERIVED_INPUTS[name][0]):
+            inputs, function = DERIVED_INPUTS[name]
+            kind = "derive"
+        else:
+            inputs, function, kind = (), None, "input"
+        for dep in inputs:
+            visit(dep, path + (name,))
+        state[name] = "done"
+        steps.append((name, kind, inputs, function))
+
+    for target in targets:
+        visit(target, ())
+    last_use = {}
+    for i, (_name, _kind, inputs, _function) in enumerate(steps):
+        for dep in inputs:
+            last_use[dep] = i
+    return tuple((name, kind, inputs, function,
+                  tuple(dep for dep in dict.fromkeys(inputs) if last_use[dep] == i and dep not in targets))
+                 for i, (name, kind, inputs, function) in enumerate(steps))
+
+
+def plan(targets, available=()):
+    """计算步骤的节点名（依赖在前）；用于查看某组分析工具实际会算哪些节点"""
+    return [step[0] for step in _plan(tuple(targets), frozenset(available))]
+
+
+def _read(columns, name, rows):
+    """
+    读取一列输入：数值列 → float64 数组（None/空串 → NaN），
+    文字列 → 字典编码（int32 代码数组, 词表），None/空串编码为 -1；同一文字列被多张基准表引用时只扫描一次
+    输入中没有该列时整列按缺失处理（同 screen_universe）
+    """
+    source = columns.get(name)
+    if name in TEXT_FIELDS:
+        if source is None:
+            return np.full(rows, CODE_MISSING, dtype=np.int32), ()
+        lookup = {None: CODE_MISSING, "": CODE_MISSING}
+        codes = np.fromiter((lookup.setdefault(v, len(lookup) - 2) for v in source), dtype=np.int32)
+        if len(codes) != rows:
+            raise ValueError(f"⚠️ 列长度不一致：{name}（{len(codes)}行，应为{rows}行）")
+        return codes, tuple(v for v in lookup if v is not None and v != "")
+    if source is None:
+        values = np.full(rows, np.nan)
+    elif isinstance(source, np.ndarray):
+        values = np.asarray(source, dtype=np.float64)
+    else:
+        values = np.asarray([np.nan if v is None or v == "" else v for v in source], dtype=np.float64)
+    if len(values) != rows:
+        raise ValueError(f"⚠️ 列长度不一致：{name}（{len(values)}行，应为{rows}行）")
+    return values
+
+
+def evaluate(columns, targets, trace=None):
+    """
+    核心功能：按依赖图计算一组节点（每个节点每批只算一次，中间列最后一次使用后释放）
+    :param columns: {字段名: 列}（字段名同各分析函数参数名，另可提供 total_assets 推导资本总额/平均总资产）
+    :param targets: 节点名列表（分析工具名、NODES 中间量或输入列名）
+    :param trace: 可选列表，按计算顺序追加 (节点名, 耗时秒)
+    :return: {节点名: 值}
+    """
+    targets = tuple(targets)
+    unknown = [name for name in targets if not (name in ANALYZER_NODES or name in NODES or name in DERIVED_INPUTS
+                                                or name in columns)]
+    if unknown:
+        raise ValueError(f"⚠️ 未知指标：{', '.join(unknown)}（可用：分析工具名、NODES 中间量或输入列名）")
+    rows = len(next(iter(columns.values()))) if columns else 0
+    values = {}
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for name, kind, inputs, function, free in _plan(targets, frozenset(columns)):
+            start = time.perf_counter()
+            if kind == "input":
+                value = _read(columns, name, rows)
+            else:
+                value = function(*(values[dep] for dep in inputs))
+                if kind == "derive" and name in columns:  # 已提供的列优先，缺失行才用推导值
+                    supplied = _read(columns, name, rows)
+                    value = np.where(np.isnan(supplied), value, supplied)
+            values[name] = value
+            for dep in free:
+                del values[dep]
+            if trace is not None:
+                trace.append((name, time.perf_counter() - start))
+    return {name: values[name] for name in targets}
+
+
+def compute_metrics(columns, analyzers=None, trace=None):
+    """
+    一次计算多个分析工具（共用的中间量只算一次，未请求工具的节点不计算）
+    :param analyzers: 分析工具名列表（默认全部11个工具）
+    :return: {分析工具: {数值列: float64数组(无效行NaN), 等级代码列: int8数组(-1=无效), "valid": bool数组}}
+             等级代码 → 文字见 universe_screener.SCREEN_LABELS；capital_structure 的 structure_code 见 STRUCTURE_STATUSES
+    """
+    analyzers = list(analyzers or ANALYZER_NODES)
+    unknown = [name for name in analyzers if name not in ANALYZER_NODES]
+    if unknown:
+        raise ValueError(f"⚠️ 未知分析工具：{', '.join(unknown)}")
+    return evaluate(columns, analyzers, trace)
+
+
+# ----------------------
+# 极简演示（3家公司，资本总额/NOPAT 由总资产与EBIT推导）
+# ----------------------
+if __name__ == "__main__":
+    from batch_processing.universe_screener import screen_labels
+
+    demo = {
+        "total_assets": [38000, 9000, 5200], "current_liabilities": [8000, 2500, 4800],
+        "operating_profit": [5000, 900, -10], "ebit": [5200, 950, 20], "interest_expense": [600, 400, 50],
+        "industry_cycle": ["强周期", "", "防御性"], "equity": [20000, 3000, 0], "debt": [10000, 3500, 0],
+        "company_type": ["国企", "民企", None],
+    }
+    trace = []
+    metrics = compute_metrics(demo, ["roce", "capital_structure", "interest_coverage", "eva"], trace)
+    derived = evaluate(demo, ["capital_employed", "nopat"])
+    print("===== 🧮 共享指标依赖图示例（3家公司） =====")
+    for i in range(3):
+        print(f"公司{i + 1}：资本总额 {derived['capital_employed'][i]:.0f}万 | NOPAT {derived['nopat'][i]:.1f}万"
+              f" | ROCE {metrics['roce']['roce'][i]}% | 利息保障 {metrics['interest_coverage']['normal_coverage'][i]}倍"
+              f"（{screen_labels('risk_code', metrics['interest_coverage']['risk_code'][i:i + 1])[0]}）"
+              f" | EVA {metrics['eva']['eva'][i]}万 | 资本结构："
+              f"{STRUCTURE_STATUSES[metrics['capital_structure']['structure_code'][i]]}")
+    print(f"→ 共计算 {len(trace)} 个节点（资本总额/EBIT等共用中间量各算一次）：{'、'.join(name for name, _s in trace)}")
@@ -0,0 +1,273 @@
+# ==============================================
+# 【批量结果卡片渲染器】v1.0
+# 独特性：每个分析工具的结果卡片（同各模块 __main__ 的卡片内容）预编译为一个模板 → 逐批流式写出 Markdown/HTML
+#         输出不在内存中拼成整篇文档；可按分片交给多进程渲染，主进程按分片顺序写盘（任意进程数输出逐字节一致）
+# 开发者：Kiwi_hazel
+# 用法：python -m batch_processing.report_renderer 结果.jsonl 报告.html [--workers 4] [--analyzers roce,dupont]
+#       （结果.jsonl 为 statement_pipeline 的输出；报告格式按后缀 .md/.html 判断，或用 --format 指定）
+# ==============================================
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from html import escape
+from string import Formatter
+
+from batch_processing.statement_pipeline import peak_rss_mb, read_records
+from common.cli import ANALYZERS, INPUT_ERROR
+
+FORMATS = ("markdown", "html")
+MISSING = "—"  # 结果中缺少的字段（如未提供短期利息时的结构分析）
+DEFAULT_SHARD_SIZE = 500  # 每个渲染分片的公司数；同时在途的分片不超过 2×进程数
+
+# 卡片内容（行模板, ...），同各模块 __main__ 的卡片输出；{字段} 取结果 dict 中的同名字段
+CARD_LINES = {
+    "current_ratio": ("📊 计算结果：流动比率 = {current_ratio}",),
+    "quick_ratio": ("📊 计算结果：速动比率 = {quick_ratio}",),
+    "cash_ratio": (
+        "现金比率：{cash_ratio}（现金/流动负债 → 越高短期偿债能力越强）",
+        "现金储备天数：{survival_days}天（无收入时可维持运营的天数）",
+        "行业安全线：{industry_threshold}",
+        "⚠️ 极端情景测试：{stress_test}",
+        "🎯 现金健康度：{health_quadrant}",
+        "💡 行动建议：{health_note}",
+    ),
+    "interest_coverage": (
+        "📊 正常情景利息保障倍数：{normal_coverage}倍（EBIT/利息费用）",
+        "📊 衰退情景测试（{industry_cycle}，EBIT降{ebit_drop}%）：{stress_coverage}倍",
+        "🚨 债务风险等级：{risk_level}",
+        "💡 风险解读：{risk_note}",
+        "🔍 利息结构分析：{structure_analysis}",
+    ),
+    "roce": ("📊 ROCE：{roce}%",),
+    "capital_structure": ("💡 资本结构辅助判断：{capital_structure}",),
+    "dupont": (
+        "ROE（净资产收益率）：{roe}%",
+        "三因素分解：{factors}",
+        "行业对比：{radar}（↑高于行业10%，↓低于行业10%，→ 持平）",
+        "🎯 战略类型：{strategy_type}",
+        "💡 战略解读：{strategy_note}",
+    ),
+    "inventory": (
+        "存货周转率：{turnover_rate}次/年（越高越好）",
+        "存货周转天数：{turnover_days}天/次（越短越好）",
+        "细分行业：{industry_subtype}",
+        "🏥 供应链健康度：{health_score}",
+        "📝 改善建议：{health_note}",
+        "💰 {hidden_cost_note}",
+    ),
+    "roi_ri": (
+        "📊 基础指标（{industry}行业）",
+        "• ROI（投资回报率）：{roi}%",
+        "• 行业资本成本率：{cost_of_capital}%",
+        "• RI（剩余收益）：{ri}万元（= 收益 - 资本成本）",
+        "🔍 联动分析：{analysis}",
+    ),
+    "pe_safety_margin": (
+        "静态PE（当前估值）：{pe_static}倍",
+        "动态PE（考虑增长）：{pe_dynamic}倍（=静态PE/(1+增速)）",
+        "安全边际分析：{margin_status}（安全边际={safety_margin}%，安全PE上限={safety_pe_upper}倍）",
+        "估值驱动因素：{driver}",
+        "💡 核心结论：{driver_note}",
+    ),
+    "eva": (
+        "EVA（经济增加值）：{eva}万元（真正的'经济利润'，非会计利润）",
+        "EVA收益率：{eva_yield}%（=EVA/资本总额 → 衡量资本使用效率）",
+        "加权平均资本成本WACC：{wacc}%（{company_type}融资成本）",
+        "🎯 价值创造定位：{value_level}",
+        "💡 战略解读：{level_note}",
+        "🔍 驱动因素：{driver_analysis}",
+    ),
+}
+
+# 文档骨架：（文档头, 公司标题, 卡片开头, 卡片行, 卡片结尾, 错误卡片, 公司结尾, 文档尾）；文档头/尾原样写出，其余为格式串
+_LAYOUTS = {
+    "markdown": ("# 📊 财务分析结果卡片\n\n", "## {entity}（{period}）\n\n", "### {title}\n\n", "- {line}\n", "\n",
+                 "### {title}\n\n> {error}\n\n", "---\n\n", ""),
+    "html": ('<!DOCTYPE html>\n<html lang="zh-CN">\n<head>\n<meta charset="utf-8">\n<title>财务分析结果卡片</title>\n'
+             "<style>body{font-family:sans-serif;max-width:960px;margin:auto}"
+             ".card{border:1px solid #ccc;border-radius:6px;padding:4px 12px;margin:8px 0}"
+             ".error{color:#b00}</style>\n</head>\n<body>\n<h1>📊 财务分析结果卡片</h1>\n",
+             '<section class="company">\n<h2>{entity}（{period}）</h2>\n', '<div class="card">\n<h3>{title}</h3>\n<ul>\n',
+             "<li>{line}</li>\n", "</ul>\n</div>\n",
+             '<div class="card error">\n<h3>{title}</h3>\n<p>{error}</p>\n</div>\n', "</section>\n",
+             "</body>\n</html>\n"),
+}
+
+
+def _identity(text):
+    return text
+
+
+class CardTemplate:
+    """一个分析工具 × 一种格式的预编译卡片：整张卡片合成为一个格式串，渲染时只做一次 format_map"""
+    __slots__ = ("analyzer", "fields", "_body", "_error", "_escape")
+
+    def __init__(self, analyzer, fmt):
+        _head, _company, card_open, card_line, card_close, card_error, _end, _tail = _LAYOUTS[fmt]
+        self._escape = escape if fmt == "html" else _identity
+        title = self._escape(ANALYZERS[analyzer]["title"])
+        # 行模板中的字面文字按格式转义一次（花括号占位符不受影响），字段值在渲染时转义
+        lines = "".join(card_line.format(line=self._escape(line)) for line in CARD_LINES[analyzer])
+        self.analyzer = analyzer
+        self.fields = tuple(dict.fromkeys(f for line in CARD_LINES[analyzer]
+                                          for _text, f, _spec, _conv in Formatter().parse(line) if f))
+        self._body = card_open.format(title=title) + lines + card_close
+        self._error = card_error.format(title=title, error="{error}")
+
+    def render(self, result):
+        """单张卡片：结果 dict → 文本（错误结果渲染为错误卡片）"""
+        esc = self._escape
+        if "error" in result:
+            return self._error.format(error=esc(str(result["error"])))
+        return self._body.format_map({f: esc(str(result[f])) if f in result else MISSING for f in self.fields})
+
+
+@lru_cache(maxsize=None)
+def compile_card(analyzer, fmt):
+    """预编译卡片模板（每个进程内每个分析工具×格式只编译一次）"""
+    if fmt not in FORMATS:
+        raise ValueError(f"⚠️ 未知报告格式：{fmt}（可选：{'/'.join(FORMATS)}）")
+    if analyzer not in CARD_LINES:
+        raise ValueError(f"⚠️ 没有卡片模板的分析工具：{analyzer}")
+    return CardTemplate(analyzer, fmt)
+
+
+def render_rows(rows, fmt, analyzers=None):
+    """
+    渲染一个分片：管道结果行（{entity, period, results: {工具: 结果}}）→ 文本
+    :param analyzers: 只渲染这些工具的卡片（默认渲染结果中出现的全部工具，按 ANALYZERS 顺序）
+    :return: （文本, 卡片数）
+    """
+    _head, company, *_middle, end, _tail = _LAYOUTS[fmt]
+    esc = escape if fmt == "html" else _identity
+    names = [name for name in (analyzers or ANALYZERS) if name in CARD_LINES]
+    parts = []
+    cards = 0
+    for row in rows:
+        results = row.get("results", {})
+        parts.append(company.format(entity=esc(str(row.get("entity", MISSING))),
+                                    period=esc(str(row.get("period", MISSING)))))
+        for name in names:
+            result = results.get(name)
+            if result is not None:
+                parts.append(compile_card(name, fmt).render(result))
+                cards += 1
+        parts.append(end)
+    return "".join(parts), cards
+
+
+def _render_task(task):
+    """子进程任务：一个分片 → （文本, 卡片数）"""
+    rows, fmt, analyzers = task
+    return render_rows(rows, fmt, analyzers)
+
+
+def _shards(rows, shard_size):
+    shard = []
+    for row in rows:
+        shard.append(row)
+        if len(shard) >= shard_size:
+            yield shard
+            shard = []
+    if shard:
+        yield shard
+
+
+def _format_for(path):
+    return "html" if path.endswith((".html", ".htm")) else "markdown"
+
+
+def render_report(results, output_path, fmt=None, analyzers=None, shard_size=DEFAULT_SHARD_SIZE, max_workers=None):
+    """
+    核心功能：流式渲染结果卡片到文件（内存中同时只保留在途分片）
+    :param results: statement_pipeline 结果文件路径（.jsonl，可带.gz）或结果行可迭代对象
+    :param fmt: markdown / html（默认按输出文件后缀判断）
+    :param analyzers: 只渲染这些工具的卡片（默认全部）
+    :param shard_size: 每个分片的公司数
+    :param max_workers: 进程数（None=CPU核数，1=当前进程内串行）
+    :return: 运行统计 {companies, cards, skipped, bytes, seconds, cards_per_sec, peak_rss_mb}
+             （skipped = 管道输出的无效输入行与结果文件中无法解析的行，不渲染）
+    """
+    fmt = fmt or _format_for(output_path)
+    if fmt not in FORMATS:
+        raise ValueError(f"⚠️ 未知报告格式：{fmt}（可选：{'/'.join(FORMATS)}）")
+    unknown = [name for name in (analyzers or ()) if name not in CARD_LINES]
+    if unknown:
+        raise ValueError(f"⚠️ 没有卡片模板的分析工具：{', '.join(unknown)}")
+    rows = read_records(results) if isinstance(results, str) else results
+    head, *_middle, tail = _LAYOUTS[fmt]
+    workers = max_workers or os.cpu_count() or 1
+
+    companies = cards = skipped = 0
+
+    def company_rows():
+        nonlocal skipped
+        for row in rows:
+            if "error" in row or INPUT_ERROR in row:
+                skipped += 1
+                continue
+            yield row
+
+    start = time.perf_counter()
+    with open(output_path, "w", encoding="utf-8") as out:
+        out.write(head)
+
+        def write(shard_rows, rendered):
+            nonlocal companies, cards
+            text, shard_cards = rendered
+            out.write(text)
+            companies += shard_rows
+            cards += shard_cards
+
+        if workers == 1:
+            for shard in _shards(company_rows(), shard_size):
+                write(len(shard), render_rows(shard, fmt, analyzers))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending = deque()
+                for shard in _shards(company_rows(), shard_size):
+                    pending.append((len(shard), executor.submit(_render_task, (shard, fmt, analyzers))))
+                    if len(pending) >= 2 * workers:
+                        size, future = pending.popleft()
+                        write(size, future.result())
+                while pending:
+                    size, future = pending.popleft()
+                    write(size, future.result())
+        out.write(tail)
+        size = out.tell()
+    seconds = time.perf_counter() - start
+    return {
+        "companies": companies,
+        "cards": cards,
+        "skipped": skipped,
+        "bytes": size,
+        "seconds": round(seconds, 3),
+        "cards_per_sec": round(cards / seconds, 1) if seconds > 0 else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m batch_processing.report_renderer", description="批量结果卡片渲染器")
+    parser.add_argument("input", help="statement_pipeline 的结果文件（.jsonl，可带 .gz）")
+    parser.add_argument("output", help="报告文件（.md / .html）")
+    parser.add_argument("--format", choices=FORMATS, help="报告格式（默认按输出文件后缀判断）")
+    parser.add_argument("--analyzers", help="逗号分隔的分析工具名（默认全部）")
+    parser.add_argument("--workers", type=int, help="渲染进程数（默认CPU核数）")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE)
+    args = parser.parse_args(argv)
+    analyzers = args.analyzers.split(",") if args.analyzers else None
+    stats = render_report(args.input, args.output, args.format, analyzers, args.shard_size, args.workers)
+    print(f"✅ 渲染{stats['companies']}家公司 / {stats['cards']}张卡片，用时{stats['seconds']}s"
+          f"（{stats['cards_per_sec']} 张/秒），输出{stats['bytes'] / 1e6:.1f}MB，峰值内存{stats['peak_rss_mb']}MB，"
+          f"跳过错误行{stats['skipped']}行", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
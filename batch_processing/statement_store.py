@@ -0,0 +1,368 @@
+# ==============================================
+# 【列式报表数据集·内存映射】v1.0
+# 独特性：CSV 一次性转换为"每个字段一个定长类型列"的二进制数据集（.npy），读取时内存映射、零拷贝
+#         行按（分区列, 期间, 公司）排序 + 分区×期间块索引 → "制造业, 2015–2024" 只对应一段连续行，只读这些页
+#         公司索引（CSR：公司 → 行号，按期间排序）支持按公司取全部历史
+# 开发者：Kiwi_hazel
+# 目录结构：meta.json（行数/列类型/文字列字典/索引说明）| columns/<字段>.npy | index/<索引>.npy
+# 列类型：数值字段 → float64（缺失=NaN）；文字字段 → 字典编码整数（int16/int32）
+#         文字字段 = 分析工具的文字参数 + text_fields 指定的列 + 首批数据中无法解析为数值的其他列（如公司名称）
+# 注意：数据集中的行已按（分区, 期间, 公司）重排，与原CSV行序不同
+# 用法：convert_csv("报表.csv", "报表集")；store = open_store("报表集")
+#       store.select(["operating_profit", "capital_employed"], partition="制造业", periods=(2015, 2024))
+#       命令行：python -m batch_processing.statement_store 报表.csv 报表集 [--partition industry]
+#               [--text-fields company_name,notes]
+# ==============================================
+
+import argparse
+import csv
+import json
+import mmap
+import os
+import shutil
+import sys
+import time
+from itertools import islice
+
+import numpy as np
+
+from common.cli import ANALYZERS, TEXT_FIELDS
+
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+ENTITY_FIELD, PERIOD_FIELD = "entity", "period"
+DEFAULT_PARTITION = "industry"  # 默认分区列（行业），查询"某行业 + 期间范围"只读一段连续行
+CONVERT_CHUNK_ROWS = 50_000  # 转换时每次解析的CSV行数（内存与文件大小无关）
+GATHER_CHUNK_ROWS = 1_000_000  # 重排写出时每次搬运的行数
+
+# 分析工具的文字参数（common.cli.TEXT_FIELDS）按字典编码存储；
+# 数值参数始终按数值列解析（出现非数值时报错，而不是悄悄转成文字列）
+NUMERIC_FIELDS = frozenset(param for spec in ANALYZERS.values() for param, cast, _default in spec["params"]
+                           if cast is not str)
+
+
+def is_store(path):
+    """路径是否为本格式的数据集目录"""
+    return os.path.isfile(os.path.join(path, META_FILE))
+
+
+def _parse_numeric(values, field, first_row):
+    """字符串列 → float64（空串 = NaN）；无法解析时报出字段名和行号"""
+    try:
+        return np.fromiter(map(float, values), np.float64, len(values))  # 常见情况：没有空值
+    except ValueError:
+        pass
+    out = np.empty(len(values))
+    for offset, value in enumerate(values):
+        try:
+            out[offset] = float(value) if value else np.nan
+        except ValueError:
+            raise ValueError(f"⚠️ 第{first_row + offset}行字段 {field} 不是数值：{value!r}"
+                             f"（文字列请用 text_fields / --text-fields 指定）") from None
+    return out
+
+
+def _looks_numeric(values):
+    """一列字符串是否都能解析为数值（空串视为缺失）"""
+    try:
+        for value in values:
+            if value:
+                float(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _code_dtype(vocab_size):
+    return np.int16 if vocab_size <= np.iinfo(np.int16).max else np.int32
+
+
+def convert_csv(csv_path, store_path, partition=DEFAULT_PARTITION, chunk_rows=CONVERT_CHUNK_ROWS, text_fields=()):
+    """
+    核心功能：CSV 报表 → 列式内存映射数据集（一次性转换，之后所有筛选直接读二进制列）
+    第一遍流式解析写入临时列文件，第二遍按（分区, 期间, 公司）重排写出并建立索引（数据集行序 ≠ CSV行序）
+    :param csv_path: 报表CSV（必须含 entity、period 列；period 为整数，如年份 2024 或年月 202403）
+    :param store_path: 输出目录（已存在则覆盖）
+    :param partition: 分区文字列（默认 industry；None = 不分区，仅按期间、公司排序）
+    :param text_fields: 额外按文字（字典编码）存储的列；首批数据中无法解析为数值的非分析参数列也自动按文字存储
+    :return: 转换统计 {rows, columns, seconds, bytes}
+    """
+    start = time.perf_counter()
+    tmp_path = store_path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(os.path.join(tmp_path, "raw"))
+    with open(csv_path, "r", encoding="utf-8", newline="") as stream:
+        reader = csv.reader(stream)
+        header = next(reader)
+        missing = [f for f in (ENTITY_FIELD, PERIOD_FIELD, partition) if f and f not in header]
+        if missing:
+            raise ValueError(f"⚠️ CSV 缺少字段：{', '.join(missing)}")
+        fields = [f for f in header if f not in (ENTITY_FIELD, PERIOD_FIELD)]
+        text = TEXT_FIELDS | set(text_fields)
+        categorical = [ENTITY_FIELD] + [f for f in fields if f in text or f == partition]
+        vocabs = {field: {} for field in categorical}
+        raw = {field: open(os.path.join(tmp_path, "raw", field), "wb") for field in header}
+        rows = 0
+        try:
+            while True:
+                chunk = list(islice(reader, chunk_rows))
+                if not chunk:
+                    break
+                if rows == 0:  # 首批数据：非分析参数列若含非数值内容（如公司名称）→ 按文字列存储
+                    for field, values in zip(header, zip(*chunk)):
+                        if (field not in vocabs and field != PERIOD_FIELD and field not in NUMERIC_FIELDS
+                                and not _looks_numeric(values)):
+                            vocabs[field] = {}
+                for field, values in zip(header, zip(*chunk)):
+                    if field in vocabs:
+                        vocab = vocabs[field]
+                        array = np.array([vocab.setdefault(v, len(vocab)) for v in values], dtype=np.int32)
+                    elif field == PERIOD_FIELD:
+                        array = np.array(values, dtype=np.int64)
+                    else:
+                        array = _parse_numeric(values, field, rows + 2)  # 行号含表头
+                    raw[field].write(array.tobytes())
+                rows += len(chunk)
+        finally:
+            for handle in raw.values():
+                handle.close()
+
+    def load_raw(field, dtype):
+        if rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(tmp_path, "raw", field), dtype=dtype, mode="r", shape=(rows,))
+
+    # 排序键：（分区代码, 期间代码, 公司代码）→ 行号排列
+    entity = np.asarray(load_raw(ENTITY_FIELD, np.int32))
+    period_values, period_code = np.unique(np.asarray(load_raw(PERIOD_FIELD, np.int64)), return_inverse=True)
+    part_code = np.asarray(load_raw(partition, np.int32)) if partition else np.zeros(rows, dtype=np.int32)
+    order = np.lexsort((entity, period_code, part_code))
+
+    os.makedirs(os.path.join(tmp_path, "columns"))
+    os.makedirs(os.path.join(tmp_path, "index"))
+    columns = {}
+    for field in header:
+        if field in vocabs:
+            dtype = _code_dtype(len(vocabs[field]))
+            source = load_raw(field, np.int32)
+        elif field == PERIOD_FIELD:
+            dtype, source = np.int32 if period_values.max(initial=0) <= np.iinfo(np.int32).max else np.int64, None
+        else:
+            dtype, source = np.float64, load_raw(field, np.float64)
+        out = np.lib.format.open_memmap(os.path.join(tmp_path, "columns", field + ".npy"), "w+", dtype, (rows,))
+        for begin in range(0, rows, GATHER_CHUNK_ROWS):
+            picked = order[begin:begin + GATHER_CHUNK_ROWS]
+            out[begin:begin + len(picked)] = period_values[period_code[picked]] if source is None else source[picked]
+        out.flush()
+        del out
+        columns[field] = np.dtype(dtype).str
+
+    # 分区×期间块索引：块号 = 分区代码 × 期间数 + 期间代码，块内行连续
+    n_partitions = len(vocabs[partition]) if partition else 1
+    block = part_code[order].astype(np.int64) * len(period_values) + period_code[order]
+    block_offsets = np.concatenate([[0], np.cumsum(np.bincount(block, minlength=n_partitions * len(period_values)))])
+    # 公司索引（CSR）：稳定排序保留（分区, 期间）顺序 → 每家公司的行按期间递增
+    sorted_entity = entity[order]
+    entity_rows = np.argsort(sorted_entity, kind="stable")
+    entity_offsets = np.concatenate([[0], np.cumsum(np.bincount(sorted_entity, minlength=len(vocabs[ENTITY_FIELD])))])
+    for name, array in (("block_offsets", block_offsets), ("entity_offsets", entity_offsets),
+                        ("entity_rows", entity_rows), ("periods", period_values)):
+        np.save(os.path.join(tmp_path, "index", name + ".npy"), array.astype(np.int64))
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "rows": rows,
+        "columns": columns,
+        "vocabs": {field: list(vocab) for field, vocab in vocabs.items()},
+        "partition": partition,
+        "sort_key": [partition, PERIOD_FIELD, ENTITY_FIELD] if partition else [PERIOD_FIELD, ENTITY_FIELD],
+        "source": os.path.basename(csv_path),
+    }
+    with open(os.path.join(tmp_path, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    shutil.rmtree(os.path.join(tmp_path, "raw"))
+    shutil.rmtree(store_path, ignore_errors=True)
+    os.replace(tmp_path, store_path)  # 转换完成才出现目标目录，中途失败不会留下半个数据集
+    size = sum(os.path.getsize(os.path.join(root, name)) for root, _dirs, files in os.walk(store_path)
+               for name in files)
+    return {"rows": rows, "columns": len(columns), "seconds": round(time.perf_counter() - start, 3), "bytes": size}
+
+
+class StatementStore:
+    """
+    只读数据集句柄：列在首次访问时内存映射，切片即零拷贝视图
+    行选择：select/rows 按分区 + 期间范围返回连续切片，按公司返回行号数组
+    """
+
+    def __init__(self, path):
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"⚠️ 数据集格式版本不兼容：{meta.get('format_version')}（当前支持 {FORMAT_VERSION}）")
+        self.path = path
+        self.meta = meta
+        self.rows_total = meta["rows"]
+        self.fields = tuple(meta["columns"])
+        self.vocabs = meta["vocabs"]
+        self.partition = meta["partition"]
+        self._columns = {}
+        self._codes = {field: {value: code for code, value in enumerate(vocab)} for field, vocab in self.vocabs.items()}
+        index = {name: np.load(os.path.join(path, "index", name + ".npy"), mmap_mode="r")
+                 for name in ("block_offsets", "entity_offsets", "entity_rows")}
+        self.periods = np.load(os.path.join(path, "index", "periods.npy"))
+        self._block_offsets = index["block_offsets"]
+        self._entity_offsets = index["entity_offsets"]
+        self._entity_rows = index["entity_rows"]
+
+    def _map(self, field):
+        """
+        内存映射一个列文件 → 只读零拷贝数组
+        映射设为随机访问（关闭内核预读），实际读取范围由 _prefetch 按查询行区间精确预取
+        """
+        with open(os.path.join(self.path, "columns", field + ".npy"), "rb") as f:
+            version = np.lib.format.read_magic(f)
+            read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else \
+                np.lib.format.read_array_header_2_0
+            shape, _fortran_order, dtype = read_header(f)
+            offset = f.tell()
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mapped, "madvise"):
+            mapped.madvise(mmap.MADV_RANDOM)
+        return mapped, offset, np.frombuffer(mapped, dtype=dtype, count=shape[0], offset=offset)
+
+    def column(self, field):
+        """内存映射的整列（文字列为字典编码，见 decode）"""
+        if field not in self._columns:
+            if field not in self.meta["columns"]:
+                raise KeyError(f"⚠️ 数据集中没有字段：{field}")
+            self._columns[field] = self._map(field)
+        return self._columns[field][2]
+
+    def _prefetch(self, field, selection):
+        """连续行区间 → 一次性预取对应的页（MADV_WILLNEED），只读匹配的页"""
+        mapped, offset, array = self._columns[field]
+        if not isinstance(selection, slice) or selection.stop <= selection.start or not hasattr(mapped, "madvise"):
+            return
+        begin = offset + selection.start * array.itemsize
+        end = offset + selection.stop * array.itemsize
+        aligned = begin - begin % mmap.PAGESIZE
+        mapped.madvise(mmap.MADV_WILLNEED, aligned, end - aligned)
+
+    def _read(self, field, selection):
+        values = self.column(field)
+        self._prefetch(field, selection)
+        return values[selection]
+
+    def decode(self, field, codes):
+        """字典编码 → 字符串列表"""
+        vocab = self.vocabs[field]
+        return [vocab[code] for code in np.asarray(codes).tolist()]
+
+    def _period_span(self, periods):
+        """期间范围 (起, 止)（含两端）→ 期间代码区间 [lo, hi)"""
+        if periods is None:
+            return 0, len(self.periods)
+        first, last = periods
+        return int(np.searchsorted(self.periods, first, "left")), int(np.searchsorted(self.periods, last, "right"))
+
+    def rows(self, partition=None, periods=None, entities=None):
+        """
+        行选择（不读取任何数据列）
+        :param partition: 分区值或分区值列表（如 "制造业"）；None = 全部
+        :param periods: 期间范围 (起, 止)，含两端；None = 全部
+        :param entities: 公司名称列表；给出时按公司索引取行（结果再按分区、期间过滤）
+        :return: slice（连续行，列切片为零拷贝视图）或 int64 行号数组
+        """
+        lo, hi = self._period_span(periods)
+        n_periods = len(self.periods)
+        if partition is None:
+            parts = range((len(self._block_offsets) - 1) // n_periods) if n_periods else range(0)
+        else:
+            if self.partition is None:
+                raise ValueError("⚠️ 数据集未按分区列排序，无法按分区查询")
+            names = [partition] if isinstance(partition, str) else list(partition)
+            parts = sorted(self._codes[self.partition][name] for name in names if name in self._codes[self.partition])
+        spans = [(int(self._block_offsets[p * n_periods + lo]), int(self._block_offsets[p * n_periods + hi]))
+                 for p in parts if hi > lo]
+        if entities is not None:
+            codes = [self._codes[ENTITY_FIELD][name] for name in entities if name in self._codes[ENTITY_FIELD]]
+            picked = np.concatenate([self._entity_rows[self._entity_offsets[c]:self._entity_offsets[c + 1]]
+                                     for c in codes]) if codes else np.empty(0, dtype=np.int64)
+            inside = np.zeros(len(picked), dtype=bool)
+            for begin, end in spans:
+                inside |= (picked >= begin) & (picked < end)
+            return np.sort(picked[inside])
+        spans = [(begin, end) for begin, end in spans if end > begin]
+        merged = []
+        for begin, end in spans:  # 相邻区间合并（如全部分区 + 全部期间 → 整个数据集一段）
+            if merged and merged[-1][1] == begin:
+                merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((begin, end))
+        if len(merged) == 1:
+            return slice(*merged[0])
+        if not merged:
+            return slice(0, 0)
+        return np.concatenate([np.arange(begin, end) for begin, end in merged])
+
+    def select(self, fields, partition=None, periods=None, entities=None, decode=False):
+        """
+        核心功能：按条件取若干列（连续行时为内存映射的零拷贝视图，否则按行号拷贝）
+        :param fields: 字段名列表
+        :param decode: 文字列是否解码为字符串列表（默认返回字典编码数组）
+        :return: {字段名: 数组}，另含 "_rows"（行选择，可复用于取其他列）
+        """
+        selection = self.rows(partition, periods, entities)
+        out = {"_rows": selection}
+        for field in fields:
+            values = self._read(field, selection)
+            out[field] = self.decode(field, values) if decode and field in self.vocabs else values
+        return out
+
+    def records(self, fields=None, partition=None, periods=None, entities=None, batch_rows=10000):
+        """
+        逐行生成报表记录 dict（供 statement_pipeline 等逐行工具使用；NaN → None，文字列解码为字符串）
+        按 batch_rows 分批读取列，内存与数据集大小无关
+        """
+        fields = list(fields or self.fields)
+        selection = self.rows(partition, periods, entities)
+        contiguous = isinstance(selection, slice)
+        total = selection.stop - selection.start if contiguous else len(selection)
+        for begin in range(0, total, batch_rows):
+            if contiguous:
+                picked = slice(selection.start + begin, min(selection.start + begin + batch_rows, selection.stop))
+            else:
+                picked = selection[begin:begin + batch_rows]
+            columns = []
+            for field in fields:
+                values = self._read(field, picked)
+                if field in self.vocabs:
+                    columns.append(self.decode(field, values))
+                else:
+                    columns.append([None if v != v else v for v in values.tolist()])
+            for values in zip(*columns):
+                yield dict(zip(fields, values))
+
+
+def open_store(path):
+    """打开数据集（只读取元数据与索引，数据列按需内存映射）"""
+    return StatementStore(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CSV 报表 → 列式内存映射数据集（一次性转换）")
+    parser.add_argument("csv_path")
+    parser.add_argument("store_path")
+    parser.add_argument("--partition", default=DEFAULT_PARTITION, help="分区文字列（none = 不分区）")
+    parser.add_argument("--text-fields", help="逗号分隔的额外文字列（默认自动识别非数值列）")
+    args = parser.parse_args(argv)
+    partition = None if args.partition.lower() == "none" else args.partition
+    text_fields = [f.strip() for f in args.text_fields.split(",")] if args.text_fields else ()
+    stats = convert_csv(args.csv_path, args.store_path, partition, text_fields=text_fields)
+    print(f"✅ 转换完成：{stats['rows']:,} 行 × {stats['columns']} 列，{stats['bytes'] / 1e6:.1f} MB，"
+          f"耗时 {stats['seconds']}s → {args.store_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
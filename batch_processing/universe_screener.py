@@ -0,0 +1,318 @@
+# ==============================================
+# 【全市场筛选器·多核分片】v1.0
+# 独特性：公司池输入一次性写入共享内存（数值列 float64 块 + 文字列字典编码 int32 块）
+#         → 按固定行区间分片交给进程池 → 工作进程按名称挂载共享内存、只读自己的分片
+#         → 结果写回共享输出块的对应行区间（合并顺序固定，任意进程数结果逐位一致）
+# 开发者：Kiwi_hazel
+# 用法：screen_universe({"cash_eq": [...], "industry_type": [...], ...}, max_workers=8)
+#       → {分析工具: {数值列/等级代码列/valid}}，等级代码 → 文字见 SCREEN_LABELS
+# 每条记录的数值与单公司函数（common.cli.run_analyzer）一致；capital_structure 只输出文字结论，不参与筛选
+# ==============================================
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from batch_processing.batch_kernels import run_batch
+from common.cli import ANALYZERS, REQUIRED
+from investment_valuation.eva_economic_value_added import VALUE_LEVELS
+from investment_valuation.pe_valuation_safety_margin import MARGIN_STATUSES
+from operation_efficiency.inventory_turnover_days import HEALTH_GRADES
+from profitability_analysis.dupont_analysis_strategic import STRATEGY_TYPES
+from solvency_analysis.cash_ratio_stress_test import HEALTH_QUADRANTS
+from solvency_analysis.interest_coverage_stress import RISK_LEVELS
+
+CODE_MISSING = -1  # 等级代码：缺少必填字段或数据错误
+DEFAULT_SHARD_SIZE = 10000
+
+# 筛选列：分析工具 → 数值列（结果字段名）
+SCREEN_VALUES = {
+    "current_ratio": ("current_ratio",),
+    "quick_ratio": ("quick_ratio",),
+    "cash_ratio": ("cash_ratio", "survival_days"),
+    "interest_coverage": ("normal_coverage", "stress_coverage"),
+    "roce": ("roce",),
+    "dupont": ("roe",),
+    "inventory": ("turnover_days",),
+    "roi_ri": ("roi", "ri"),
+    "pe_safety_margin": ("pe_static", "safety_margin"),
+    "eva": ("eva", "eva_yield"),
+}
+
+# 等级代码列：分析工具 → （代码列名, 结果字段名, 文字表）；代码 = 文字在表中的下标
+SCREEN_CODES = {
+    "cash_ratio": ("quadrant_code", "health_quadrant", tuple(label for label, _note in HEALTH_QUADRANTS)),
+    "interest_coverage": ("risk_code", "risk_level", tuple(label for label, _note in RISK_LEVELS)),
+    "dupont": ("strategy_code", "strategy_type", tuple(label for label, _note in STRATEGY_TYPES)),
+    "inventory": ("grade_code", "health_score", tuple(label for label, _note in HEALTH_GRADES)),
+    "pe_safety_margin": ("status_code", "margin_status", MARGIN_STATUSES),
+    "eva": ("value_code", "value_level", tuple(label for label, _note in VALUE_LEVELS)),
+}
+
+# 代码列名 → 文字表（渲染用）
+SCREEN_LABELS = {column: labels for column, _field, labels in SCREEN_CODES.values()}
+
+
+def _input_fields(analyzers):
+    """选定工具用到的输入字段：（数值字段, 文字字段），按首次出现顺序"""
+    numeric, text = [], []
+    for name in analyzers:
+        for param, cast, _default in ANALYZERS[name]["params"]:
+            target = text if cast is str else numeric
+            if param not in numeric and param not in text:
+                target.append(param)
+    return numeric, text
+
+
+def _output_layout(analyzers):
+    """输出块布局：float64 行 = 各工具数值列；int8 行 = 各工具等级代码列 + valid 标记"""
+    values, codes = [], []
+    for name in analyzers:
+        values.extend((name, column) for column in SCREEN_VALUES[name])
+        if name in SCREEN_CODES:
+            codes.append((name, SCREEN_CODES[name][0]))
+        codes.append((name, "valid"))
+    return values, codes
+
+
+def _encode_text(values):
+    """文字列字典编码：（int32 代码数组, 词表）；None/空串编码为 -1（按缺失处理）"""
+    vocab, lookup = [], {}
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        if value is None or value == "":
+            codes[i] = CODE_MISSING
+            continue
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(vocab)
+            vocab.append(value)
+        codes[i] = code
+    return codes, tuple(vocab)
+
+
+class SharedUniverse:
+    """
+    公司池的共享内存布局（上下文管理器，退出时释放共享内存）
+    输入：numeric(F×N float64，NaN=缺失) + text(T×N int32，-1=缺失)
+    输出：values(V×N float64) + codes(C×N int8)，工作进程按行区间写入
+    """
+
+    def __init__(self, columns, analyzers):
+        self.analyzers = tuple(analyzers)
+        numeric_fields, text_fields = _input_fields(self.analyzers)
+        value_columns, code_columns = _output_layout(self.analyzers)
+        rows = len(next(iter(columns.values()))) if columns else 0
+        self.rows = rows
+
+        vocabs = []
+        blocks = {}
+        # 每块至少1字节：SharedMemory 不允许 size=0
+        for block, shape, dtype in (("numeric", (len(numeric_fields), rows), np.float64),
+                                    ("text", (len(text_fields), rows), np.int32),
+                                    ("values", (len(value_columns), rows), np.float64),
+                                    ("codes", (len(code_columns), rows), np.int8)):
+            size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            blocks[block] = (shared_memory.SharedMemory(create=True, size=size), shape, np.dtype(dtype).str)
+        self._blocks = blocks
+
+        numeric, text, _values, _codes = self.arrays()
+        for i, field in enumerate(numeric_fields):
+            source = columns.get(field)
+            if source is None:
+                numeric[i] = np.nan
+                continue
+            column = np.asarray([np.nan if v is None or v == "" else v for v in source]
+                                if not isinstance(source, np.ndarray) else source, dtype=np.float64)
+            if len(column) != rows:
+                self.close()
+                raise ValueError(f"⚠️ 列长度不一致：{field}（{len(column)}行，应为{rows}行）")
+            numeric[i] = column
+        for i, field in enumerate(text_fields):
+            source = columns.get(field)
+            if source is None:
+                text[i] = CODE_MISSING
+                vocabs.append(())
+                continue
+            codes, vocab = _encode_text(list(source))
+            if len(codes) != rows:
+                self.close()
+                raise ValueError(f"⚠️ 列长度不一致：{field}（{len(codes)}行，应为{rows}行）")
+            text[i] = codes
+            vocabs.append(vocab)
+        del numeric, text, _values, _codes  # 释放视图，close() 时共享内存不能仍被引用
+
+        # 工作进程只收到这份小字典（共享内存名称 + 形状 + 词表），不复制任何行数据
+        self.spec = {
+            "analyzers": self.analyzers,
+            "numeric_fields": tuple(numeric_fields),
+            "text_fields": tuple(text_fields),
+            "vocabs": tuple(vocabs),
+            "value_columns": tuple(value_columns),
+            "code_columns": tuple(code_columns),
+            "rows": rows,
+            "blocks": {name: (shm.name, shape, dtype) for name, (shm, shape, dtype) in blocks.items()},
+        }
+
+    @property
+    def nbytes(self):
+        """共享内存总字节数（输入 + 输出）"""
+        return sum(shm.size for shm, _shape, _dtype in self._blocks.values())
+
+    def arrays(self):
+        """（numeric, text, values, codes）四个共享数组视图"""
+        return tuple(np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+                     for shm, shape, dtype in self._blocks.values())
+
+    def results(self):
+        """从共享输出块复制出结果：{分析工具: {列名: 数组}}（复制后共享内存可安全释放）"""
+        _numeric, _text, values, codes = self.arrays()
+        out = {name: {} for name in self.analyzers}
+        for (name, column), row in zip(self.spec["value_columns"], values):
+            out[name][column] = row.copy()
+        for (name, column), row in zip(self.spec["code_columns"], codes):
+            out[name][column] = row.astype(bool) if column == "valid" else row.copy()
+        return out
+
+    def close(self):
+        for shm, _shape, _dtype in self._blocks.values():
+            shm.close()
+            shm.unlink()
+        self._blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _shard_records(name, spec, numeric, text, start, stop):
+    """
+    把分片中某个工具的输入还原为参数 dict 列表（缺少必填字段的行为 None）
+    数值经 tolist() 转为 Python float，保证取整口径与单公司函数一致
+    """
+    numeric_index = {field: i for i, field in enumerate(spec["numeric_fields"])}
+    text_index = {field: i for i, field in enumerate(spec["text_fields"])}
+    columns = []
+    for param, cast, default in ANALYZERS[name]["params"]:
+        if cast is str:
+            i = text_index[param]
+            vocab = spec["vocabs"][i]
+            values = [vocab[code] if code >= 0 else None for code in text[i, start:stop].tolist()]
+        else:
+            values = [None if v != v else v for v in numeric[numeric_index[param], start:stop].tolist()]  # NaN → 缺失
+        columns.append((param, default is REQUIRED, values))
+    records = []
+    for row in range(stop - start):
+        record = {}
+        for param, required, values in columns:
+            value = values[row]
+            if value is None:
+                if required:
+                    record = None
+                    break
+                continue
+            record[param] = value
+        records.append(record)
+    return records
+
+
+def _screen_shard(task):
+    """
+    单个分片的筛选（进程池工作函数）：挂载共享内存 → 计算 [start, stop) 行 → 写回输出块对应行
+    :return: （start, stop, 各工具有效行数）
+    """
+    spec, start, stop = task
+    handles = [shared_memory.SharedMemory(name=name) for name, _shape, _dtype in spec["blocks"].values()]
+    try:
+        numeric, text, values, codes = (np.ndarray(shape, dtype=dtype, buffer=shm.buf) for shm, (_name, shape, dtype)
+                                        in zip(handles, spec["blocks"].values()))
+        value_rows = {key: i for i, key in enumerate(spec["value_columns"])}
+        code_rows = {key: i for i, key in enumerate(spec["code_columns"])}
+        counts = {}
+        for name in spec["analyzers"]:
+            records = _shard_records(name, spec, numeric, text, start, stop)
+            present = [i for i, record in enumerate(records) if record is not None]
+            results = run_batch(name, [records[i] for i in present])
+            columns = SCREEN_VALUES[name]
+            block = np.full((len(columns), stop - start), np.nan)
+            valid = np.zeros(stop - start, dtype=np.int8)
+            code_spec = SCREEN_CODES.get(name)
+            code = np.full(stop - start, CODE_MISSING, dtype=np.int8)
+            lookup = {label: i for i, label in enumerate(code_spec[2])} if code_spec else {}
+            for i, result in zip(present, results):
+                if "error" in result:
+                    continue
+                valid[i] = 1
+                for j, column in enumerate(columns):
+                    block[j, i] = result[column]
+                if code_spec:
+                    code[i] = lookup[result[code_spec[1]]]
+            for j, column in enumerate(columns):
+                values[value_rows[(name, column)], start:stop] = block[j]
+            if code_spec:
+                codes[code_rows[(name, code_spec[0])], start:stop] = code
+            codes[code_rows[(name, "valid")], start:stop] = valid
+            counts[name] = int(valid.sum())
+        del numeric, text, values, codes
+        return start, stop, counts
+    finally:
+        for shm in handles:
+            shm.close()
+
+
+def shard_bounds(rows, shard_size=DEFAULT_SHARD_SIZE):
+    """固定行区间分片 [(start, stop), ...]（只取决于行数和分片大小，与进程数无关）"""
+    return [(start, min(start + shard_size, rows)) for start in range(0, rows, shard_size)]
+
+
+def screen_universe(columns, analyzers=None, max_workers=None, shard_size=DEFAULT_SHARD_SIZE):
+    """
+    核心功能：全市场多核筛选
+    :param columns: {字段名: 列}（字段名同各分析函数参数名；数值列可为 NumPy 数组，缺失用 NaN/None，
+                    文字列为字符串序列，None/空串表示缺失）
+    :param analyzers: 分析工具名列表（默认 SCREEN_VALUES 中的全部工具）
+    :param max_workers: 进程数（None=CPU核数，1=当前进程内串行）
+    :param shard_size: 每个分片的行数（分片边界固定，结果与进程数无关）
+    :return: {分析工具: {数值列: float64数组(无效行NaN), 等级代码列: int8数组(-1=无效), "valid": bool数组}}
+    """
+    analyzers = list(analyzers or SCREEN_VALUES)
+    unknown = [name for name in analyzers if name not in SCREEN_VALUES]
+    if unknown:
+        raise ValueError(f"⚠️ 不支持筛选的分析工具：{', '.join(unknown)}")
+
+    with SharedUniverse(columns, analyzers) as universe:
+        tasks = [(universe.spec, start, stop) for start, stop in shard_bounds(universe.rows, shard_size)]
+        workers = max_workers or os.cpu_count() or 1
+        if workers == 1 or len(tasks) <= 1:
+            for task in tasks:
+                _screen_shard(task)
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                # 各分片写入互不重叠的行区间；按提交顺序收取，任何分片失败都会在此抛出
+                for _result in executor.map(_screen_shard, tasks):
+                    pass
+        return universe.results()
+
+
+def screen_labels(column, codes):
+    """等级代码数组 → 文字列表（-1 → None）"""
+    labels = SCREEN_LABELS[column]
+    return [labels[code] if code >= 0 else None for code in np.asarray(codes).tolist()]
+
+
+if __name__ == "__main__":
+    universe = {
+        "cash_eq": [500, 3000, 80], "short_term_debt": [1000, 2000, 900], "daily_cash_burn": [8, 10, 6],
+        "industry_type": ["重资产", "轻资产", "金融"],
+        "cogs": [8000, 5000, 12000], "avg_inventory": [1000, 300, 4000], "industry_subtype": ["快消品", "耐用品", None],
+    }
+    screened = screen_universe(universe, ["cash_ratio", "inventory"], max_workers=1)
+    print("===== 🔎 全市场筛选示例（3家公司） =====")
+    cash, inventory = screened["cash_ratio"], screened["inventory"]
+    for i, (quadrant, grade) in enumerate(zip(screen_labels("quadrant_code", cash["quadrant_code"]),
+                                              screen_labels("grade_code", inventory["grade_code"]))):
+        print(f"公司{i + 1}：现金比率{cash['cash_ratio'][i]} {quadrant} | 存货周转{inventory['turnover_days'][i]}天 {grade}")
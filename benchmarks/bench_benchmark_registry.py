@@ -0,0 +1,108 @@
+# ==============================================
+# 【基准测试】行业基准查表：每次调用重建 dict 字面量（旧写法） vs 注册表行查表 vs 批量代码查表
+# 运行：python -m benchmarks.bench_benchmark_registry [次数]
+# 同时演示：校准文件热加载（修改文件 → reload_if_changed → 新阈值立即生效，内置行业代码不变）
+# ==============================================
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from common import benchmark_registry
+from common.benchmark_registry import get_registry, load_registry, reload_if_changed
+from solvency_analysis.cash_ratio_batch import cash_ratio_stress_batch
+from solvency_analysis.cash_ratio_stress_test import cash_ratio_stress_test
+
+NAMES = ("重资产", "轻资产", "金融", "服务业", "未知")
+
+
+def literal_lookup(industry_type):
+    """旧写法：每次调用都重建阈值 dict"""
+    thresholds = {
+        "重资产": {"ratio": 0.5, "days": 90},
+        "轻资产": {"ratio": 0.3, "days": 60},
+        "金融": {"ratio": 0.8, "days": 120},
+        "服务业": {"ratio": 0.4, "days": 75}
+    }
+    return thresholds.get(industry_type, thresholds["重资产"])
+
+
+def registry_lookup(industry_type):
+    return get_registry().table("cash_crisis").row(industry_type)
+
+
+def timed(function, names):
+    start = time.perf_counter()
+    for name in names:
+        function(name)
+    return time.perf_counter() - start
+
+
+def hot_reload_demo():
+    """写校准文件 → 加载 → 修改文件 → 热加载，返回各阶段的（版本, 重资产阈值, 批量查表结果）"""
+    stages = []
+    codes = np.array([0, 4, 5, -1])  # 重资产 / 新增行业 / 越界 / 越界
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "benchmarks.json")
+        calibration = {"version": "2025Q1", "tables": {"cash_crisis": {
+            "entries": {"重资产": {"ratio": 0.55}, "半导体": {"ratio": 0.6, "days": 100}},
+            "aliases": {"制造业": "重资产"}}}}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(calibration, f, ensure_ascii=False)
+        load_registry(path)
+        stages.append(_snapshot(codes))
+
+        calibration["version"] = "2025Q2"
+        calibration["tables"]["cash_crisis"]["entries"]["重资产"]["ratio"] = 0.6
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(calibration, f, ensure_ascii=False)
+        os.utime(path, (time.time() + 1, time.time() + 1))  # 保证修改时间变化（部分文件系统精度为秒）
+        reloaded = reload_if_changed()
+        stages.append(_snapshot(codes))
+    load_registry(None)  # 恢复内置基准
+    return stages, reloaded
+
+
+def _snapshot(codes):
+    registry = get_registry()
+    table = registry.table("cash_crisis")
+    alias = cash_ratio_stress_test(500, 1000, 8, "制造业")["industry_threshold"]
+    return registry.version, dict(table.row("重资产")), table.lookup(codes, "ratio").tolist(), alias
+
+
+def main(n=500_000):
+    names = [NAMES[i % len(NAMES)] for i in range(n)]
+    consistent = all(dict(registry_lookup(name)) == literal_lookup(name) for name in NAMES)
+
+    literal_seconds = timed(literal_lookup, names)
+    registry_seconds = timed(registry_lookup, names)
+    codes = get_registry().table("cash_crisis").encode(names)
+    start = time.perf_counter()
+    get_registry().table("cash_crisis").lookup(codes, "ratio")
+    batch_seconds = time.perf_counter() - start
+
+    print(f"\n===== 📚 行业基准查表基准（{n:,} 次查表） =====")
+    print(f"每次重建dict字面量：{literal_seconds:.3f}s（{literal_seconds / n * 1e9:.0f} ns/次）")
+    print(f"注册表行查表：      {registry_seconds:.3f}s（{registry_seconds / n * 1e9:.0f} ns/次） | "
+          f"加速比：{literal_seconds / registry_seconds:.1f}x")
+    print(f"批量代码查表：      {batch_seconds:.4f}s（{batch_seconds / n * 1e9:.1f} ns/行）")
+    print(f"内置注册表与旧字面量一致：{'✅' if consistent else '❌'}")
+
+    stages, reloaded = hot_reload_demo()
+    print("\n----- 🔥 热加载演示（代码：重资产 / 新增行业 / 越界 / 越界） -----")
+    for version, row, ratios, alias in stages:
+        print(f"版本 {version}：重资产={row} | 批量查表={ratios} | 别名\"制造业\" → {alias}")
+    batch = cash_ratio_stress_batch([500], [1000], [8], [0])
+    builtin_restored = get_registry().version == benchmark_registry.BUILTIN_VERSION and batch["quadrant_code"][0] >= 0
+    expected = [0.55, 0.6, 0.55, 0.55], [0.6, 0.6, 0.6, 0.6]
+    reload_ok = reloaded and [stage[2] for stage in stages] == list(expected)
+    print(f"文件修改后自动重新加载：{'✅' if reload_ok else '❌'} | 恢复内置基准：{'✅' if builtin_restored else '❌'}")
+    return 0 if consistent and reload_ok and builtin_restored else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000))
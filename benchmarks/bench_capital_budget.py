@@ -0,0 +1,123 @@
+# ==============================================
+# 【基准测试】资本预算组合优选：批量评分 + 精确/贪心求解
+# 运行：python -m benchmarks.bench_capital_budget [候选项目数]
+# 校验：① 批量ROI/RI/联动分析与 calculate_roi_ri 逐行一致（含双指标矛盾的取整边界行）
+#       ② 小规模精确解 = 穷举最优解；贪心解 ≤ 最优解 ≤ 贪心解 + max_gap
+#       ③ 所选组合满足总预算与行业上限 | 1万个项目求解远低于1秒
+# ==============================================
+
+import sys
+import time
+
+import numpy as np
+
+from common.benchmark_registry import get_registry
+from investment_valuation.capital_budget import (INDUSTRY_NAMES, analysis_notes, encode_industries, score_projects,
+                                                 select_portfolio)
+from investment_valuation.roi_ri_calculator import calculate_roi_ri
+
+BRUTE_FORCE_PROJECTS = 16  # 穷举 2^16 个组合
+BRUTE_FORCE_CASES = 30
+TARGET_SECONDS = 1.0
+
+
+def make_projects(n, seed=0):
+    """随机候选项目池：收益率围绕资本成本分布；少量收益≈资本成本的取整边界行与错误行"""
+    rng = np.random.default_rng(seed)
+    industry_code = rng.integers(0, len(INDUSTRY_NAMES) + 1, n)  # 含1个未知行业代码
+    rate = get_registry().table("cost_of_capital").lookup(industry_code, "rate")
+    investment = rng.uniform(50, 5000, n).round(1)
+    profit = (investment * (rate / 100 + rng.normal(0.01, 0.04, n))).round(2)
+    edge = rng.random(n) < 0.05  # 收益恰好在资本成本附近 → 取整后可能出现双指标矛盾
+    profit[edge] = (investment[edge] * rate[edge] / 100 + rng.choice([-0.004, 0.003, 0.004], edge.sum())).round(3)
+    profit[rng.random(n) < 0.01] = -10
+    return profit, investment, industry_code
+
+
+def check_scalar(n=50000):
+    profit, investment, industry_code = make_projects(n, seed=1)
+    scores = score_projects(profit, investment, industry_code)
+    notes = analysis_notes(scores["analysis_code"])
+    names = [INDUSTRY_NAMES[c] if c < len(INDUSTRY_NAMES) else "未知" for c in industry_code.tolist()]
+    mismatches = 0
+    for i, (p, v, name) in enumerate(zip(profit.tolist(), investment.tolist(), names)):
+        row = calculate_roi_ri(p, v, name)
+        if "error" in row:
+            mismatches += bool(scores["valid"][i])
+            continue
+        mismatches += not (row["roi"] == scores["roi"][i] and row["ri"] == scores["ri"][i]
+                           and row["cost_of_capital"] == scores["cost_of_capital"][i] and row["analysis"] == notes[i])
+    return n, int(scores["contradiction"].sum()), mismatches
+
+
+def brute_force(profit, investment, industry_code, budget, caps):
+    """穷举全部 2^n 个组合（位矩阵向量化），返回最优RI总和"""
+    scores = score_projects(profit, investment, industry_code)
+    n = len(profit)
+    masks = ((np.arange(2 ** n)[:, None] >> np.arange(n)) & 1).astype(bool)
+    value = np.where(scores["valid"], scores["ri"], -np.inf)
+    totals = np.where(masks, value, 0.0).sum(axis=1)
+    feasible = masks @ investment <= budget + 1e-9
+    codes = encode_industries([INDUSTRY_NAMES[c] if c < len(INDUSTRY_NAMES) else "未知" for c in industry_code])
+    for name, cap in caps.items():
+        member = codes == encode_industries([name])[0]
+        feasible &= masks @ np.where(member, investment, 0.0) <= cap + 1e-9
+    return float(np.max(np.where(feasible, totals, -np.inf)))
+
+
+def check_feasible(result, investment, industry_code, budget, caps):
+    picked = result["selected"]
+    codes = encode_industries([INDUSTRY_NAMES[c] if c < len(INDUSTRY_NAMES) else "未知" for c in industry_code])
+    ok = investment[picked].sum() <= budget + 1e-6
+    for name, cap in caps.items():
+        ok &= investment[picked & (codes == encode_industries([name])[0])].sum() <= cap + 1e-6
+    return bool(ok)
+
+
+def check_small():
+    """小规模：精确解 vs 穷举；贪心解的误差上界是否成立"""
+    wrong = 0
+    for case in range(BRUTE_FORCE_CASES):
+        profit, investment, industry_code = make_projects(BRUTE_FORCE_PROJECTS, seed=100 + case)
+        budget = float(investment.sum() * 0.35)
+        caps = {"高科技": budget * 0.3, "房地产": budget * 0.2}
+        optimum = max(brute_force(profit, investment, industry_code, budget, caps), 0.0)
+        exact = select_portfolio(profit, investment, industry_code, budget, caps, method="exact")
+        greedy = select_portfolio(profit, investment, industry_code, budget, caps, method="greedy")
+        wrong += abs(exact["total_ri"] - optimum) > 1e-6 or exact["method"] != "exact"
+        wrong += not greedy["total_ri"] - 1e-6 <= optimum <= greedy["total_ri"] + greedy["max_gap"] + 1e-6
+        wrong += not (check_feasible(exact, investment, industry_code, budget, caps)
+                      and check_feasible(greedy, investment, industry_code, budget, caps))
+    return wrong
+
+
+def main(n=10000):
+    failures = 0
+    print("\n===== 🏆 资本预算组合优选基准 =====")
+    rows, contradictions, mismatches = check_scalar()
+    failures += mismatches
+    print(f"批量评分 vs calculate_roi_ri：{rows:,} 行，双指标矛盾 {contradictions} 行，不一致 {mismatches}")
+    wrong = check_small()
+    failures += wrong
+    print(f"精确解 vs 穷举（{BRUTE_FORCE_CASES} 组 × {BRUTE_FORCE_PROJECTS} 个项目）+ 贪心误差上界：异常 {wrong}")
+
+    for size in (40, n, n * 10):
+        profit, investment, industry_code = make_projects(size, seed=2)
+        budget = float(investment.sum() * 0.2)
+        caps = {"高科技": budget * 0.25, "房地产": budget * 0.15}
+        start = time.perf_counter()
+        result = select_portfolio(profit, investment, industry_code, budget, caps)
+        seconds = time.perf_counter() - start
+        feasible = check_feasible(result, investment, industry_code, budget, caps)
+        failures += not feasible
+        if size == n:
+            failures += seconds >= TARGET_SECONDS
+        print(f"\n{size:,} 个候选项目（预算{budget:,.0f}万）：{seconds * 1000:.1f}ms | 方法 {result['method']} | "
+              f"入选 {result['selected'].sum():,} 个 | 约束{'✅' if feasible else '❌'}")
+        print(f"  RI合计 {result['total_ri']:,.2f}万 | 上界 {result['upper_bound']:,.2f}万 | "
+              f"最大误差 {result['max_gap']:,.2f}万（{result['max_gap'] / max(result['upper_bound'], 1e-9):.4%}）")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(a) for a in sys.argv[1:2]]))
@@ -0,0 +1,74 @@
+# ==============================================
+# 【基准测试】现金比率压力测试：逐行循环 vs 批量向量化
+# 运行：python -m benchmarks.bench_cash_ratio_batch [行数]
+# ==============================================
+
+import sys
+import time
+
+import numpy as np
+
+from solvency_analysis.cash_ratio_batch import INDUSTRY_NAMES, QUADRANT_LABELS, cash_ratio_stress_batch
+from solvency_analysis.cash_ratio_stress_test import cash_ratio_stress_test
+
+
+def make_universe(n, seed=0):
+    """生成随机公司池（含少量负数错误行、零负债、零消耗边界行）"""
+    rng = np.random.default_rng(seed)
+    cash_eq = rng.uniform(0, 5000, n).round(1)
+    short_term_debt = rng.uniform(0, 8000, n).round(1)
+    daily_cash_burn = rng.uniform(0, 60, n).round(2)
+    short_term_debt[rng.random(n) < 0.01] = 0
+    daily_cash_burn[rng.random(n) < 0.01] = 0
+    cash_eq[rng.random(n) < 0.005] = -1
+    industry_code = rng.integers(0, len(INDUSTRY_NAMES) + 1, n)  # 含1个未知行业代码
+    return cash_eq, short_term_debt, daily_cash_burn, industry_code
+
+
+def run_loop(cash_eq, short_term_debt, daily_cash_burn, industry_code):
+    names = [INDUSTRY_NAMES[c] if c < len(INDUSTRY_NAMES) else "未知" for c in industry_code.tolist()]
+    return [
+        cash_ratio_stress_test(c, d, b, name)
+        for c, d, b, name in zip(cash_eq.tolist(), short_term_debt.tolist(), daily_cash_burn.tolist(), names)
+    ]
+
+
+def check_equal(rows, batch):
+    """逐行核对批量结果与单公司结果，返回不一致行数"""
+    mismatches = 0
+    for i, row in enumerate(rows):
+        if "error" in row:
+            ok = not batch["valid"][i]
+        else:
+            shortfall_ok = (row["stress_test"].endswith("✅ 覆盖") == bool(batch["stress_covered"][i])
+                            and (batch["stress_covered"][i]
+                                 or row["stress_test"].endswith(f"缺口{batch['stress_shortfall'][i]}万")))
+            ok = (row["cash_ratio"] == batch["cash_ratio"][i]
+                  and row["survival_days"] == batch["survival_days"][i]
+                  and row["health_quadrant"] == QUADRANT_LABELS[batch["quadrant_code"][i]]
+                  and shortfall_ok)
+        mismatches += not ok
+    return mismatches
+
+
+def main(n=200_000):
+    data = make_universe(n)
+
+    start = time.perf_counter()
+    rows = run_loop(*data)
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = cash_ratio_stress_batch(*data)
+    batch_seconds = time.perf_counter() - start
+
+    mismatches = check_equal(rows, batch)
+    print(f"\n===== ⏱️ 现金比率压力测试基准（{n:,} 行） =====")
+    print(f"逐行循环：{loop_seconds:.3f}s（{n / loop_seconds:,.0f} 行/秒）")
+    print(f"批量向量化：{batch_seconds:.3f}s（{n / batch_seconds:,.0f} 行/秒）")
+    print(f"加速比：{loop_seconds / batch_seconds:.1f}x | 不一致行数：{mismatches}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000) else 0)
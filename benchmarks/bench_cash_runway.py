@@ -0,0 +1,136 @@
+# ==============================================
+# 【基准测试】现金跑道逐日预测：逐公司逐日循环 vs 分块向量化
+# 运行：python -m benchmarks.bench_cash_runway [公司数] [天数] [情景数]
+# 校验：① 恒定日均消耗、无流入时与 cash_ratio_stress_test 的储备天数/四象限逐条一致
+#       ② 逐日循环回放与向量化结果一致 | 峰值常驻内存不随公司数增长（输入为内存映射文件）
+# ==============================================
+
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.bench_cash_ratio_batch import make_universe, run_loop
+from solvency_analysis.cash_ratio_batch import QUADRANT_LABELS, encode_industries
+from solvency_analysis.cash_runway import NOT_DEPLETED, cash_runway
+
+NAIVE_COMPANIES = 200  # 逐日循环太慢，只在前 NAIVE_COMPANIES 家公司上计时并外推
+MIN_BURN = 5.0  # 校验①：日均消耗下限，保证储备天数落在预测期内
+
+
+def check_scalar(n=20000, horizon=1100):
+    """
+    恒定消耗、无流入 → 可维持天数应等于 现金/日均消耗（与单公司版本逐条比对）
+    现金/消耗恰好落在 x.x5 附近时，两种算法的浮点误差可能让一位小数舍入方向不同，单独计数，不算不一致
+    :return: （公司数, 不一致数, 舍入边界差异数）
+    """
+    cash_eq, short_term_debt, burn, industry_code = make_universe(n, seed=3)
+    burn = np.where(burn > 0, np.maximum(burn, MIN_BURN), 0.0)
+    rows = run_loop(cash_eq, short_term_debt, burn, industry_code)
+    outflow = np.broadcast_to(burn[:, None], (n, horizon))
+    result = cash_runway(cash_eq, short_term_debt, industry_code, outflow=outflow)
+    mismatches = ties = 0
+    for i, row in enumerate(rows):
+        if "error" in row:
+            mismatches += bool(result["valid"][i])
+            continue
+        ok = (row["cash_ratio"] == result["cash_ratio"][i]
+              and row["health_quadrant"] == QUADRANT_LABELS[result["quadrant_code"][0, i]])
+        if row["survival_days"] != result["survival_days"][0, i]:
+            exact = float(cash_eq[i]) / float(burn[i]) * 10
+            tie = (abs(exact - np.floor(exact) - 0.5) < 1e-6
+                   and abs(row["survival_days"] - result["survival_days"][0, i]) < 0.11)
+            ties += tie
+            ok = ok and tie
+        mismatches += not ok
+    return n, mismatches, ties
+
+
+def write_flows(path, companies, days, seed=0):
+    """分块写出逐日流入/流出（float32 内存映射文件，生成器内存与公司数无关）；流出含季节性，还款集中在月末"""
+    rng = np.random.default_rng(seed)
+    shape = (companies, days)
+    inflow = np.lib.format.open_memmap(path + "_in.npy", "w+", np.float32, shape)
+    outflow = np.lib.format.open_memmap(path + "_out.npy", "w+", np.float32, shape)
+    repayments = np.lib.format.open_memmap(path + "_repay.npy", "w+", np.float32, shape)
+    season = 1 + 0.3 * np.sin(2 * np.pi * np.arange(days) / 365)
+    for start in range(0, companies, 10000):
+        rows = slice(start, min(start + 10000, companies))
+        size = rows.stop - rows.start
+        level = rng.uniform(5, 80, (size, 1))
+        inflow[rows] = level * rng.uniform(0.7, 1.4, (size, days))
+        outflow[rows] = level * season * rng.uniform(0.8, 1.2, (size, days))
+        repayments[rows] = 0
+        repayments[rows, 29::30] = rng.uniform(0, 600, (size, 1)) * (rng.random((size, 1)) < 0.6)
+    for array in (inflow, outflow, repayments):
+        array.flush()
+    return (np.load(path + suffix, mmap_mode="r") for suffix in ("_in.npy", "_out.npy", "_repay.npy"))
+
+
+def naive_runway(cash_eq, inflow, outflow, repayments, inflow_scale):
+    """旧做法：每个（情景, 公司）逐日累加现金，遇到首个负值即停止"""
+    survival = np.full((len(inflow_scale), len(cash_eq)), np.inf)
+    flows = [array.tolist() for array in (np.asarray(inflow, float), np.asarray(outflow, float),
+                                          np.asarray(repayments, float))]
+    for s, scale in enumerate(inflow_scale.tolist()):
+        for i, cash in enumerate(cash_eq.tolist()):
+            balance = cash
+            for day, (inp, out, rep) in enumerate(zip(flows[0][i], flows[1][i], flows[2][i])):
+                after = balance + (inp * scale - out - rep)
+                if after < 0:
+                    survival[s, i] = day + (balance / (balance - after) if balance > 0 else 0.0)
+                    break
+                balance = after
+    return np.round(survival, 1)
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main(companies=50_000, days=365, scenarios=20):
+    failures = 0
+    print("\n===== 🏆 现金跑道逐日预测基准 =====")
+    rng = np.random.default_rng(1)
+    cash_eq = rng.uniform(100, 20000, companies).round(1)
+    short_term_debt = rng.uniform(100, 30000, companies).round(1)
+    industry_code = encode_industries(rng.choice(["重资产", "轻资产", "金融", "服务业"], companies))
+    inflow_scale = np.linspace(1.0, 0.0, scenarios)  # 情景：收入从100%逐步下滑到0
+    with tempfile.TemporaryDirectory() as tmp:
+        inflow, outflow, repayments = write_flows(os.path.join(tmp, "flows"), companies, days)
+        input_mb = 3 * companies * days * 4 / 1e6
+        rss_before = peak_rss_mb()
+        start = time.perf_counter()
+        result = cash_runway(cash_eq, short_term_debt, industry_code, inflow, outflow, repayments,
+                             inflow_scale=inflow_scale)
+        fast_seconds = time.perf_counter() - start
+        rss = peak_rss_mb()
+
+        subset = slice(0, NAIVE_COMPANIES)
+        start = time.perf_counter()
+        naive = naive_runway(cash_eq[subset], inflow[subset], outflow[subset], repayments[subset], inflow_scale)
+        naive_seconds = (time.perf_counter() - start) * companies / NAIVE_COMPANIES
+        # 逐日累加与 cumsum 的浮点累加顺序相同，取整后应完全一致
+        mismatches = int(np.sum(naive != result["survival_days"][:, subset]))
+        failures += mismatches
+
+    cells = companies * days * scenarios
+    depleted = result["depletion_day"] != NOT_DEPLETED
+    print(f"\n{companies:,} 家 × {days} 天 × {scenarios} 个情景（{cells:,} 个公司·日·情景）")
+    print(f"分块向量化：{fast_seconds:.2f}s（{cells / fast_seconds:,.0f} 格/秒）")
+    print(f"逐日循环（按{NAIVE_COMPANIES}家外推）：{naive_seconds:.1f}s | 加速比 {naive_seconds / fast_seconds:.0f}x"
+          f" | 不一致 {mismatches}")
+    print(f"峰值常驻内存：{rss:.0f} MB（计算前 {rss_before:.0f} MB；输入文件 {input_mb:.0f} MB）")
+    print(f"预测期内耗尽：基准情景 {depleted[0].mean():.1%} → 零收入情景 {depleted[-1].mean():.1%}")
+
+    n, mismatches, ties = check_scalar()
+    failures += mismatches
+    print(f"\n恒定消耗 vs cash_ratio_stress_test：{n:,} 家，不一致 {mismatches}（x.x5 舍入边界差异 {ties}）")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(a) for a in sys.argv[1:4]]))
@@ -0,0 +1,71 @@
+# ==============================================
+# 【基准测试】命令行冷启动耗时 + 按需加载/无副作用导入校验
+# 运行：python -m benchmarks.bench_cli_startup [重复次数]
+# 校验项：① 每个子命令只导入被调度的分析模块（不导入其他分析模块和 numpy）
+#         ② 全部分析模块作为库导入时不读标准输入、不打印任何内容
+# ==============================================
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from common.cli import ANALYZERS
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_PACKAGES = ("solvency_analysis", "profitability_analysis", "operation_efficiency", "investment_valuation")
+
+
+def _run(args, stdin_text=""):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, *args], input=stdin_text, capture_output=True, text=True,
+                          cwd=REPO_ROOT, encoding="utf-8")
+    return time.perf_counter() - start, proc
+
+
+def median_wall_time(args, stdin_text="", repeat=5):
+    return statistics.median(_run(args, stdin_text)[0] for _ in range(repeat))
+
+
+def imported_modules(name):
+    """运行子命令后检查 sys.modules，记录实际导入的项目模块和 numpy"""
+    code = ("import sys, json; from common.cli import main; code = main(); "
+            "print(json.dumps(sorted(sys.modules)), file=sys.stderr); sys.exit(code)")
+    _, proc = _run(["-c", code, name, "--stdin"], json.dumps(ANALYZERS[name]["example"]))
+    loaded = json.loads(proc.stderr.strip().splitlines()[-1]) if proc.stderr.strip() else []
+    modules = {m for m in loaded if (m.startswith(PROJECT_PACKAGES) and "." in m) or m == "numpy"}
+    return modules, proc.returncode
+
+
+def check_side_effect_free_imports():
+    """导入全部分析模块：标准输入为空时若模块调用 input() 会报 EOFError，任何打印也视为副作用"""
+    modules = sorted({spec["module"] for spec in ANALYZERS.values()} | {"solvency_analysis.current_ratio_calculator"})
+    code = "; ".join(f"import {m}" for m in modules)
+    _, proc = _run(["-c", code])
+    return proc.returncode == 0 and not proc.stdout, proc.stderr.strip()
+
+
+def main(repeat=5):
+    baseline = median_wall_time(["-c", "pass"], repeat=repeat)
+    print(f"\n===== ⏱️ 命令行冷启动基准（中位数，重复{repeat}次） =====")
+    print(f"{'空解释器基线':<20}{baseline * 1000:8.1f} ms")
+
+    failures = 0
+    for name, spec in ANALYZERS.items():
+        seconds = median_wall_time(["-m", "common.cli", name, "--stdin"], json.dumps(spec["example"]), repeat)
+        modules, returncode = imported_modules(name)
+        lazy_ok = modules == {spec["module"]}
+        failures += (not lazy_ok) + (returncode != 0)
+        print(f"{name:<20}{seconds * 1000:8.1f} ms（+{(seconds - baseline) * 1000:5.1f} ms）"
+              f" | 导入：{', '.join(sorted(modules))} {'✅' if lazy_ok else '❌'}")
+
+    imports_ok, stderr = check_side_effect_free_imports()
+    failures += not imports_ok
+    print(f"\n全部模块无副作用导入：{'✅' if imports_ok else '❌ ' + stderr[-200:]}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
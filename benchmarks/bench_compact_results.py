@@ -0,0 +1,59 @@
+# ==============================================
+# 【基准测试】结果对象内存占用：原始 dict vs __slots__ 紧凑记录 vs 列式批量
+# 运行：python -m benchmarks.bench_compact_results [行数]
+# 同时校验：紧凑记录 to_dict() 渲染结果与原分析函数输出完全一致
+# ==============================================
+
+import sys
+import tracemalloc
+
+from benchmarks.synthetic import statement_records
+from common.compact_results import (
+    CashRatioRecord, DupontRecord, EvaRecord, InterestCoverageRecord, ResultBatch)
+from investment_valuation.eva_economic_value_added import calculate_eva_strategic
+from profitability_analysis.dupont_analysis_strategic import analyze_dupont
+from solvency_analysis.cash_ratio_stress_test import cash_ratio_stress_test
+from solvency_analysis.interest_coverage_stress import interest_coverage_stress
+
+CASES = (
+    ("现金比率", cash_ratio_stress_test, CashRatioRecord,
+     lambda r: (r["cash_eq"], r["short_term_debt"], r["daily_cash_burn"], r["industry_type"])),
+    ("利息保障", interest_coverage_stress, InterestCoverageRecord,
+     lambda r: (r["ebit"], r["interest_expense"], r["short_term_interest"], r["industry_cycle"] or None)),
+    ("杜邦分析", analyze_dupont, DupontRecord,
+     lambda r: (r["net_profit"], r["revenue"], r["avg_assets"], r["avg_equity"], r["industry"])),
+    ("EVA", calculate_eva_strategic, EvaRecord,
+     lambda r: (r["nopat"], r["capital_employed"], r["company_type"], r["eva_last_year"])),
+)
+
+
+def measure(build):
+    """返回（构建结果, 构建过程新增的内存字节数）"""
+    tracemalloc.start()
+    value = build()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, current
+
+
+def main(n=100_000):
+    inputs = list(statement_records(n))
+    print(f"\n===== 🧮 结果对象内存基准（{n:,} 行，字节/行） =====")
+    print(f"{'分析工具':<8}{'原始dict':>12}{'紧凑记录':>12}{'列式批量':>12}{'压缩比':>10}  渲染一致")
+    failures = 0
+    for title, function, record_type, args_of in CASES:
+        rows = [args_of(r) for r in inputs]
+        dicts, dict_bytes = measure(lambda: [function(*args) for args in rows])
+        records, record_bytes = measure(lambda: [record_type.from_inputs(*args) for args in rows])
+        batch, _ = measure(lambda: ResultBatch.from_records(record_type, records))
+        batch_bytes = batch.nbytes + sys.getsizeof(batch.errors)
+        consistent = all(r.to_dict() == d for r, d in zip(batch, dicts))
+        failures += not consistent
+        print(f"{title:<8}{dict_bytes / n:>12.0f}{record_bytes / n:>12.0f}{batch_bytes / n:>12.1f}"
+              f"{dict_bytes / batch_bytes:>9.0f}x  {'✅' if consistent else '❌'}")
+        del dicts, records, batch
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
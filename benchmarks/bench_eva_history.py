@@ -0,0 +1,96 @@
+# ==============================================
+# 【基准测试】EVA历史库：每季度全量重跑历史（旧做法） vs 增量重算（只算新期间/追溯调整影响的记录）
+# 运行：python -m benchmarks.bench_eva_history [实体数] [季度数]
+# 校验：库中每条结果与 calculate_eva_strategic（上年EVA取上年同期）完全一致 | 追溯调整只重算受影响期间
+# ==============================================
+
+import random
+import sys
+import time
+
+from investment_valuation.eva_economic_value_added import calculate_eva_strategic
+from investment_valuation.eva_history import EvaHistoryStore, prior_period
+
+COMPANY_TYPES = ("国企", "民企", "外企")
+
+
+def make_quarters(entities, quarters, seed=0):
+    """随机季度面板：{期间: [记录]}，含少量NOPAT≤0的数据错误行"""
+    rng = random.Random(seed)
+    types = [rng.choice(COMPANY_TYPES) for _ in range(entities)]
+    panel = {}
+    for q in range(quarters):
+        period = f"{2015 + q // 4}Q{q % 4 + 1}"
+        panel[period] = [{"entity": f"E{i:06d}", "period": period,
+                          "nopat": round(rng.uniform(-50, 1500), 2),
+                          "capital_employed": round(rng.uniform(2000, 20000), 2),
+                          "company_type": types[i]} for i in range(entities)]
+    return panel
+
+
+def full_recompute(panel):
+    """旧做法：每次都按时间顺序重跑全部历史（上年EVA由调用方手工衔接）"""
+    eva = {}
+    results = {}
+    for period, records in panel.items():
+        for r in records:
+            last = eva.get((r["entity"], prior_period(period)))
+            result = calculate_eva_strategic(r["nopat"], r["capital_employed"], r["company_type"], last)
+            eva[(r["entity"], period)] = result.get("eva")
+            results[(r["entity"], period)] = result
+    return results
+
+
+def main(entities=2000, quarters=16):
+    panel = make_quarters(entities, quarters)
+    periods = list(panel)
+    store = EvaHistoryStore()
+
+    # 历史回填（一次性）
+    start = time.perf_counter()
+    for period in periods[:-1]:
+        store.upsert(panel[period])
+    store.refresh()
+    backfill_seconds = time.perf_counter() - start
+
+    # 新季度到达：增量 vs 全量
+    start = time.perf_counter()
+    store.upsert(panel[periods[-1]])
+    new_quarter = store.refresh()
+    incremental_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    full_recompute(panel)
+    full_seconds = time.perf_counter() - start
+
+    # 重复导入相同数据：不应触发任何重算
+    unchanged = store.upsert(panel[periods[-4]])
+
+    # 追溯调整：1% 实体的某个历史季度 NOPAT 变化
+    rng = random.Random(1)
+    restated_period = periods[len(periods) // 2]
+    restated = rng.sample(panel[restated_period], max(1, entities // 100))
+    for r in restated:
+        r["nopat"] = round(r["nopat"] * 1.3 + 10, 2)
+    start = time.perf_counter()
+    store.upsert(restated)
+    restatement = store.refresh()
+    restatement_seconds = time.perf_counter() - start
+
+    expected = full_recompute(panel)
+    mismatches = sum(store.result(entity, period) != result for (entity, period), result in expected.items())
+
+    rows = entities * quarters
+    print(f"\n===== 🏆 EVA历史库基准（{entities:,} 个实体 × {quarters} 个季度 = {rows:,} 条） =====")
+    print(f"历史回填：{backfill_seconds:.3f}s")
+    print(f"新季度到达：增量重算 {new_quarter['recomputed']:,} 条 {incremental_seconds:.3f}s | "
+          f"全量重跑 {rows:,} 条 {full_seconds:.3f}s | 加速比：{full_seconds / incremental_seconds:.1f}x")
+    print(f"重复导入相同数据：变化 {unchanged} 条")
+    print(f"追溯调整 {len(restated)} 个实体（{restated_period}）：重算 {restatement['recomputed']} 条 "
+          f"（本期 + 下一年同期），{restatement_seconds * 1000:.1f} ms")
+    print(f"与逐条 calculate_eva_strategic 不一致：{mismatches}")
+    ok = mismatches == 0 and unchanged == 0 and restatement["recomputed"] <= 2 * len(restated)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(a) for a in sys.argv[1:3]]))
@@ -0,0 +1,127 @@
+# ==============================================
+# 【基准测试】运行指标埋点开销：无埋点入口 vs 埋点关闭 vs 埋点开启
+# 运行：python -m benchmarks.bench_instrumentation [记录数] [轮数]
+# 校验：① 埋点关闭时单条入口（run_analyzer）开销 < MAX_DISABLED_OVERHEAD
+#       ② 开启后调用数/行数/错误数/等级分布与实际结果一致，Prometheus 文本可逐行解析
+# ==============================================
+
+import os
+import re
+import sys
+import tempfile
+import time
+
+from batch_processing import batch_kernels
+from batch_processing.statement_pipeline import map_fields
+from benchmarks.synthetic import statement_records
+from common import cli
+from common.instrumentation import METRICS, disable, enable
+
+ANALYZER_MIX = ("current_ratio", "cash_ratio", "interest_coverage", "roce", "inventory", "roi_ri")
+MAX_DISABLED_OVERHEAD = 0.05  # 关闭时允许的最大额外开销（5%，含计时噪声）
+BATCH_SIZE = 500
+SLICES = 40  # 计时分片数
+SAMPLE_LINE = re.compile(r'^[a-z_]+(\{([a-z]+="([^"\\]|\\.)*",?)*\})? \S+$')
+
+
+def make_calls(n):
+    calls = []
+    for i, record in enumerate(statement_records(n)):
+        name = ANALYZER_MIX[i % len(ANALYZER_MIX)]
+        params = map_fields(record, name)
+        if params is not None:
+            calls.append((name, params))
+    return calls
+
+
+def best_of(variants, slices, rounds):
+    """
+    各方案在每个小分片上交替运行 rounds 轮，取每个分片的最快值再求和
+    （分片级取最小值可剔除调度/缓存抖动，比整轮取最快值稳定得多）
+    """
+    best = {name: [float("inf")] * len(slices) for name in variants}
+    for _ in range(rounds):
+        for i, part in enumerate(slices):
+            for name, run in variants.items():
+                start = time.perf_counter()
+                run(part)
+                best[name][i] = min(best[name][i], time.perf_counter() - start)
+    return {name: sum(times) for name, times in best.items()}
+
+
+def check_metrics(calls):
+    """开启埋点跑一遍，核对计数并解析导出文本，返回问题数"""
+    METRICS.reset()
+    enable()
+    try:
+        results = [cli.run_analyzer(name, params) for name, params in calls]
+    finally:
+        disable()
+    problems = 0
+    for name in ANALYZER_MIX:
+        mine = [r for (n, _p), r in zip(calls, results) if n == name]
+        key = (name, "scalar")
+        problems += METRICS.calls.get(key, 0) != len(mine)
+        problems += METRICS.errors.get(key, 0) != sum("error" in r for r in mine)
+        level_field = cli.ANALYZERS[name].get("level_field")
+        if level_field:
+            counted = sum(count for (n, _level), count in METRICS.levels.items() if n == name)
+            problems += counted != sum("error" not in r for r in mine)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "metrics.prom")
+        METRICS.write_textfile(path)
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    problems += sum(1 for line in text.splitlines() if not line.startswith("#") and not SAMPLE_LINE.match(line))
+    print(f"导出 {len(text.splitlines())} 行 Prometheus 文本，示例：")
+    for line in text.splitlines():
+        if line.startswith("fat_analyzer_level_total") or line.startswith('fat_analyzer_errors_total'):
+            print(f"  {line}")
+    return problems
+
+
+def main(n=60000, rounds=7):
+    calls = make_calls(n)
+    groups = {}
+    for name, params in calls:
+        groups.setdefault(name, []).append(params)
+    batches = [(name, records[i:i + BATCH_SIZE]) for name, records in groups.items()
+               for i in range(0, len(records), BATCH_SIZE)]
+
+    def scalar(entry):
+        return lambda part: [entry(name, params) for name, params in part]
+
+    def batch(entry):
+        return lambda part: [entry(name, records) for name, records in part]
+
+    def instrumented(run):
+        def wrapped(part):
+            enable()
+            try:
+                run(part)
+            finally:
+                disable()
+        return wrapped
+
+    print(f"\n===== 🏆 运行指标埋点开销（{len(calls):,} 条记录，{len(ANALYZER_MIX)} 个工具轮换，分片最快{rounds}轮） =====")
+    failures = 0
+    for title, items, raw, public in (
+            ("单条入口 run_analyzer", calls, scalar(cli._run_analyzer), scalar(cli.run_analyzer)),
+            (f"批量入口 run_batch（每批{BATCH_SIZE}条）", batches, batch(batch_kernels._run_batch),
+             batch(batch_kernels.run_batch))):
+        step = max(1, len(items) // SLICES)
+        slices = [items[i:i + step] for i in range(0, len(items), step)]
+        best = best_of({"无埋点": raw, "关闭": public, "开启": instrumented(public)}, slices, rounds)
+        disabled = best["关闭"] / best["无埋点"] - 1
+        enabled = best["开启"] / best["无埋点"] - 1
+        print(f"{title}：无埋点 {best['无埋点']:.3f}s | 关闭 {best['关闭']:.3f}s（{disabled:+.1%}） | "
+              f"开启 {best['开启']:.3f}s（{enabled:+.1%}）")
+        failures += disabled > MAX_DISABLED_OVERHEAD
+
+    problems = check_metrics(calls)
+    print(f"指标计数/格式问题：{problems}")
+    return 1 if failures or problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(a) for a in sys.argv[1:3]]))
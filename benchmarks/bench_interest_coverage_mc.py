@@ -0,0 +1,85 @@
+# ==============================================
+# 【基准测试】利息保障倍数蒙特卡洛引擎：单进程 vs 进程池 + 可复现性/一致性校验
+# 运行：python -m benchmarks.bench_interest_coverage_mc [公司数] [路径数]
+# 校验：① 不同进程数结果一致 ② 零波动退化为固定降幅，与单公司版本一致
+#       ③ 计算分位数时内存峰值受 buffer_bytes 限制（不随 分片行数×路径数 增长）
+# ==============================================
+
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from solvency_analysis.interest_coverage_monte_carlo import (
+    CYCLE_NAMES, RISK_LABELS, interest_coverage_monte_carlo)
+from solvency_analysis.interest_coverage_stress import interest_coverage_stress
+
+BUFFER_CHECK = (2000, 20_000, 4 << 20)  # 内存校验：分片行数 × 路径数（不分块需 160MB 路径缓存），缓存上限 4MB
+BUFFER_PEAK_RATIO = 4  # 峰值 ≤ 缓存上限 × 4（路径缓存 + 分位数计算时的拷贝 + 路径块临时数组）
+
+
+def make_portfolio(n, seed=0):
+    rng = np.random.default_rng(seed)
+    ebit = rng.uniform(-50, 3000, n)
+    interest = rng.uniform(10, 600, n)
+    cycle_code = rng.integers(0, len(CYCLE_NAMES), n)
+    return ebit, interest, cycle_code
+
+
+def check_degenerate_case(ebit, interest, cycle_code, sample=2000):
+    """shock_vol=0 时蒙特卡洛退化为固定降幅，风险等级应与单公司版本完全一致"""
+    ebit, interest, cycle_code = ebit[:sample], interest[:sample], cycle_code[:sample]
+    mc = interest_coverage_monte_carlo(ebit, interest, cycle_code, n_paths=8, shock_vol=0.0,
+                                       percentiles=(), max_workers=1)
+    mismatches = 0
+    for i in range(len(ebit)):
+        row = interest_coverage_stress(float(ebit[i]), float(interest[i]), None, CYCLE_NAMES[cycle_code[i]])
+        if "error" in row:
+            mismatches += bool(mc["valid"][i])
+        else:
+            mismatches += mc["risk_probabilities"][i][RISK_LABELS.index(row["risk_level"])] != 1.0
+    return mismatches
+
+
+def check_buffer_peak(ebit, interest, cycle_code):
+    """tracemalloc 统计单进程模拟的内存峰值（MB），以及路径缓存不分块时需要的内存（MB）"""
+    rows, n_paths, buffer_bytes = BUFFER_CHECK
+    tracemalloc.start()
+    interest_coverage_monte_carlo(ebit[:rows], interest[:rows], cycle_code[:rows], n_paths=n_paths, shard_size=rows,
+                                  max_workers=1, buffer_bytes=buffer_bytes)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20, rows * n_paths * 4 / 2**20
+
+
+def main(n=20_000, n_paths=2000):
+    data = make_portfolio(n)
+    workers = max(2, os.cpu_count() or 1)  # 至少2个进程，确保走进程池路径
+    timings = {}
+    results = {}
+    for label, max_workers in (("单进程", 1), (f"进程池×{workers}", workers)):
+        start = time.perf_counter()
+        results[label] = interest_coverage_monte_carlo(*data, n_paths=n_paths, max_workers=max_workers)
+        timings[label] = time.perf_counter() - start
+
+    first, second = results.values()
+    reproducible = (np.array_equal(first["risk_probabilities"], second["risk_probabilities"], equal_nan=True)
+                    and np.array_equal(first["coverage_percentiles"], second["coverage_percentiles"], equal_nan=True))
+    mismatches = check_degenerate_case(*data)
+    peak_mb, unchunked_mb = check_buffer_peak(*data)
+    limit_mb = BUFFER_CHECK[2] * BUFFER_PEAK_RATIO / 2**20
+
+    print(f"\n===== ⏱️ 蒙特卡洛衰退引擎基准（{n:,} 家 × {n_paths:,} 路径） =====")
+    for label, seconds in timings.items():
+        print(f"{label}：{seconds:.2f}s（{n * n_paths / seconds / 1e6:,.1f} 百万路径/秒）")
+    print(f"不同进程数结果一致：{'✅' if reproducible else '❌'} | 零波动退化校验不一致行数：{mismatches}")
+    print(f"分位数路径缓存（{BUFFER_CHECK[0]:,}行 × {BUFFER_CHECK[1]:,}路径，上限{BUFFER_CHECK[2] >> 20}MB）："
+          f"内存峰值 {peak_mb:.1f}MB（不分块需 {unchunked_mb:.0f}MB，校验上限 {limit_mb:.0f}MB）")
+    return 0 if reproducible and mismatches == 0 and peak_mb <= limit_mb else 1
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    sys.exit(main(*args))
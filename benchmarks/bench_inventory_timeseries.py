@@ -0,0 +1,121 @@
+# ==============================================
+# 【基准测试】存货周转时间序列：逐窗口重算（旧做法） vs 前缀和一次遍历
+# 运行：python -m benchmarks.bench_inventory_timeseries [公司数] [月数]
+# 校验：① 逐窗口重算与前缀和结果一致（月度 + 日度快照）
+#       ② 两期快照、跨365天时与 calculate_inventory_health 逐条一致
+# ==============================================
+
+import re
+import sys
+import time
+
+import numpy as np
+
+from operation_efficiency.inventory_timeseries import (GRADE_LABELS, SUBTYPE_NAMES, rolling_inventory_turnover,
+                                                       window_starts)
+from operation_efficiency.inventory_turnover_days import calculate_inventory_health
+
+NAIVE_COMPANIES = 40  # 逐窗口重算太慢，只在前 NAIVE_COMPANIES 家公司上计时并外推
+
+
+def month_ends(months, start="2015-01"):
+    """months+1 个连续月末日期（首个为起始月月末）"""
+    first = np.datetime64(start, "M")
+    return np.arange(first + 1, first + months + 2).astype("datetime64[D]") - np.timedelta64(1, "D")
+
+
+def make_panel(companies, periods, seed=0):
+    """季节性存货面板（年末备货高峰）+ 营业成本，含少量缺失快照"""
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(200, 5000, (companies, 1))
+    season = 1 + rng.uniform(0.1, 0.8, (companies, 1)) * np.cos(2 * np.pi * (np.arange(periods) % 12 - 11) / 12)
+    inventory = (base * season * rng.uniform(0.9, 1.1, (companies, periods))).round(2)
+    cogs = (base * rng.uniform(0.3, 2.5, (companies, 1)) * rng.uniform(0.8, 1.2, (companies, periods))).round(2)
+    inventory[rng.random((companies, periods)) < 0.002] = np.nan
+    return inventory, cogs, rng.integers(0, len(SUBTYPE_NAMES), companies)
+
+
+def naive_turnover(inventory, cogs, days, window):
+    """旧做法：每个（公司, 期末）重新累加窗口内的梯形面积与营业成本"""
+    starts, window_ok = window_starts(days, window)
+    out = np.full(inventory.shape, np.nan)
+    inv, flow, day = inventory.tolist(), cogs.tolist(), days.tolist()
+    for i in range(len(inv)):
+        for t in range(len(day)):
+            if not window_ok[t]:
+                continue
+            s = int(starts[t])
+            area = total = 0.0
+            for k in range(s + 1, t + 1):
+                area += (inv[i][k - 1] + inv[i][k]) / 2 * (day[k] - day[k - 1])
+                total += flow[i][k]
+            out[i, t] = area / total if total > 0 else np.nan  # 周转天数 = 平均存货 / 日均营业成本
+    return out
+
+
+def check_naive(inventory, cogs, dates, subtypes, window):
+    """前 NAIVE_COMPANIES 家：逐窗口重算的周转天数 vs 前缀和结果（未取整值，相对误差）"""
+    subset = slice(0, NAIVE_COMPANIES)
+    start = time.perf_counter()
+    naive = naive_turnover(inventory[subset], cogs[subset], dates.astype(np.int64), window)
+    naive_seconds = time.perf_counter() - start
+    fast = rolling_inventory_turnover(inventory[subset], cogs[subset], dates, subtypes[subset], (window,))[window]
+    both = fast["valid"] & np.isfinite(naive)
+    unrounded = fast["avg_inventory"] / fast["cogs"] * np.where(both, fast["span_days"], np.nan)
+    error = np.nanmax(np.abs(unrounded[both] / naive[both] - 1)) if both.any() else 0.0
+    return naive_seconds * len(inventory) / NAIVE_COMPANIES, error
+
+
+def check_scalar(n=20000, seed=1):
+    """两期快照（期初、期末，跨365天）→ 与单公司函数逐条比对"""
+    rng = np.random.default_rng(seed)
+    opening = rng.uniform(10, 5000, n).round(2)
+    closing = rng.uniform(10, 5000, n).round(2)
+    cogs = rng.uniform(50, 40000, n).round(2)
+    subtypes = rng.integers(0, len(SUBTYPE_NAMES), n)
+    dates = np.array(["2023-12-31", "2024-12-30"], dtype="datetime64[D]")  # 相隔365天
+    panel = rolling_inventory_turnover(np.stack([opening, closing], axis=1), np.stack([np.zeros(n), cogs], axis=1),
+                                       dates, subtypes, (365,))[365]
+    mismatches = 0
+    for i in range(n):
+        expected = calculate_inventory_health(float(cogs[i]), (float(opening[i]) + float(closing[i])) / 2,
+                                              SUBTYPE_NAMES[subtypes[i]])
+        cost = re.search(r"约([-\d.]+)万元", expected["hidden_cost_note"])
+        ok = (expected["turnover_rate"] == panel["turnover_rate"][i, 1]
+              and expected["turnover_days"] == panel["turnover_days"][i, 1]
+              and expected["health_score"] == GRADE_LABELS[panel["grade_code"][i, 1]]
+              and (float(cost.group(1)) if cost else 0.0) == panel["hidden_cost"][i, 1])
+        mismatches += not ok
+    return n, mismatches
+
+
+def main(companies=5000, months=120):
+    failures = 0
+    print("\n===== 🏆 存货周转时间序列基准 =====")
+    for label, periods, dates in (
+            (f"月度快照（{companies:,} 家 × {months} 个月）", months, month_ends(months)),
+            (f"日度快照（{companies // 10:,} 家 × {months * 15} 天）", months * 15,
+             np.arange(np.datetime64("2015-01-01"), np.datetime64("2015-01-01") + months * 15 + 1))):
+        rows = companies if periods == months else companies // 10
+        inventory, cogs, subtypes = make_panel(rows, periods + 1)
+        start = time.perf_counter()
+        rolling_inventory_turnover(inventory, cogs, dates, subtypes)
+        fast_seconds = time.perf_counter() - start
+        print(f"\n{label}")
+        print(f"前缀和一次遍历（90天+365天）：{fast_seconds:.3f}s")
+        naive_total = 0.0
+        for window in (90, 365):
+            naive_seconds, error = check_naive(inventory, cogs, dates, subtypes, window)
+            naive_total += naive_seconds
+            failures += error > 1e-9
+            print(f"  逐窗口重算 {window}天窗口（按{NAIVE_COMPANIES}家外推）：{naive_seconds:.2f}s | 最大相对误差 {error:.1e}")
+        print(f"加速比：{naive_total / fast_seconds:.0f}x")
+
+    n, mismatches = check_scalar()
+    failures += mismatches
+    print(f"\n两期年度快照 vs calculate_inventory_health：{n:,} 条，不一致 {mismatches}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(a) for a in sys.argv[1:3]]))
@@ -0,0 +1,134 @@
+# ==============================================
+# 【基准测试】贷款簿利率冲击：逐债务人逐笔循环 vs 向量化重定价 + 分组汇总
+# 运行：python -m benchmarks.bench_loan_book_shock [债务笔数] [债务人数] [随机冲击路径数]
+# 校验：① 各情景按债务人汇总的利息代入 interest_coverage_stress，倍数/风险等级/结构分析逐条一致
+#       ② 逐笔循环的利息汇总与向量化结果一致
+# ==============================================
+
+import sys
+import time
+
+import numpy as np
+
+from solvency_analysis.interest_coverage_monte_carlo import CYCLE_NAMES, RISK_LABELS
+from solvency_analysis.interest_coverage_stress import interest_coverage_stress
+from solvency_analysis.loan_book_shock import (RATE_FLOATING, RATE_FLOOR, RATE_SHOCKS, REFINANCE_TENOR, RESET_TENOR,
+                                               SHOCK_TENORS, SHORT_TERM_YEARS, loan_book_rate_shock, risk_migration,
+                                               shock_matrix)
+
+NAIVE_OBLIGORS = 500  # 逐笔循环太慢，只在前 NAIVE_OBLIGORS 家债务人上计时并外推
+CHECK_SCENARIOS = 3  # 校验①只取前几条路径（每条都要逐债务人调用单公司函数）
+
+
+def make_book(tranches, obligors, seed=0):
+    """随机贷款簿：每家债务人至少一笔债务；含少量 EBIT≤0 的错误行"""
+    rng = np.random.default_rng(seed)
+    obligor_code = np.concatenate([np.arange(obligors), rng.integers(0, obligors, tranches - obligors)])
+    book = {
+        "obligor_code": obligor_code,
+        "principal": rng.uniform(100, 20000, tranches).round(1),
+        "rate_type": (rng.random(tranches) < 0.45).astype(np.int8),
+        "rate": rng.uniform(0.005, 0.045, tranches).round(4),
+        "spread": rng.uniform(0.002, 0.04, tranches).round(4),
+        "maturity": rng.choice([0.25, 0.5, 0.75, 1, 2, 3, 5, 7, 10], tranches) * rng.uniform(0.5, 1.0, tranches),
+    }
+    base = np.bincount(obligor_code, weights=book["principal"] * (book["rate"] + book["spread"]), minlength=obligors)
+    ebit = (base * rng.lognormal(1.2, 0.6, obligors)).round(1)
+    ebit[rng.random(obligors) < 0.01] = -50
+    return book, ebit, rng.integers(0, len(CYCLE_NAMES) + 1, obligors)  # 含1个未知周期代码
+
+
+def random_shocks(paths, seed=1):
+    """随机平行 + 扭转冲击路径（bp）：水平因子 + 斜率因子"""
+    rng = np.random.default_rng(seed)
+    level = rng.normal(50, 100, (paths, 1))
+    slope = rng.normal(0, 60, (paths, 1))
+    return (level + slope * (1 - np.log1p(SHOCK_TENORS) / np.log1p(SHOCK_TENORS[-1]))).round()
+
+
+def naive_totals(book, obligors, shocks):
+    """旧做法：逐情景、逐笔债务重定价，按债务人累加到字典"""
+    _names, shift = shock_matrix(shocks)
+    columns = [book[k].tolist() for k in ("obligor_code", "principal", "rate_type", "rate", "spread", "maturity")]
+    totals = []
+    for row in shift.tolist():
+        interest, short = {}, {}
+        for code, principal, kind, rate, spread, maturity in zip(*columns):
+            if code >= obligors:
+                continue
+            floating = kind == RATE_FLOATING
+            tenor_shift = float(np.interp(RESET_TENOR if floating else REFINANCE_TENOR, SHOCK_TENORS, row))
+            repriced = 1.0 if floating else min(max(1 - maturity, 0.0), 1.0)
+            shocked = max(rate + tenor_shift, RATE_FLOOR) + spread
+            value = principal * ((rate + spread) * (1 - repriced) + shocked * repriced)
+            interest[code] = interest.get(code, 0.0) + value
+            if maturity <= SHORT_TERM_YEARS:
+                short[code] = short.get(code, 0.0) + value
+        totals.append(([interest.get(i, 0.0) for i in range(obligors)], [short.get(i, 0.0) for i in range(obligors)]))
+    return totals
+
+
+def check_scalar(result, ebit, cycle_code):
+    """冲击后的利息汇总 → interest_coverage_stress 逐条比对（倍数、风险等级、结构分析）"""
+    names = [CYCLE_NAMES[c] if c < len(CYCLE_NAMES) else "未知" for c in cycle_code.tolist()]
+    checked = mismatches = 0
+    for s in range(CHECK_SCENARIOS):
+        interest = result["interest_expense"][s].tolist()
+        short = result["short_term_interest"][s].tolist()
+        for i, (e, name) in enumerate(zip(ebit.tolist(), names)):
+            row = interest_coverage_stress(e, interest[i], short[i] or None, name)
+            checked += 1
+            if "error" in row:
+                mismatches += bool(result["valid"][s, i])
+                continue
+            ratio = result["short_term_ratio"][s, i]
+            alert = "⚠️" in row["structure_analysis"]
+            ok = (row["normal_coverage"] == result["normal_coverage"][s, i]
+                  and row["stress_coverage"] == result["stress_coverage"][s, i]
+                  and row["ebit_drop"] == result["ebit_drop"][i]
+                  and row["risk_level"] == RISK_LABELS[result["risk_code"][s, i]]
+                  and alert == bool(result["structure_alert"][s, i])
+                  and (not short[i] or f"短期利息占比{ratio}%" in row["structure_analysis"]))
+            mismatches += not ok
+    return checked, mismatches
+
+
+def main(tranches=500_000, obligors=100_000, random_paths=50):
+    book, ebit, cycle_code = make_book(tranches, obligors)
+    shocks = np.vstack([[bp for _name, bp in RATE_SHOCKS], random_shocks(random_paths)])
+    failures = 0
+    print(f"\n===== 🏆 贷款簿利率冲击基准（{tranches:,} 笔债务 / {obligors:,} 家债务人） =====")
+
+    start = time.perf_counter()
+    result = loan_book_rate_shock(**book, ebit=ebit, cycle_code=cycle_code, shocks=shocks)
+    fast_seconds = time.perf_counter() - start
+    cells = tranches * len(shocks)
+    print(f"向量化重定价 + 分组汇总（{len(shocks)} 条路径）：{fast_seconds:.2f}s（{cells / fast_seconds:,.0f} 笔·情景/秒）")
+
+    subset = book["obligor_code"] < NAIVE_OBLIGORS
+    small = {k: v[subset] for k, v in book.items()}
+    start = time.perf_counter()
+    naive = naive_totals(small, NAIVE_OBLIGORS, shocks)
+    naive_seconds = (time.perf_counter() - start) * tranches / subset.sum()
+    error = max(np.max(np.abs(np.array(t) - result[k][s, :NAIVE_OBLIGORS]))
+                for s, pair in enumerate(naive) for k, t in zip(("interest_expense", "short_term_interest"), pair))
+    failures += error > 1e-6
+    print(f"逐笔循环（按{NAIVE_OBLIGORS}家外推）：{naive_seconds:.1f}s | 加速比 {naive_seconds / fast_seconds:.0f}x"
+          f" | 利息汇总最大差异 {error:.1e}万")
+
+    checked, mismatches = check_scalar(result, ebit, cycle_code)
+    failures += mismatches
+    print(f"\n前{CHECK_SCENARIOS}条路径 vs interest_coverage_stress：{checked:,} 条，不一致 {mismatches}")
+
+    print("\n情景                          高危级占比  结构预警占比")
+    for s, (name, _bp) in enumerate(RATE_SHOCKS):
+        valid = result["valid"][s]
+        print(f"{name:<28}{np.mean(result['adjusted_risk_code'][s][valid] == 3):>10.1%}"
+              f"{np.mean(result['structure_alert'][s][valid]):>12.1%}")
+    migration = risk_migration(result, 2)
+    print(f"平行上移200bp 等级恶化债务人：{np.triu(migration, 1).sum():,} 家")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(a) for a in sys.argv[1:4]]))
@@ -0,0 +1,216 @@
+# ==============================================
+# 【基准测试】共享指标依赖图：全部分析工具一次计算（共用中间量只算一次）vs 各工具单独计算 vs 逐行单公司函数
+# 运行：python -m benchmarks.bench_metric_graph [公司数]
+# 校验：① 11个分析工具的数值/等级代码/有效标记与单公司函数（run_analyzer）逐行一致
+#         （含资本总额/NOPAT/平均总资产由总资产、EBIT推导及部分缺失行补齐的场景）
+#       ② 每个节点每批只计算一次；只请求单个工具时不计算任何用不到的节点
+#       ③ 全部工具一次计算的耗时 ≈ 唯一节点耗时之和（调度开销）
+# ==============================================
+
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from batch_processing.metric_graph import (ANALYZER_NODES, DERIVED_INPUTS, NODES, NOPAT_RATE, compute_metrics,
+                                           plan)
+from batch_processing.universe_screener import SCREEN_CODES, SCREEN_VALUES
+from benchmarks.synthetic import statement_columns
+from common.cli import run_analyzer
+
+SCALAR_ROWS = 10_000  # 逐行校验/计时的行数（单公司函数较慢，计时按行数外推）
+STRUCTURE_PREFIXES = ("→ 未提供", "→ 资本结构健康", "→ 注意")  # capital_structure_check 三种结论，下标同 STRUCTURE_STATUSES
+
+
+def make_columns(n, seed=0):
+    """合成报表列；约2%的行注入缺失/0/负数，文字列约2%为空"""
+    columns = statement_columns(n, seed)
+    rng = np.random.default_rng(seed + 1)
+    for field, values in columns.items():
+        if isinstance(values, np.ndarray):
+            bad = np.flatnonzero(rng.random(n) < 0.02)
+            values[bad] = rng.choice([np.nan, 0.0, -5.0], len(bad))
+        else:
+            for i in np.flatnonzero(rng.random(n) < 0.02).tolist():
+                values[i] = ""
+    tiny = np.flatnonzero(rng.random(n) < 0.002)  # 周转率取整为0 → 单公司版本除零
+    columns["cogs"][tiny] = 0.01
+    return columns
+
+
+def derived_scenario(columns, seed=0):
+    """提供总资产；资本总额只提供八成（其余行由总资产-流动负债补齐），NOPAT/平均总资产不提供（由EBIT/总资产推导）"""
+    rng = np.random.default_rng(seed + 2)
+    derived = {k: v for k, v in columns.items() if k not in ("nopat", "avg_assets")}
+    derived["total_assets"] = (columns["capital_employed"] + columns["current_liabilities"] * 1.05).round(2)
+    supplied = columns["capital_employed"].copy()
+    supplied[rng.random(len(supplied)) < 0.2] = np.nan
+    derived["capital_employed"] = supplied
+    # 单公司函数的输入：按同一公式独立推导
+    expected = dict(derived)
+    from_assets = derived["total_assets"] - columns["current_liabilities"]
+    expected["capital_employed"] = np.where(np.isnan(supplied), from_assets, supplied)
+    expected["nopat"] = columns["ebit"] * NOPAT_RATE
+    expected["avg_assets"] = derived["total_assets"]
+    return derived, expected
+
+
+def scalar_results(columns, rows):
+    """逐行 run_analyzer（NaN → 缺失）；单公司函数除零的行记为 None"""
+    fields = {k: (v[:rows].tolist() if isinstance(v, np.ndarray) else v[:rows]) for k, v in columns.items()}
+    out = {name: [] for name in ANALYZER_NODES}
+    for i in range(rows):
+        record = {k: (None if v[i] != v[i] else v[i]) for k, v in fields.items()}
+        for name in ANALYZER_NODES:
+            try:
+                out[name].append((run_analyzer(name, record), record))
+            except ArithmeticError:
+                out[name].append((None, record))
+    return out
+
+
+def _same(got, want):
+    return got == want or (got != got and want != want)
+
+
+def _expected(name, result, record):
+    """单公司结果 → （valid, {数值列: 值}, 等级代码）"""
+    if result is None or "error" in result:
+        return False, {}, -1
+    if name == "capital_structure":
+        code = next(i for i, prefix in enumerate(STRUCTURE_PREFIXES) if result["capital_structure"].startswith(prefix))
+        return True, {"equity_plus_debt": (record["equity"] or 0.0) + (record["debt"] or 0.0)}, code
+    values = {column: result[column] for column in SCREEN_VALUES[name]}
+    code = -1
+    if name in SCREEN_CODES:
+        code = SCREEN_CODES[name][2].index(result[SCREEN_CODES[name][1]])
+    return True, values, code
+
+
+def check_parity(metrics, expected, rows):
+    """依赖图输出与单公司函数逐行比对，返回 {分析工具: 不一致行数}"""
+    mismatches = {}
+    for name, results in expected.items():
+        output = metrics[name]
+        code_column = "structure_code" if name == "capital_structure" else SCREEN_CODES.get(name, (None,))[0]
+        wrong = 0
+        for i, (result, record) in enumerate(results[:rows]):
+            valid, values, code = _expected(name, result, record)
+            if bool(output["valid"][i]) != valid:
+                wrong += 1
+                continue
+            if not valid:
+                continue
+            wrong += not all(_same(float(output[column][i]), float(value)) for column, value in values.items())
+            if code_column is not None:
+                wrong += int(output[code_column][i]) != code
+        mismatches[name] = wrong
+    return mismatches
+
+
+def _inputs(name, computed):
+    """节点实际使用的输入（可推导输入只有在其推导列被计算时才算依赖）"""
+    if name in ANALYZER_NODES or name in NODES:
+        return (ANALYZER_NODES.get(name) or NODES[name])[0]
+    if name in DERIVED_INPUTS and all(dep in computed for dep in DERIVED_INPUTS[name][0]):
+        return DERIVED_INPUTS[name][0]
+    return ()
+
+
+def check_pruning(columns, name):
+    """只请求一个工具：每个节点只算一次，且除目标外每个节点都被后续节点用到（没有白算的节点）"""
+    trace = []
+    compute_metrics(columns, [name], trace)
+    names = [node for node, _seconds in trace]
+    computed = set(names)
+    used = {dep for node in names for dep in _inputs(node, computed)}
+    dead = [node for node in names if node != name and node not in used]
+    others = [node for node in names if node in ANALYZER_NODES and node != name]
+    return names, len(names) != len(computed) or bool(dead) or bool(others)
+
+
+def best_of(function, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def main(n=200_000):
+    failures = 0
+    columns = make_columns(n)
+    derived, derived_inputs = derived_scenario(columns)
+    analyzers = list(ANALYZER_NODES)
+    print(f"\n===== 🏆 共享指标依赖图基准（{n:,} 个公司-期间 × {len(analyzers)} 个分析工具） =====")
+
+    # ① 逐行一致（两种输入场景）
+    rows = min(SCALAR_ROWS, n)
+    # 提供了 NOPAT 列时，其缺失行由 EBIT×0.75 补齐：单公司函数的输入同样补齐
+    plain_inputs = dict(columns, nopat=np.where(np.isnan(columns["nopat"]), columns["ebit"] * NOPAT_RATE,
+                                                columns["nopat"]))
+    start = time.perf_counter()
+    expected = scalar_results(plain_inputs, rows)
+    scalar_seconds = (time.perf_counter() - start) * n / rows
+    derived_expected = scalar_results(derived_inputs, rows)
+    full = check_parity(compute_metrics(columns), expected, rows)
+    from_assets = check_parity(compute_metrics(derived), derived_expected, rows)
+    failures += sum(full.values()) + sum(from_assets.values())
+    print(f"\n逐行校验（前{rows:,}行）          有效行  不一致  推导场景不一致")
+    for name in analyzers:
+        valid = sum(result is not None and "error" not in result for result, _record in expected[name])
+        print(f"{name:<24}{valid:>10,}{full[name]:>8}{from_assets[name]:>14}")
+
+    # ② 每个节点只算一次 + 剪枝
+    trace = []
+    compute_metrics(columns, analyzers, trace)
+    names = [node for node, _seconds in trace]
+    repeated = [node for node, count in Counter(names).items() if count > 1]
+    failures += bool(repeated) or names != plan(analyzers, columns)
+    per_analyzer, pruning_failures = {}, []
+    for name in analyzers:
+        per_analyzer[name], failed = check_pruning(columns, name)
+        if failed:
+            pruning_failures.append(name)
+    failures += len(pruning_failures)
+    shared = Counter(node for nodes in per_analyzer.values() for node in set(nodes) - {*analyzers})
+    shared = {node: count for node, count in shared.items() if count > 1}
+    separate_nodes = sum(len(nodes) for nodes in per_analyzer.values())
+    pruning = "✅" if not pruning_failures else "❌ " + "/".join(pruning_failures)
+    print(f"\n全部工具一次计算：{len(names)} 个唯一节点（重复计算 {len(repeated)} 个）"
+          f" | 各工具单独计算共 {separate_nodes} 个节点 | 剪枝校验：{pruning}")
+    print("多个工具共用的节点：" + "、".join(f"{node}×{count}" for node, count in
+                                       sorted(shared.items(), key=lambda item: -item[1])))
+    roce_only = per_analyzer["roce"]
+    print(f"只请求 roce：计算 {len(roce_only)} 个节点（{'、'.join(roce_only)}）")
+
+    # ③ 耗时：一次计算 vs 唯一节点之和 vs 各工具单独计算之和（同样保留全部结果）vs 逐行
+    # 数组输入（数值列已是 float64）与列表输入（如逐行读取CSV后的列，读取/转换本身是共用节点）各测一次
+    full_seconds, trace = min(_traced(columns) for _ in range(3))
+    node_seconds = sum(seconds for _node, seconds in trace)
+    print(f"\n全部工具一次计算：{full_seconds:.3f}s（{n * len(analyzers) / full_seconds:,.0f} 个工具结果/秒）"
+          f" | 唯一节点耗时之和 {node_seconds:.3f}s（调度开销 {full_seconds / node_seconds - 1:.1%}）")
+    lists = {k: (v.tolist() if isinstance(v, np.ndarray) else v) for k, v in columns.items()}
+    for label, source in (("数组输入", columns), ("列表输入", lists), ("总资产推导", derived)):
+        once = best_of(lambda source=source: compute_metrics(source))
+        separate = best_of(lambda source=source: [compute_metrics(source, [name]) for name in analyzers])
+        print(f"{label}：一次计算 {once:.3f}s | 各工具单独计算之和 {separate:.3f}s（节省 {1 - once / separate:.0%}）")
+    print(f"逐行单公司函数（按{rows:,}行外推）：{scalar_seconds:.1f}s | 加速比 {scalar_seconds / full_seconds:.0f}x")
+    costly = sorted(trace, key=lambda item: -item[1])[:5]
+    print("耗时最多的节点：" + "、".join(f"{node} {seconds * 1000:.1f}ms" for node, seconds in costly))
+    return 1 if failures else 0
+
+
+def _traced(columns):
+    """（整次计算耗时, 逐节点耗时）"""
+    trace = []
+    start = time.perf_counter()
+    compute_metrics(columns, None, trace)
+    return time.perf_counter() - start, trace
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(a) for a in sys.argv[1:2]]))
@@ -0,0 +1,80 @@
+# ==============================================
+# 【基准测试】市盈率安全边际：逐格点调用单股票函数 vs 敏感性网格向量化 + 翻转价格求解
+# 运行：python -m benchmarks.bench_pe_grid [价格格点数] [观察名单股票数]
+# 校验：网格每个格点与 calculate_pe_safety_margin 一致 | 翻转价格处状态恰好翻转（含前后1分钱）
+# ==============================================
+
+import sys
+import time
+
+import numpy as np
+
+from investment_valuation.pe_safety_margin_batch import (
+    MARGIN_STATUSES, VALUATION_DRIVERS, pe_flip_prices, pe_safety_margin_grid)
+from investment_valuation.pe_valuation_safety_margin import calculate_pe_safety_margin
+
+GROWTH = np.arange(-20, 41, 2.5)        # 25 个增速情景
+INDUSTRY_PE = np.array([15, 20, 25, 30, 40], dtype=float)
+
+
+def check_grid(prices, eps_ttm, historical_pe_75th, grid):
+    """逐格点对比单股票函数（同时计时），返回（不一致格点数, 耗时）"""
+    mismatches = 0
+    start = time.perf_counter()
+    for i, price in enumerate(prices.tolist()):
+        for j, growth in enumerate(GROWTH.tolist()):
+            for k, industry_pe in enumerate(INDUSTRY_PE.tolist()):
+                row = calculate_pe_safety_margin(price, eps_ttm, growth, industry_pe, historical_pe_75th)
+                cell = (0, i, j, k)
+                mismatches += (row["pe_dynamic"] != grid["pe_dynamic"][cell]
+                               or row["safety_margin"] != grid["safety_margin"][cell]
+                               or row["margin_status"] != MARGIN_STATUSES[grid["status_code"][cell]]
+                               or row["driver"] != VALUATION_DRIVERS[grid["driver_code"][cell]][0])
+    return mismatches, time.perf_counter() - start
+
+
+def check_flips(eps_ttm, industry_pe, historical_pe_75th, flips):
+    """在翻转价位及前后1分钱处调用单股票函数，确认状态恰好在该价位翻转"""
+    def status(i, price):
+        return calculate_pe_safety_margin(price, float(eps_ttm[i]), 0, float(industry_pe[i]),
+                                          float(historical_pe_75th[i]))["margin_status"]
+
+    bad = 0
+    for i in range(len(eps_ttm)):
+        low, high = float(flips["undervalued_max_price"][i]), float(flips["overvalued_min_price"][i])
+        bad += status(i, low) != MARGIN_STATUSES[0] or status(i, round(low + 0.01, 2)) == MARGIN_STATUSES[0]
+        bad += status(i, high) != MARGIN_STATUSES[2] or status(i, round(high - 0.01, 2)) == MARGIN_STATUSES[2]
+    return bad
+
+
+def main(price_points=200, watchlist=5000):
+    eps_ttm, historical_pe_75th = 2.5, 30.0
+    prices = np.round(np.linspace(20, 120, price_points), 2)
+    cells = price_points * len(GROWTH) * len(INDUSTRY_PE)
+
+    start = time.perf_counter()
+    grid = pe_safety_margin_grid(prices, eps_ttm, GROWTH, INDUSTRY_PE, historical_pe_75th)
+    grid_seconds = time.perf_counter() - start
+    grid_mismatches, loop_seconds = check_grid(prices, eps_ttm, historical_pe_75th, grid)
+
+    rng = np.random.default_rng(0)
+    names_eps = rng.uniform(0.05, 8, watchlist).round(3)
+    names_industry_pe = rng.uniform(6, 60, watchlist).round(1)
+    names_history = rng.uniform(6, 90, watchlist).round(1)
+    start = time.perf_counter()
+    flips = pe_flip_prices(names_eps, names_industry_pe, names_history)
+    flip_seconds = time.perf_counter() - start
+    flip_mismatches = check_flips(names_eps, names_industry_pe, names_history, flips)
+    gap = np.max(np.abs(flips["undervalued_max_price"] - flips["undervalued_below"]))
+
+    print(f"\n===== 📈 市盈率安全边际网格基准（价格{price_points}×增速{len(GROWTH)}×行业PE{len(INDUSTRY_PE)}"
+          f" = {cells:,} 格点） =====")
+    print(f"逐格点调用：{loop_seconds:.3f}s | 网格向量化：{grid_seconds * 1000:.2f} ms | "
+          f"加速比：{loop_seconds / grid_seconds:.0f}x | 不一致格点：{grid_mismatches}")
+    print(f"观察名单 {watchlist:,} 只股票翻转价格：{flip_seconds * 1000:.1f} ms | "
+          f"取整口径与解析解最大差：{gap:.3f}元 | 翻转位置错误：{flip_mismatches}")
+    return 0 if grid_mismatches == 0 and flip_mismatches == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(a) for a in sys.argv[1:3]]))
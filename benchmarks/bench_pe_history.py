@@ -0,0 +1,89 @@
+# ==============================================
+# 【基准测试】近5年PE 75分位数：每天重排序窗口（旧做法） vs 有序窗口增量更新
+# 运行：python -m benchmarks.bench_pe_history [股票数] [交易日数]
+# 校验：两种做法逐日逐股票结果一致 | 批量安全边际与 calculate_pe_safety_margin 逐行一致
+# ==============================================
+
+import sys
+import time
+
+import numpy as np
+
+from investment_valuation.pe_history import (
+    MIN_PERIODS, SortedList, TRADING_DAYS_5Y, PEHistoryEngine, rolling_pe_percentile)
+from investment_valuation.pe_safety_margin_batch import MARGIN_STATUSES, pe_safety_margin_batch
+from investment_valuation.pe_valuation_safety_margin import calculate_pe_safety_margin
+
+
+def make_market(tickers, days, seed=0):
+    """随机行情：几何布朗运动股价 + 季度更新的EPS（含少量亏损季度）"""
+    rng = np.random.default_rng(seed)
+    prices = (rng.uniform(5, 100, (tickers, 1)) * np.exp(np.cumsum(rng.normal(0, 0.02, (tickers, days)), axis=1)))
+    quarters = days // 63 + 1
+    eps = np.repeat(rng.uniform(-0.3, 4, (tickers, quarters)), 63, axis=1)[:, :days]
+    return prices.round(2), eps.round(3)
+
+
+def resort_percentile(prices, eps):
+    """旧做法：每只股票每天取近5年窗口重新计算分位数"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pe = np.where((prices > 0) & (eps > 0), prices / eps, np.nan)
+    out = np.full(pe.shape, np.nan)
+    for i in range(pe.shape[0]):
+        for t in range(pe.shape[1]):
+            window = pe[i, max(0, t - TRADING_DAYS_5Y + 1):t + 1]
+            window = window[~np.isnan(window)]
+            if len(window) >= MIN_PERIODS:
+                out[i, t] = np.percentile(window, 75)
+    return out
+
+
+def main(tickers=100, days=2000):
+    prices, eps = make_market(tickers, days)
+
+    start = time.perf_counter()
+    expected = resort_percentile(prices, eps)
+    resort_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    history = rolling_pe_percentile(prices, eps)
+    rolling_seconds = time.perf_counter() - start
+
+    same = np.array_equal(history, expected, equal_nan=True)
+
+    # 日频增量：模拟每日收盘后更新整个股票池
+    engine = PEHistoryEngine()
+    names = [f"S{i:05d}" for i in range(tickers)]
+    start = time.perf_counter()
+    for t in range(days):
+        engine.update_day(names, prices[:, t].tolist(), eps[:, t].tolist())
+    daily_seconds = (time.perf_counter() - start) / days
+    same = same and np.array_equal(np.array(engine.current(names)), history[:, -1], equal_nan=True)
+
+    # 批量安全边际（直接接收最后一日的分位数PE）
+    rng = np.random.default_rng(1)
+    growth = rng.uniform(-20, 40, tickers).round(1)
+    industry_pe = rng.uniform(8, 50, tickers).round(1)
+    batch = pe_safety_margin_batch(prices[:, -1], eps[:, -1], growth, industry_pe, history[:, -1])
+    mismatches = 0
+    for i in range(tickers):
+        result = calculate_pe_safety_margin(float(prices[i, -1]), float(eps[i, -1]), float(growth[i]),
+                                            float(industry_pe[i]), float(history[i, -1]))
+        if "error" in result:
+            mismatches += bool(batch["valid"][i])
+        else:
+            mismatches += (result["safety_margin"] != batch["safety_margin"][i]
+                           or result["margin_status"] != MARGIN_STATUSES[batch["status_code"][i]])
+
+    cells = tickers * days
+    print(f"\n===== 📈 滚动历史PE分位数基准（{tickers:,} 只股票 × {days:,} 交易日 = {cells:,} 个股票日） =====")
+    print(f"有序窗口实现：{'sortedcontainers.SortedList' if SortedList is not None else 'bisect 有序列表'}")
+    print(f"每天重排序：{resort_seconds:.3f}s | 有序窗口增量：{rolling_seconds:.3f}s | "
+          f"加速比：{resort_seconds / rolling_seconds:.1f}x")
+    print(f"日频更新整个股票池：{daily_seconds * 1000:.2f} ms/交易日（{daily_seconds / tickers * 1e6:.2f} µs/股票）")
+    print(f"分位数逐位一致：{'✅' if same else '❌'} | 批量安全边际不一致行数：{mismatches}")
+    return 0 if same and mismatches == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(a) for a in sys.argv[1:3]]))
@@ -0,0 +1,198 @@
+# ==============================================
+# 【基准测试】比率定义语言：定义编译为向量化内核 vs 逐行调用单公司函数 vs 手写批量内核
+# 运行：python -m benchmarks.bench_ratio_dsl [公司数]
+# 校验：① 全部内置比率（流动/速动/现金/ROCE/杜邦/周转）的数值、分档、错误提示与单公司函数逐行一致
+#       ② 编译缓存：同一定义只编译一次，重复取内核不再编译
+# ==============================================
+
+import sys
+import time
+
+import numpy as np
+
+from common.benchmark_registry import BUILTIN_TABLES, get_registry
+from common.ratio_dsl import (RATIOS, band_labels, compile_ratio, compute_ratios, error_messages, kernel_cache_info,
+                              register_ratio)
+from operation_efficiency.inventory_turnover_days import calculate_inventory_health
+from profitability_analysis.dupont_analysis_strategic import analyze_dupont
+from profitability_analysis.dupont_panel import dupont_panel, encode_industries
+from profitability_analysis.roce_calculator import calculate_roce, judge_roce_level
+from solvency_analysis.cash_ratio_stress_test import cash_ratio_stress_test
+from solvency_analysis.financial_ratio_calculator import (CURRENT_RATIO_ADVICE, CURRENT_RATIO_BANDS, QUICK_RATIO_ADVICE,
+                                                          QUICK_RATIO_BANDS, calculate_current_ratio,
+                                                          calculate_quick_ratio, ratio_advice)
+
+SCALAR_ROWS = 20_000  # 逐行校验/计时的行数（单公司函数较慢，计时按行数外推）
+
+
+def _names(table, n, rng):
+    """随机行业名称（含1个未知名称，走默认行业）"""
+    return rng.choice([*BUILTIN_TABLES[table]["entries"], "未知"], n).tolist()
+
+
+def make_columns(n, seed=0):
+    """随机报表列：金额保留1位小数，含少量0/负数错误行与取整边界行"""
+    rng = np.random.default_rng(seed)
+
+    def amount(low, high, bad=0.01):
+        values = rng.uniform(low, high, n).round(1)
+        values[rng.random(n) < bad] = rng.choice([0.0, -5.0])
+        return values
+
+    columns = {
+        "current_assets": amount(10, 5000), "quick_assets": amount(5, 3000), "current_liabilities": amount(10, 3000),
+        "cash_eq": amount(0, 2000), "short_term_debt": amount(0, 3000), "daily_cash_burn": amount(0, 30),
+        "operating_profit": amount(-100, 3000), "capital_employed": amount(500, 30000),
+        "net_profit": amount(-50, 1500), "revenue": amount(100, 20000), "avg_assets": amount(100, 15000),
+        "avg_equity": amount(50, 8000), "cogs": amount(50, 10000), "avg_inventory": amount(10, 3000),
+        "industry_type": _names("cash_crisis", n, rng), "industry_subtype": _names("inventory_days", n, rng),
+    }
+    capital = columns["capital_employed"]
+    capital[rng.random(n) < 0.01] = 50.0  # 资本总额 < 营业利润 → 第3条校验规则
+    return columns, _names("roce", n, rng), _names("dupont", n, rng)
+
+
+def scalar_rows(columns, roce_industry, dupont_industry, rows):
+    """逐行调用单公司函数，返回每个比率的 (数值或错误提示, 分档文字) 列表"""
+    get = {k: (v[:rows].tolist() if isinstance(v, np.ndarray) else v[:rows]) for k, v in columns.items()}
+    out = {name: [] for name in RATIOS}
+    for i in range(rows):
+        for name, function, assets, bands, advice in (
+                ("current_ratio", calculate_current_ratio, "current_assets", CURRENT_RATIO_BANDS, CURRENT_RATIO_ADVICE),
+                ("quick_ratio", calculate_quick_ratio, "quick_assets", QUICK_RATIO_BANDS, QUICK_RATIO_ADVICE)):
+            ratio = function(get[assets][i], get["current_liabilities"][i])
+            if isinstance(ratio, str):
+                out[name].append((ratio, None))
+            else:
+                out[name].append((ratio, ratio_advice(ratio, bands, advice)))
+
+        cash = cash_ratio_stress_test(get["cash_eq"][i], get["short_term_debt"][i], get["daily_cash_burn"][i],
+                                      get["industry_type"][i])
+        if "error" in cash:
+            out["cash_ratio"].append((cash["error"], None))
+            out["survival_days"].append((cash["error"], None))
+        else:
+            out["cash_ratio"].append((cash["cash_ratio"], cash["health_quadrant"]))
+            out["survival_days"].append((cash["survival_days"], None))
+
+        roce = calculate_roce(get["operating_profit"][i], get["capital_employed"][i])
+        if isinstance(roce, str):
+            out["roce"].append((roce, None))
+        else:
+            median = get_registry().table("roce").row(roce_industry[i])["median"]
+            out["roce"].append((roce, judge_roce_level(roce, median)))
+
+        dupont = analyze_dupont(get["net_profit"][i], get["revenue"][i], get["avg_assets"][i], get["avg_equity"][i],
+                                dupont_industry[i])
+        if "error" in dupont:
+            for name in ("net_margin", "asset_turnover", "equity_multiplier", "roe"):
+                out[name].append((dupont["error"], None))
+        else:
+            arrows = dupont["radar"].replace("驱动因素趋势：净利率", "").replace(" 周转率", "").replace(" 杠杆", "")
+            for name, value, arrow in zip(("net_margin", "asset_turnover", "equity_multiplier"),
+                                          dupont["factors"].values(), arrows):
+                out[name].append((value, arrow))
+            out["roe"].append((dupont["roe"], None))
+
+        try:
+            health = calculate_inventory_health(get["cogs"][i], get["avg_inventory"][i], get["industry_subtype"][i])
+        except ZeroDivisionError:  # 周转率取整为0时单公司版本除零；DSL 按 on_zero 返回 inf
+            health = None
+        if health is None:
+            out["inventory_turnover"].append((0.0, None))
+            out["inventory_days"].append((None, None))
+        elif "error" in health:
+            out["inventory_turnover"].append((health["error"], None))
+            out["inventory_days"].append((health["error"], None))
+        else:
+            out["inventory_turnover"].append((health["turnover_rate"], None))
+            out["inventory_days"].append((health["turnover_days"], health["health_score"]))
+    return out
+
+
+def check_parity(results, expected, columns, rows):
+    """DSL 结果（数值/分档/错误提示）与单公司函数逐行比对"""
+    head = {k: v[:rows] for k, v in columns.items()}
+    mismatches = {}
+    for name, rows_expected in expected.items():
+        result = results[name]
+        values = result["value"][:rows].tolist()
+        labels = band_labels(name, result["band_code"][:rows])
+        errors = error_messages(name, result["error_code"][:rows], head)
+        wrong = 0
+        for (value, label), got_value, got_label, got_error in zip(rows_expected, values, labels, errors):
+            if value is None:  # 单公司版本除零的行
+                continue
+            if isinstance(value, str):
+                wrong += got_error != value
+            else:
+                wrong += got_error is not None or got_value != value or got_label != label
+        mismatches[name] = wrong
+    return mismatches
+
+
+def check_cache():
+    """编译缓存：新定义首次编译耗时 vs 重复取内核耗时（校验只编译1次）"""
+    before = kernel_cache_info()
+    start = time.perf_counter()
+    register_ratio("debt_cover", {"title": "现金覆盖率", "numerator": "cash_eq + 0.5 * current_assets",
+                                  "denominator": "max(short_term_debt, 1)", "digits": 3,
+                                  "rules": (("cash_eq >= 0", "⚠️ 现金不可为负（当前输入：{cash_eq}万元）"),),
+                                  "bands": (("value >= 2", "充足"), ("1 <= value < 2", "达标"), (None, "不足"))})
+    compile_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(1000):
+        compile_ratio("debt_cover")
+    cached_seconds = (time.perf_counter() - start) / 1000
+    after = kernel_cache_info()
+    RATIOS.pop("debt_cover")
+    return compile_seconds, cached_seconds, after.misses - before.misses, after.hits - before.hits
+
+
+def main(n=200_000):
+    failures = 0
+    columns, roce_industry, dupont_industry = make_columns(n)
+    print(f"\n===== 🏆 比率定义语言基准（{n:,} 家公司 × {len(RATIOS)} 个内置比率） =====")
+
+    # ROCE 分档用 "roce" 表行业、杜邦分档用 "dupont" 表行业：两张表行业不同，分两次传入 industry 列
+    start = time.perf_counter()
+    results = compute_ratios([r for r in RATIOS if r not in ("roce", "net_margin", "asset_turnover",
+                                                             "equity_multiplier", "roe")], columns)
+    results.update(compute_ratios(["roce"], {**columns, "industry": roce_industry}))
+    results.update(compute_ratios(["net_margin", "asset_turnover", "equity_multiplier", "roe"],
+                                  {**columns, "industry": dupont_industry}))
+    dsl_seconds = time.perf_counter() - start
+
+    rows = min(SCALAR_ROWS, n)
+    start = time.perf_counter()
+    expected = scalar_rows(columns, roce_industry, dupont_industry, rows)
+    scalar_seconds = (time.perf_counter() - start) * n / rows
+    mismatches = check_parity(results, expected, columns, rows)
+    failures += sum(mismatches.values())
+    print(f"DSL 向量化内核：{dsl_seconds:.3f}s（{n * len(RATIOS) / dsl_seconds:,.0f} 个比率/秒）")
+    print(f"逐行单公司函数（按{rows:,}行外推）：{scalar_seconds:.2f}s | 加速比 {scalar_seconds / dsl_seconds:.0f}x")
+    print("\n比率                  错误行    不一致")
+    for name, wrong in mismatches.items():
+        print(f"{name:<20}{int((~results[name]['valid']).sum()):>8,}{wrong:>10}")
+
+    # 杜邦三因素 + ROE：DSL vs 手写的 dupont_panel（同为向量化，比较定义语言的额外开销）
+    dupont_columns = {k: columns[k] for k in ("net_profit", "revenue", "avg_assets", "avg_equity")}
+    start = time.perf_counter()
+    compute_ratios(["net_margin", "asset_turnover", "equity_multiplier", "roe"],
+                   {**dupont_columns, "industry": dupont_industry})
+    dsl_dupont = time.perf_counter() - start
+    start = time.perf_counter()
+    dupont_panel(*(dupont_columns[k][:, None] for k in dupont_columns), encode_industries(dupont_industry))
+    hand_dupont = time.perf_counter() - start
+    print(f"\n杜邦四项：DSL {dsl_dupont * 1000:.1f}ms | 手写 dupont_panel {hand_dupont * 1000:.1f}ms"
+          f"（DSL 含逐项取整与分档，手写内核含战略类型）")
+
+    compile_seconds, cached_seconds, misses, hits = check_cache()
+    failures += misses != 1
+    print(f"编译缓存：新定义首次编译 {compile_seconds * 1000:.2f}ms | 重复取内核 {cached_seconds * 1e6:.1f}µs"
+          f" | 新编译 {misses} 次，命中 {hits} 次")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(a) for a in sys.argv[1:2]]))
@@ -0,0 +1,160 @@
+# ==============================================
+# 【基准测试】批量结果卡片渲染：逐行格式化 + 整篇文档拼接 vs 预编译模板 + 分片流式写盘（单进程/多进程）
+# 运行：python -m benchmarks.bench_report_renderer [公司数] [进程数]
+# 校验：① 预编译模板输出与逐行格式化输出逐字节一致（Markdown/HTML）
+#       ② 多进程输出与单进程逐字节一致；HTML 标签成对闭合
+#       ③ 流式渲染的内存峰值远小于输出文件（不在内存中拼整篇文档）
+# ==============================================
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from html import escape
+from html.parser import HTMLParser
+from string import Formatter
+
+from batch_processing.report_renderer import _LAYOUTS, CARD_LINES, MISSING, render_report
+from batch_processing.statement_pipeline import analyze_batch, batched
+from benchmarks.synthetic import statement_records
+from common.cli import ANALYZERS
+
+# 流式渲染的内存峰值上限 = 固定开销（分片缓冲、模板、结果读取，与输出大小无关，约14MB）+ 输出文件大小的 1/4
+MEMORY_FLOOR_MB = 20
+MEMORY_RATIO = 0.25
+
+
+def write_results(path, n):
+    """合成报表 → 全部分析工具 → 管道结果JSONL（同 statement_pipeline 输出）"""
+    with open(path, "w", encoding="utf-8") as out:
+        for batch in batched(statement_records(n), 1000):
+            rows, _skipped = analyze_batch(batch, list(ANALYZERS))
+            out.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows))
+
+
+def read_results(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def naive_render(rows, output_path, fmt):
+    """旧做法：每张卡片逐行 format（同 __main__ 的 print 逐行拼接），整篇文档在内存中拼好后一次写出"""
+    head, company, card_open, card_line, card_close, card_error, end, tail = _LAYOUTS[fmt]
+    esc = escape if fmt == "html" else str
+    document = head
+    for row in rows:
+        document += company.format(entity=esc(str(row["entity"])), period=esc(str(row["period"])))
+        for name in ANALYZERS:
+            result = row["results"].get(name)
+            if result is None:
+                continue
+            title = esc(ANALYZERS[name]["title"])
+            if "error" in result:
+                document += card_error.format(title=title, error=esc(str(result["error"])))
+                continue
+            values = {k: esc(str(v)) for k, v in result.items()}
+            document += card_open.format(title=title)
+            for line in CARD_LINES[name]:
+                text = esc(line).format_map({f: values.get(f, MISSING) for f in _fields(line)})
+                document += card_line.format(line=text)
+            document += card_close
+        document += end
+    document += tail
+    with open(output_path, "w", encoding="utf-8") as out:
+        out.write(document)
+
+
+def _fields(line):
+    return {f for _text, f, _spec, _conv in Formatter().parse(line) if f}
+
+
+class _TagBalance(HTMLParser):
+    """统计块级标签是否成对闭合"""
+    TAGS = ("section", "div", "ul", "li", "h2", "h3", "p")
+
+    def __init__(self):
+        super().__init__()
+        self.depth = 0
+        self.broken = 0
+
+    def handle_starttag(self, tag, attrs):
+        self.depth += tag in self.TAGS
+
+    def handle_endtag(self, tag):
+        if tag in self.TAGS:
+            self.depth -= 1
+            self.broken += self.depth < 0
+
+
+def html_balanced(path):
+    parser = _TagBalance()
+    with open(path, encoding="utf-8") as f:
+        for chunk in iter(lambda: f.read(1 << 20), ""):
+            parser.feed(chunk)
+    parser.close()
+    return parser.depth == 0 and parser.broken == 0
+
+
+def same_file(a, b):
+    with open(a, "rb") as fa, open(b, "rb") as fb:
+        return fa.read() == fb.read()
+
+
+def traced_peak_mb(function, *args, **kwargs):
+    tracemalloc.start()
+    try:
+        function(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def main(n=20000, workers=None):
+    workers = workers or max(os.cpu_count() or 1, 2)
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        results_path = os.path.join(tmp, "results.jsonl")
+        write_results(results_path, n)
+        rows = read_results(results_path)
+        print(f"\n===== 🏆 批量结果卡片渲染基准（{n:,} 家公司 × {len(CARD_LINES)} 个分析工具） =====")
+
+        for fmt, suffix in (("markdown", ".md"), ("html", ".html")):
+            naive_path = os.path.join(tmp, "naive" + suffix)
+            serial_path = os.path.join(tmp, "serial" + suffix)
+            parallel_path = os.path.join(tmp, "parallel" + suffix)
+
+            start = time.perf_counter()
+            naive_render(rows, naive_path, fmt)
+            naive_seconds = time.perf_counter() - start
+            serial = render_report(rows, serial_path, fmt, max_workers=1)
+            parallel = render_report(results_path, parallel_path, fmt, max_workers=workers)
+
+            identical = same_file(naive_path, serial_path)
+            consistent = same_file(serial_path, parallel_path)
+            balanced = fmt != "html" or html_balanced(serial_path)
+            failures += not (identical and consistent and balanced)
+            cards = serial["cards"]
+            print(f"\n【{fmt}】{cards:,} 张卡片，输出 {serial['bytes'] / 1e6:.1f}MB")
+            print(f"逐行格式化+整篇拼接：{naive_seconds:.2f}s（{cards / naive_seconds:,.0f} 张/秒）")
+            print(f"预编译模板·单进程：{serial['seconds']:.2f}s（{serial['cards_per_sec']:,.0f} 张/秒）"
+                  f" | 加速比 {naive_seconds / serial['seconds']:.1f}x")
+            print(f"预编译模板·{workers}进程（含读取结果JSONL）：{parallel['seconds']:.2f}s"
+                  f"（{parallel['cards_per_sec']:,.0f} 张/秒，本机 {os.cpu_count()} 核）")
+            print(f"与逐行格式化逐字节一致：{'✅' if identical else '❌'} | 多进程与单进程一致：{'✅' if consistent else '❌'}"
+                  + ("" if fmt != "html" else f" | HTML标签闭合：{'✅' if balanced else '❌'}"))
+
+        # ③ 内存峰值（tracemalloc 只统计渲染期间新分配的内存；结果从JSONL逐行读取）
+        output_mb = os.path.getsize(os.path.join(tmp, "serial.html")) / 1e6
+        streamed = traced_peak_mb(render_report, results_path, os.path.join(tmp, "mem.html"), "html", max_workers=1)
+        whole = traced_peak_mb(naive_render, rows, os.path.join(tmp, "mem_naive.html"), "html")
+        memory_limit = MEMORY_FLOOR_MB + output_mb * MEMORY_RATIO
+        failures += streamed > memory_limit
+        print(f"\n内存峰值（HTML，输出 {output_mb:.1f}MB）：流式渲染 {streamed:.1f}MB（上限 {memory_limit:.1f}MB）"
+              f" | 整篇拼接 {whole:.1f}MB")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(a) for a in sys.argv[1:3]]))
@@ -0,0 +1,118 @@
+# ==============================================
+# 【基准测试】ROCE行业对比图：延迟导入省下的启动开销 + 复用图形对象 vs 每家公司新建图形 + 进程池批量输出
+# 运行：python -m benchmarks.bench_roce_chart [公司数] [进程数]
+# 校验：① 导入 roce_chart / 运行非画图任务（calculate_roce、命令行 roce）不会加载 matplotlib
+#       ② 复用图形对象输出的 PNG/SVG 与每次新建图形逐字节一致（复用不会残留上一家公司的内容）
+#       ③ 多进程批量输出与单进程清单一致、文件齐全
+# ==============================================
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import statement_records
+from profitability_analysis.roce_chart import RoceChart, chart_filename, render_roce_charts
+from profitability_analysis.roce_calculator import calculate_roce
+
+PER_CHART_COMPANIES = 50  # 单张图耗时对比（复用 vs 新建）所用的公司数
+ROCE_INDUSTRIES = ("科技/互联网", "制造业", "零售/消费", "金融/银行", "能源/公用事业")
+
+# 在全新解释器中测量：导入 roce_chart + 非画图计算的耗时、是否加载了 matplotlib、首次画图时加载 matplotlib 的耗时
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import profitability_analysis.roce_chart as chart
+from profitability_analysis.roce_calculator import calculate_roce
+[calculate_roce(5000 + i, 30000) for i in range(1000)]
+lazy = time.perf_counter() - start
+loaded_before = "matplotlib" in sys.modules
+chart.load_matplotlib()
+print(lazy, loaded_before, chart.LOAD_SECONDS)
+"""
+
+
+def companies(n):
+    """合成报表记录 → 画图所需字段（行业换成 "roce" 表的行业名称）"""
+    for i, record in enumerate(statement_records(n)):
+        yield {"entity": record["entity"], "period": record["period"], "operating_profit": record["operating_profit"],
+               "capital_employed": record["capital_employed"], "industry": ROCE_INDUSTRIES[i % len(ROCE_INDUSTRIES)]}
+
+
+def probe_import():
+    output = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.split()
+    return float(output[0]), output[1] == "True", float(output[2])
+
+
+def cli_loads_matplotlib():
+    code = ("import io, sys; from common.cli import main; "
+            "main(['roce', '--operating_profit', '5000', '--capital_employed', '30000'], stdout=io.StringIO()); "
+            "print('matplotlib' in sys.modules)")
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                          cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip() == "True"
+
+
+def per_chart(tmp, fmt):
+    """同一批公司：复用一张图 vs 每家公司新建图形；返回（复用单张耗时, 新建单张耗时, 不一致文件数）"""
+    rows = [r for r in companies(PER_CHART_COMPANIES * 2) if isinstance(
+        calculate_roce(r["operating_profit"], r["capital_employed"]), float)][:PER_CHART_COMPANIES]
+    timings, outputs = {}, {}
+    for mode in ("reuse", "fresh"):
+        folder = os.path.join(tmp, f"{mode}_{fmt}")
+        os.makedirs(folder)
+        chart = RoceChart()
+        start = time.perf_counter()
+        for r in rows:
+            if mode == "fresh":
+                chart = RoceChart()
+            chart.draw(r["entity"], calculate_roce(r["operating_profit"], r["capital_employed"]), r["industry"])
+            chart.save(os.path.join(folder, f"{chart_filename(r['entity'], r['period'])}.{fmt}"), fmt)
+        timings[mode] = (time.perf_counter() - start) / len(rows)
+        outputs[mode] = folder
+    different = 0
+    for name in os.listdir(outputs["reuse"]):
+        with open(os.path.join(outputs["reuse"], name), "rb") as a, open(os.path.join(outputs["fresh"], name), "rb") as b:
+            different += a.read() != b.read()
+    return timings["reuse"], timings["fresh"], different
+
+
+def main(n=500, workers=None):
+    workers = workers or max(os.cpu_count() or 1, 2)
+    failures = 0
+    print(f"\n===== 🏆 ROCE行业对比图基准（{n:,} 家公司） =====")
+
+    lazy_seconds, loaded_before, load_seconds = probe_import()
+    cli_loaded = cli_loads_matplotlib()
+    failures += loaded_before or cli_loaded
+    print(f"导入 roce_chart + 1000次 calculate_roce：{lazy_seconds * 1000:.1f}ms"
+          f"（加载matplotlib：{'❌ 是' if loaded_before else '✅ 否'}）"
+          f" | 命令行 roce 加载matplotlib：{'❌ 是' if cli_loaded else '✅ 否'}")
+    print(f"首次画图时加载 matplotlib + Agg 后端：{load_seconds * 1000:.0f}ms（非画图任务省下的启动开销）")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in ("png", "svg"):
+            reuse, fresh, different = per_chart(tmp, fmt)
+            failures += different
+            print(f"\n单张{fmt.upper()}：复用图形 {reuse * 1000:.1f}ms | 每次新建 {fresh * 1000:.1f}ms"
+                  f"（节省 {1 - reuse / fresh:.0%}）| 输出不一致 {different}/{PER_CHART_COMPANIES}")
+
+        runs = {}
+        for count in (1, workers):
+            folder = os.path.join(tmp, f"batch_{count}")
+            runs[count] = stats = render_roce_charts(companies(n), folder, ("png", "svg"), max_workers=count)
+            missing = sum(not os.path.exists(p) for *_rest, paths, _err in stats["manifest"] for p in paths)
+            failures += missing
+            print(f"\n批量 PNG+SVG · {count}进程：{stats['seconds']:.2f}s（{stats['charts_per_sec']:,.0f} 张/秒）"
+                  f" | {stats['charts']:,} 张图，数据错误 {stats['errors']} 家，缺失文件 {missing}")
+        strip = [[(e, p, level, [os.path.basename(x) for x in paths], err)
+                  for e, p, level, paths, err in runs[count]["manifest"]] for count in (1, workers)]
+        consistent = strip[0] == strip[1]
+        failures += not consistent
+        print(f"多进程与单进程清单一致：{'✅' if consistent else '❌'}（本机 {os.cpu_count()} 核）")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(a) for a in sys.argv[1:3]]))
@@ -0,0 +1,74 @@
+# ==============================================
+# 【基准测试】ROCE行业分位数：全量排序（精确） vs 流式分位数草图（单进程/多进程合并）
+# 运行：python -m benchmarks.bench_roce_percentiles [行数] [进程数]
+# 校验：草图分位数相对误差≤1% | 多进程合并结果与单进程逐桶一致 | 草图内存与行数无关
+# ==============================================
+
+import math
+import os
+import sys
+import time
+from collections import defaultdict
+
+from benchmarks.synthetic import statement_records
+from profitability_analysis.roce_calculator import calculate_roce
+from profitability_analysis.roce_percentiles import SUMMARY_QUANTILES, build_percentiles
+
+
+def exact_quantiles(records):
+    """精确基准：按（行业, 期间）收集全部正ROCE后排序（口径同草图：取整为0的行不计入），取第 ⌊q×(n-1)⌋ 个样本"""
+    groups = defaultdict(list)
+    for r in records:
+        roce = calculate_roce(r["operating_profit"], r["capital_employed"])
+        if isinstance(roce, float) and roce > 0:
+            groups[(r["industry"], r["period"])].append(roce)
+    result = {}
+    for key, values in groups.items():
+        values.sort()
+        result[key] = {name: values[math.floor(q * (len(values) - 1))] for name, q in SUMMARY_QUANTILES}
+    return result
+
+
+def main(n=200_000, workers=None):
+    workers = workers or max(2, os.cpu_count() or 1)
+    records = list(statement_records(n))
+
+    start = time.perf_counter()
+    exact = exact_quantiles(records)
+    exact_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    serial = build_percentiles(iter(records), max_workers=1)
+    serial_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = build_percentiles(iter(records), max_workers=workers, shard_size=10000)
+    parallel_seconds = time.perf_counter() - start
+
+    worst = 0.0
+    for (industry, period), expected in exact.items():
+        sketch = serial.sketch(industry, period)
+        for name, q in SUMMARY_QUANTILES:
+            worst = max(worst, abs(sketch.quantile(q) - expected[name]) / expected[name])
+    deterministic = serial.to_dict() == parallel.to_dict()
+    bins = sum(len(s.bins) for s in serial.sketches.values())
+
+    industry = serial.industries()[0]
+    serial.summary(industry)  # 预热缓存
+    start = time.perf_counter()
+    for _ in range(100_000):
+        serial.summary(industry)
+    query_ns = (time.perf_counter() - start) / 100_000 * 1e9
+
+    print(f"\n===== 📈 ROCE分位数基准（{n:,} 行，{len(exact)} 个行业×期间分组） =====")
+    print(f"全量排序（精确）：{exact_seconds:.3f}s | 草图单进程：{serial_seconds:.3f}s | "
+          f"草图{workers}进程：{parallel_seconds:.3f}s")
+    print(f"草图桶总数：{bins:,}（全量排序需保存 {n - serial.rejected:,} 个数值） | 缓存查询：{query_ns:.0f} ns/次")
+    print(f"P20/中位数/P80 最大相对误差：{worst:.4%}（上限 {serial.sketches[next(iter(serial.sketches))].accuracy:.0%}）")
+    print(f"多进程合并与单进程一致：{'✅' if deterministic else '❌'}")
+    return 0 if deterministic and worst <= 0.01 + 1e-12 else 1
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    sys.exit(main(*args))
@@ -0,0 +1,172 @@
+# ==============================================
+# 【基准测试】SKU存货账龄引擎：内存映射流式扫描的吞吐、多进程扩展与峰值内存
+# 运行：python -m benchmarks.bench_sku_aging [流水记录数] [SKU数] [最大进程数]
+# 校验：① 小样本与逐日回放 + 先进先出批次队列（纯Python参考实现）一致
+#       ② 不同进程数结果一致 | 峰值常驻内存远小于流水文件大小
+# ==============================================
+
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from collections import deque
+
+import numpy as np
+
+from operation_efficiency.inventory_turnover_days import calculate_inventory_health
+from operation_efficiency.sku_aging import (AGING_BOUNDS, KIND_ISSUE, KIND_OPENING, KIND_RECEIPT, MOVEMENT_DTYPE,
+                                            analyze_sku_aging, to_day_number, write_movements)
+
+PERIOD_START, AS_OF = "2024-01-01", "2024-12-31"
+WRITE_BATCH = 1_000_000
+
+
+def sequential_ledger(n_skus, moves_per_sku, seed=0):
+    """逐SKU按时间生成的小样本流水（出库不超过当时结存，便于参考实现回放）"""
+    rng = random.Random(seed)
+    start, end = to_day_number(PERIOD_START), to_day_number(AS_OF)
+    rows = []
+    for sku in range(n_skus):
+        category = sku % 7
+        balance = round(rng.uniform(0, 500), 2)
+        rows.append((sku, category, KIND_OPENING, start, balance))
+        for day in sorted(rng.randint(start, end + 30) for _ in range(moves_per_sku)):  # 含截止日之后的流水
+            if rng.random() < 0.5 or balance <= 0:
+                value = round(rng.uniform(1, 300), 2)
+                rows.append((sku, category, KIND_RECEIPT, day, value))
+                balance += value if day <= end else 0
+            else:
+                value = round(rng.uniform(0, balance), 2)
+                rows.append((sku, category, KIND_ISSUE, day, value))
+                balance -= value if day <= end else 0
+    rng.shuffle(rows)  # 文件中的记录顺序任意
+    return np.array(rows, dtype=MOVEMENT_DTYPE)
+
+
+def reference(records):
+    """参考实现：逐SKU按日回放结存 + 先进先出批次队列"""
+    start, end = to_day_number(PERIOD_START), to_day_number(AS_OF)
+    by_sku = {}
+    for sku, _category, kind, day, value in records.tolist():
+        if day <= end:
+            by_sku.setdefault(sku, []).append((day, kind, value))
+    out = {}
+    for sku, moves in by_sku.items():
+        moves.sort(key=lambda m: (m[0], m[1]))  # 同日：期初、入库先于出库
+        layers, balance, area, cogs, i = deque(), 0.0, 0.0, 0.0, 0
+        for day in range(start, end):
+            while i < len(moves) and moves[i][0] <= day:
+                _day, kind, value = moves[i]
+                if kind == KIND_ISSUE:
+                    balance -= value
+                    cogs += value
+                    while value > 1e-12 and layers:
+                        take = min(value, layers[0][1])
+                        value -= take
+                        layers[0][1] -= take
+                        if layers[0][1] <= 1e-12:
+                            layers.popleft()
+                else:
+                    balance += value
+                    layers.append([max(_day, start), value])
+                i += 1
+            area += balance
+        for _day, kind, value in moves[i:]:  # 截止日当天的流水：计入结存，不占用时间
+            balance += -value if kind == KIND_ISSUE else value
+            cogs += value if kind == KIND_ISSUE else 0
+            if kind == KIND_ISSUE:
+                while value > 1e-12 and layers:
+                    take = min(value, layers[0][1])
+                    value -= take
+                    layers[0][1] -= take
+                    if layers[0][1] <= 1e-12:
+                        layers.popleft()
+            else:
+                layers.append([_day, value])
+        aging = [0.0] * (len(AGING_BOUNDS) + 1)
+        for day, value in layers:
+            aging[int(np.searchsorted(AGING_BOUNDS, end - day, side="left"))] += value
+        out[sku] = (area / (end - start), cogs, balance, aging)
+    return out
+
+
+def check_reference(tmp):
+    records = sequential_ledger(300, 40)
+    path = os.path.join(tmp, "small.bin")
+    write_movements(path, records)
+    result = analyze_sku_aging(path, PERIOD_START, AS_OF, "快消品", max_workers=1, chunk_rows=997)
+    expected = reference(records)
+    sku = result["sku"]
+    wrong = 0
+    for i, sku_id in enumerate(sku["sku"].tolist()):
+        avg, cogs, closing, aging = expected[sku_id]
+        got = (sku["avg_inventory"][i], sku["cogs"][i], sku["closing"][i], *sku["aging"][i])
+        wrong += not np.allclose(got, (avg, cogs, closing, *aging), rtol=1e-9, atol=1e-6)
+    period = to_day_number(AS_OF) - to_day_number(PERIOD_START)
+    company = calculate_inventory_health(sum(v[1] for v in expected.values()) * 365 / period,
+                                         sum(v[0] for v in expected.values()), "快消品")
+    wrong += company["health_score"] != result["company"]["health_score"]
+    return len(records), len(expected), wrong
+
+
+def write_large(path, n_records, n_skus, seed=0):
+    """分批写出大文件（生成器内存与文件大小无关）；出库按SKU缩放，保证期末结存非负"""
+    rng = np.random.default_rng(seed)
+    start, end = to_day_number(PERIOD_START), to_day_number(AS_OF)
+    written = 0
+    while written < n_records:
+        rows = min(WRITE_BATCH, n_records - written)
+        batch = np.empty(rows, dtype=MOVEMENT_DTYPE)
+        batch["sku"] = rng.integers(0, n_skus, rows)
+        batch["category"] = batch["sku"] % 97
+        batch["kind"] = np.where(rng.random(rows) < 0.55, KIND_RECEIPT, KIND_ISSUE)
+        batch["day"] = rng.integers(start, end + 1, rows)
+        batch["value"] = rng.uniform(1, 100, rows).round(2) * np.where(batch["kind"] == KIND_ISSUE, 0.9, 1.0)
+        if written == 0:
+            batch["kind"][:n_skus] = KIND_OPENING
+            batch["sku"][:n_skus] = np.arange(min(n_skus, rows))
+            batch["day"][:n_skus] = start
+        write_movements(path, batch, append=written > 0)
+        written += rows
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+def main(n_records=5_000_000, n_skus=200_000, max_workers=None):
+    max_workers = max_workers or max(2, os.cpu_count() or 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        records, skus, wrong = check_reference(tmp)
+        print(f"\n===== 🏆 SKU存货账龄引擎基准 =====")
+        print(f"参考实现比对：{records:,} 条流水 / {skus} 个SKU，不一致 {wrong}")
+
+        path = os.path.join(tmp, "movements.bin")
+        write_large(path, n_records, n_skus)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"\n流水文件：{n_records:,} 条，{size_mb:.0f} MB，{n_skus:,} 个SKU（本机 {os.cpu_count()} 核）")
+        print(f"{'进程数':<6}{'耗时(s)':>10}{'记录/秒':>14}{'加速比':>8}  结果一致")
+        baseline = reference_result = None
+        failures = wrong
+        for workers in sorted({1, *range(2, max_workers + 1, 2), max_workers}):
+            start = time.perf_counter()
+            result = analyze_sku_aging(path, PERIOD_START, AS_OF, "制造业", n_skus=n_skus, max_workers=workers)
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            reference_result = reference_result or result
+            same = all(np.allclose(result["sku"][f], reference_result["sku"][f], rtol=1e-9, equal_nan=True)
+                       for f in ("avg_inventory", "cogs", "closing", "aging"))
+            failures += not same
+            print(f"{workers:<6}{seconds:>10.2f}{n_records / seconds:>14,.0f}{baseline / seconds:>8.2f}  "
+                  f"{'✅' if same else '❌'}")
+        rss = max(peak_rss_mb(), peak_rss_mb(resource.RUSAGE_CHILDREN))
+        print(f"峰值常驻内存：{rss:.0f} MB（流水文件 {size_mb:.0f} MB；内存由 SKU 累加矩阵决定，与记录数无关）")
+        company = reference_result["company"]
+        print(f"公司级：周转{company['turnover_days']}天 {company['health_score']} | 账龄 {company['aging']}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(a) for a in sys.argv[1:4]]))
@@ -0,0 +1,44 @@
+# ==============================================
+# 【基准测试】财务报表流式管道：吞吐量（行/秒）+ 峰值内存随文件大小的变化
+# 运行：python -m benchmarks.bench_statement_pipeline [基础行数]
+# 每个文件规模在独立子进程中运行，峰值内存互不干扰；内存应基本不随行数增长
+# ==============================================
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic import write_statement_csv
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_in_subprocess(input_path, output_path, batch_size):
+    code = ("import json, sys; from batch_processing.statement_pipeline import run_pipeline; "
+            f"print(json.dumps(run_pipeline({input_path!r}, {output_path!r}, batch_size={batch_size})))")
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=REPO_ROOT, check=True)
+    return json.loads(proc.stdout)
+
+
+def main(base_rows=20_000, batch_size=1000):
+    print(f"\n===== ⏱️ 报表流式管道基准（全部分析工具，批次={batch_size}） =====")
+    peaks = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for multiple in (1, 4):
+            n = base_rows * multiple
+            input_path = os.path.join(tmp, f"statements_{n}.csv")
+            output_path = os.path.join(tmp, f"results_{n}.jsonl")
+            write_statement_csv(input_path, n)
+            stats = run_in_subprocess(input_path, output_path, batch_size)
+            peaks.append(stats["peak_rss_mb"])
+            size_mb = os.path.getsize(input_path) / 1024 / 1024
+            print(f"{n:>9,} 行（{size_mb:6.1f}MB）：{stats['rows_per_sec']:>10,.0f} 行/秒 | "
+                  f"峰值内存 {stats['peak_rss_mb']}MB | 用时 {stats['seconds']}s")
+    if None not in peaks:
+        print(f"文件扩大4倍，峰值内存变化：{peaks[1] - peaks[0]:+.1f}MB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
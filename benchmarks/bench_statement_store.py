@@ -0,0 +1,151 @@
+# ==============================================
+# 【基准测试】列式报表数据集：每次重新解析CSV vs 一次转换 + 内存映射查询
+# 运行：python -m benchmarks.bench_statement_store [行数]
+# 校验：① 查询结果与直接解析CSV筛选的记录逐值一致（含 calculate_roce 结果；数据集已按 分区/期间/公司 重排，
+#         按（公司, 期间）对齐 / 排序后比对，行序本身不同）
+#       ② 清空页缓存后执行"制造业 + 期间范围"查询，只有匹配行所在的页被读入（mincore 统计常驻页）
+# ==============================================
+
+import csv
+import ctypes
+import mmap
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from batch_processing.statement_store import convert_csv, open_store
+from benchmarks.synthetic import write_statement_csv
+from profitability_analysis.roce_calculator import calculate_roce
+
+QUERY = {"partition": "制造业", "periods": (2016, 2018)}
+FIELDS = ("operating_profit", "capital_employed", "net_profit", "revenue", "avg_assets", "avg_equity", "cogs",
+          "avg_inventory", "cash_eq", "short_term_debt", "ebit", "interest_expense")
+
+
+def parse_csv(path, partition, periods):
+    """旧做法：逐行解析整个CSV，筛选后把所需字段转成浮点数"""
+    first, last = periods
+    columns = {field: [] for field in ("entity", "period", *FIELDS)}
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            if row["industry"] == partition and first <= int(row["period"]) <= last:
+                columns["entity"].append(row["entity"])
+                columns["period"].append(int(row["period"]))
+                for field in FIELDS:
+                    columns[field].append(float(row[field]))
+    return columns
+
+
+def _libc():
+    libc = ctypes.CDLL(None, use_errno=True)
+    libc.mmap.restype = ctypes.c_void_p
+    libc.mmap.argtypes = (ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_long)
+    libc.munmap.argtypes = (ctypes.c_void_p, ctypes.c_size_t)
+    libc.mincore.argtypes = (ctypes.c_void_p, ctypes.c_size_t, ctypes.c_char_p)
+    return libc
+
+
+def resident_pages(path):
+    """文件在页缓存中的常驻页数 / 总页数（Linux mincore）"""
+    libc = _libc()
+    size = os.path.getsize(path)
+    pages = (size + mmap.PAGESIZE - 1) // mmap.PAGESIZE
+    with open(path, "rb") as f:
+        address = libc.mmap(None, size, mmap.PROT_READ, mmap.MAP_SHARED, f.fileno(), 0)
+        vector = ctypes.create_string_buffer(pages)
+        try:
+            if libc.mincore(address, size, vector) != 0:
+                raise OSError(ctypes.get_errno(), "mincore")
+        finally:
+            libc.munmap(address, size)
+    return sum(byte & 1 for byte in vector.raw), pages
+
+
+def evict(path):
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def check_pages(store_path):
+    """清空列文件的页缓存 → 查询并读取 FIELDS → 统计常驻页；无法清空页缓存的环境返回 None"""
+    files = [os.path.join(store_path, "columns", field + ".npy") for field in FIELDS]
+    try:
+        for path in files:
+            evict(path)
+        if sum(resident_pages(path)[0] for path in files) > len(files):  # 只允许 .npy 头所在的页
+            return None
+    except (AttributeError, OSError):
+        return None
+    store = open_store(store_path)
+    selected = store.select(FIELDS, **QUERY)
+    for field in FIELDS:
+        float(np.sum(selected[field]))  # 真正读取数据
+    touched = total = 0
+    for path in files:
+        resident, pages = resident_pages(path)
+        touched += resident
+        total += pages
+    rows = selected["_rows"]
+    return touched, total, (rows.stop - rows.start) / store.rows_total
+
+
+def main(n=300_000):
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "statements.csv")
+        store_path = os.path.join(tmp, "statements")
+        write_statement_csv(csv_path, n)
+        stats = convert_csv(csv_path, store_path)
+        print(f"\n===== 🏆 列式报表数据集基准（{n:,} 行） =====")
+        print(f"CSV {os.path.getsize(csv_path) / 1e6:.0f} MB → 数据集 {stats['bytes'] / 1e6:.0f} MB"
+              f"（{stats['columns']} 列），一次性转换 {stats['seconds']:.2f}s")
+
+        # ② 先做页缓存统计（之后的查询会把列文件映射进本进程，映射中的页无法清出缓存）
+        pages = check_pages(store_path)
+
+        start = time.perf_counter()
+        parsed = parse_csv(csv_path, QUERY["partition"], QUERY["periods"])
+        parse_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store = open_store(store_path)
+        selected = store.select(("entity", "period", *FIELDS), **QUERY)
+        select_seconds = time.perf_counter() - start
+
+        # ① 逐值比对（数据集按 分区/期间/公司 排序，CSV 按原始顺序 → 统一按（公司, 期间）对齐）
+        keys = [(e, p) for e, p in zip(store.decode("entity", selected["entity"]), selected["period"].tolist())]
+        stored = dict(zip(keys, zip(*(selected[f].tolist() for f in FIELDS))))
+        expected = dict(zip(zip(parsed["entity"], parsed["period"]), zip(*(parsed[f] for f in FIELDS))))
+        mismatches = int(stored != expected)
+        failures += mismatches
+
+        start = time.perf_counter()
+        roce_rows = [calculate_roce(op, ce) for op, ce in zip(selected["operating_profit"].tolist(),
+                                                              selected["capital_employed"].tolist())]
+        analyze_seconds = time.perf_counter() - start
+        roce_expected = [calculate_roce(op, ce)
+                         for op, ce in zip(parsed["operating_profit"], parsed["capital_employed"])]
+        failures += sorted(map(str, roce_rows)) != sorted(map(str, roce_expected))
+
+        print(f"\n查询：{QUERY['partition']}, {QUERY['periods'][0]}–{QUERY['periods'][1]} → {len(keys):,} 行"
+              f" × {len(FIELDS)} 个字段（连续行 {selected['_rows']}）")
+        print(f"重新解析CSV：{parse_seconds:.3f}s | 内存映射查询：{select_seconds * 1000:.2f}ms"
+              f" | 加速比 {parse_seconds / select_seconds:,.0f}x | 记录不一致 {mismatches}")
+        print(f"calculate_roce 逐行分析：{analyze_seconds:.3f}s（解析耗时是分析的 {parse_seconds / analyze_seconds:.1f} 倍）")
+        if pages is None:
+            print("页缓存统计：当前环境无法清空页缓存，跳过")
+        else:
+            touched, total, share = pages
+            print(f"页缓存统计（冷启动查询）：读入 {touched:,} / {total:,} 页（{touched / total:.1%}）；"
+                  f"匹配行占全部行 {share:.1%}，差额来自页边界对齐与文件头")
+            failures += touched / total > share + 0.1
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(a) for a in sys.argv[1:2]]))
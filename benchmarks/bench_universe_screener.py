@@ -0,0 +1,113 @@
+# ==============================================
+# 【基准测试】全市场多核筛选：强扩展（总行数固定）与弱扩展（每进程行数固定），1 → N 个进程
+# 运行：python -m benchmarks.bench_universe_screener [强扩展总行数] [弱扩展每进程行数] [最大进程数]
+# 校验：不同进程数的结果逐位一致 | 抽样行与 run_analyzer 单公司结果一致
+# ==============================================
+
+import os
+import pickle
+import random
+import sys
+import time
+
+import numpy as np
+
+from batch_processing.statement_pipeline import map_fields
+from batch_processing.universe_screener import (SCREEN_CODES, SCREEN_LABELS, SCREEN_VALUES, SharedUniverse,
+                                                screen_universe)
+from benchmarks.synthetic import STATEMENT_FIELDS, statement_records
+from common.cli import TEXT_FIELDS, run_analyzer
+
+
+def make_universe(n, seed=0):
+    """合成公司池：{字段: 列}（数值列为 NumPy 数组，文字列为字符串列表）"""
+    records = list(statement_records(n, seed))
+    columns = {}
+    for field in STATEMENT_FIELDS[2:]:
+        values = [r[field] for r in records]
+        columns[field] = values if field in TEXT_FIELDS else np.array(values, dtype=np.float64)
+    return columns, records
+
+
+def same(a, b):
+    return all(np.array_equal(a[name][column], b[name][column], equal_nan=True)
+               for name in a for column in a[name])
+
+
+def spot_check(screened, records, samples=300, seed=0):
+    """抽样比对：筛选结果 vs 单公司函数（含缺失字段跳过与数据错误行）"""
+    rng = random.Random(seed)
+    wrong = 0
+    for i in rng.sample(range(len(records)), min(samples, len(records))):
+        for name, columns in SCREEN_VALUES.items():
+            params = map_fields(records[i], name)
+            try:
+                expected = run_analyzer(name, params) if params is not None else {"error": "缺少必填字段"}
+            except ArithmeticError:  # 单公司函数自身的除零边界：筛选器记为无效行
+                expected = {"error": "算术异常"}
+            ok = "error" not in expected
+            got = screened[name]
+            if bool(got["valid"][i]) != ok:
+                wrong += 1
+                continue
+            if not ok:
+                continue
+            wrong += any(got[column][i] != expected[column] for column in columns)
+            if name in SCREEN_CODES:
+                column, field, _labels = SCREEN_CODES[name]
+                wrong += SCREEN_LABELS[column][got[column][i]] != expected[field]
+    return wrong
+
+
+def timed(columns, workers):
+    start = time.perf_counter()
+    screened = screen_universe(columns, max_workers=workers)
+    return screened, time.perf_counter() - start
+
+
+def main(strong_rows=40000, weak_rows=10000, max_workers=None):
+    max_workers = max_workers or max(2, os.cpu_count() or 1)
+    worker_counts = sorted({1, *range(2, max_workers + 1, 2), max_workers})
+    print(f"\n===== 🏆 全市场多核筛选基准（{len(SCREEN_VALUES)} 个工具，本机 {os.cpu_count()} 核） =====")
+
+    columns, records = make_universe(strong_rows)
+    with SharedUniverse(columns, SCREEN_VALUES) as universe:
+        shm_bytes = universe.nbytes
+        spec_bytes = len(pickle.dumps((universe.spec, 0, 0)))
+    pickled_bytes = len(pickle.dumps(columns))
+    print(f"共享内存：{shm_bytes / 1e6:.1f} MB（输入+输出） | 每个分片任务只传递 {spec_bytes:,} 字节描述 "
+          f"（直接 pickle 全部输入列需 {pickled_bytes / 1e6:.1f} MB）")
+
+    print(f"\n【强扩展】总行数固定 {strong_rows:,}")
+    print(f"{'进程数':<6}{'耗时(s)':>10}{'行/秒':>12}{'加速比':>8}{'效率':>8}  结果一致")
+    baseline = reference = None
+    failures = 0
+    for workers in worker_counts:
+        screened, seconds = timed(columns, workers)
+        if reference is None:
+            reference, baseline = screened, seconds
+        identical = same(reference, screened)
+        failures += not identical
+        speedup = baseline / seconds
+        print(f"{workers:<6}{seconds:>10.3f}{strong_rows / seconds:>12,.0f}{speedup:>8.2f}{speedup / workers:>8.0%}  "
+              f"{'✅' if identical else '❌'}")
+
+    mismatches = spot_check(reference, records)
+    print(f"抽样比对 run_analyzer 不一致：{mismatches}")
+
+    print(f"\n【弱扩展】每进程行数固定 {weak_rows:,}")
+    print(f"{'进程数':<6}{'总行数':>10}{'耗时(s)':>10}{'行/秒':>12}{'效率':>8}")
+    weak_baseline = None
+    for workers in worker_counts:
+        weak_columns, _records = make_universe(weak_rows * workers, seed=1)
+        _screened, seconds = timed(weak_columns, workers)
+        weak_baseline = weak_baseline or seconds
+        print(f"{workers:<6}{weak_rows * workers:>10,}{seconds:>10.3f}{weak_rows * workers / seconds:>12,.0f}"
+              f"{weak_baseline / seconds:>8.0%}")
+    if (os.cpu_count() or 1) < max_workers:
+        print(f"注：本机仅 {os.cpu_count()} 核，超过核数的进程数只反映调度开销，扩展效率请在目标批处理节点上测量")
+    return 1 if failures or mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(a) for a in sys.argv[1:4]]))
@@ -0,0 +1,124 @@
+# ==============================================
+# 【压测】分析服务：不同并发下的 p50/p99 延迟与吞吐（微批 vs 逐条）
+# 运行：python -m benchmarks.load_test_service [每档请求数] [并发档位，逗号分隔]
+#       例：python -m benchmarks.load_test_service 3000 1,16,64,256
+# 服务在子进程中启动（与压测客户端不共享事件循环）；全部响应与 run_analyzer 结果逐字节比对
+# ==============================================
+
+import asyncio
+import json
+import re
+import subprocess
+import sys
+import time
+
+from benchmarks.synthetic import statement_records
+from batch_processing.statement_pipeline import map_fields
+from common.cli import run_analyzer
+
+ANALYZER_MIX = ("dupont", "cash_ratio", "eva", "pe_safety_margin", "roce")
+MODES = (("微批", 256, 1.0), ("逐条", 1, 0.0))  # （名称, --max-batch, --window-ms）
+
+
+def make_requests(n):
+    """合成请求：（工具名, 请求体字节, 期望响应字节），按 ANALYZER_MIX 轮换"""
+    requests = []
+    for i, record in enumerate(statement_records(n * 2)):
+        name = ANALYZER_MIX[i % len(ANALYZER_MIX)]
+        params = map_fields(record, name)
+        try:
+            expected = run_analyzer(name, params)
+        except ZeroDivisionError:  # 单公司函数自身的除零边界，不纳入比对
+            continue
+        requests.append((name, json.dumps(params).encode(), json.dumps(expected, ensure_ascii=False).encode()))
+        if len(requests) == n:
+            break
+    return requests
+
+
+def start_server(max_batch, window_ms):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "batch_processing.analysis_service", "--port", "0",
+         "--max-batch", str(max_batch), "--window-ms", str(window_ms)],
+        stdout=subprocess.PIPE, text=True)
+    port = int(re.search(r":(\d+)", process.stdout.readline()).group(1))
+    return process, port
+
+
+async def http(reader, writer, method, path, body=b""):
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    return status, await reader.readexactly(length)
+
+
+async def run_level(port, requests, concurrency):
+    """concurrency 个 keep-alive 连接共同消费请求队列，返回（延迟列表, 耗时, 错误响应数）"""
+    queue = iter(range(len(requests)))
+    latencies = [0.0] * len(requests)
+    wrong = 0
+
+    async def worker():
+        nonlocal wrong
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for i in queue:
+            name, body, expected = requests[i]
+            start = time.perf_counter()
+            status, payload = await http(reader, writer, "POST", f"/analyze/{name}", body)
+            latencies[i] = time.perf_counter() - start
+            wrong += status != 200 or payload != expected
+        writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - start, wrong
+
+
+async def fetch_stats(port):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    _status, payload = await http(reader, writer, "GET", "/stats")
+    writer.close()
+    stats = json.loads(payload)
+    return sum(s["requests"] for s in stats.values()), sum(s["batches"] for s in stats.values())
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def main(n=3000, levels="1,16,64,256"):
+    levels = [int(c) for c in str(levels).split(",")]
+    requests = make_requests(n)
+    print(f"\n===== 🌐 分析服务压测（每档 {len(requests):,} 个请求，工具轮换：{'/'.join(ANALYZER_MIX)}） =====")
+    print(f"{'模式':<6}{'并发':>6}{'吞吐(req/s)':>14}{'p50(ms)':>10}{'p99(ms)':>10}{'平均批大小':>12}  响应一致")
+    failures = 0
+    for mode, max_batch, window_ms in MODES:
+        process, port = start_server(max_batch, window_ms)
+        try:
+            for concurrency in levels:
+                before = asyncio.run(fetch_stats(port))
+                latencies, seconds, wrong = asyncio.run(run_level(port, requests, concurrency))
+                after = asyncio.run(fetch_stats(port))
+                batches = after[1] - before[1]
+                mean_batch = (after[0] - before[0]) / batches if batches else 0
+                failures += wrong
+                print(f"{mode:<6}{concurrency:>6}{len(requests) / seconds:>14.0f}"
+                      f"{percentile(latencies, 50) * 1000:>10.2f}{percentile(latencies, 99) * 1000:>10.2f}"
+                      f"{mean_batch:>12.1f}  {'✅' if wrong == 0 else f'❌ {wrong}'}")
+        finally:
+            process.terminate()
+            process.wait()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:3]
+    sys.exit(main(int(args[0]) if args else 3000, *args[1:]))
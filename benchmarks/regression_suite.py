@@ -0,0 +1,182 @@
+# ==============================================
+# 【性能回归套件】全部分析函数 × 单公司循环/批量 × 1 / 1万 / 100万行
+# 运行：python -m benchmarks.regression_suite [--sizes 1,10000,1000000] [--only roce,dupont]
+#       [--modes scalar,batch] [--tolerance 0.25] [--baseline 基线.json] [--save]
+# 基线：JSON 文件记录每项吞吐（行/秒）与运行环境；本次吞吐低于 基线×(1-容忍度) 判为回归，退出码1
+#       --save 把本次结果写入（合并到）基线文件，升级依赖/换机器后重新建立基线即可
+# 校验：批量结果（batch_kernels.run_batch）与单公司函数逐条一致
+# ==============================================
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from batch_processing.batch_kernels import run_batch
+from benchmarks.synthetic import statement_columns
+from common.cli import ANALYZERS, coerce_params, load_analyzer, normalize_result
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "regression_baseline.json")
+DEFAULT_SIZES = (1, 10_000, 1_000_000)
+DEFAULT_TOLERANCE = 0.25  # 吞吐下降超过25%判为回归
+MODES = ("scalar", "batch")
+MIN_SECONDS = 0.2  # 单次计时下限：小规模用例重复调用直到总耗时超过该值
+CHECK_ROWS = 2000  # 一致性校验只比对前 CHECK_ROWS 行
+
+
+def environment():
+    """运行环境指纹（与基线不同时提示：吞吐对比可能不可比）"""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def measure(run, repeat=3, min_seconds=MIN_SECONDS):
+    """
+    单次调用耗时（秒）：调用次数自动放大到总耗时≥min_seconds，取 repeat 次中的最快值
+    单轮超过1秒的大规模用例只跑一轮
+    """
+    def elapsed(loops):
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        return time.perf_counter() - start
+
+    loops, seconds = 1, elapsed(1)
+    while seconds < min_seconds:
+        loops = max(loops * 2, int(loops * min_seconds / max(seconds, 1e-9)) + 1)
+        seconds = elapsed(loops)
+    best = seconds
+    if seconds < 1.0:
+        best = min([best] + [elapsed(loops) for _ in range(repeat - 1)])
+    return best / loops
+
+
+def analyzer_inputs(name, columns, rows):
+    """某个工具的前 rows 行输入：（参数 dict 列表, 已转换的关键字参数列表）"""
+    params = [param for param, _cast, _default in ANALYZERS[name]["params"]]
+    values = [columns[param][:rows] for param in params]
+    values = [v.tolist() if isinstance(v, np.ndarray) else v for v in values]
+    records = [dict(zip(params, row)) for row in zip(*values)]
+    return records, [coerce_params(name, record) for record in records]
+
+
+def run_suite(sizes=DEFAULT_SIZES, analyzers=None, modes=MODES, seed=0):
+    """
+    核心功能：逐项计时
+    :return: {"函数名/模式/行数": {"rows_per_sec", "seconds", "consistent"}}
+    """
+    analyzers = list(analyzers or ANALYZERS)
+    columns = statement_columns(max(sizes), seed)
+    results = {}
+    for name in analyzers:
+        function = load_analyzer(name)
+        for rows in sizes:
+            records, calls = analyzer_inputs(name, columns, rows)
+            check = CHECK_ROWS if rows > CHECK_ROWS else rows
+            consistent = (run_batch(name, records[:check])
+                          == [normalize_result(name, function(**kwargs)) for kwargs in calls[:check]])
+            runners = {
+                "scalar": lambda: [function(**kwargs) for kwargs in calls],
+                "batch": lambda: run_batch(name, records),
+            }
+            for mode in modes:
+                seconds = measure(runners[mode])
+                results[f"{ANALYZERS[name]['function']}/{mode}/{rows}"] = {
+                    "rows_per_sec": round(rows / seconds, 1),
+                    "seconds": round(seconds, 6),
+                    "consistent": consistent,
+                }
+            del records, calls
+    return results
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, baseline=None):
+    """合并写入基线（同名项覆盖，其余保留），环境指纹更新为本机"""
+    merged = dict((baseline or {}).get("results", {}))
+    merged.update({key: {"rows_per_sec": value["rows_per_sec"]} for key, value in results.items()})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": dict(sorted(merged.items()))}, f,
+                  ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    与基线对比
+    :return: {键: （基线吞吐 或 None, 变化比例 或 None, 是否回归）}
+    """
+    reference = (baseline or {}).get("results", {})
+    report = {}
+    for key, value in results.items():
+        base = reference.get(key, {}).get("rows_per_sec")
+        if not base:
+            report[key] = (None, None, False)
+            continue
+        change = value["rows_per_sec"] / base - 1
+        report[key] = (base, change, change < -tolerance)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.regression_suite", description="分析函数性能回归套件")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES), help="逗号分隔的行数")
+    parser.add_argument("--only", help="逗号分隔的分析工具名（默认全部）")
+    parser.add_argument("--modes", default=",".join(MODES), help="scalar（单公司循环）/ batch（批量内核）")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="允许的吞吐下降比例（0.25=25%%）")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基线JSON文件路径")
+    parser.add_argument("--save", action="store_true", help="把本次结果写入基线文件")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    analyzers = args.only.split(",") if args.only else None
+    unknown = [name for name in analyzers or () if name not in ANALYZERS]
+    if unknown:
+        parser.error(f"未知分析工具：{', '.join(unknown)}")
+    modes = args.modes.split(",")
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"（未找到基线文件 {args.baseline}，本次只计时不对比；加 --save 建立基线）")
+    elif baseline.get("environment") != environment():
+        print(f"注意：基线环境 {baseline.get('environment')} 与本机 {environment()} 不同，吞吐对比仅供参考")
+
+    results = run_suite(sizes, analyzers, modes)
+    report = compare(results, baseline, args.tolerance)
+    print(f"\n===== 🏆 性能回归套件（容忍度 {args.tolerance:.0%}） =====")
+    print(f"{'函数/模式/行数':<44}{'行/秒':>14}{'基线':>14}{'变化':>9}  结果")
+    regressions = inconsistent = 0
+    for key, value in results.items():
+        base, change, regressed = report[key]
+        regressions += regressed
+        inconsistent += not value["consistent"]
+        status = "❌ 回归" if regressed else "✅"
+        if not value["consistent"]:
+            status += " ❌ 批量≠单公司"
+        base_text = f"{base:,.0f}" if base is not None else "-"
+        change_text = f"{change:+.1%}" if change is not None else "-"
+        print(f"{key:<44}{value['rows_per_sec']:>14,.0f}{base_text:>14}{change_text:>9}  {status}")
+    print(f"\n回归 {regressions} 项 | 批量与单公司结果不一致 {inconsistent} 项")
+
+    if args.save:
+        save_baseline(args.baseline, results, baseline)
+        print(f"基线已写入：{args.baseline}")
+    return 1 if regressions or inconsistent else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+# ==============================================
+# 【合成财务报表数据】基准测试共用
+# 字段覆盖全部分析工具的输入（字段名与各分析函数参数名一致）
+# ==============================================
+
+import csv
+import random
+
+STATEMENT_FIELDS = (
+    "entity", "period",
+    "current_assets", "quick_assets", "current_liabilities",
+    "cash_eq", "short_term_debt", "daily_cash_burn", "industry_type",
+    "ebit", "interest_expense", "short_term_interest", "industry_cycle",
+    "operating_profit", "capital_employed", "equity", "debt",
+    "net_profit", "revenue", "avg_assets", "avg_equity", "industry",
+    "cogs", "avg_inventory", "industry_subtype",
+    "profit", "investment",
+    "stock_price", "eps_ttm", "eps_forecast", "industry_pe", "historical_pe_75th",
+    "nopat", "company_type", "eva_last_year",
+)
+
+
+def statement_records(n, seed=0):
+    """生成 n 条合成报表记录（生成器，不占用与 n 成正比的内存）"""
+    rng = random.Random(seed)
+    for i in range(n):
+        revenue = rng.uniform(1000, 50000)
+        avg_assets = revenue / rng.uniform(0.5, 3.5)
+        avg_equity = avg_assets / rng.uniform(1.1, 4.0)
+        current_liabilities = rng.uniform(200, 8000)
+        current_assets = current_liabilities * rng.uniform(0.6, 3.0)
+        operating_profit = revenue * rng.uniform(-0.05, 0.25)
+        ebit = operating_profit * rng.uniform(1.0, 1.2)
+        interest = rng.uniform(10, 800)
+        capital_employed = avg_assets * rng.uniform(0.6, 0.9)
+        eps = rng.uniform(-0.2, 5)
+        yield {
+            "entity": f"C{i // 10:07d}",
+            "period": 2015 + i % 10,
+            "current_assets": round(current_assets, 2),
+            "quick_assets": round(current_assets * rng.uniform(0.4, 0.9), 2),
+            "current_liabilities": round(current_liabilities, 2),
+            "cash_eq": round(current_assets * rng.uniform(0.05, 0.6), 2),
+            "short_term_debt": round(current_liabilities, 2),
+            "daily_cash_burn": round(rng.uniform(0, 60), 2),
+            "industry_type": rng.choice(("重资产", "轻资产", "金融", "服务业")),
+            "ebit": round(ebit, 2),
+            "interest_expense": round(interest, 2),
+            "short_term_interest": round(interest * rng.uniform(0.1, 0.9), 2),
+            "industry_cycle": rng.choice(("强周期", "弱周期", "防御性", "")),
+            "operating_profit": round(operating_profit, 2),
+            "capital_employed": round(capital_employed, 2),
+            "equity": round(avg_equity, 2),
+            "debt": round(capital_employed - avg_equity * rng.uniform(0.8, 1.0), 2),
+            "net_profit": round(operating_profit * 0.75, 2),
+            "revenue": round(revenue, 2),
+            "avg_assets": round(avg_assets, 2),
+            "avg_equity": round(avg_equity, 2),
+            "industry": rng.choice(("科技业", "零售业", "制造业")),
+            "cogs": round(revenue * rng.uniform(0.5, 0.9), 2),
+            "avg_inventory": round(revenue * rng.uniform(0.03, 0.4), 2),
+            "industry_subtype": rng.choice(("快消品", "耐用品", "奢侈品", "制造业")),
+            "profit": round(operating_profit * rng.uniform(0.05, 0.3), 2),
+            "investment": round(rng.uniform(100, 5000), 2),
+            "stock_price": round(rng.uniform(3, 200), 2),
+            "eps_ttm": round(eps, 3),
+            "eps_forecast": round(rng.uniform(-20, 40), 1),
+            "industry_pe": round(rng.uniform(8, 60), 1),
+            "historical_pe_75th": round(rng.uniform(8, 80), 1),
+            "nopat": round(ebit * 0.75, 2),
+            "company_type": rng.choice(("国企", "民企", "外企")),
+            "eva_last_year": round(rng.uniform(-500, 2000), 2),
+        }
+
+
+def write_statement_csv(path, n, seed=0):
+    """把 n 条合成记录流式写入CSV"""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=STATEMENT_FIELDS)
+        writer.writeheader()
+        writer.writerows(statement_records(n, seed))
+
+
+def statement_columns(n, seed=0):
+    """
+    列式合成报表数据（NumPy 一次生成，百万行级别也只需几秒）
+    分布与 statement_records 相同（随机流不同）；数值列为 float64，文字列为字符串列表（"" 表示未填）
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+
+    def uniform(low, high):
+        return rng.uniform(low, high, n)
+
+    def choice(options):
+        return [options[i] for i in rng.integers(0, len(options), n).tolist()]
+
+    revenue = uniform(1000, 50000)
+    avg_assets = revenue / uniform(0.5, 3.5)
+    avg_equity = avg_assets / uniform(1.1, 4.0)
+    current_liabilities = uniform(200, 8000)
+    current_assets = current_liabilities * uniform(0.6, 3.0)
+    operating_profit = revenue * uniform(-0.05, 0.25)
+    ebit = operating_profit * uniform(1.0, 1.2)
+    interest = uniform(10, 800)
+    capital_employed = avg_assets * uniform(0.6, 0.9)
+    columns = {
+        "current_assets": current_assets,
+        "quick_assets": current_assets * uniform(0.4, 0.9),
+        "current_liabilities": current_liabilities,
+        "cash_eq": current_assets * uniform(0.05, 0.6),
+        "short_term_debt": current_liabilities,
+        "daily_cash_burn": uniform(0, 60),
+        "industry_type": choice(("重资产", "轻资产", "金融", "服务业")),
+        "ebit": ebit,
+        "interest_expense": interest,
+        "short_term_interest": interest * uniform(0.1, 0.9),
+        "industry_cycle": choice(("强周期", "弱周期", "防御性", "")),
+        "operating_profit": operating_profit,
+        "capital_employed": capital_employed,
+        "equity": avg_equity,
+        "debt": capital_employed - avg_equity * uniform(0.8, 1.0),
+        "net_profit": operating_profit * 0.75,
+        "revenue": revenue,
+        "avg_assets": avg_assets,
+        "avg_equity": avg_equity,
+        "industry": choice(("科技业", "零售业", "制造业")),
+        "cogs": revenue * uniform(0.5, 0.9),
+        "avg_inventory": revenue * uniform(0.03, 0.4),
+        "industry_subtype": choice(("快消品", "耐用品", "奢侈品", "制造业")),
+        "profit": operating_profit * uniform(0.05, 0.3),
+        "investment": uniform(100, 5000),
+        "stock_price": uniform(3, 200),
+        "eps_ttm": uniform(-0.2, 5).round(3),
+        "eps_forecast": uniform(-20, 40).round(1),
+        "industry_pe": uniform(8, 60).round(1),
+        "historical_pe_75th": uniform(8, 80).round(1),
+        "nopat": ebit * 0.75,
+        "company_type": choice(("国企", "民企", "外企")),
+        "eva_last_year": uniform(-500, 2000),
+    }
+    for field, values in columns.items():
+        if isinstance(values, np.ndarray) and field not in ("eps_ttm", "eps_forecast", "industry_pe",
+                                                            "historical_pe_75th"):
+            columns[field] = values.round(2)
+    return columns
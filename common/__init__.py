@@ -0,0 +1 @@
+# 公共组件（向量化数值工具、统一命令行入口等），各分析模块共用
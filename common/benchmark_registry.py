@@ -0,0 +1,231 @@
+# ==============================================
+# 【行业基准注册表】v1.0
+# 独特性：全部分析工具的行业阈值/基准集中管理 + 整数行业代码批量查表 + 版本号 + 本地文件热加载
+# 开发者：Kiwi_hazel
+# 用法：from common.benchmark_registry import get_registry
+#       get_registry().table("cash_crisis").row("重资产")        → {"ratio": 0.5, "days": 90}
+#       get_registry().table("cash_crisis").column("ratio")[codes] → 批量查表（numpy数组）
+# 校准文件（JSON）：{"version": "2025Q1", "tables": {"cash_crisis": {"entries": {"重资产": {"ratio": 0.55}},
+#                                                                 "aliases": {"制造业": "重资产"}}}}
+#   → 已有行业按字段覆盖，新行业追加在末尾（内置行业的整数代码保持不变），aliases 把其他模块的叫法映射到本表
+# ==============================================
+
+import json
+import os
+import sys
+import threading
+from types import MappingProxyType
+
+BUILTIN_VERSION = "builtin-2024"
+ENV_FILE = "FAT_BENCHMARK_FILE"  # 设置该环境变量后，首次使用时自动加载对应校准文件
+
+# 内置基准表：{表名: {"default": 默认行业, "entries": {行业: {字段: 值}}}}（行业顺序即整数代码）
+BUILTIN_TABLES = {
+    # 现金比率压力测试：行业危机阈值（cash_ratio_stress_test）
+    "cash_crisis": {
+        "default": "重资产",
+        "entries": {
+            "重资产": {"ratio": 0.5, "days": 90},   # 如制造业，需更多现金应对设备维护
+            "轻资产": {"ratio": 0.3, "days": 60},   # 如科技公司，现金消耗快但融资灵活
+            "金融": {"ratio": 0.8, "days": 120},    # 如银行，需高流动性应对挤兑风险
+            "服务业": {"ratio": 0.4, "days": 75},   # 如餐饮，依赖现金流周转
+        },
+    },
+    # 利息保障倍数压力测试：衰退情景EBIT降幅（interest_coverage_stress）
+    "recession_drop": {
+        "default": "中性行业",
+        "entries": {
+            "强周期": {"drop": 0.3},    # 如钢铁/房地产，衰退期EBIT降30%
+            "弱周期": {"drop": 0.15},   # 如家电/消费，衰退期EBIT降15%
+            "防御性": {"drop": 0.1},    # 如医药/公用事业，衰退期EBIT降10%
+            "中性行业": {"drop": 0.2},  # 未指定周期性时默认降20%
+        },
+    },
+    # ROCE行业基准（roce_calculator，参考Wind数据库2024年行业中位数）
+    "roce": {
+        "default": "默认行业",
+        "entries": {
+            "科技/互联网": {"median": 20.0},
+            "制造业": {"median": 15.0},
+            "零售/消费": {"median": 18.0},
+            "金融/银行": {"median": 12.0},
+            "能源/公用事业": {"median": 10.0},
+            "默认行业": {"median": 15.0},
+        },
+    },
+    # 杜邦分析行业基准（analyze_dupont）
+    "dupont": {
+        "default": "制造业",
+        "entries": {
+            "科技业": {"净利率": 15.0, "资产周转率": 1.2, "权益乘数": 1.5},  # 高利润低周转
+            "零售业": {"净利率": 3.0, "资产周转率": 3.0, "权益乘数": 2.0},   # 低利润高周转
+            "制造业": {"净利率": 8.0, "资产周转率": 1.8, "权益乘数": 2.5},   # 均衡型
+        },
+    },
+    # 存货周转天数细分行业标准（calculate_inventory_health）
+    "inventory_days": {
+        "default": "制造业",
+        "entries": {
+            "快消品": {"优秀": 30, "良好": 45, "警戒": 60},    # 如食品饮料
+            "耐用品": {"优秀": 60, "良好": 90, "警戒": 120},   # 如家电
+            "奢侈品": {"优秀": 90, "良好": 150, "警戒": 200},  # 如高端服装
+            "制造业": {"优秀": 60, "良好": 90, "警戒": 150},   # 如汽车零部件
+        },
+    },
+    # 行业资本成本率%（calculate_roi_ri，参考2024年Wind行业数据）
+    "cost_of_capital": {
+        "default": "全行业平均",
+        "entries": {
+            "高科技": {"rate": 12.0},   # 高风险行业，资本成本高
+            "制造业": {"rate": 8.0},    # 中等风险
+            "服务业": {"rate": 6.5},    # 低风险
+            "房地产": {"rate": 10.0},   # 政策敏感型，资本成本较高
+            "全行业平均": {"rate": 8.0},
+        },
+    },
+    # 企业类型WACC基准%（calculate_eva_strategic）
+    "wacc": {
+        "default": "其他",
+        "entries": {
+            "国企": {"rate": 5.5},   # 融资成本低（债券利率3-4%）
+            "民企": {"rate": 7.5},   # 融资成本高（债券利率5-6%）
+            "外企": {"rate": 6.5},   # 国际融资渠道多，成本中等
+            "其他": {"rate": 6.5},
+        },
+    },
+}
+
+
+class BenchmarkTable:
+    """单张基准表：行业名称驻留、整数代码、别名；行 dict 只读，数值列按需构建为 numpy 数组并缓存"""
+    __slots__ = ("name", "names", "codes", "default_code", "rows", "_columns")
+
+    def __init__(self, name, entries, default, aliases=None):
+        self.name = name
+        self.names = tuple(sys.intern(key) for key in entries)
+        self.codes = {key: code for code, key in enumerate(self.names)}
+        for alias, target in (aliases or {}).items():
+            if target not in self.codes:
+                raise ValueError(f"⚠️ 基准表 {name} 的别名 {alias} 指向不存在的行业：{target}")
+            self.codes[sys.intern(alias)] = self.codes[target]
+        if default not in self.codes:
+            raise ValueError(f"⚠️ 基准表 {name} 的默认行业不存在：{default}")
+        self.default_code = self.codes[default]
+        self.rows = tuple(MappingProxyType(dict(entries[key])) for key in self.names)
+        self._columns = {}
+
+    def code(self, name):
+        """行业名称/别名 → 整数代码（未知名称返回默认行业代码）"""
+        return self.codes.get(name, self.default_code)
+
+    def row(self, name):
+        """单公司查表：行业名称 → 只读阈值 dict（未知名称回落到默认行业）"""
+        return self.rows[self.codes.get(name, self.default_code)]
+
+    def encode(self, names):
+        """批量编码：行业名称序列 → int16 代码数组"""
+        import numpy as np
+        codes, default = self.codes, self.default_code
+        return np.fromiter((codes.get(name, default) for name in names), dtype=np.int16)
+
+    def column(self, field):
+        """批量查表用的数值列（下标=行业代码），首次调用时构建并缓存"""
+        column = self._columns.get(field)
+        if column is None:
+            import numpy as np
+            column = np.array([row[field] for row in self.rows], dtype=float)
+            column.flags.writeable = False
+            self._columns[field] = column
+        return column
+
+    def lookup(self, codes, field):
+        """按代码数组查数值列（越界代码回落到默认行业）"""
+        import numpy as np
+        codes = np.asarray(codes)
+        known = (codes >= 0) & (codes < len(self.names))
+        return self.column(field)[np.where(known, codes, self.default_code).astype(np.intp)]
+
+
+class BenchmarkRegistry:
+    """一个版本的全部基准表（只读快照；热加载时整体替换，读者不会看到半更新状态）"""
+    __slots__ = ("version", "source", "generation", "tables")
+
+    def __init__(self, tables, version=BUILTIN_VERSION, source=None, generation=0):
+        self.version = version
+        self.source = source
+        self.generation = generation
+        self.tables = tables
+
+    def table(self, name):
+        return self.tables[name]
+
+
+def build_registry(overrides=None, source=None, generation=0):
+    """
+    内置表 + 校准覆盖 → 新注册表
+    :param overrides: 校准文件内容（dict），格式见模块头部说明
+    """
+    overrides = overrides or {}
+    tables = {}
+    override_tables = overrides.get("tables", {})
+    unknown = set(override_tables) - set(BUILTIN_TABLES)
+    if unknown:
+        raise ValueError(f"⚠️ 未知基准表：{', '.join(sorted(unknown))}")
+    for name, builtin in BUILTIN_TABLES.items():
+        override = override_tables.get(name, {})
+        entries = {key: dict(fields) for key, fields in builtin["entries"].items()}
+        for key, fields in override.get("entries", {}).items():
+            entries.setdefault(key, {}).update(fields)
+        missing = [key for key, fields in entries.items() if set(fields) != set(next(iter(builtin["entries"].values())))]
+        if missing:
+            raise ValueError(f"⚠️ 基准表 {name} 的行业字段不完整：{', '.join(missing)}")
+        tables[name] = BenchmarkTable(name, entries, override.get("default", builtin["default"]), override.get("aliases"))
+    return BenchmarkRegistry(tables, overrides.get("version", BUILTIN_VERSION), source, generation)
+
+
+_lock = threading.Lock()
+_registry = None
+_source_mtime = None
+
+
+def load_registry(path=None):
+    """
+    加载并启用注册表（热加载：运行中的服务调用即可生效，无需重启）
+    :param path: 校准JSON文件路径；None 表示只用内置基准
+    :return: 新注册表（generation 每次加载递增）
+    """
+    global _registry, _source_mtime
+    overrides = None
+    mtime = None
+    if path:
+        with open(path, encoding="utf-8") as f:
+            overrides = json.load(f)
+        mtime = os.path.getmtime(path)
+    with _lock:
+        generation = _registry.generation + 1 if _registry is not None else 0
+        registry = build_registry(overrides, path, generation)  # 校验失败时抛错，旧注册表保持不变
+        _registry, _source_mtime = registry, mtime
+    return registry
+
+
+def get_registry():
+    """当前注册表（首次调用时加载：有环境变量 FAT_BENCHMARK_FILE 则读取该文件，否则用内置基准）"""
+    registry = _registry
+    if registry is None:
+        registry = load_registry(os.environ.get(ENV_FILE) or None)
+    return registry
+
+
+def reload_if_changed():
+    """校准文件修改时间变化则重新加载（供常驻服务定期调用），返回是否发生了重新加载"""
+    registry = get_registry()
+    if not registry.source:
+        return False
+    try:
+        mtime = os.path.getmtime(registry.source)
+    except OSError:
+        return False
+    if mtime == _source_mtime:
+        return False
+    load_registry(registry.source)
+    return True
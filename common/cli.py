@@ -0,0 +1,240 @@
+# ==============================================
+# 【统一命令行入口】v1.0
+# 独特性：一个入口调度全部分析工具 + 按需加载（只导入被调用的模块）+ 参数/标准输入JSON两种输入
+# 开发者：Kiwi_hazel
+# 用法：python -m common.cli list
+#       python -m common.cli roce --operating_profit 5000 --capital_employed 30000
+#       echo '{"operating_profit": 5000, "capital_employed": 30000}' | python -m common.cli roce --stdin
+#       （--stdin 读取JSONL：每行一个JSON对象即一家公司，每行输出一条JSON结果；无效行输出错误并继续）
+# ==============================================
+
+import argparse
+import importlib
+import json
+import sys
+
+from common.instrumentation import METRICS
+
+REQUIRED = object()  # 必填参数标记
+
+# 调度表：只登记"模块路径+函数名"字符串，命令行启动时不导入任何分析模块
+# level_field：结果中的等级/象限字段（运行指标按该字段统计分布）
+ANALYZERS = {
+    "current_ratio": {
+        "title": "流动比率",
+        "module": "solvency_analysis.financial_ratio_calculator",
+        "function": "calculate_current_ratio",
+        "result_key": "current_ratio",
+        "params": (("current_assets", float, REQUIRED), ("current_liabilities", float, REQUIRED)),
+        "example": {"current_assets": 1200, "current_liabilities": 500},
+    },
+    "quick_ratio": {
+        "title": "速动比率",
+        "module": "solvency_analysis.financial_ratio_calculator",
+        "function": "calculate_quick_ratio",
+        "result_key": "quick_ratio",
+        "params": (("quick_assets", float, REQUIRED), ("current_liabilities", float, REQUIRED)),
+        "example": {"quick_assets": 800, "current_liabilities": 500},
+    },
+    "cash_ratio": {
+        "title": "现金比率压力测试",
+        "module": "solvency_analysis.cash_ratio_stress_test",
+        "function": "cash_ratio_stress_test",
+        "level_field": "health_quadrant",
+        "params": (("cash_eq", float, REQUIRED), ("short_term_debt", float, REQUIRED),
+                   ("daily_cash_burn", float, REQUIRED), ("industry_type", str, "重资产")),
+        "example": {"cash_eq": 500, "short_term_debt": 1000, "daily_cash_burn": 8, "industry_type": "重资产"},
+    },
+    "interest_coverage": {
+        "title": "利息保障倍数压力测试",
+        "module": "solvency_analysis.interest_coverage_stress",
+        "function": "interest_coverage_stress",
+        "level_field": "risk_level",
+        "params": (("ebit", float, REQUIRED), ("interest_expense", float, REQUIRED),
+                   ("short_term_interest", float, None), ("industry_cycle", str, None)),
+        "example": {"ebit": 500, "interest_expense": 100, "short_term_interest": 60, "industry_cycle": "强周期"},
+    },
+    "roce": {
+        "title": "ROCE资本回报率",
+        "module": "profitability_analysis.roce_calculator",
+        "function": "calculate_roce",
+        "result_key": "roce",
+        "params": (("operating_profit", float, REQUIRED), ("capital_employed", float, REQUIRED)),
+        "example": {"operating_profit": 5000, "capital_employed": 30000},
+    },
+    "capital_structure": {
+        "title": "资本结构校验",
+        "module": "profitability_analysis.roce_calculator",
+        "function": "capital_structure_check",
+        "result_key": "capital_structure",
+        "params": (("capital_employed", float, REQUIRED), ("equity", float, 0.0), ("debt", float, 0.0)),
+        "example": {"capital_employed": 30000, "equity": 20000, "debt": 10000},
+    },
+    "dupont": {
+        "title": "战略型杜邦分析",
+        "module": "profitability_analysis.dupont_analysis_strategic",
+        "function": "analyze_dupont",
+        "level_field": "strategy_type",
+        "params": (("net_profit", float, REQUIRED), ("revenue", float, REQUIRED), ("avg_assets", float, REQUIRED),
+                   ("avg_equity", float, REQUIRED), ("industry", str, "制造业")),
+        "example": {"net_profit": 1200, "revenue": 8000, "avg_assets": 5000, "avg_equity": 3000, "industry": "科技业"},
+    },
+    "inventory": {
+        "title": "存货周转天数",
+        "module": "operation_efficiency.inventory_turnover_days",
+        "function": "calculate_inventory_health",
+        "level_field": "health_score",
+        "params": (("cogs", float, REQUIRED), ("avg_inventory", float, REQUIRED), ("industry_subtype", str, "制造业")),
+        "example": {"cogs": 8000, "avg_inventory": 1000, "industry_subtype": "快消品"},
+    },
+    "roi_ri": {
+        "title": "ROI&RI双指标",
+        "module": "investment_valuation.roi_ri_calculator",
+        "function": "calculate_roi_ri",
+        "params": (("profit", float, REQUIRED), ("investment", float, REQUIRED), ("industry", str, "制造业")),
+        "example": {"profit": 150, "investment": 1000, "industry": "制造业"},
+    },
+    "pe_safety_margin": {
+        "title": "市盈率安全边际",
+        "module": "investment_valuation.pe_valuation_safety_margin",
+        "function": "calculate_pe_safety_margin",
+        "level_field": "margin_status",
+        "params": (("stock_price", float, REQUIRED), ("eps_ttm", float, REQUIRED), ("eps_forecast", float, REQUIRED),
+                   ("industry_pe", float, REQUIRED), ("historical_pe_75th", float, REQUIRED)),
+        "example": {"stock_price": 60, "eps_ttm": 2.5, "eps_forecast": 15, "industry_pe": 25, "historical_pe_75th": 30},
+    },
+    "eva": {
+        "title": "EVA战略价值",
+        "module": "investment_valuation.eva_economic_value_added",
+        "function": "calculate_eva_strategic",
+        "level_field": "value_level",
+        "params": (("nopat", float, REQUIRED), ("capital_employed", float, REQUIRED), ("company_type", str, "民企"),
+                   ("eva_last_year", float, None)),
+        "example": {"nopat": 1200, "capital_employed": 8000, "company_type": "民企", "eva_last_year": 1000},
+    },
+}
+
+# 文字字段 = 各分析工具中类型为 str 的参数（行业/周期/企业类型等），其余参数均为数值
+TEXT_FIELDS = frozenset(param for spec in ANALYZERS.values() for param, cast, _default in spec["params"]
+                        if cast is str)
+INPUT_ERROR = "input_error"  # statement_pipeline.read_records 对无效JSONL行生成的记录字段（值为带行号的错误提示）
+
+
+def load_analyzer(name):
+    """按名称导入分析函数（首次调用才导入对应模块）"""
+    spec = ANALYZERS[name]
+    return getattr(importlib.import_module(spec["module"]), spec["function"])
+
+
+def coerce_params(name, record):
+    """
+    把一条记录（dict，可来自命令行或JSON）转换为分析函数的关键字参数
+    缺少必填参数或类型无法转换时抛出 ValueError
+    """
+    kwargs = {}
+    for param, cast, default in ANALYZERS[name]["params"]:
+        value = record.get(param)
+        if value is None or value == "":
+            if default is REQUIRED:
+                raise ValueError(f"⚠️ 缺少必填参数：{param}")
+            kwargs[param] = default
+            continue
+        try:
+            kwargs[param] = cast(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"⚠️ 参数类型错误：{param}={value!r}") from None
+    return kwargs
+
+
+def normalize_result(name, value):
+    """
+    统一输出为 dict：原本返回 dict 的工具原样返回；
+    返回数值/字符串的工具（如 calculate_roce）包装为 {result_key: 值}，"⚠️"开头的字符串视为错误
+    """
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str) and value.startswith("⚠️"):
+        return {"error": value}
+    return {ANALYZERS[name].get("result_key", "result"): value}
+
+
+def run_analyzer(name, record):
+    """库调用入口：对一条记录运行指定分析工具，返回结果 dict（参数错误也以 {"error": ...} 返回）"""
+    if METRICS.enabled:
+        return METRICS.call(name, "scalar", ANALYZERS[name].get("level_field"), _run_analyzer, name, record)
+    return _run_analyzer(name, record)
+
+
+def _run_analyzer(name, record):
+    """run_analyzer 的计算主体（埋点开启时经 METRICS.call 包装调用）"""
+    try:
+        kwargs = coerce_params(name, record)
+    except ValueError as exc:
+        return {"error": str(exc)}
+    return normalize_result(name, load_analyzer(name)(**kwargs))
+
+
+def iter_jsonl_records(stream):
+    """
+    逐行读取JSONL（严格：每行一个JSON对象，边读边算；标准输入与 statement_pipeline 读文件共用）
+    :return: 生成（记录, 错误提示）；无法解析或不是对象的行记录为 None 并给出提示，不影响后续各行
+    """
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            value = json.loads(line)
+        except json.JSONDecodeError:
+            value = None
+        if isinstance(value, dict):
+            yield value, None
+        else:
+            yield None, f"⚠️ 第{number}行不是有效JSON对象"
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m common.cli", description="财务分析工具包统一命令行入口")
+    subparsers = parser.add_subparsers(dest="analyzer", required=True)
+    subparsers.add_parser("list", help="列出全部分析工具及参数示例")
+    for name, spec in ANALYZERS.items():
+        sub = subparsers.add_parser(name, help=spec["title"])
+        sub.add_argument("--stdin", action="store_true", help="从标准输入读取JSON记录（每行一条）")
+        for param, _cast, default in spec["params"]:
+            hint = "必填" if default is REQUIRED else f"可选，默认{default}"
+            sub.add_argument(f"--{param}", f"--{param.replace('_', '-')}", dest=param, help=hint)
+    return parser
+
+
+def main(argv=None, stdin=None, stdout=None):
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    args = build_parser().parse_args(argv)
+
+    if args.analyzer == "list":
+        for name, spec in ANALYZERS.items():
+            print(f"{name:<18}{spec['title']}  例：{json.dumps(spec['example'], ensure_ascii=False)}", file=stdout)
+        return 0
+
+    if args.stdin:
+        records = iter_jsonl_records(stdin)
+    else:
+        records = [({param: getattr(args, param) for param, _cast, _default in ANALYZERS[args.analyzer]["params"]},
+                    None)]
+
+    exit_code = 0
+    for record, error in records:
+        if error is not None:
+            result = {"error": error}
+        else:
+            try:
+                result = run_analyzer(args.analyzer, record)
+            except (ArithmeticError, ValueError) as exc:  # 单公司函数异常（如周转率取整为0）：输出错误，继续下一条
+                result = {"error": f"⚠️ 计算失败：{exc}"}
+        if "error" in result:
+            exit_code = 1
+        print(json.dumps(result, ensure_ascii=False), file=stdout)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+# ==============================================
+# 【紧凑结果对象】v1.0
+# 独特性：只存数值 + 小整数代码（象限/风险等级/战略类型/价值分级），中文解读按需从共享文字表渲染
+# 开发者：Kiwi_hazel
+# 两种形态：① __slots__ 单行记录（无 __dict__，每行几十字节）
+#           ② ResultBatch 列式批量（numpy 数组 + int8 代码列，百万行级别筛选用）
+# 渲染：record.to_dict() 还原为与原分析函数完全相同的结果 dict
+# ==============================================
+
+import sys
+
+import numpy as np
+
+from common.benchmark_registry import get_registry
+from investment_valuation.eva_economic_value_added import VALUE_LEVELS, calculate_eva_strategic
+from profitability_analysis.dupont_analysis_strategic import STRATEGY_TYPES, analyze_dupont
+from solvency_analysis.cash_ratio_stress_test import (
+    HEALTH_QUADRANTS, STRESS_WINDOW_DAYS, cash_ratio_stress_test)
+from solvency_analysis.interest_coverage_stress import RISK_LEVELS, SHORT_TERM_ALERT_PCT, interest_coverage_stress
+
+TRENDS = ("↑", "→", "↓")  # 杜邦趋势箭头代码
+_NAN = float("nan")
+
+
+def _code_of(table):
+    """文字表 → {标签: 代码} 反查表"""
+    return {label: code for code, (label, _note) in enumerate(table)}
+
+
+_QUADRANT_CODES = _code_of(HEALTH_QUADRANTS)
+_RISK_CODES = _code_of(RISK_LEVELS)
+_STRATEGY_CODES = _code_of(STRATEGY_TYPES)
+_VALUE_CODES = _code_of(VALUE_LEVELS)
+_TREND_CODES = {arrow: code for code, arrow in enumerate(TRENDS)}
+
+
+class ErrorRecord:
+    """数据错误行（错误提示字符串驻留复用，不重复占用内存）"""
+    __slots__ = ("message",)
+
+    def __init__(self, message):
+        self.message = sys.intern(message)
+
+    def to_dict(self):
+        return {"error": self.message}
+
+
+class CashRatioRecord:
+    """现金比率压力测试紧凑结果（stress_shortfall 为 nan 表示60天情景已覆盖）"""
+    __slots__ = ("cash_ratio", "survival_days", "stress_shortfall", "quadrant_code", "industry_type")
+    NUMERIC_FIELDS = ("cash_ratio", "survival_days", "stress_shortfall")
+    CODE_FIELD = "quadrant_code"
+    CATEGORY_FIELD = "industry_type"
+    TEXT_TABLE = HEALTH_QUADRANTS
+
+    def __init__(self, cash_ratio, survival_days, stress_shortfall, quadrant_code, industry_type):
+        self.cash_ratio = cash_ratio
+        self.survival_days = survival_days
+        self.stress_shortfall = stress_shortfall
+        self.quadrant_code = quadrant_code
+        self.industry_type = sys.intern(industry_type)
+
+    @classmethod
+    def from_inputs(cls, cash_eq, short_term_debt, daily_cash_burn, industry_type):
+        result = cash_ratio_stress_test(cash_eq, short_term_debt, daily_cash_burn, industry_type)
+        if "error" in result:
+            return ErrorRecord(result["error"])
+        stress_cash_needed = daily_cash_burn * STRESS_WINDOW_DAYS
+        shortfall = _NAN if cash_eq >= stress_cash_needed else round(stress_cash_needed - cash_eq, 1)
+        return cls(result["cash_ratio"], result["survival_days"], shortfall,
+                   _QUADRANT_CODES[result["health_quadrant"]], industry_type)
+
+    @property
+    def health_quadrant(self):
+        return HEALTH_QUADRANTS[self.quadrant_code][0]
+
+    @property
+    def health_note(self):
+        return HEALTH_QUADRANTS[self.quadrant_code][1]
+
+    def to_dict(self):
+        threshold = get_registry().table("cash_crisis").row(self.industry_type)
+        coverage = "✅ 覆盖" if self.stress_shortfall != self.stress_shortfall else f"❌ 缺口{self.stress_shortfall}万"
+        return {
+            "cash_ratio": self.cash_ratio,
+            "survival_days": self.survival_days,
+            "stress_test": f"{STRESS_WINDOW_DAYS}天无收入压力测试：{coverage}",
+            "health_quadrant": self.health_quadrant,
+            "health_note": self.health_note,
+            "industry_threshold": f"{self.industry_type}安全线：现金比率≥{threshold['ratio']}，储备天数≥{threshold['days']}天",
+        }
+
+
+class InterestCoverageRecord:
+    """利息保障倍数压力测试紧凑结果（short_term_ratio 为 nan 表示未提供短期利息）"""
+    __slots__ = ("normal_coverage", "stress_coverage", "ebit_drop", "short_term_ratio", "risk_code", "industry_cycle")
+    NUMERIC_FIELDS = ("normal_coverage", "stress_coverage", "ebit_drop", "short_term_ratio")
+    CODE_FIELD = "risk_code"
+    CATEGORY_FIELD = "industry_cycle"
+    TEXT_TABLE = RISK_LEVELS
+
+    def __init__(self, normal_coverage, stress_coverage, ebit_drop, short_term_ratio, risk_code, industry_cycle):
+        self.normal_coverage = normal_coverage
+        self.stress_coverage = stress_coverage
+        self.ebit_drop = ebit_drop
+        self.short_term_ratio = short_term_ratio
+        self.risk_code = risk_code
+        self.industry_cycle = sys.intern(industry_cycle)
+
+    @classmethod
+    def from_inputs(cls, ebit, interest_expense, short_term_interest=None, industry_cycle=None):
+        result = interest_coverage_stress(ebit, interest_expense, short_term_interest, industry_cycle)
+        if "error" in result:
+            return ErrorRecord(result["error"])
+        short_term_ratio = round(short_term_interest / interest_expense * 100, 1) if short_term_interest else _NAN
+        return cls(result["normal_coverage"], result["stress_coverage"], result["ebit_drop"], short_term_ratio,
+                   _RISK_CODES[result["risk_level"]], result["industry_cycle"])
+
+    @property
+    def risk_level(self):
+        return RISK_LEVELS[self.risk_code][0]
+
+    @property
+    def risk_note(self):
+        return RISK_LEVELS[self.risk_code][1]
+
+    def to_dict(self):
+        ratio = self.short_term_ratio
+        if ratio != ratio:
+            structure = "（未提供短期利息数据，无法分析结构）"
+        else:
+            structure = f"短期利息占比{ratio}% → {'⚠️ 短期偿债压力大（建议优先偿还）' if ratio > SHORT_TERM_ALERT_PCT else '短期压力可控（结构健康）'}"
+        return {
+            "normal_coverage": self.normal_coverage,
+            "stress_coverage": self.stress_coverage,
+            "ebit_drop": self.ebit_drop,
+            "risk_level": self.risk_level,
+            "risk_note": self.risk_note,
+            "structure_analysis": structure,
+            "industry_cycle": self.industry_cycle,
+        }
+
+
+class DupontRecord:
+    """杜邦分析紧凑结果（trend_code 把三个趋势箭头打包为一个 0~26 的整数）"""
+    __slots__ = ("roe", "net_margin", "asset_turnover", "equity_multiplier", "trend_code", "strategy_code", "industry")
+    NUMERIC_FIELDS = ("roe", "net_margin", "asset_turnover", "equity_multiplier")
+    CODE_FIELD = "strategy_code"
+    EXTRA_CODE_FIELDS = ("trend_code",)
+    CATEGORY_FIELD = "industry"
+    TEXT_TABLE = STRATEGY_TYPES
+
+    def __init__(self, roe, net_margin, asset_turnover, equity_multiplier, trend_code, strategy_code, industry):
+        self.roe = roe
+        self.net_margin = net_margin
+        self.asset_turnover = asset_turnover
+        self.equity_multiplier = equity_multiplier
+        self.trend_code = trend_code
+        self.strategy_code = strategy_code
+        self.industry = sys.intern(industry)
+
+    @classmethod
+    def from_inputs(cls, net_profit, revenue, avg_assets, avg_equity, industry):
+        result = analyze_dupont(net_profit, revenue, avg_assets, avg_equity, industry)
+        if "error" in result:
+            return ErrorRecord(result["error"])
+        radar = result["radar"]
+        arrows = [radar[radar.index(name) + len(name)] for name in ("净利率", "周转率", "杠杆")]
+        trend_code = sum(_TREND_CODES[a] * 3 ** (2 - i) for i, a in enumerate(arrows))
+        factors = list(result["factors"].values())
+        return cls(result["roe"], *factors, trend_code, _STRATEGY_CODES[result["strategy_type"]], industry)
+
+    @property
+    def strategy_type(self):
+        return STRATEGY_TYPES[self.strategy_code][0]
+
+    @property
+    def strategy_note(self):
+        return STRATEGY_TYPES[self.strategy_code][1]
+
+    @property
+    def trends(self):
+        code = self.trend_code
+        return TRENDS[code // 9], TRENDS[code // 3 % 3], TRENDS[code % 3]
+
+    def to_dict(self):
+        margin, turnover, leverage = self.trends
+        return {
+            "roe": self.roe,
+            "factors": {"净利率(%)": self.net_margin, "资产周转率(次)": self.asset_turnover,
+                        "权益乘数(倍)": self.equity_multiplier},
+            "radar": f"驱动因素趋势：净利率{margin} 周转率{turnover} 杠杆{leverage}",
+            "strategy_type": self.strategy_type,
+            "strategy_note": self.strategy_note,
+            "industry": self.industry,
+        }
+
+
+class EvaRecord:
+    """EVA战略价值紧凑结果"""
+    __slots__ = ("eva", "eva_yield", "wacc", "nopat_yield", "value_code", "company_type")
+    NUMERIC_FIELDS = ("eva", "eva_yield", "wacc", "nopat_yield")
+    CODE_FIELD = "value_code"
+    CATEGORY_FIELD = "company_type"
+    TEXT_TABLE = VALUE_LEVELS
+
+    def __init__(self, eva, eva_yield, wacc, nopat_yield, value_code, company_type):
+        self.eva = eva
+        self.eva_yield = eva_yield
+        self.wacc = wacc
+        self.nopat_yield = nopat_yield
+        self.value_code = value_code
+        self.company_type = sys.intern(company_type)
+
+    @classmethod
+    def from_inputs(cls, nopat, capital_employed, company_type, eva_last_year=None):
+        result = calculate_eva_strategic(nopat, capital_employed, company_type, eva_last_year)
+        if "error" in result:
+            return ErrorRecord(result["error"])
+        nopat_yield = round(nopat / capital_employed * 100, 2)
+        return cls(result["eva"], result["eva_yield"], result["wacc"], nopat_yield,
+                   _VALUE_CODES[result["value_level"]], company_type)
+
+    @property
+    def value_level(self):
+        return VALUE_LEVELS[self.value_code][0]
+
+    @property
+    def level_note(self):
+        return VALUE_LEVELS[self.value_code][1]
+
+    def to_dict(self):
+        return {
+            "eva": self.eva,
+            "eva_yield": self.eva_yield,
+            "wacc": self.wacc,
+            "value_level": self.value_level,
+            "level_note": self.level_note,
+            "driver_analysis": f"EVA驱动：{self.nopat_yield}%（NOPAT收益率） - {self.wacc}%（WACC） = {self.eva_yield}%（EVA收益率）",
+            "company_type": self.company_type,
+        }
+
+
+class ResultBatch:
+    """
+    列式（struct-of-arrays）批量结果：数值列 float64、代码列 int8（-1=数据错误）、
+    类别列用字典编码（int16 代码 + 去重名称表），错误提示稀疏存储
+    """
+    __slots__ = ("record_type", "columns", "categories", "errors")
+
+    def __init__(self, record_type, columns, categories, errors=None):
+        self.record_type = record_type
+        self.columns = columns
+        self.categories = categories
+        self.errors = errors or {}
+
+    @classmethod
+    def from_records(cls, record_type, records):
+        """把紧凑记录（含 ErrorRecord）序列转换为列式批量"""
+        records = list(records)
+        n = len(records)
+        code_fields = (record_type.CODE_FIELD,) + getattr(record_type, "EXTRA_CODE_FIELDS", ())
+        columns = {name: np.full(n, np.nan) for name in record_type.NUMERIC_FIELDS}
+        columns.update({name: np.full(n, -1, dtype=np.int8) for name in code_fields})
+        category_codes = np.full(n, -1, dtype=np.int16)
+        categories = {}
+        errors = {}
+        for i, record in enumerate(records):
+            if isinstance(record, ErrorRecord):
+                errors[i] = record.message
+                continue
+            for name in record_type.NUMERIC_FIELDS + code_fields:
+                columns[name][i] = getattr(record, name)
+            category_codes[i] = categories.setdefault(getattr(record, record_type.CATEGORY_FIELD), len(categories))
+        columns[record_type.CATEGORY_FIELD] = category_codes
+        return cls(record_type, columns, tuple(categories), errors)
+
+    @classmethod
+    def from_cash_ratio_batch(cls, batch, industry_code):
+        """
+        直接包装 cash_ratio_stress_batch 的列式输出（不经过逐行记录）
+        :param industry_code: 与批量计算相同的行业代码数组（越界代码归入默认重资产）
+        """
+        table = get_registry().table("cash_crisis")
+        industry_code = np.asarray(industry_code)
+        known = (industry_code >= 0) & (industry_code < len(table.names))
+        valid = batch["valid"]
+        columns = {
+            "cash_ratio": batch["cash_ratio"],
+            "survival_days": batch["survival_days"],
+            "stress_shortfall": np.where(batch["stress_covered"], np.nan, batch["stress_shortfall"]),
+            "quadrant_code": batch["quadrant_code"],
+            "industry_type": np.where(valid, np.where(known, industry_code, table.default_code), -1).astype(np.int16),
+        }
+        message = cash_ratio_stress_test(-1, 0, 0, "")["error"]
+        errors = dict.fromkeys(np.flatnonzero(~valid).tolist(), message)
+        return cls(CashRatioRecord, columns, table.names, errors)
+
+    def __len__(self):
+        return len(self.columns[self.record_type.CODE_FIELD])
+
+    def __getitem__(self, i):
+        """按需物化第 i 行为紧凑记录"""
+        if i in self.errors:
+            return ErrorRecord(self.errors[i])
+        record_type = self.record_type
+        values = {name: self.columns[name][i].item() for name in record_type.__slots__ if name in self.columns}
+        values[record_type.CATEGORY_FIELD] = self.categories[values[record_type.CATEGORY_FIELD]]
+        return record_type(**values)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def labels(self):
+        """代码列 → 中文标签列表（错误行为"数据错误"），仅在展示时调用"""
+        table = self.record_type.TEXT_TABLE
+        return [table[c][0] if c >= 0 else "数据错误" for c in self.columns[self.record_type.CODE_FIELD].tolist()]
+
+    def counts(self):
+        """各代码出现次数（如象限分布），无需渲染任何文字"""
+        codes = self.columns[self.record_type.CODE_FIELD]
+        return np.bincount(codes[codes >= 0], minlength=len(self.record_type.TEXT_TABLE))
+
+    def iter_dicts(self):
+        """逐行惰性渲染为原分析函数格式的结果 dict"""
+        return (record.to_dict() for record in self)
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self.columns.values())
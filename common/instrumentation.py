@@ -0,0 +1,189 @@
+# ==============================================
+# 【运行指标·可选埋点】v1.0
+# 独特性：分析工具调度入口（run_analyzer / run_batch）统一埋点 + Prometheus 文本格式导出
+#         关闭时入口只多一次布尔判断（不计时、不加锁、不分配对象）
+# 开发者：Kiwi_hazel
+# 开启：环境变量 FAT_METRICS=1，或代码中 enable()
+# 指标：调用次数 | 延迟直方图 | 处理行数 | 错误返回次数（{"error": ...}） | 等级/象限分布 | 管道各阶段耗时
+# 导出：render() → Prometheus 文本 | write_textfile("metrics.prom")（node_exporter 文本采集目录）
+#       serve_metrics(9108) → 本地 HTTP 端点 /metrics | 分析服务自带 GET /metrics
+# ==============================================
+
+import os
+import threading
+from bisect import bisect_left
+import time
+
+ENV_ENABLE = "FAT_METRICS"
+PREFIX = "fat"
+# 延迟直方图上界（秒）：覆盖单条微秒级调用到整批秒级调用
+LATENCY_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class Metrics:
+    """
+    进程内指标集合（线程安全：更新与导出共用一把锁；锁只在开启时使用）
+    """
+
+    def __init__(self, enabled=False, buckets=LATENCY_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = {}       # (工具, 路径) → 调用次数
+            self.rows = {}        # (工具, 路径) → 处理行数
+            self.errors = {}      # (工具, 路径) → 错误返回行数
+            self.latency = {}     # (工具, 路径) → [各桶计数..., 超出上界计数, 总秒数, 次数]
+            self.levels = {}      # (工具, 等级) → 行数
+            self.stages = {}      # 阶段 → [总秒数, 次数]
+
+    def record(self, name, path, results, seconds, level_field=None):
+        """
+        记录一次调用
+        :param path: "scalar"（单条 run_analyzer）/ "batch"（run_batch）
+        :param results: 本次调用返回的结果 dict 序列
+        :param level_field: 结果中的等级字段名（None 表示该工具无等级）
+        """
+        key = (name, path)
+        bucket = bisect_left(self.buckets, seconds)  # 第一个 ≥ seconds 的上界；超出全部上界时只计入 +Inf
+        with self._lock:
+            self.calls[key] = self.calls.get(key, 0) + 1
+            self.rows[key] = self.rows.get(key, 0) + len(results)
+            histogram = self.latency.get(key)
+            if histogram is None:
+                histogram = self.latency[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            histogram[bucket] += 1
+            histogram[-2] += seconds
+            histogram[-1] += 1
+            errors = self.errors.get(key, 0)
+            levels = self.levels
+            for result in results:
+                if "error" in result:
+                    errors += 1
+                elif level_field is not None:
+                    level_key = (name, result.get(level_field))
+                    levels[level_key] = levels.get(level_key, 0) + 1
+            self.errors[key] = errors
+
+    def call(self, name, path, level_field, function, *args):
+        """计时调用 function(*args) 并记录；function 抛出异常时记为一次错误后原样抛出"""
+        start = time.perf_counter()
+        try:
+            result = function(*args)
+        except Exception:
+            self.record(name, path, ({"error": None},), time.perf_counter() - start)
+            raise
+        self.record(name, path, result if path == "batch" else (result,), time.perf_counter() - start, level_field)
+        return result
+
+    def record_stage(self, stage, seconds):
+        """记录一个处理阶段的耗时（如管道的 read / analyze / write）"""
+        with self._lock:
+            total = self.stages.setdefault(stage, [0.0, 0])
+            total[0] += seconds
+            total[1] += 1
+
+    def render(self):
+        """导出为 Prometheus 文本格式（0.0.4）"""
+        with self._lock:
+            lines = []
+
+            def family(name, kind, help_text, samples):
+                lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+                lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+                lines.extend(f"{PREFIX}_{sample}" for sample in samples)
+
+            def series(metric, table):
+                return [f"{metric}{_labels(analyzer=name, path=path)} {value}"
+                        for (name, path), value in sorted(table.items())]
+
+            family("analyzer_calls_total", "counter", "Analyzer entry-point calls", series("analyzer_calls_total", self.calls))
+            family("analyzer_rows_total", "counter", "Records processed", series("analyzer_rows_total", self.rows))
+            family("analyzer_errors_total", "counter", "Records that returned an error result",
+                   series("analyzer_errors_total", self.errors))
+            histogram_lines = []
+            for (name, path), histogram in sorted(self.latency.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram):
+                    cumulative += count
+                    histogram_lines.append(f"analyzer_latency_seconds_bucket"
+                                           f"{_labels(analyzer=name, path=path, le=repr(bound))} {cumulative}")
+                histogram_lines.append(f"analyzer_latency_seconds_bucket{_labels(analyzer=name, path=path, le='+Inf')} "
+                                       f"{histogram[-1]}")
+                histogram_lines.append(f"analyzer_latency_seconds_sum{_labels(analyzer=name, path=path)} {histogram[-2]!r}")
+                histogram_lines.append(f"analyzer_latency_seconds_count{_labels(analyzer=name, path=path)} {histogram[-1]}")
+            family("analyzer_latency_seconds", "histogram", "Latency per entry-point call", histogram_lines)
+            family("analyzer_level_total", "counter", "Result distribution by level/quadrant",
+                   [f"analyzer_level_total{_labels(analyzer=name, level=level)} {count}"
+                    for (name, level), count in sorted(self.levels.items(), key=lambda item: (item[0][0], str(item[0][1])))])
+            family("stage_seconds_total", "counter", "Seconds spent per processing stage",
+                   [f"stage_seconds_total{_labels(stage=stage)} {total[0]!r}" for stage, total in sorted(self.stages.items())])
+            family("stage_runs_total", "counter", "Processing stage executions",
+                   [f"stage_runs_total{_labels(stage=stage)} {total[1]}" for stage, total in sorted(self.stages.items())])
+            return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """原子写出到文件（先写临时文件再改名，采集方不会读到半个文件）"""
+        tmp = f"{path}.tmp.{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+
+# 全局指标集合：调度入口读取 METRICS.enabled 决定是否埋点
+METRICS = Metrics(enabled=os.environ.get(ENV_ENABLE, "").lower() in ("1", "true", "yes", "on"))
+
+
+def enable():
+    METRICS.enabled = True
+
+
+def disable():
+    METRICS.enabled = False
+
+
+def render():
+    return METRICS.render()
+
+
+def write_textfile(path):
+    METRICS.write_textfile(path)
+
+
+def serve_metrics(port=9108, host="127.0.0.1"):
+    """
+    后台线程启动本地指标端点（GET /metrics），返回 server（server.shutdown() 停止）
+    :param port: 0 表示由系统分配空闲端口（实际端口见 server.server_address）
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # 只在需要端点时导入，不拖慢命令行启动
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0].rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = METRICS.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass  # 采集请求不写访问日志
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,39 @@
+# ==============================================
+# 【向量化数值工具】
+# 功能：批量计算时复现标量版本的 round() 结果，保证批量/逐行结果逐行一致
+# 开发者：Kiwi_hazel
+# ==============================================
+
+import numpy as np
+
+
+def py_round(values, ndigits):
+    """
+    与 Python 内置 round(x, ndigits) 逐元素一致的向量化取整
+    np.round 先乘10^n再取整，在"恰好.5"附近可能与 round() 差一位；
+    仅对这些临界元素回退到 round()，其余元素保持纯向量化
+    :param values: 数值数组（可含 inf/nan，原样保留）
+    :param ndigits: 保留小数位数
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.round(values, ndigits)
+    with np.errstate(invalid="ignore", over="ignore"):
+        scaled = values * (10.0 ** ndigits)
+        frac = np.abs(scaled - np.trunc(scaled))
+        tolerance = 1e-9 + 1e-12 * np.abs(scaled)
+        suspect = np.isfinite(scaled) & (np.abs(frac - 0.5) <= tolerance)
+    if suspect.any():
+        idx = np.flatnonzero(suspect)
+        out.flat[idx] = [round(float(v), ndigits) for v in values.flat[idx]]
+    return out
+
+
+def safe_divide(numerator, denominator, zero_value=np.inf):
+    """
+    向量化除法：分母为0时返回 zero_value（对应标量版本的 `... if x != 0 else float('inf')`）
+    """
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    out = np.full(np.broadcast(numerator, denominator).shape, zero_value, dtype=float)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
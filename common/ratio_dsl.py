@@ -0,0 +1,464 @@
+# ==============================================
+# 【比率定义语言】v1.0
+# 独特性：新比率 = 一个定义 dict（分子/分母表达式 + 校验规则 + 分档阈值），不再手写单公司函数
+#         每个定义只编译一次为列式向量化内核（编译结果按定义内容缓存），分析师新增比率不牺牲批量速度
+# 开发者：Kiwi_hazel
+# 公式：比率 = round(分子 / 分母 × scale, digits)；分母为0 → on_zero（默认 inf，同单公司版本）
+#       校验：rules 按顺序检查，第一条不成立的规则下标 → error_code（-1=通过），该行比率为 nan
+#       分档：bands 按顺序匹配第一个成立的条件 → band_code（最后一档条件为 None，即"其余"）
+# 表达式：列名、其他比率名（自动按依赖顺序先算，取整后的值）、数字、+ - * /、比较、and/or/not、
+#         abs()/min()/max()、bench("基准表", "字段", 行业列)（查注册表，行业列可为名称或代码）；分档条件中 value=本比率
+# 用法：compute_ratios(["roce", "inventory_days"], {"operating_profit": [...], "capital_employed": [...], ...})
+#       register_ratio("debt_to_equity", {"numerator": "total_debt", "denominator": "equity", "digits": 2})
+# ==============================================
+
+import ast
+from functools import lru_cache
+
+import numpy as np
+
+from common.benchmark_registry import get_registry
+from common.numeric import py_round, safe_divide
+from operation_efficiency.inventory_turnover_days import HEALTH_GRADES, INVENTORY_INPUT_ERROR
+from profitability_analysis.dupont_analysis_strategic import DUPONT_INPUT_ERROR
+from profitability_analysis.roce_calculator import ROCE_INPUT_ERRORS, ROCE_LEVELS
+from solvency_analysis.cash_ratio_stress_test import CASH_INPUT_ERROR, HEALTH_QUADRANTS
+from solvency_analysis.financial_ratio_calculator import (CURRENT_RATIO_ADVICE, CURRENT_RATIO_BANDS, QUICK_RATIO_ADVICE,
+                                                         QUICK_RATIO_BANDS, RATIO_INPUT_ERROR)
+
+DEFINITION_KEYS = ("title", "numerator", "denominator", "scale", "digits", "on_zero", "rules", "bands")
+FUNCTIONS = {"abs": (1, "np.abs"), "min": (2, "np.minimum"), "max": (2, "np.maximum")}
+_BIN_OPS = {ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/"}
+_COMPARE_OPS = {ast.Gt: ">", ast.GtE: ">=", ast.Lt: "<", ast.LtE: "<=", ast.Eq: "==", ast.NotEq: "!="}
+
+
+def _advice_bands(bands, advice):
+    """流动/速动比率分档：阈值与建议文字都取自 financial_ratio_calculator，与单公司版本同一份定义"""
+    high, low = bands
+    return ((f"value > {high!r}", advice[0]), (f"value < {low!r}", advice[1]), (None, advice[2]))
+
+
+def _trend_bands(field):
+    """杜邦三因素与行业基准对比（↑高于10% / ↓低于10% / → 持平），口径同 analyze_dupont"""
+    return ((f"value > bench('dupont', '{field}', industry) * 1.1", "↑"),
+            (f"value < bench('dupont', '{field}', industry) * 0.9", "↓"),
+            (None, "→"))
+
+
+_DUPONT_RULES = (("net_profit > 0 and revenue > 0 and avg_assets > 0 and avg_equity > 0", DUPONT_INPUT_ERROR),)
+_INVENTORY_RULES = (("cogs > 0 and avg_inventory > 0", INVENTORY_INPUT_ERROR),)
+
+# 内置比率定义（口径与单公司函数逐行一致）；新增比率用 register_ratio，不要直接改这张表
+RATIOS = {
+    "current_ratio": {
+        "title": "流动比率",
+        "numerator": "current_assets",
+        "denominator": "current_liabilities",
+        "digits": 2,
+        "rules": (("current_liabilities > 0 and current_assets >= 0", RATIO_INPUT_ERROR),),
+        "bands": _advice_bands(CURRENT_RATIO_BANDS, CURRENT_RATIO_ADVICE),
+    },
+    "quick_ratio": {
+        "title": "速动比率",
+        "numerator": "quick_assets",
+        "denominator": "current_liabilities",
+        "digits": 2,
+        "rules": (("current_liabilities > 0 and quick_assets >= 0", RATIO_INPUT_ERROR),),
+        "bands": _advice_bands(QUICK_RATIO_BANDS, QUICK_RATIO_ADVICE),
+    },
+    "survival_days": {
+        "title": "现金储备天数",
+        "numerator": "cash_eq",
+        "denominator": "daily_cash_burn",
+        "digits": 1,
+        "rules": (("cash_eq >= 0 and short_term_debt >= 0 and daily_cash_burn >= 0", CASH_INPUT_ERROR),),
+    },
+    "cash_ratio": {
+        "title": "现金比率",
+        "numerator": "cash_eq",
+        "denominator": "short_term_debt",
+        "digits": 2,
+        "rules": (("cash_eq >= 0 and short_term_debt >= 0 and daily_cash_burn >= 0", CASH_INPUT_ERROR),),
+        "bands": (
+            ("value >= bench('cash_crisis', 'ratio', industry_type) * 1.5"
+             " and survival_days >= bench('cash_crisis', 'days', industry_type) * 1.5", HEALTH_QUADRANTS[0][0]),
+            ("value >= bench('cash_crisis', 'ratio', industry_type)"
+             " and survival_days >= bench('cash_crisis', 'days', industry_type)", HEALTH_QUADRANTS[1][0]),
+            ("value > 0 and survival_days > 0", HEALTH_QUADRANTS[2][0]),
+            (None, HEALTH_QUADRANTS[3][0]),
+        ),
+    },
+    "roce": {
+        "title": "ROCE资本回报率(%)",
+        "numerator": "operating_profit",
+        "denominator": "capital_employed",
+        "scale": 100,
+        "digits": 2,
+        "rules": (("operating_profit > 0", ROCE_INPUT_ERRORS[0]), ("capital_employed > 0", ROCE_INPUT_ERRORS[1]),
+                  ("capital_employed >= operating_profit", ROCE_INPUT_ERRORS[2])),
+        "bands": (("value > bench('roce', 'median', industry) * 1.2", ROCE_LEVELS[0]),
+                  ("value >= bench('roce', 'median', industry)", ROCE_LEVELS[1]),
+                  ("value > bench('roce', 'median', industry) * 0.8", ROCE_LEVELS[2]),
+                  (None, ROCE_LEVELS[3])),
+    },
+    "net_margin": {
+        "title": "净利率(%)",
+        "numerator": "net_profit",
+        "denominator": "revenue",
+        "scale": 100,
+        "digits": 2,
+        "rules": _DUPONT_RULES,
+        "bands": _trend_bands("净利率"),
+    },
+    "asset_turnover": {
+        "title": "资产周转率(次)",
+        "numerator": "revenue",
+        "denominator": "avg_assets",
+        "digits": 2,
+        "rules": _DUPONT_RULES,
+        "bands": _trend_bands("资产周转率"),
+    },
+    "equity_multiplier": {
+        "title": "权益乘数(倍)",
+        "numerator": "avg_assets",
+        "denominator": "avg_equity",
+        "digits": 2,
+        "rules": _DUPONT_RULES,
+        "bands": _trend_bands("权益乘数"),
+    },
+    "roe": {
+        "title": "ROE净资产收益率(%)",  # 由取整后的三因素合成，同 analyze_dupont
+        "numerator": "net_margin * asset_turnover * equity_multiplier",
+        "denominator": "100",
+        "digits": 2,
+        "rules": _DUPONT_RULES,
+    },
+    "inventory_turnover": {
+        "title": "存货周转率(次/年)",
+        "numerator": "cogs",
+        "denominator": "avg_inventory",
+        "digits": 2,
+        "rules": _INVENTORY_RULES,
+    },
+    "inventory_days": {
+        "title": "存货周转天数",
+        "numerator": "365",
+        "denominator": "inventory_turnover",
+        "digits": 1,
+        "rules": _INVENTORY_RULES,
+        "bands": (("value <= bench('inventory_days', '优秀', industry_subtype)", HEALTH_GRADES[0][0]),
+                  ("value <= bench('inventory_days', '良好', industry_subtype)", HEALTH_GRADES[1][0]),
+                  ("value <= bench('inventory_days', '警戒', industry_subtype)", HEALTH_GRADES[2][0]),
+                  (None, HEALTH_GRADES[3][0])),
+    },
+}
+
+
+class _Translator:
+    """表达式 AST → NumPy 源码（白名单语法），同时收集引用的列名/比率名/行业列"""
+
+    def __init__(self, ratio_names, allow_value):
+        self.ratio_names = ratio_names
+        self.allow_value = allow_value
+        self.columns = []
+        self.depends = []
+        self.key_columns = []
+
+    def translate(self, expression):
+        try:
+            tree = ast.parse(str(expression).strip(), mode="eval")
+        except SyntaxError as exc:
+            raise ValueError(f"⚠️ 表达式语法错误：{expression}（{exc.msg}）") from None
+        return self._emit(tree.body, expression)
+
+    def _name(self, name, expression):
+        if name == "value":
+            if not self.allow_value:
+                raise ValueError(f"⚠️ value 只能用于分档条件：{expression}")
+            return "v"
+        if name in self.ratio_names:
+            if name not in self.depends:
+                self.depends.append(name)
+            return f"r[{name!r}]"
+        if name not in self.columns:
+            self.columns.append(name)
+        return f"c.values({name!r})"
+
+    def _emit(self, node, expression):
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            return repr(node.value)
+        if isinstance(node, ast.Name):
+            return self._name(node.id, expression)
+        if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+            left, right = self._emit(node.left, expression), self._emit(node.right, expression)
+            return f"({left} {_BIN_OPS[type(node.op)]} {right})"
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            return f"({'-' if isinstance(node.op, ast.USub) else '+'}{self._emit(node.operand, expression)})"
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return f"np.logical_not({self._emit(node.operand, expression)})"
+        if isinstance(node, ast.BoolOp):
+            function = "np.logical_and" if isinstance(node.op, ast.And) else "np.logical_or"
+            source = self._emit(node.values[0], expression)
+            for value in node.values[1:]:
+                source = f"{function}({source}, {self._emit(value, expression)})"
+            return source
+        if isinstance(node, ast.Compare) and all(type(op) in _COMPARE_OPS for op in node.ops):
+            # 链式比较 a < b < c → (a < b) & (b < c)
+            operands = [self._emit(n, expression) for n in (node.left, *node.comparators)]
+            parts = [f"({a} {_COMPARE_OPS[type(op)]} {b})" for a, op, b in zip(operands, node.ops, operands[1:])]
+            source = parts[0]
+            for part in parts[1:]:
+                source = f"np.logical_and({source}, {part})"
+            return source
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+            return self._call(node, expression)
+        raise ValueError(f"⚠️ 表达式不支持的语法：{ast.unparse(node)}（{expression}）")
+
+    def _call(self, node, expression):
+        name, args = node.func.id, node.args
+        if name == "bench":
+            if (len(args) != 3 or not all(isinstance(a, ast.Constant) and isinstance(a.value, str) for a in args[:2])
+                    or not isinstance(args[2], ast.Name)):
+                raise ValueError(f"⚠️ bench 用法：bench('基准表', '字段', 行业列)（{expression}）")
+            table, field, key = args[0].value, args[1].value, args[2].id
+            if key not in self.key_columns:
+                self.key_columns.append(key)
+            return f"c.bench({table!r}, {field!r}, {key!r})"
+        if name in FUNCTIONS and len(args) == FUNCTIONS[name][0]:
+            return f"{FUNCTIONS[name][1]}({', '.join(self._emit(a, expression) for a in args)})"
+        raise ValueError(f"⚠️ 表达式不支持的函数：{name}（可用：bench/abs/min/max）")
+
+
+class _Frame:
+    """一批记录的输入列：数值列按需转为 float 数组、行业列按需编码，同一批内跨比率复用"""
+    __slots__ = ("columns", "rows", "_values", "_codes")
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.rows = len(next(iter(columns.values()))) if columns else 0
+        self._values = {}
+        self._codes = {}
+
+    def values(self, name):
+        column = self._values.get(name)
+        if column is None:
+            column = self._values[name] = np.asarray(self.columns[name], dtype=float)
+        return column
+
+    def bench(self, table_name, field, key):
+        table = get_registry().table(table_name)
+        codes = self._codes.get((table_name, key))
+        if codes is None:
+            raw = np.asarray(self.columns[key])
+            codes = raw if raw.dtype.kind in "iu" else table.encode(raw.tolist())
+            self._codes[(table_name, key)] = codes
+        return table.lookup(codes, field)
+
+
+def _lambda(source):
+    return eval(f"lambda c, r, v: {source}", {"__builtins__": {}, "np": np})
+
+
+def _full(values, rows, dtype):
+    """常量表达式（如分母 "100"）广播为整列"""
+    return np.broadcast_to(np.asarray(values, dtype=dtype), (rows,))
+
+
+class RatioKernel:
+    """一个比率定义编译后的向量化内核（只读，可跨批次/线程复用）"""
+    __slots__ = ("name", "title", "columns", "key_columns", "depends", "scale", "digits", "on_zero",
+                 "messages", "labels", "_numerator", "_denominator", "_rules", "_bands")
+
+    def __init__(self, name, definition, ratio_names):
+        unknown = set(definition) - set(DEFINITION_KEYS)
+        if unknown:
+            raise ValueError(f"⚠️ 比率 {name} 的定义含未知字段：{sorted(unknown)}（可用：{DEFINITION_KEYS}）")
+        if "numerator" not in definition or "denominator" not in definition:
+            raise ValueError(f"⚠️ 比率 {name} 缺少 numerator/denominator 表达式")
+        bands = tuple(definition.get("bands", ()))
+        if bands and (bands[-1][0] is not None or any(cond is None for cond, _label in bands[:-1])):
+            raise ValueError(f"⚠️ 比率 {name} 的分档最后一档条件须为 None（其余），且只能有这一档")
+
+        translator = _Translator(ratio_names - {name}, allow_value=False)
+        self._numerator = _lambda(translator.translate(definition["numerator"]))
+        self._denominator = _lambda(translator.translate(definition["denominator"]))
+        rules = tuple(definition.get("rules", ()))
+        self._rules = tuple(_lambda(translator.translate(cond)) for cond, _message in rules)
+        translator.allow_value = True
+        self._bands = tuple(_lambda(translator.translate(cond)) for cond, _label in bands[:-1])
+
+        self.name = name
+        self.title = definition.get("title", name)
+        self.columns = tuple(translator.columns)
+        self.key_columns = tuple(translator.key_columns)
+        self.depends = tuple(translator.depends)
+        self.scale = definition.get("scale", 1)
+        self.digits = definition.get("digits")
+        self.on_zero = definition.get("on_zero", np.inf)
+        self.messages = tuple(message for _cond, message in rules)
+        self.labels = tuple(label for _cond, label in bands)
+
+    def __call__(self, frame, ratios):
+        """
+        :param frame: 输入列（_Frame）
+        :param ratios: 依赖比率的值 {比率名: 数组}
+        :return: value / error_code（int8，-1=通过）/ band_code（int8，无分档或错误行为-1）/ valid
+        """
+        rows = frame.rows
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            error_code = np.full(rows, -1, dtype=np.int8)
+            for code in range(len(self._rules) - 1, -1, -1):  # 倒序覆盖 → 保留第一条不成立的规则
+                error_code[~_full(self._rules[code](frame, ratios, None), rows, bool)] = code
+            valid = error_code < 0
+
+            value = safe_divide(_full(self._numerator(frame, ratios, None), rows, float),
+                                _full(self._denominator(frame, ratios, None), rows, float), self.on_zero)
+            if self.scale != 1:
+                value = value * self.scale
+            if self.digits is not None:
+                value = py_round(value, self.digits)
+            value[~valid] = np.nan
+
+            band_code = np.full(rows, -1, dtype=np.int8)
+            if self.labels:
+                conditions = [_full(band(frame, ratios, value), rows, bool) for band in self._bands]
+                band_code = np.select(conditions, range(len(conditions)), default=len(conditions)).astype(np.int8)
+                band_code[~valid] = -1
+        return {"value": value, "error_code": error_code, "band_code": band_code, "valid": valid}
+
+
+def _freeze(value):
+    """定义 dict → 可哈希的嵌套元组（编译缓存的键）"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(frozen):
+    return {key: item for key, item in frozen}
+
+
+@lru_cache(maxsize=256)
+def _compile(name, frozen, ratio_names):
+    return RatioKernel(name, _thaw(frozen), ratio_names)
+
+
+def compile_ratio(name, definition=None):
+    """
+    比率定义 → 向量化内核（相同定义只编译一次；定义内容变化时自动重新编译）
+    :param definition: 省略时取 RATIOS[name]
+    """
+    if definition is None:
+        if name not in RATIOS:
+            raise ValueError(f"⚠️ 未定义的比率：{name}（可用：{'/'.join(RATIOS)}）")
+        definition = RATIOS[name]
+    return _compile(name, _freeze(definition), frozenset(RATIOS))
+
+
+def kernel_cache_info():
+    """编译缓存命中情况（hits/misses/currsize）"""
+    return _compile.cache_info()
+
+
+def register_ratio(name, definition):
+    """
+    分析师新增/覆盖比率定义：先编译校验（语法、字段、依赖），通过后才写入 RATIOS
+    :return: 编译好的内核
+    """
+    kernel = _compile(name, _freeze(definition), frozenset(RATIOS) | {name})
+    missing = [dep for dep in kernel.depends if dep not in RATIOS]
+    if missing:
+        raise ValueError(f"⚠️ 比率 {name} 依赖未定义的比率：{missing}")
+    candidate = dict(RATIOS, **{name: dict(definition)})
+    _evaluation_order(name, ratios=candidate)  # 在候选定义表上检查循环依赖，被拒绝的定义不会留在 RATIOS
+    RATIOS[name] = candidate[name]
+    return kernel
+
+
+def _evaluation_order(*names, ratios=None):
+    """
+    按依赖关系排序（依赖在前），检测循环依赖
+    :param ratios: 候选定义表（注册前校验用），省略时取 RATIOS
+    """
+    order, state = [], {}
+
+    def visit(name, path):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"⚠️ 比率循环依赖：{' → '.join(path + (name,))}")
+        state[name] = "visiting"
+        if ratios is None:
+            kernel = compile_ratio(name)
+        else:
+            kernel = _compile(name, _freeze(ratios[name]), frozenset(ratios))
+        for dep in kernel.depends:
+            visit(dep, path + (name,))
+        state[name] = "done"
+        order.append(name)
+
+    for name in names:
+        visit(name, ())
+    return order
+
+
+def compute_ratios(names, columns):
+    """
+    核心功能：批量计算一组比率（依赖比率自动先算且只算一次）
+    :param names: 比率名列表（见 RATIOS）
+    :param columns: 输入列 {列名: 序列/数组}，行业列可为名称或注册表代码
+    :return: {比率名: {"value", "error_code", "band_code", "valid"}}（只含请求的比率）
+    """
+    names = [names] if isinstance(names, str) else list(names)
+    order = _evaluation_order(*names)
+    kernels = [compile_ratio(name) for name in order]
+    missing = sorted({col for k in kernels for col in k.columns + k.key_columns if col not in columns})
+    if missing:
+        raise ValueError(f"⚠️ 比率 {'/'.join(names)} 缺少输入列：{missing}")
+    frame = _Frame(columns)
+    results = {}
+    for kernel in kernels:
+        results[kernel.name] = kernel(frame, {dep: results[dep]["value"] for dep in kernel.depends})
+    return {name: results[name] for name in names}
+
+
+def band_labels(name, band_code):
+    """分档代码数组 → 分档文字列表（错误行/无分档为 None）"""
+    labels = compile_ratio(name).labels
+    return [labels[c] if c >= 0 else None for c in np.asarray(band_code).tolist()]
+
+
+def error_messages(name, error_code, columns):
+    """错误代码数组 → 校验提示列表（模板中的 {列名} 用该行原始输入填充，与单公司版本逐字一致；通过行为 None）"""
+    messages = compile_ratio(name).messages
+    error_code = np.asarray(error_code)
+    out = [None] * len(error_code)
+    for i in np.flatnonzero(error_code >= 0).tolist():
+        row = {key: (value[i].item() if hasattr(value[i], "item") else value[i]) for key, value in columns.items()}
+        out[i] = messages[error_code[i]].format(**row)
+    return out
+
+
+# ----------------------
+# 极简演示（3家公司 × 全部内置比率）
+# ----------------------
+if __name__ == "__main__":
+    demo = {
+        "current_assets": [1200, 800, 3000], "quick_assets": [800, 300, 2600], "current_liabilities": [500, 700, 0],
+        "cash_eq": [500, 60, 900], "short_term_debt": [1000, 400, 300], "daily_cash_burn": [8, 5, 0],
+        "industry_type": ["重资产", "轻资产", "金融"],
+        "operating_profit": [5000, 800, -10], "capital_employed": [30000, 3000, 2000], "industry": ["制造业"] * 3,
+        "net_profit": [1200, 300, 50], "revenue": [8000, 9000, 400], "avg_assets": [5000, 2500, 900],
+        "avg_equity": [3000, 1000, 600], "cogs": [8000, 1200, 500], "avg_inventory": [1000, 600, 0],
+        "industry_subtype": ["快消品", "耐用品", "制造业"],
+    }
+    print("\n===== 🧮 比率定义语言演示（3家公司） =====")
+    for ratio, result in compute_ratios(list(RATIOS), demo).items():
+        labels = band_labels(ratio, result["band_code"])
+        errors = error_messages(ratio, result["error_code"], demo)
+        cells = [error or (f"{value}（{label}）" if label else f"{value}")
+                 for value, label, error in zip(result["value"].tolist(), labels, errors)]
+        print(f"{compile_ratio(ratio).title}：" + " | ".join(cells))
+    print(f"\n编译缓存：{kernel_cache_info()}")
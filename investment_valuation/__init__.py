@@ -0,0 +1 @@
+# 投资估值分析工具（ROI&RI、市盈率安全边际、EVA）
@@ -0,0 +1,213 @@
+# ==============================================
+# 【资本预算·项目组合优选器】v1.0
+# 独特性：数千个候选项目批量计算ROI/RI + 批量标记双指标矛盾 → 在总预算与行业上限下选出RI总和最大的组合
+#         小规模：分支定界精确求解；大规模：密度贪心 + 线性松弛上界，给出可证明的最大误差
+# 开发者：Kiwi_hazel
+# 公式：ROI/RI/资本成本率/联动分析口径同 roi_ri_calculator.py
+#       max Σ RI_i·x_i  s.t. Σ 投资额_i·x_i ≤ 总预算，Σ_{行业g} 投资额_i·x_i ≤ 行业上限_g，x_i ∈ {0,1}
+#       上界 = 按 RI/投资额 从高到低的分数贪心（预算+行业上限为嵌套约束，分数贪心即线性松弛最优解）
+# 用法：select_portfolio(项目收益[项目], 投资额[项目], 行业代码[项目], 总预算, 行业上限={"高科技": 5000})
+# ==============================================
+
+import numpy as np
+
+from common.benchmark_registry import BUILTIN_TABLES, get_registry
+from common.numeric import py_round
+from investment_valuation.roi_ri_calculator import ANALYSIS_NOTES
+
+# 行业代码 = 基准注册表 "cost_of_capital" 表的行号；未知行业按"全行业平均"处理
+INDUSTRY_NAMES = tuple(BUILTIN_TABLES["cost_of_capital"]["entries"])
+ANALYSIS_ERROR = -1
+CONTRADICTION_CODES = (1, 2)  # ROI达标但RI为负 / ROI未达标但RI为正
+
+EXACT_MAX_PROJECTS = 40  # 候选项目（RI>0 且放得下）不超过该数量时用分支定界精确求解
+EXACT_NODE_LIMIT = 200_000  # 分支定界节点上限，超过则返回当前最优解并给出误差上界
+_TOLERANCE = 1e-9
+
+
+def encode_industries(industries):
+    """行业名称数组 → 行业代码数组（未知行业按全行业平均，支持注册表别名）"""
+    return get_registry().table("cost_of_capital").encode(industries)
+
+
+def score_projects(profit, investment, industry_code):
+    """
+    核心功能：批量计算ROI/RI与联动分析代码（结果与 calculate_roi_ri 逐行一致）
+    :param profit: 项目年收益 [项目]（万元）
+    :param investment: 投资额 [项目]（万元）
+    :param industry_code: 行业代码 [项目]（见 encode_industries）
+    :return: 列式结果；数据错误（收益或投资额≤0）的行 valid=False、数值为 nan、analysis_code=-1
+    """
+    profit = np.asarray(profit, dtype=float)
+    investment = np.asarray(investment, dtype=float)
+    cost_of_capital = get_registry().table("cost_of_capital").lookup(industry_code, "rate")
+    valid = (profit > 0) & (investment > 0)
+    safe_investment = np.where(valid, investment, 1.0)
+
+    roi = py_round((profit / safe_investment) * 100, 2)
+    ri = py_round(profit - (investment * cost_of_capital / 100), 2)
+    roi_ok = roi > cost_of_capital
+    analysis_code = np.select([roi_ok & (ri > 0), roi_ok, ri > 0], [0, 1, 2], default=3).astype(np.int8)
+
+    roi[~valid] = np.nan
+    ri[~valid] = np.nan
+    analysis_code[~valid] = ANALYSIS_ERROR
+    return {
+        "roi": roi,
+        "ri": ri,
+        "cost_of_capital": cost_of_capital,
+        "analysis_code": analysis_code,
+        "contradiction": np.isin(analysis_code, CONTRADICTION_CODES),  # 双指标矛盾，需人工复核
+        "valid": valid,
+    }
+
+
+def analysis_notes(analysis_code):
+    """联动分析代码数组 → 结论文字列表（错误行为 None）"""
+    return [ANALYSIS_NOTES[c] if c >= 0 else None for c in np.asarray(analysis_code).tolist()]
+
+
+def _fractional_bound(order, weight, value, group, remaining, caps, start=0):
+    """
+    从 order[start:] 开始的分数贪心：预算与行业上限的剩余额度内按密度装入，最后一件可部分装入
+    :return: 可增加的 RI 上界
+    """
+    caps = caps.copy()
+    bound = 0.0
+    for i in order[start:]:
+        take = min(weight[i], remaining, caps[group[i]])
+        if take <= 0:
+            continue
+        bound += value[i] * take / weight[i]
+        remaining -= take
+        caps[group[i]] -= take
+        if remaining <= 0:
+            break
+    return bound
+
+
+def _greedy_fill(order, weight, group, budget, caps):
+    """按密度从高到低整件装入，放不下的跳过（继续尝试更小的项目）"""
+    chosen = np.zeros(len(weight), dtype=bool)
+    caps = caps.copy()
+    remaining = budget
+    for i, w, g in zip(order.tolist(), weight[order].tolist(), group[order].tolist()):
+        if w <= remaining + _TOLERANCE and w <= caps[g] + _TOLERANCE:
+            chosen[i] = True
+            remaining -= w
+            caps[g] -= w
+    return chosen
+
+
+def _branch_and_bound(order, weight, value, group, budget, caps, incumbent):
+    """
+    深度优先分支定界（先尝试选入，再尝试不选），上界用分数贪心；显式栈，不受递归深度限制
+    :param incumbent: 初始可行解（贪心解），用于尽早剪枝
+    :return: （最优选择, 是否在节点上限内证明最优）
+    """
+    best = incumbent.copy()
+    best_value = float(value[best].sum())
+    stack = [(0, budget, caps.copy(), 0.0, ())]
+    nodes = 0
+    while stack and nodes < EXACT_NODE_LIMIT:
+        k, remaining, caps, total, picks = stack.pop()
+        nodes += 1
+        if total > best_value + _TOLERANCE:
+            best = np.zeros(len(weight), dtype=bool)
+            best[list(picks)] = True
+            best_value = total
+        if k == len(order):
+            continue
+        if total + _fractional_bound(order, weight, value, group, remaining, caps, k) <= best_value + _TOLERANCE:
+            continue
+        i = order[k]
+        stack.append((k + 1, remaining, caps, total, picks))  # 不选（后出栈）
+        if weight[i] <= remaining + _TOLERANCE and weight[i] <= caps[group[i]] + _TOLERANCE:
+            taken = caps.copy()
+            taken[group[i]] -= weight[i]
+            stack.append((k + 1, remaining - weight[i], taken, total + value[i], picks + (i,)))  # 选入（先出栈）
+    return best, not stack
+
+
+def select_portfolio(profit, investment, industry_code, budget, industry_caps=None, method="auto"):
+    """
+    核心功能：资本预算约束下的项目组合优选（RI总和最大）
+    :param profit: 项目年收益 [项目]（万元）
+    :param investment: 投资额 [项目]（万元）
+    :param industry_code: 行业代码 [项目]（见 encode_industries）
+    :param budget: 总资本预算（万元）
+    :param industry_caps: 行业投资上限 {行业名称: 万元}（未列出的行业不设上限；名称须在注册表中，含别名）
+    :param method: auto（候选≤EXACT_MAX_PROJECTS 用精确法，否则贪心）/ exact / greedy
+    :return: 项目评分列 + selected [项目] + 组合汇总：
+             total_ri、total_investment、upper_bound（线性松弛上界）、max_gap（与最优解的最大差距，精确解为0）、
+             method（实际使用的方法）、industry_investment [行业]（按当前注册表行业代码）
+    """
+    if method not in ("auto", "exact", "greedy"):
+        raise ValueError(f"⚠️ 未知求解方法：{method}（可选 auto/exact/greedy）")
+    industry_code = np.asarray(industry_code)
+    scores = score_projects(profit, investment, industry_code)
+    investment = np.asarray(investment, dtype=float)
+    # 行业数按当前注册表计（校准新增的行业代码 ≥ 内置行业数）
+    table = get_registry().table("cost_of_capital")
+    group = np.where((industry_code >= 0) & (industry_code < len(table.names)), industry_code,
+                     table.default_code).astype(np.int64)
+    caps = np.full(len(table.names), np.inf)
+    unknown = [name for name in (industry_caps or {}) if name not in table.codes]
+    if unknown:
+        raise ValueError(f"⚠️ 行业上限中的行业不在注册表中：{', '.join(map(str, unknown))}")
+    for name, cap in (industry_caps or {}).items():
+        caps[table.codes[name]] = cap
+
+    # 候选：RI>0（负RI项目只会拉低总和）且单独放得下
+    candidate = scores["valid"] & (scores["ri"] > 0) & (investment <= budget) & (investment <= caps[group])
+    index = np.flatnonzero(candidate)
+    weight, value, members = investment[index], scores["ri"][index], group[index]
+    order = np.argsort(-(value / weight), kind="stable") if len(index) else np.empty(0, dtype=np.int64)
+
+    chosen = _greedy_fill(order, weight, members, budget, caps)
+    upper_bound = _fractional_bound(order, weight, value, members, budget, caps)
+    used = "greedy"
+    if method == "exact" or (method == "auto" and len(index) <= EXACT_MAX_PROJECTS):
+        chosen, proven = _branch_and_bound(order, weight, value, members, budget, caps, chosen)
+        used = "exact" if proven else "exact_truncated"
+        if proven:
+            upper_bound = float(value[chosen].sum())
+    else:
+        # 贪心解之外再比较"单个RI最大的项目"，保证不会因一个大项目放不下而严重偏离
+        single = np.zeros(len(index), dtype=bool)
+        if len(index):
+            single[np.argmax(value)] = True
+        if value[single].sum() > value[chosen].sum():
+            chosen = single
+
+    selected = np.zeros(len(investment), dtype=bool)
+    selected[index[chosen]] = True
+    total_ri = float(value[chosen].sum())
+    scores.update({
+        "selected": selected,
+        "total_ri": total_ri,
+        "total_investment": float(weight[chosen].sum()),
+        "upper_bound": upper_bound,
+        "max_gap": max(upper_bound - total_ri, 0.0),
+        "method": used,
+        "industry_investment": np.bincount(members[chosen], weights=weight[chosen], minlength=len(table.names)),
+    })
+    return scores
+
+
+# ----------------------
+# 极简演示（随机候选项目池）
+# ----------------------
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    for n in (30, 5000):
+        investment = rng.uniform(100, 3000, n).round(0)
+        profit = (investment * rng.uniform(0.02, 0.2, n)).round(1)
+        industries = rng.integers(0, len(INDUSTRY_NAMES), n)
+        result = select_portfolio(profit, investment, industries, budget=n * 300, industry_caps={"房地产": n * 40})
+        print(f"\n===== 📈 资本预算组合优选（{n:,} 个候选项目，预算{n * 300:,}万） =====")
+        print(f"求解方法：{result['method']} | 入选{result['selected'].sum()}个 | 投资{result['total_investment']:,.0f}万"
+              f" | RI合计{result['total_ri']:,.2f}万（与最优解差距≤{result['max_gap']:,.2f}万）")
+        print(f"双指标矛盾项目：{result['contradiction'].sum()}个（需人工复核）")
+        print("行业投资：" + " | ".join(f"{name}{amount:,.0f}万" for name, amount
+                                      in zip(INDUSTRY_NAMES, result["industry_investment"]) if amount))
@@ -5,6 +5,27 @@
 # 公式：EVA = NOPAT - (资本总额 × WACC) → 真正的"经济利润"
 # ==============================================
 
+from common.benchmark_registry import get_registry
+
+# 价值创造分级（定位, 战略解读），下标即价值代码，批量/紧凑结果共用同一张文字表
+VALUE_LEVELS = (
+    ("【价值创造者（高增长）】", "EVA为正且增速>10% → 企业在创造超额价值，可持续扩大投资"),
+    ("【价值创造者（稳定型）】", "EVA为正但增速<10% → 价值创造能力稳定，需优化资本结构降低WACC"),
+    ("【价值平庸者】", "EVA=0 → 刚好覆盖资本成本，未创造超额价值，需提升经营效率"),
+    ("【价值毁灭者】", "EVA<0 → 资本成本高于回报，需紧急剥离低效率资产或改进经营"),
+)
+
+
+def eva_growth(eva, eva_last_year):
+    """
+    EVA同比增速（小数）：以上年EVA的绝对值为基数，上年为负时由负转正/亏损收窄记为正增长
+    （直接除以负的上年EVA会把改善算成负增速）；上年EVA为0或缺失时无增速，返回 None
+    """
+    if not eva_last_year:
+        return None
+    return (eva - eva_last_year) / abs(eva_last_year)
+
+
 def calculate_eva_strategic(nopat, capital_employed, company_type, eva_last_year=None):
     """
     核心功能：计算EVA并评估企业价值创造能力
@@ -18,12 +39,8 @@ def calculate_eva_strategic(nopat, capital_employed, company_type, eva_last_year
         return {"error": "⚠️ 数据错误：NOPAT和资本总额需>0（例：NOPAT=1000万，资本总额=8000万）"}
     
     # 点1：资本成本（WACC）动态调整（不同企业类型融资成本差异）
-    wacc_baseline = {
-        "国企": 5.5,    # 融资成本低（债券利率3-4%）
-        "民企": 7.5,    # 融资成本高（债券利率5-6%）
-        "外企": 6.5     # 国际融资渠道多，成本中等
-    }
-    wacc = wacc_baseline.get(company_type, 6.5) / 100  # 转为小数（如5.5% → 0.055）
+    # 见 common/benchmark_registry.py 的 "wacc" 表（国企/民企/外企）
+    wacc = get_registry().table("wacc").row(company_type)["rate"] / 100  # 转为小数（如5.5% → 0.055）
     
     # 核心计算
     eva = round(nopat - (capital_employed * wacc), 2)
@@ -31,18 +48,14 @@ def calculate_eva_strategic(nopat, capital_employed, company_type, eva_last_year
     
     # 点2：价值创造分级（战略定位）
     if eva > 0:
-        if eva_last_year and (eva - eva_last_year)/eva_last_year > 0.1:
-            value_level = "【价值创造者（高增长）】"
-            level_note = "EVA为正且增速>10% → 企业在创造超额价值，可持续扩大投资"
+        if eva_last_year and eva_growth(eva, eva_last_year) > 0.1:
+            value_level, level_note = VALUE_LEVELS[0]
         else:
-            value_level = "【价值创造者（稳定型）】"
-            level_note = "EVA为正但增速<10% → 价值创造能力稳定，需优化资本结构降低WACC"
+            value_level, level_note = VALUE_LEVELS[1]
     elif eva == 0:
-        value_level = "【价值平庸者】"
-        level_note = "EVA=0 → 刚好覆盖资本成本，未创造超额价值，需提升经营效率"
+        value_level, level_note = VALUE_LEVELS[2]
     else:
-        value_level = "【价值毁灭者】"
-        level_note = "EVA<0 → 资本成本高于回报，需紧急剥离低效率资产或改进经营"
+        value_level, level_note = VALUE_LEVELS[3]
     
     # 创新点3：EVA驱动因素拆分（管理改进方向）
     nopat_contribution = round(nopat / capital_employed * 100, 2)  # NOPAT资本收益率（%）
@@ -89,4 +102,3 @@ if __name__ == "__main__":
         print(f"🔍 驱动因素：{result['driver_analysis']}")
     print(f"\n📌 关键逻辑：EVA>0 → 企业创造的价值>资本成本 → 值得投资")
     print("="*50)
- 
@@ -0,0 +1,275 @@
+# ==============================================
+# 【EVA历史库·增量计算】v1.0
+# 独特性：本地SQLite时间序列（实体×期间的 NOPAT/资本总额/EVA）+ 只重算输入变化的记录 + 上年EVA自动取数
+# 开发者：Kiwi_hazel
+# 增量规则：写入时输入与库中一致则不动；输入变化（新期间/追溯调整）只标记该期间 + 以它为"上年"的下一年同期
+#           refresh() 只对标记记录批量重算 EVA、增速、价值分级，从不重跑全部历史
+#           WACC基准表内容（名称/别名映射、默认类型、各类型利率）的哈希变化时自动全量重算（与注册表版本号无关）
+# 用法：store = EvaHistoryStore("eva.db")
+#       store.upsert([{"entity": "C001", "period": "2024Q3", "nopat": 1200, "capital_employed": 8000,
+#                      "company_type": "民企"}])
+#       store.refresh() → {"recomputed": 1}；store.result("C001", "2024Q3") → 与 calculate_eva_strategic 相同的结果 dict
+# ==============================================
+
+import hashlib
+import json
+import math
+import sqlite3
+
+import numpy as np
+
+from common.benchmark_registry import get_registry
+from common.numeric import py_round
+from investment_valuation.eva_economic_value_added import VALUE_LEVELS, calculate_eva_strategic
+
+CODE_ERROR = -1  # 价值代码 -1 表示输入数据错误（NOPAT或资本总额≤0）
+HIGH_GROWTH = 0.1  # 增速>10% 为高增长（同单公司版本）
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS eva_history (
+    entity           TEXT NOT NULL,
+    period           TEXT NOT NULL,
+    prior_period     TEXT NOT NULL,   -- 上年同期（增速基数）
+    nopat            REAL NOT NULL,
+    capital_employed REAL NOT NULL,
+    company_type     TEXT NOT NULL,
+    eva              REAL,
+    eva_yield        REAL,
+    wacc             REAL,
+    nopat_yield      REAL,
+    eva_last_year    REAL,
+    eva_growth       REAL,
+    value_code       INTEGER,
+    dirty            INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (entity, period)
+);
+CREATE INDEX IF NOT EXISTS eva_history_prior ON eva_history (entity, prior_period);
+CREATE INDEX IF NOT EXISTS eva_history_dirty ON eva_history (dirty) WHERE dirty = 1;
+CREATE TABLE IF NOT EXISTS eva_meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# 仅当输入真正变化时才覆盖并标记待重算（追溯调整为相同数值时不触发任何重算）
+_UPSERT = """
+INSERT INTO eva_history (entity, period, prior_period, nopat, capital_employed, company_type)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (entity, period) DO UPDATE SET
+    nopat = excluded.nopat, capital_employed = excluded.capital_employed,
+    company_type = excluded.company_type, dirty = 1
+WHERE nopat IS NOT excluded.nopat OR capital_employed IS NOT excluded.capital_employed
+   OR company_type IS NOT excluded.company_type
+"""
+
+
+def prior_period(period):
+    """
+    上年同期：2024 → 2023，2024Q3 → 2023Q3，2024-06 → 2023-06
+    :param period: 以4位年份开头的期间标识（int 或 str）
+    """
+    period = str(period)
+    if len(period) < 4 or not period[:4].isdigit():
+        raise ValueError(f"⚠️ 期间需以4位年份开头（例：2024 / 2024Q3 / 2024-06），当前：{period}")
+    return f"{int(period[:4]) - 1}{period[4:]}"
+
+
+def eva_bulk(nopat, capital_employed, company_type, eva_last_year):
+    """
+    批量EVA + 价值分级（逐行与 calculate_eva_strategic 一致）
+    :param company_type: 企业类型名称序列（按注册表 "wacc" 表取WACC）
+    :param eva_last_year: 上年EVA数组（nan 表示无上年数据）
+    :return: 列式结果字典；数据错误的行数值为 nan、value_code=-1
+    """
+    nopat = np.asarray(nopat, dtype=float)
+    capital_employed = np.asarray(capital_employed, dtype=float)
+    eva_last_year = np.asarray(eva_last_year, dtype=float)
+    valid = (nopat > 0) & (capital_employed > 0)
+
+    table = get_registry().table("wacc")
+    wacc = table.lookup(table.encode(company_type), "rate") / 100
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eva = py_round(nopat - (capital_employed * wacc), 2)
+        eva_yield = py_round(eva / capital_employed * 100, 2)
+        nopat_yield = py_round(nopat / capital_employed * 100, 2)
+        has_base = ~np.isnan(eva_last_year) & (eva_last_year != 0)
+        growth = np.where(has_base, (eva - eva_last_year) / np.abs(eva_last_year), np.nan)
+
+    value_code = np.select(
+        [(eva > 0) & has_base & (growth > HIGH_GROWTH), eva > 0, eva == 0],
+        [0, 1, 2],
+        default=3,
+    ).astype(np.int8)
+    value_code[~valid] = CODE_ERROR
+    for column in (eva, eva_yield, nopat_yield, growth):
+        column[~valid] = np.nan
+
+    return {
+        "eva": eva,
+        "eva_yield": eva_yield,
+        "wacc": np.where(valid, py_round(wacc * 100, 2), np.nan),
+        "nopat_yield": nopat_yield,
+        "eva_growth": growth,
+        "value_code": value_code,
+        "valid": valid,
+    }
+
+
+def wacc_fingerprint(table):
+    """
+    WACC基准表内容哈希：企业类型→代码映射（含别名）、默认类型代码、各代码利率，任一变化都会改变EVA
+    :param table: 注册表的 "wacc" 表（BenchmarkTable）
+    """
+    content = [sorted(table.codes.items()), table.default_code, [row["rate"] for row in table.rows]]
+    return hashlib.sha256(json.dumps(content, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _nullable(values):
+    """numpy 数组 → SQLite 参数列表（nan 存为 NULL）"""
+    return [None if v != v else v for v in values.tolist()]
+
+
+class EvaHistoryStore:
+    """实体×期间的EVA时间序列库（SQLite单文件，":memory:" 为内存库）"""
+
+    def __init__(self, path=":memory:"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def upsert(self, records):
+        """
+        写入/追溯调整（不立即计算）
+        :param records: 可迭代 dict，字段 entity / period / nopat / capital_employed / company_type
+        :return: 实际发生变化（新增或输入改变）的记录数
+        """
+        rows = ((str(r["entity"]), str(r["period"]), prior_period(r["period"]), float(r["nopat"]),
+                 float(r["capital_employed"]), r["company_type"]) for r in records)
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(_UPSERT, rows)
+            return self.conn.total_changes - before
+
+    def pending(self):
+        """待重算记录数（不含尚未传播的下一年同期）"""
+        return self.conn.execute("SELECT COUNT(*) FROM eva_history WHERE dirty = 1").fetchone()[0]
+
+    def refresh(self):
+        """
+        增量重算：标记记录 + 以它们为上年的下一年同期 → 批量计算EVA → 取上年EVA批量计算增速与价值分级
+        :return: {"recomputed": 重算记录数, "full": 是否因WACC基准表内容变化而全量重算}
+        """
+        fingerprint = wacc_fingerprint(get_registry().table("wacc"))
+        with self.conn:
+            stored = self.conn.execute("SELECT value FROM eva_meta WHERE key = 'wacc_fingerprint'").fetchone()
+            full = stored is not None and stored[0] != fingerprint
+            if full:  # WACC 基准变了（即使注册表版本号没改），全部EVA都受影响
+                self.conn.execute("UPDATE eva_history SET dirty = 1")
+            self.conn.execute("INSERT OR REPLACE INTO eva_meta VALUES ('wacc_fingerprint', ?)", (fingerprint,))
+
+            # 1) 传播一层：输入变化的期间是下一年同期的"上年EVA"
+            self.conn.execute("""
+                UPDATE eva_history SET dirty = 1
+                WHERE dirty = 0 AND (entity, prior_period) IN (SELECT entity, period FROM eva_history WHERE dirty = 1)
+            """)
+            targets = self.conn.execute("""
+                SELECT rowid, nopat, capital_employed, company_type FROM eva_history WHERE dirty = 1
+            """).fetchall()
+            if not targets:
+                return {"recomputed": 0, "full": full}
+            rowid, nopat, capital_employed, company_type = zip(*targets)
+
+            # 2) 本期EVA（只依赖本期输入）先全部落库，第3步取上年EVA时可能正好取到本轮刚算出的值
+            own = eva_bulk(nopat, capital_employed, company_type, np.full(len(rowid), np.nan))
+            self.conn.executemany(
+                "UPDATE eva_history SET eva = ?, eva_yield = ?, wacc = ?, nopat_yield = ? WHERE rowid = ?",
+                zip(*(_nullable(own[k]) for k in ("eva", "eva_yield", "wacc", "nopat_yield")), rowid))
+
+            # 3) 上年EVA → 增速与价值分级
+            last = self.conn.execute("""
+                SELECT t.rowid, p.eva FROM eva_history t
+                LEFT JOIN eva_history p ON p.entity = t.entity AND p.period = t.prior_period
+                WHERE t.dirty = 1
+            """).fetchall()
+            eva_last_year = dict(last)
+            prior = np.array([eva_last_year[r] if eva_last_year[r] is not None else np.nan for r in rowid])
+            result = eva_bulk(nopat, capital_employed, company_type, prior)
+            self.conn.executemany(
+                "UPDATE eva_history SET eva_last_year = ?, eva_growth = ?, value_code = ?, dirty = 0 WHERE rowid = ?",
+                zip(_nullable(prior), _nullable(result["eva_growth"]), result["value_code"].tolist(), rowid))
+        return {"recomputed": len(rowid), "full": full}
+
+    def history(self, entity):
+        """某实体全部期间（按期间排序）的计算结果"""
+        cursor = self.conn.execute("""
+            SELECT period, nopat, capital_employed, company_type, eva, eva_yield, wacc, eva_last_year, eva_growth,
+                   value_code, dirty
+            FROM eva_history WHERE entity = ? ORDER BY period
+        """, (str(entity),))
+        names = [column[0] for column in cursor.description]
+        return [dict(zip(names, row)) for row in cursor]
+
+    def result(self, entity, period):
+        """
+        渲染为 calculate_eva_strategic 格式的结果 dict（上年EVA取自库中上年同期）
+        :return: 结果 dict；不存在返回 None；尚未 refresh 的记录抛出 RuntimeError
+        """
+        row = self.conn.execute("""
+            SELECT nopat, capital_employed, company_type, eva, eva_yield, wacc, nopat_yield, value_code, dirty
+            FROM eva_history WHERE entity = ? AND period = ?
+        """, (str(entity), str(period))).fetchone()
+        if row is None:
+            return None
+        nopat, capital_employed, company_type, eva, eva_yield, wacc, nopat_yield, value_code, dirty = row
+        if dirty:
+            raise RuntimeError(f"⚠️ {entity} {period} 有未重算的输入变化，请先调用 refresh()")
+        if value_code == CODE_ERROR:
+            return calculate_eva_strategic(nopat, capital_employed, company_type)
+        value_level, level_note = VALUE_LEVELS[value_code]
+        # SQLite 不保存 -0.0 的符号；取整为0时按未取整差额恢复符号，保证文字与单公司版本一致
+        raw = nopat - (capital_employed * (wacc / 100))
+        eva, eva_yield = (math.copysign(v, raw) if v == 0 else v for v in (eva, eva_yield))
+        return {
+            "eva": eva,
+            "eva_yield": eva_yield,
+            "wacc": wacc,
+            "value_level": value_level,
+            "level_note": level_note,
+            "driver_analysis": f"EVA驱动：{nopat_yield}%（NOPAT收益率） - {wacc}%（WACC） = {eva_yield}%（EVA收益率）",
+            "company_type": company_type,
+        }
+
+    def level_counts(self, period):
+        """某期间的价值分级分布（代码 → 实体数）"""
+        rows = self.conn.execute("""
+            SELECT value_code, COUNT(*) FROM eva_history WHERE period = ? AND dirty = 0 GROUP BY value_code
+        """, (str(period),))
+        return dict(rows.fetchall())
+
+
+# ----------------------
+# 极简演示：2家公司 × 3年，含一次追溯调整
+# ----------------------
+if __name__ == "__main__":
+    store = EvaHistoryStore()
+    store.upsert([
+        {"entity": "A", "period": 2022, "nopat": 300, "capital_employed": 8000, "company_type": "民企"},
+        {"entity": "A", "period": 2023, "nopat": 800, "capital_employed": 8000, "company_type": "民企"},
+        {"entity": "A", "period": 2024, "nopat": 900, "capital_employed": 8000, "company_type": "民企"},
+        {"entity": "B", "period": 2024, "nopat": 1200, "capital_employed": 8000, "company_type": "国企"},
+    ])
+    print("\n===== 🏆 EVA历史库（演示） =====")
+    print(f"首次计算：{store.refresh()}")
+    for row in store.history("A"):
+        print(f"A {row['period']}：EVA={row['eva']}万 | 上年EVA={row['eva_last_year']} | "
+              f"定位={VALUE_LEVELS[row['value_code']][0]}")
+    changed = store.upsert([{"entity": "A", "period": 2023, "nopat": 500, "capital_employed": 8000,
+                             "company_type": "民企"}])
+    print(f"\n追溯调整 A 2023（变化 {changed} 条）→ 重算：{store.refresh()}（只涉及2023及以它为上年的2024）")
+    print(f"A 2024：{store.result('A', 2024)['value_level']}")
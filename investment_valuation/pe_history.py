@@ -0,0 +1,178 @@
+# ==============================================
+# 【历史PE分位数·滚动引擎】v1.0
+# 独特性：每只股票一个有序窗口（插入/删除 O(log w)），逐日增量产出近5年PE的75%分位数，无需每天重排序
+# 开发者：Kiwi_hazel
+# 公式：日度PE = 收盘价 / 最近12个月EPS（EPS≤0 的交易日PE无意义，不进入窗口但照常占用窗口天数）
+#       分位数 = 窗口内有效PE的线性插值分位数（与 numpy.percentile 默认口径一致）
+# 依赖：优先使用 sortedcontainers.SortedList（pip install sortedcontainers），未安装时回落到 bisect 有序列表
+# 输出直接作为 calculate_pe_safety_margin / pe_safety_margin_batch 的 historical_pe_75th
+# ==============================================
+
+import math
+from array import array
+from bisect import bisect_left, insort
+
+try:
+    from sortedcontainers import SortedList
+except ImportError:  # 可选依赖
+    SortedList = None
+
+TRADING_DAYS_5Y = 5 * 252   # 近5年交易日数
+MIN_PERIODS = 252           # 有效PE不足1年时不输出分位数（nan）
+DEFAULT_PERCENTILE = 75
+
+
+class _BisectList:
+    """SortedList 的最小替代：有序 Python 列表 + 二分插入/删除（w≈1260 时内存搬移开销很小）"""
+    __slots__ = ("_items",)
+
+    def __init__(self):
+        self._items = []
+
+    def add(self, value):
+        insort(self._items, value)
+
+    def remove(self, value):
+        del self._items[bisect_left(self._items, value)]
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+
+def _percentile_of_sorted(ordered, n, q):
+    """有序序列的线性插值分位数（逐位复现 numpy.percentile 的 linear 口径，结果逐位一致）"""
+    virtual = (n - 1) * (q / 100)
+    lower = math.floor(virtual)
+    gamma = virtual - lower
+    a = ordered[lower]
+    b = ordered[min(lower + 1, n - 1)]
+    diff = b - a
+    return b - diff * (1 - gamma) if gamma >= 0.5 else a + diff * gamma
+
+
+class RollingPercentile:
+    """单只股票的滚动分位数窗口：环形缓冲区记录到期顺序，有序列表提供分位数"""
+    __slots__ = ("window", "q", "min_periods", "_ring", "_pos", "_filled", "_sorted")
+
+    def __init__(self, window=TRADING_DAYS_5Y, q=DEFAULT_PERCENTILE, min_periods=MIN_PERIODS):
+        if window <= 0 or not 0 <= q <= 100:
+            raise ValueError("⚠️ 窗口长度需>0，分位数需在0~100之间")
+        self.window = window
+        self.q = q
+        self.min_periods = min(min_periods, window)
+        self._ring = array("d", [math.nan]) * window  # 每个交易日的PE（无效日为nan），8字节/天
+        self._pos = 0
+        self._filled = 0
+        self._sorted = SortedList() if SortedList is not None else _BisectList()
+
+    def push(self, pe):
+        """
+        追加一个交易日的PE（None/nan/≤0 视为无效日），返回追加后的分位数
+        """
+        if pe is None or not pe > 0 or pe == math.inf:
+            pe = math.nan
+        ring, pos = self._ring, self._pos
+        if self._filled == self.window:
+            expired = ring[pos]
+            if expired == expired:  # 非nan才在有序列表中
+                self._sorted.remove(expired)
+        else:
+            self._filled += 1
+        ring[pos] = pe
+        if pe == pe:
+            self._sorted.add(pe)
+        self._pos = (pos + 1) % self.window
+        return self.value()
+
+    def value(self):
+        """当前窗口的分位数（有效PE少于 min_periods 时为 nan）"""
+        n = len(self._sorted)
+        if n < self.min_periods or n == 0:
+            return math.nan
+        return _percentile_of_sorted(self._sorted, n, self.q)
+
+    def __len__(self):
+        return len(self._sorted)
+
+
+def daily_pe(price, eps_ttm):
+    """日度PE（EPS或股价≤0、数据缺失时返回 nan）"""
+    if price is None or eps_ttm is None or not (price > 0 and eps_ttm > 0):
+        return math.nan
+    return price / eps_ttm
+
+
+class PEHistoryEngine:
+    """
+    多股票日频引擎：每日收盘后对每只股票 update 一次，随时查询当前历史分位数PE
+    用法：engine.update_day(tickers, prices, eps_ttm) → 当日各股票的近5年75分位PE
+    """
+
+    def __init__(self, window=TRADING_DAYS_5Y, q=DEFAULT_PERCENTILE, min_periods=MIN_PERIODS):
+        self.window = window
+        self.q = q
+        self.min_periods = min_periods
+        self.windows = {}  # {股票代码: RollingPercentile}
+
+    def _window(self, ticker):
+        rolling = self.windows.get(ticker)
+        if rolling is None:
+            rolling = self.windows[ticker] = RollingPercentile(self.window, self.q, self.min_periods)
+        return rolling
+
+    def update(self, ticker, price, eps_ttm):
+        """追加一只股票一个交易日的数据，返回其最新分位数PE"""
+        return self._window(ticker).push(daily_pe(price, eps_ttm))
+
+    def update_day(self, tickers, prices, eps_ttm):
+        """追加一个交易日的截面数据（停牌股票不传即可，其窗口不前进），返回与 tickers 对齐的分位数列表"""
+        return [self.update(t, p, e) for t, p, e in zip(tickers, prices, eps_ttm)]
+
+    def current(self, tickers):
+        """当前分位数PE列表（未见过的股票为 nan），可直接作为批量安全边际的 historical_pe_75th"""
+        windows = self.windows
+        return [windows[t].value() if t in windows else math.nan for t in tickers]
+
+
+def rolling_pe_percentile(prices, eps_ttm, window=TRADING_DAYS_5Y, q=DEFAULT_PERCENTILE, min_periods=MIN_PERIODS):
+    """
+    历史回填：对 股票×交易日 矩阵一次性计算每天的滚动分位数PE
+    :param prices: 收盘价，形状(股票数, 交易日数)（numpy数组或嵌套列表）
+    :param eps_ttm: 最近12个月EPS，同形状（按交易日前向填充）
+    :return: numpy 数组，同形状；有效样本不足的位置为 nan
+    """
+    import numpy as np
+
+    prices = np.asarray(prices, dtype=float)
+    eps_ttm = np.asarray(eps_ttm, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pe = np.where((prices > 0) & (eps_ttm > 0), prices / eps_ttm, np.nan)
+    out = np.empty_like(pe)
+    for i, row in enumerate(pe.tolist()):
+        rolling = RollingPercentile(window, q, min_periods)
+        out[i] = [rolling.push(value) for value in row]
+    return out
+
+
+# ----------------------
+# 极简演示：3只股票 × 6年随机行情 → 近5年75分位PE → 批量安全边际
+# ----------------------
+if __name__ == "__main__":
+    import numpy as np
+
+    from investment_valuation.pe_safety_margin_batch import pe_safety_margin_batch, status_labels
+
+    rng = np.random.default_rng(0)
+    days = 6 * 252
+    prices = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, (3, days)), axis=1))
+    eps = np.repeat(rng.uniform(1, 3, (3, days // 63 + 1)), 63, axis=1)[:, :days]  # 季度更新的EPS
+    history = rolling_pe_percentile(prices, eps)
+    result = pe_safety_margin_batch(prices[:, -1], eps[:, -1], 15, 25, history[:, -1])
+    print("\n===== 📈 历史PE分位数滚动引擎（演示） =====")
+    print(f"有序窗口实现：{'sortedcontainers.SortedList' if SortedList is not None else 'bisect 有序列表'}")
+    for i, label in enumerate(status_labels(result["status_code"])):
+        print(f"股票{i + 1}：静态PE={result['pe_static'][i]} | 近5年75分位PE={history[i, -1]:.2f} | "
+              f"安全边际={result['safety_margin'][i]}% {label}")
@@ -0,0 +1,183 @@
+# ==============================================
+# 【市盈率安全边际·批量版】v1.0
+# 独特性：股票池一次性向量化计算 + 与单股票版本逐行一致 + 直接接收滚动历史分位数PE（pe_history.py）
+#         + 价格×增速×行业PE 敏感性网格 + 状态翻转价格解析解
+# 开发者：Kiwi_hazel
+# 公式：同 pe_valuation_safety_margin.py（静态/动态PE、安全PE上限、安全边际、估值驱动因素）
+#       翻转价格：安全边际 = (U/PE - 1)×100，U = 安全PE上限（与股价无关）
+#                → 低估：股价 < EPS×U/1.2；高估：股价 > EPS×U/0.9（再按取整口径精确到分）
+# ==============================================
+
+import numpy as np
+
+from common.numeric import py_round, safe_divide
+from investment_valuation.pe_valuation_safety_margin import (
+    MARGIN_STATUSES, OVERVALUED_MARGIN, SAFETY_PE_PREMIUM, UNDERVALUED_MARGIN, VALUATION_DRIVERS)
+
+CODE_ERROR = -1  # 状态/驱动代码 -1 表示输入数据错误（含历史分位数PE缺失）
+
+
+def pe_safety_margin_batch(stock_price, eps_ttm, eps_forecast, industry_pe, historical_pe_75th):
+    """
+    核心功能：批量评估市盈率安全边际（结果与 calculate_pe_safety_margin 逐行一致）
+    各参数为数组或标量（按 numpy 规则广播），含义同单股票版本
+    :param historical_pe_75th: 近5年PE的75%分位数（可直接传 rolling_pe_percentile / PEHistoryEngine.current 的输出，
+                               nan 表示历史样本不足，该行按数据错误处理）
+    :return: 列式结果字典；数据错误的行 valid=False、数值列为 nan、状态/驱动代码为 -1
+    """
+    stock_price, eps_ttm, eps_forecast, industry_pe, historical_pe_75th = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (stock_price, eps_ttm, eps_forecast, industry_pe, historical_pe_75th)))
+
+    # 数据校验（与单股票版本一致：股价/EPS/行业PE/历史PE需>0）
+    valid = (stock_price > 0) & (eps_ttm > 0) & (industry_pe > 0) & (historical_pe_75th > 0)
+
+    # 基础计算（先按单股票版本取整，再用取整后的值判断）
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pe_static = py_round(safe_divide(stock_price, eps_ttm), 2)
+        pe_dynamic = np.where(eps_forecast != -100, py_round(pe_static / (1 + eps_forecast / 100), 2), np.inf)
+        safety_pe_upper = np.minimum(industry_pe * SAFETY_PE_PREMIUM, historical_pe_75th)
+        safety_margin = py_round((safety_pe_upper - pe_static) / pe_static * 100, 1)
+
+    status_code = np.select(
+        [safety_margin > UNDERVALUED_MARGIN, safety_margin >= OVERVALUED_MARGIN], [0, 1], default=2).astype(np.int8)
+    premium = pe_static > industry_pe * 1.5
+    driver_code = np.select(
+        [premium & (eps_forecast > industry_pe * 0.5), premium, pe_static < industry_pe * 0.8],
+        [0, 1, 2],
+        default=3,
+    ).astype(np.int8)
+    safety_pe_upper = py_round(safety_pe_upper, 2)
+
+    status_code[~valid] = CODE_ERROR
+    driver_code[~valid] = CODE_ERROR
+    for column in (pe_static, pe_dynamic, safety_margin, safety_pe_upper):
+        column[~valid] = np.nan
+
+    return {
+        "pe_static": pe_static,
+        "pe_dynamic": pe_dynamic,
+        "safety_margin": safety_margin,
+        "safety_pe_upper": safety_pe_upper,
+        "status_code": status_code,   # 见 MARGIN_STATUSES
+        "driver_code": driver_code,   # 见 VALUATION_DRIVERS
+        "valid": valid,
+    }
+
+
+def status_labels(status_code):
+    """安全边际状态代码数组 → 中文标签（错误行返回"数据错误"），仅在需要展示时调用"""
+    return [MARGIN_STATUSES[c] if c >= 0 else "数据错误" for c in np.asarray(status_code).ravel().tolist()]
+
+
+def driver_labels(driver_code):
+    """估值驱动代码数组 → 中文标签（错误行返回"数据错误"）"""
+    return [VALUATION_DRIVERS[c][0] if c >= 0 else "数据错误" for c in np.asarray(driver_code).ravel().tolist()]
+
+
+def pe_safety_margin_grid(stock_price, eps_ttm, eps_forecast, industry_pe, historical_pe_75th):
+    """
+    敏感性网格：价格 × 增速 × 行业PE 一次向量化计算（每个格点与 calculate_pe_safety_margin 一致）
+    :param stock_price: 价格轴，形状(P,)（全部股票共用）或(H, P)（每只股票各自的价格轴）
+    :param eps_ttm: 最近12个月EPS，标量或(H,)
+    :param eps_forecast: 增速轴（%），形状(G,)
+    :param industry_pe: 行业PE轴，形状(I,) 或 (H, I)
+    :param historical_pe_75th: 历史75分位PE，标量或(H,)
+    :return: 同 pe_safety_margin_batch 的列式结果，各列形状(H, P, G, I)（单只股票时 H=1）
+    """
+    stock_price = np.atleast_2d(np.asarray(stock_price, dtype=float))[:, :, None, None]
+    eps_ttm = np.reshape(np.asarray(eps_ttm, dtype=float), (-1, 1, 1, 1))
+    eps_forecast = np.reshape(np.asarray(eps_forecast, dtype=float), (1, 1, -1, 1))
+    industry_pe = np.atleast_2d(np.asarray(industry_pe, dtype=float))[:, None, None, :]
+    historical_pe_75th = np.reshape(np.asarray(historical_pe_75th, dtype=float), (-1, 1, 1, 1))
+    return pe_safety_margin_batch(stock_price, eps_ttm, eps_forecast, industry_pe, historical_pe_75th)
+
+
+def _last_tick(predicate, estimate, slack):
+    """
+    单调谓词的最后一个成立价位（分）：predicate(价格数组) 在低价成立、高价不成立
+    从解析估计值 ± slack 出发，先保证区间端点一真一假，再逐位二分（约十几次向量化调用）
+    :return: 最后成立价位（分，float）；最低价位也不成立时为 nan
+    """
+    lo = np.maximum(np.floor(estimate) - slack, 1)
+    hi = np.ceil(estimate) + slack
+    for _ in range(64):  # 估计偏差超出 slack 时逐步放宽（正常情况下不会触发）
+        lo_bad = ~predicate(lo / 100) & (lo > 1)
+        hi_bad = predicate(hi / 100)
+        if not (lo_bad.any() or hi_bad.any()):
+            break
+        width = hi - lo
+        lo = np.where(lo_bad, np.maximum(lo - width, 1), lo)
+        hi = np.where(hi_bad, hi + width, hi)
+    found = predicate(lo / 100)
+    while True:
+        open_ = hi - lo > 1
+        if not open_.any():
+            break
+        mid = np.floor((lo + hi) / 2)
+        ok = predicate(mid / 100)
+        lo = np.where(open_ & ok, mid, lo)
+        hi = np.where(open_ & ~ok, mid, hi)
+    return np.where(found, lo, np.nan)
+
+
+def pe_flip_prices(eps_ttm, industry_pe, historical_pe_75th):
+    """
+    状态翻转价格：股价低于多少为"✅ 低估"、高于多少为"❌ 高估"（与股价无关的增速不参与判断）
+    :param eps_ttm: 最近12个月EPS（元/股），数组或标量（标量按长度1的数组返回）
+    :param industry_pe: 行业平均PE
+    :param historical_pe_75th: 历史75分位PE
+    :return: 列式结果字典
+        - undervalued_below / overvalued_above：解析解（连续价格，未考虑取整）
+        - undervalued_max_price：仍判定为低估的最高价（精确到分，含PE/安全边际取整口径）
+        - overvalued_min_price：开始判定为高估的最低价（精确到分）
+        - 数据错误的行 valid=False、数值列为 nan
+    """
+    eps_ttm, industry_pe, historical_pe_75th = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(a, dtype=float)) for a in (eps_ttm, industry_pe, historical_pe_75th)))
+    valid = (eps_ttm > 0) & (industry_pe > 0) & (historical_pe_75th > 0)
+    safety_pe_upper = np.where(valid, np.minimum(industry_pe * SAFETY_PE_PREMIUM, historical_pe_75th), np.nan)
+
+    # 解析解：安全边际 (U/PE - 1)×100 = 阈值 → PE = U / (1 + 阈值/100)
+    undervalued_below = eps_ttm * safety_pe_upper / (1 + UNDERVALUED_MARGIN / 100)
+    overvalued_above = eps_ttm * safety_pe_upper / (1 + OVERVALUED_MARGIN / 100)
+
+    def status_at(price):
+        return pe_safety_margin_batch(price, eps_ttm, 0, industry_pe, historical_pe_75th)["status_code"]
+
+    # 取整带来的偏差：PE取2位（±0.005）+ 安全边际取1位（±0.05% → PE偏差约 U×0.0005/0.9²）
+    slack = np.ceil(np.nan_to_num(eps_ttm * (0.01 + safety_pe_upper * 0.001)) * 100) + 2
+    with np.errstate(invalid="ignore"):
+        undervalued_max = _last_tick(lambda p: (status_at(p) == 0) | ~valid,
+                                     np.nan_to_num(undervalued_below * 100), slack)
+        fair_max = _last_tick(lambda p: (status_at(p) <= 1) | ~valid,
+                              np.nan_to_num(overvalued_above * 100), slack)
+    undervalued_max_price = undervalued_max / 100
+    overvalued_min_price = (fair_max + 1) / 100
+    for column in (undervalued_below, overvalued_above, undervalued_max_price, overvalued_min_price):
+        column[~valid] = np.nan
+
+    return {
+        "safety_pe_upper": safety_pe_upper,
+        "undervalued_below": undervalued_below,
+        "overvalued_above": overvalued_above,
+        "undervalued_max_price": undervalued_max_price,
+        "overvalued_min_price": overvalued_min_price,
+        "valid": valid,
+    }
+
+
+# ----------------------
+# 极简演示：单只股票的敏感性网格 + 翻转价格
+# ----------------------
+if __name__ == "__main__":
+    prices = np.arange(40, 101, 10)
+    growth = np.array([0, 15, 30])
+    grid = pe_safety_margin_grid(prices, 2.5, growth, 25, 30)
+    flips = pe_flip_prices(2.5, 25, 30)
+    print("\n===== 📈 市盈率安全边际敏感性网格（EPS=2.5元，行业PE=25，历史75分位PE=30） =====")
+    for i, price in enumerate(prices.tolist()):
+        cells = " | ".join(f"增速{g}%：动态PE={grid['pe_dynamic'][0, i, j, 0]}" for j, g in enumerate(growth.tolist()))
+        print(f"股价{price}元：安全边际={grid['safety_margin'][0, i, 0, 0]}% "
+              f"{MARGIN_STATUSES[grid['status_code'][0, i, 0, 0]]} | {cells}")
+    print(f"\n翻转价格：≤{flips['undervalued_max_price'][0]:.2f}元 为低估（解析解 {flips['undervalued_below'][0]:.4f}），"
+          f"≥{flips['overvalued_min_price'][0]:.2f}元 为高估（解析解 {flips['overvalued_above'][0]:.4f}）")
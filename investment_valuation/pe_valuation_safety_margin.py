@@ -5,6 +5,22 @@
 # 公式：静态PE=当前股价/最近12个月EPS；动态PE=当前股价/未来12个月预测EPS
 # ==============================================
 
+SAFETY_PE_PREMIUM = 1.2     # 安全PE上限 = min(行业PE×1.2, 历史75分位PE)
+UNDERVALUED_MARGIN = 20     # 安全边际>20% → 低估
+OVERVALUED_MARGIN = -10     # 安全边际<-10% → 高估
+
+# 安全边际状态（下标即状态代码），批量版本共用
+MARGIN_STATUSES = ("✅ 低估", "⚠️ 合理", "❌ 高估")
+
+# 估值驱动因素（标签, 解读），下标即驱动代码，批量版本共用
+VALUATION_DRIVERS = (
+    ("【高增长预期驱动】", "PE高于行业因市场预期未来盈利高增长（需验证增速能否兑现）"),
+    ("【风险溢价过高驱动】", "PE高于行业但增速无支撑，可能存在估值泡沫或流动性溢价"),
+    ("【低增长预期驱动】", "PE低于行业可能因盈利增速放缓或风险担忧（需分析基本面是否恶化）"),
+    ("【行业均衡驱动】", "PE与行业匹配，估值逻辑合理无明显偏离"),
+)
+
+
 def calculate_pe_safety_margin(stock_price, eps_ttm, eps_forecast, industry_pe, historical_pe_75th):
     """
     核心功能：评估市盈率合理性及安全边际
@@ -21,24 +37,21 @@ def calculate_pe_safety_margin(stock_price, eps_ttm, eps_forecast, industry_pe,
     pe_dynamic = round(pe_static / (1 + eps_forecast/100), 2) if eps_forecast != -100 else float('inf')  # 动态PE（考虑增长）
     
     # 点1：安全边际测算（当前PE vs 安全PE上限）
-    safety_pe_upper = min(industry_pe * 1.2, historical_pe_75th)  # 安全PE上限=行业PE*1.2和历史75分位PE的最小值
+    safety_pe_upper = min(industry_pe * SAFETY_PE_PREMIUM, historical_pe_75th)  # 安全PE上限=行业PE*1.2和历史75分位PE的最小值
     safety_margin = round((safety_pe_upper - pe_static) / pe_static * 100, 1)  # 安全边际（%）
-    margin_status = "✅ 低估" if safety_margin > 20 else \
-                    "⚠️ 合理" if safety_margin >= -10 else \
-                    "❌ 高估"
+    margin_status = MARGIN_STATUSES[0] if safety_margin > UNDERVALUED_MARGIN else \
+                    MARGIN_STATUSES[1] if safety_margin >= OVERVALUED_MARGIN else \
+                    MARGIN_STATUSES[2]
     
     # 点2：估值驱动因素分析
     if pe_static > industry_pe * 1.5:
         if eps_forecast > industry_pe * 0.5:  # 假设行业平均增速=行业PE*0.5（简化逻辑）
-            driver = "【高增长预期驱动】"
-            driver_note = "PE高于行业因市场预期未来盈利高增长（需验证增速能否兑现）"
+            driver, driver_note = VALUATION_DRIVERS[0]
         else:
-            driver = "【风险溢价过高驱动】"
-            driver_note = "PE高于行业但增速无支撑，可能存在估值泡沫或流动性溢价"
+            driver, driver_note = VALUATION_DRIVERS[1]
     elif pe_static < industry_pe * 0.8:
-        driver = "【低增长预期驱动】"
-        driver_note = "PE低于行业可能因盈利增速放缓或风险担忧（需分析基本面是否恶化）"
-    else: driver = "【行业均衡驱动】" ; driver_note = "PE与行业匹配，估值逻辑合理无明显偏离"
+        driver, driver_note = VALUATION_DRIVERS[2]
+    else: driver, driver_note = VALUATION_DRIVERS[3]
     
     return {
         "pe_static": pe_static,
@@ -77,4 +90,3 @@ if __name__ == "__main__":
         print(f"💡 核心结论：{result['driver_note']}")
     print(f"\n📌 安全边际逻辑：安全边际>20% → 股价被低估；< -10% → 高估需警惕")
     print("="*50)
- 
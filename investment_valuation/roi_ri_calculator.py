@@ -5,6 +5,17 @@
 # 输入：项目收益、投资额、行业类型 → 输出双指标结果+联动分析
 # ==============================================
 
+from common.benchmark_registry import get_registry
+
+# 双指标联动分析结论，下标即分析代码（0双达标/1 ROI达标但RI为负/2 ROI未达标但RI为正/3双不达标），批量版本共用
+ANALYSIS_NOTES = (
+    "✅ 双指标达标：项目创造超额价值，建议投资（ROI高于资本成本，RI为正）",
+    "⚠️ 注意矛盾：ROI达标但RI为负 → 可能因投资额过大，资本成本侵蚀利润（例：高ROI但低收益额）",
+    "⚠️ 注意矛盾：ROI未达标但RI为正 → 可能因投资额过小，收益额足以覆盖资本成本（例：低ROI但高收益额）",
+    "❌ 双指标不达标：项目未创造超额价值，不建议投资",
+)
+
+
 def calculate_roi_ri(profit, investment, industry):
     """
     计算ROI和RI
@@ -19,28 +30,22 @@ def calculate_roi_ri(profit, investment, industry):
         return {"error": f"⚠️ 投资额需>0（当前：{investment}万元），投资额为0意味着无风险"}
     
     # 2. 行业资本成本率
-    industry_cost = {
-        "高科技": 12.0,  # 高风险行业，资本成本高
-        "制造业": 8.0,   # 中等风险
-        "服务业": 6.5,   # 低风险
-        "房地产": 10.0   # 政策敏感型，资本成本较高
-    }
-    cost_of_capital = industry_cost.get(industry, 8.0)  # 默认8%（全行业平均）
+    # 见 common/benchmark_registry.py 的 "cost_of_capital" 表（高科技/制造业/服务业/房地产）
+    cost_of_capital = get_registry().table("cost_of_capital").row(industry)["rate"]  # 默认8%（全行业平均）
     
     # 3. 双指标计算
     roi = round((profit / investment) * 100, 2)
     ri = round(profit - (investment * cost_of_capital / 100), 2)  # RI=收益-资本成本
     
     # 4. 联动分析（核心价值：揭示单一指标局限性）
-    analysis = ""
     if roi > cost_of_capital and ri > 0:
-        analysis = "✅ 双指标达标：项目创造超额价值，建议投资（ROI高于资本成本，RI为正）"
+        analysis = ANALYSIS_NOTES[0]
     elif roi > cost_of_capital and ri <= 0:
-        analysis = "⚠️ 注意矛盾：ROI达标但RI为负 → 可能因投资额过大，资本成本侵蚀利润（例：高ROI但低收益额）"
+        analysis = ANALYSIS_NOTES[1]
     elif roi <= cost_of_capital and ri > 0:
-        analysis = "⚠️ 注意矛盾：ROI未达标但RI为正 → 可能因投资额过小，收益额足以覆盖资本成本（例：低ROI但高收益额）"
+        analysis = ANALYSIS_NOTES[2]
     else:
-        analysis = "❌ 双指标不达标：项目未创造超额价值，不建议投资"
+        analysis = ANALYSIS_NOTES[3]
     
     return {
         "roi": roi,
@@ -81,4 +86,3 @@ if __name__ == "__main__":
         print(f"🔍 联动分析：{result['analysis']}")
     print(f"\n💡 决策逻辑：ROI>资本成本率且RI>0 → 项目创造超额价值")
     print("="*50)
- 
@@ -0,0 +1 @@
+# 运营效率分析工具（存货周转天数）
@@ -0,0 +1,154 @@
+# ==============================================
+# 【存货周转·时间序列引擎】v1.0
+# 独特性：月度/日度存货快照 → 时间加权平均存货（而非期初+期末/2）+ 滚动90天/365天周转天数
+#         前缀和一次遍历：每个窗口只做两次前缀和相减，计算量与窗口长度无关
+# 开发者：Kiwi_hazel
+# 公式：时间加权平均存货 = ∫存货dt / 窗口天数（相邻快照间按梯形面积累计）
+#       周转率(次/年) = 窗口营业成本 ×（365/窗口天数）/ 时间加权平均存货；周转天数 = 365/周转率
+#       健康度评分/隐性成本口径同 inventory_turnover_days.py
+#       （窗口恰为两期快照、跨365天时与 calculate_inventory_health 结果一致）
+# 用法：rolling_inventory_turnover(存货[公司, 期], 营业成本[公司, 期], 期末日期[期], 细分行业代码[公司])
+# ==============================================
+
+import numpy as np
+
+from common.benchmark_registry import BUILTIN_TABLES, get_registry
+from common.numeric import py_round, safe_divide
+from operation_efficiency.inventory_turnover_days import CARRYING_COST_RATE, HEALTH_GRADES
+
+# 细分行业代码 = 基准注册表 "inventory_days" 表的行号（越界代码按默认制造业）
+SUBTYPE_NAMES = tuple(BUILTIN_TABLES["inventory_days"]["entries"])
+GRADE_LABELS = tuple(label for label, _note in HEALTH_GRADES)
+GRADE_ERROR = -1
+
+ROLLING_WINDOWS = (90, 365)  # 默认滚动窗口（天）
+MIN_COVERAGE = 0.9  # 窗口实际跨度至少覆盖目标天数的90%（月末快照对齐误差以内），否则视为数据不足
+
+
+def encode_subtypes(industry_subtypes):
+    """细分行业名称数组 → 行业代码数组（未知行业按默认制造业，支持注册表别名）"""
+    return get_registry().table("inventory_days").encode(industry_subtypes)
+
+
+def to_day_numbers(dates):
+    """
+    期末日期 → 天序号（int64，自1970-01-01起）；已是数值时原样返回
+    :param dates: datetime64 / "2024-01-31" 字符串 / 天序号
+    """
+    dates = np.asarray(dates)
+    if dates.dtype.kind in "MUSO":
+        return dates.astype("datetime64[D]").astype(np.int64)
+    return dates.astype(np.int64)
+
+
+def window_starts(days, window):
+    """
+    每个期末对应的窗口起点快照下标（取离"期末−窗口天数"最近的快照，等距时取较早者）
+    :return: （起点下标数组, 窗口是否有效数组）
+    """
+    target = days - window
+    right = np.clip(np.searchsorted(days, target), 0, len(days) - 1)
+    left = np.clip(right - 1, 0, len(days) - 1)
+    starts = np.where(np.abs(days[left] - target) <= np.abs(days[right] - target), left, right)
+    span = days - days[starts]
+    return starts, (starts < np.arange(len(days))) & (span >= MIN_COVERAGE * window)
+
+
+def inventory_prefix_sums(inventory, cogs, days):
+    """
+    一次遍历得到三组前缀和（后续每个窗口只需相减）：
+    存货面积（梯形，万元·天）、营业成本、缺失段计数
+    第0期营业成本属于首个快照之前，不计入任何窗口
+    """
+    gaps = np.diff(days).astype(float)
+    segment_missing = np.isnan(inventory[:, 1:]) | np.isnan(inventory[:, :-1]) | np.isnan(cogs[:, 1:])
+    area = np.where(segment_missing, 0.0, (inventory[:, 1:] + inventory[:, :-1]) / 2 * gaps)
+    flow = np.where(segment_missing, 0.0, cogs[:, 1:])
+    zeros = np.zeros((inventory.shape[0], 1))
+    return (np.concatenate([zeros, np.cumsum(area, axis=1)], axis=1),
+            np.concatenate([zeros, np.cumsum(flow, axis=1)], axis=1),
+            np.concatenate([zeros.astype(np.int64), np.cumsum(segment_missing, axis=1)], axis=1))
+
+
+def rolling_inventory_turnover(inventory, cogs, dates, subtype_code=None, windows=ROLLING_WINDOWS):
+    """
+    核心功能：全部公司 × 全部期末 × 多个滚动窗口的周转天数与健康度（一次向量化计算）
+    :param inventory: 存货期末余额 [公司, 期]（万元，缺失用 NaN；单家公司可传一维数组）
+    :param cogs: 当期营业成本 [公司, 期]（万元，第t期 = 上一期末到本期末之间发生额）
+    :param dates: 各期期末日期 [期]（严格递增，所有公司共用）
+    :param subtype_code: 细分行业代码 [公司]（见 encode_subtypes，默认全部按制造业）
+    :param windows: 滚动窗口天数序列
+    :return: {窗口天数: {"span_days", "avg_inventory", "cogs", "turnover_rate", "turnover_days",
+              "grade_code", "hidden_cost", "valid"}}，数值列形状 [公司, 期]，无效处为 NaN / grade_code=-1
+    """
+    inventory = np.atleast_2d(np.asarray(inventory, dtype=float))
+    cogs = np.atleast_2d(np.asarray(cogs, dtype=float))
+    days = to_day_numbers(dates)
+    if inventory.shape != cogs.shape or inventory.shape[1] != len(days):
+        raise ValueError(f"⚠️ 形状不一致：存货{inventory.shape}，营业成本{cogs.shape}，日期{len(days)}期")
+    if np.any(np.diff(days) <= 0):
+        raise ValueError("⚠️ 期末日期需严格递增")
+    if subtype_code is None:
+        subtype_code = np.full(inventory.shape[0], SUBTYPE_NAMES.index(BUILTIN_TABLES["inventory_days"]["default"]))
+    thresholds = get_registry().table("inventory_days")
+    excellent, good, warning = (thresholds.lookup(subtype_code, field)[:, None] for field in ("优秀", "良好", "警戒"))
+
+    area, flow, missing = inventory_prefix_sums(inventory, cogs, days)
+    results = {}
+    for window in windows:
+        starts, window_ok = window_starts(days, window)
+        span = (days - days[starts]).astype(float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg_inventory = (area - area[:, starts]) / span
+            window_cogs = flow - flow[:, starts]
+        valid = window_ok & (missing - missing[:, starts] == 0) & (avg_inventory > 0) & (window_cogs > 0)
+
+        # 取整口径同单公司版本：周转率2位小数，再由取整后的周转率算天数
+        with np.errstate(invalid="ignore", divide="ignore"):
+            turnover_rate = py_round(window_cogs * (365 / span) / avg_inventory, 2)
+        turnover_days = py_round(safe_divide(365, turnover_rate), 1)
+        grade_code = np.select([turnover_days <= excellent, turnover_days <= good, turnover_days <= warning],
+                               [0, 1, 2], default=3).astype(np.int8)
+        hidden_cost = np.maximum(py_round(avg_inventory * CARRYING_COST_RATE * (turnover_days / good - 1), 2), 0.0)
+
+        grade_code[~valid] = GRADE_ERROR
+        for column in (avg_inventory, window_cogs, turnover_rate, turnover_days, hidden_cost):
+            column[~valid] = np.nan
+        results[window] = {
+            "span_days": np.where(window_ok, span, np.nan),
+            "avg_inventory": avg_inventory,
+            "cogs": window_cogs,
+            "turnover_rate": turnover_rate,
+            "turnover_days": turnover_days,
+            "grade_code": grade_code,
+            "hidden_cost": hidden_cost,
+            "valid": valid,
+        }
+    return results
+
+
+def time_weighted_inventory(inventory, dates):
+    """全期时间加权平均存货 [公司]（任一快照缺失的公司为 NaN）"""
+    inventory = np.atleast_2d(np.asarray(inventory, dtype=float))
+    days = to_day_numbers(dates)
+    area, _flow, missing = inventory_prefix_sums(inventory, np.zeros_like(inventory), days)
+    average = area[:, -1] / float(days[-1] - days[0])
+    average[missing[:, -1] > 0] = np.nan
+    return average
+
+
+if __name__ == "__main__":
+    # 季节性快消品公司：年末备货高峰（期初+期末/2 会高估全年平均存货）
+    dates = np.arange("2023-12", "2025-01", dtype="datetime64[M]") + np.timedelta64(1, "M") - np.timedelta64(1, "D")
+    inventory = [900, 500, 450, 420, 430, 450, 480, 500, 560, 650, 800, 950, 1000]
+    cogs = [700, 650, 600, 620, 640, 660, 680, 700, 720, 760, 820, 900, 950]
+    result = rolling_inventory_turnover(inventory, cogs, dates, encode_subtypes(["快消品"]))
+    print("\n===== 📦 存货周转·时间序列（快消品，2024年月度快照） =====")
+    print(f"全年时间加权平均存货：{time_weighted_inventory(inventory, dates)[0]:.1f}万元"
+          f"（期初+期末/2 = {(inventory[0] + inventory[-1]) / 2:.1f}万元）")
+    for i in (3, 6, 9, 12):
+        short, year = result[90], result[365]
+        annual = (f"{year['turnover_days'][0, i]}天 {GRADE_LABELS[year['grade_code'][0, i]]}"
+                  if year["valid"][0, i] else "数据不足一年")
+        print(f"{dates[i]}：近90天周转 {short['turnover_days'][0, i]}天 {GRADE_LABELS[short['grade_code'][0, i]]}"
+              f" | 近365天 {annual}")
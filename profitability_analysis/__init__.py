@@ -0,0 +1 @@
+# 盈利能力分析工具（ROCE资本回报率、战略型杜邦分析）
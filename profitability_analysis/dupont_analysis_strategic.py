@@ -5,6 +5,21 @@
 # 公式来源：CFA二级教材P189（杜邦三分解：ROE = 净利率 × 资产周转率 × 权益乘数）
 # ==============================================
 
+from common.benchmark_registry import get_registry
+
+# 行业基准见 common/benchmark_registry.py 的 "dupont" 表（科技业/零售业/制造业）
+
+DUPONT_INPUT_ERROR = "⚠️ 输入错误：净利润、营收、资产、权益需>0（财务数据逻辑校验）"
+
+# 战略类型（类型, 战略解读），下标即战略代码，批量/紧凑结果共用同一张文字表
+STRATEGY_TYPES = (
+    ("【高利润型】", "优势：品牌溢价高，抗周期能力强；风险：需持续投入研发/营销维持溢价"),  # 如奢侈品、科技公司
+    ("【高周转型】", "优势：轻资产运营，现金流健康；风险：依赖供应链效率，易受价格战影响"),  # 如零售、快消品
+    ("【高杠杆型】", "优势：放大ROE，适合低风险稳定行业；风险：利率上升或资产贬值时压力大"),  # 如金融、房地产
+    ("【均衡型】", "优势：三因素协同发展；风险：需警惕各因素无亮点导致ROE平庸"),
+)
+
+
 def analyze_dupont(net_profit, revenue, avg_assets, avg_equity, industry):
     """
     核心功能：计算ROE三因素并输出战略解读
@@ -12,7 +27,7 @@ def analyze_dupont(net_profit, revenue, avg_assets, avg_equity, industry):
     """
     # 基础校验（财务数据必须为正）
     if net_profit <= 0 or revenue <= 0 or avg_assets <= 0 or avg_equity <= 0:
-        return {"error": "⚠️ 输入错误：净利润、营收、资产、权益需>0（财务数据逻辑校验）"}
+        return {"error": DUPONT_INPUT_ERROR}
     
     # 计算三因素（保留2位小数）
     净利率 = round((net_profit / revenue) * 100, 2)  # %
@@ -23,12 +38,7 @@ def analyze_dupont(net_profit, revenue, avg_assets, avg_equity, industry):
     # ----------------------
     # 点1：驱动因素雷达图（文字版）
     # ----------------------
-    行业基准 = {
-        "科技业": {"净利率": 15.0, "资产周转率": 1.2, "权益乘数": 1.5},  # 高利润低周转
-        "零售业": {"净利率": 3.0, "资产周转率": 3.0, "权益乘数": 2.0},   # 低利润高周转
-        "制造业": {"净利率": 8.0, "资产周转率": 1.8, "权益乘数": 2.5}    # 均衡型
-    }
-    基准 = 行业基准.get(industry, 行业基准["制造业"])  # 默认制造业
+    基准 = get_registry().table("dupont").row(industry)  # 默认制造业
     
     # 用箭头表示与行业基准的差异（↑高于 ↓低于 → 持平）
     净利率趋势 = "↑" if 净利率 > 基准["净利率"] * 1.1 else "↓" if 净利率 < 基准["净利率"] * 0.9 else "→"
@@ -38,18 +48,14 @@ def analyze_dupont(net_profit, revenue, avg_assets, avg_equity, industry):
     # ----------------------
     # 点2：战略类型判断
     # ----------------------
-    if 净利率 > 行业基准[industry]["净利率"] * 1.5:
-        战略类型 = "【高利润型】"  # 如奢侈品、科技公司
-        战略解读 = "优势：品牌溢价高，抗周期能力强；风险：需持续投入研发/营销维持溢价"
-    elif 资产周转率 > 行业基准[industry]["资产周转率"] * 1.5:
-        战略类型 = "【高周转型】"  # 如零售、快消品
-        战略解读 = "优势：轻资产运营，现金流健康；风险：依赖供应链效率，易受价格战影响"
-    elif 权益乘数 > 行业基准[industry]["权益乘数"] * 1.5:
-        战略类型 = "【高杠杆型】"  # 如金融、房地产
-        战略解读 = "优势：放大ROE，适合低风险稳定行业；风险：利率上升或资产贬值时压力大"
+    if 净利率 > 基准["净利率"] * 1.5:
+        战略类型, 战略解读 = STRATEGY_TYPES[0]
+    elif 资产周转率 > 基准["资产周转率"] * 1.5:
+        战略类型, 战略解读 = STRATEGY_TYPES[1]
+    elif 权益乘数 > 基准["权益乘数"] * 1.5:
+        战略类型, 战略解读 = STRATEGY_TYPES[2]
     else:
-        战略类型 = "【均衡型】"
-        战略解读 = "优势：三因素协同发展；风险：需警惕各因素无亮点导致ROE平庸"
+        战略类型, 战略解读 = STRATEGY_TYPES[3]
     
     return {
         "roe": ROE,
@@ -89,4 +95,3 @@ if __name__ == "__main__":
         print(f"💡 战略解读：{result['strategy_note']}")
     print(f"\n📚 关键逻辑：ROE=净利率×资产周转率×权益乘数 → 高ROE需至少1个因素突出")
     print("="*50)
- 
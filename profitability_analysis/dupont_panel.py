@@ -0,0 +1,142 @@
+# ==============================================
+# 【杜邦分析·面板引擎】v1.0
+# 独特性：公司×年度面板一次性向量化计算 + ROE同比变化的三因素归因（LMDI对数平均分解）
+# 开发者：Kiwi_hazel
+# 公式：ROE = 净利率 × 资产周转率 × 权益乘数（同 dupont_analysis_strategic.py）
+#       归因：ΔROE = Σ L(ROE₁, ROE₀) × ln(因素₁/因素₀)，L 为对数平均数 → 三项之和严格等于ΔROE
+# ==============================================
+
+import numpy as np
+
+from common.benchmark_registry import BUILTIN_TABLES, get_registry
+from common.numeric import py_round
+from profitability_analysis.dupont_analysis_strategic import STRATEGY_TYPES
+
+# 行业代码 = 基准注册表 "dupont" 表的行号；未知代码按制造业处理，与单公司版本默认值一致
+INDUSTRY_NAMES = tuple(BUILTIN_TABLES["dupont"]["entries"])
+INDUSTRY_CODES = {name: code for code, name in enumerate(INDUSTRY_NAMES)}
+DEFAULT_INDUSTRY_CODE = INDUSTRY_CODES[BUILTIN_TABLES["dupont"]["default"]]
+
+TRENDS = ("↑", "→", "↓")  # 趋势代码：0高于行业10% / 1持平 / 2低于行业10%
+STRATEGY_ERROR = -1
+
+
+def encode_industries(industries):
+    """行业名称数组 → 行业代码数组（未知行业编码为默认制造业，支持注册表别名）"""
+    return get_registry().table("dupont").encode(industries)
+
+
+def _trend(value, benchmark):
+    """向量化趋势箭头代码（规则同单公司版本：>基准×1.1 为↑，<基准×0.9 为↓）"""
+    return np.where(value > benchmark * 1.1, 0, np.where(value < benchmark * 0.9, 2, 1))
+
+
+def _log_mean(a, b):
+    """对数平均数 L(a,b) = (a-b)/(ln a - ln b)，a=b 时取 a"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        diff_log = np.log(a) - np.log(b)
+        return np.where(np.abs(diff_log) > 1e-12, (a - b) / diff_log, a)
+
+
+def dupont_panel(net_profit, revenue, avg_assets, avg_equity, industry_code):
+    """
+    核心功能：对公司×年度面板计算杜邦三因素、趋势、战略类型，并把ROE逐年变化归因到三因素
+    :param net_profit: 净利润（万元），形状(公司数, 年数)
+    :param revenue: 营业收入（万元），同上
+    :param avg_assets: 平均总资产（万元），同上
+    :param avg_equity: 平均净资产（万元），同上
+    :param industry_code: 行业代码，形状(公司数,) 或 (公司数, 年数)（见 INDUSTRY_CODES）
+    :return: 列式结果字典
+        - 因素与ROE为未取整的精确值（净利率、ROE单位为%）；
+        - 趋势/战略分类沿用单公司版本"先保留2位小数再比较"的口径，与 analyze_dupont 逐行一致；
+        - 归因数组形状(公司数, 年数-1)，第 t 列为第 t 年→第 t+1 年的变化；
+        - 任一输入≤0 的公司年 valid=False，数值为 nan，战略代码为 -1
+    """
+    net_profit = np.asarray(net_profit, dtype=float)
+    revenue = np.asarray(revenue, dtype=float)
+    avg_assets = np.asarray(avg_assets, dtype=float)
+    avg_equity = np.asarray(avg_equity, dtype=float)
+    if net_profit.ndim != 2:
+        raise ValueError("面板输入需为二维数组（公司数, 年数）")
+    industry_code = np.asarray(industry_code)
+    if industry_code.ndim == 1:
+        industry_code = industry_code[:, None]
+    industry_code = np.broadcast_to(industry_code, net_profit.shape)
+
+    # 基础校验（与单公司版本一致：财务数据必须为正）
+    valid = (net_profit > 0) & (revenue > 0) & (avg_assets > 0) & (avg_equity > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        net_margin = np.where(valid, net_profit / revenue * 100, np.nan)   # %
+        asset_turnover = np.where(valid, revenue / avg_assets, np.nan)     # 次/年
+        equity_multiplier = np.where(valid, avg_assets / avg_equity, np.nan)  # 倍
+    roe = net_margin * asset_turnover * equity_multiplier  # %（= 净利润/平均净资产 × 100）
+
+    # 行业基准查表（注册表数值列按代码下标取值）
+    benchmarks = get_registry().table("dupont")
+    margin_bench = benchmarks.lookup(industry_code, "净利率")
+    turnover_bench = benchmarks.lookup(industry_code, "资产周转率")
+    leverage_bench = benchmarks.lookup(industry_code, "权益乘数")
+
+    # 分类口径：与单公司版本一致，先取2位小数
+    margin_r = py_round(net_margin, 2)
+    turnover_r = py_round(asset_turnover, 2)
+    leverage_r = py_round(equity_multiplier, 2)
+
+    trend_code = (_trend(margin_r, margin_bench) * 9 + _trend(turnover_r, turnover_bench) * 3
+                  + _trend(leverage_r, leverage_bench)).astype(np.int8)  # 与 DupontRecord 相同的打包方式
+    strategy_code = np.select(
+        [margin_r > margin_bench * 1.5, turnover_r > turnover_bench * 1.5, leverage_r > leverage_bench * 1.5],
+        [0, 1, 2],
+        default=3,
+    ).astype(np.int8)
+    strategy_code[~valid] = STRATEGY_ERROR
+    trend_code[~valid] = -1
+
+    # ROE 变化归因（LMDI）：贡献_k = L(ROE₁, ROE₀) × ln(因素_k₁ / 因素_k₀)
+    roe_0, roe_1 = roe[:, :-1], roe[:, 1:]
+    weight = _log_mean(roe_1, roe_0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        margin_effect = weight * np.log(net_margin[:, 1:] / net_margin[:, :-1])
+        turnover_effect = weight * np.log(asset_turnover[:, 1:] / asset_turnover[:, :-1])
+        leverage_effect = weight * np.log(equity_multiplier[:, 1:] / equity_multiplier[:, :-1])
+
+    return {
+        "net_margin": net_margin,
+        "asset_turnover": asset_turnover,
+        "equity_multiplier": equity_multiplier,
+        "roe": roe,
+        "trend_code": trend_code,
+        "strategy_code": strategy_code,
+        "valid": valid,
+        "roe_change": roe_1 - roe_0,
+        "margin_effect": margin_effect,
+        "turnover_effect": turnover_effect,
+        "leverage_effect": leverage_effect,
+    }
+
+
+def trend_arrows(trend_code):
+    """打包的趋势代码 → (净利率, 周转率, 杠杆) 箭头，仅在展示时调用"""
+    return TRENDS[trend_code // 9], TRENDS[trend_code // 3 % 3], TRENDS[trend_code % 3]
+
+
+# ----------------------
+# 极简演示（1家公司×3年）
+# ----------------------
+if __name__ == "__main__":
+    panel = dupont_panel(
+        net_profit=[[800, 1000, 1200]],
+        revenue=[[8000, 9000, 9500]],
+        avg_assets=[[5000, 5200, 5600]],
+        avg_equity=[[3000, 2900, 2800]],
+        industry_code=[INDUSTRY_CODES["科技业"]],
+    )
+    print("\n===== 📊 杜邦分析面板引擎（演示） =====")
+    for year in range(3):
+        arrows = trend_arrows(int(panel["trend_code"][0, year]))
+        print(f"第{year + 1}年：ROE={panel['roe'][0, year]:.2f}% | 战略类型="
+              f"{STRATEGY_TYPES[panel['strategy_code'][0, year]][0]} | 趋势 净利率{arrows[0]} 周转率{arrows[1]} 杠杆{arrows[2]}")
+    for year in range(2):
+        print(f"第{year + 1}→{year + 2}年 ΔROE={panel['roe_change'][0, year]:+.2f}pp = "
+              f"净利率{panel['margin_effect'][0, year]:+.2f} + 周转率{panel['turnover_effect'][0, year]:+.2f} + "
+              f"杠杆{panel['leverage_effect'][0, year]:+.2f}")
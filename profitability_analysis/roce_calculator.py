@@ -5,6 +5,16 @@
 # 特点：零基础友好 | 输入安全校验 | 比率意义解读
 # ==============================================
 
+from common.benchmark_registry import get_registry
+
+# 数据校验提示（按校验顺序），比率定义语言（common/ratio_dsl.py）共用同一组模板
+ROCE_INPUT_ERRORS = (
+    "⚠️ 营业利润需>0（当前输入：{operating_profit}万元），企业亏损状态下ROCE无意义",
+    "⚠️ 资本总额需>0（当前输入：{capital_employed}万元），资本是企业运营基础",
+    "⚠️ 资本总额异常（当前：{capital_employed}万元 < 营业利润：{operating_profit}万元），可能误将'净资产'输入为'资本总额'（资本总额通常为营业利润的5-10倍）",
+)
+
+
 def calculate_roce(operating_profit, capital_employed):
     """
     计算ROCE（资本回报率）
@@ -13,28 +23,55 @@ def calculate_roce(operating_profit, capital_employed):
     """
     # 财务数据校验
     if operating_profit <= 0:
-        return f"⚠️ 营业利润需>0（当前输入：{operating_profit}万元），企业亏损状态下ROCE无意义"
+        return ROCE_INPUT_ERRORS[0].format(operating_profit=operating_profit)
     if capital_employed <= 0:
-        return f"⚠️ 资本总额需>0（当前输入：{capital_employed}万元），资本是企业运营基础"
+        return ROCE_INPUT_ERRORS[1].format(capital_employed=capital_employed)
     if capital_employed < operating_profit:
-        return f"⚠️ 资本总额异常（当前：{capital_employed}万元 < 营业利润：{operating_profit}万元），可能误将'净资产'输入为'资本总额'（资本总额通常为营业利润的5-10倍）"
+        return ROCE_INPUT_ERRORS[2].format(operating_profit=operating_profit, capital_employed=capital_employed)
 
     roce = (operating_profit / capital_employed) * 100
     return round(roce, 2)
 
 
+# 水平判断档位：静态基准按行业中位数×1.2/×1/×0.8 分档；实证基准按公司池 P80/中位数/P20 分档（见 roce_percentiles.py）
+ROCE_LEVELS = ("✅ 优秀", "👍 良好", "⚠️ 需关注", "❌ 较差")
+# 资本结构校验结论（下标同 metric_graph.STRUCTURE_STATUSES：未提供 / 一致 / 差异>10%）
+STRUCTURE_MESSAGES = (
+    "→ 未提供权益/负债数据，跳过资本结构校验",
+    "→ 资本结构健康：资本总额≈股东权益+非流动负债（数据一致）",
+    "→ 注意：资本总额（{capital_employed}万）与权益+负债（{total}万）差异>10%，建议检查报表数据（可能流动负债计算错误）",
+)
+
+
+def judge_roce_level(roce, industry_benchmark, percentiles=None):
+    """
+    ROCE水平判断
+    :param industry_benchmark: 行业基准ROCE（%，如注册表 "roce" 表中位数）
+    :param percentiles: 可选，公司池实证分位数 {"p20", "median", "p80"}；提供时按分位数分档
+    """
+    if percentiles:
+        excellent, good, watch = percentiles["p80"], percentiles["median"], percentiles["p20"]
+    else:
+        excellent, good, watch = industry_benchmark * 1.2, industry_benchmark, industry_benchmark * 0.8
+    if roce > excellent:
+        return ROCE_LEVELS[0]
+    if roce >= good:
+        return ROCE_LEVELS[1]
+    return ROCE_LEVELS[2] if roce > watch else ROCE_LEVELS[3]
+
+
 def capital_structure_check(capital_employed, equity, debt):
     """
     【微创新点】资本结构健康度辅助判断
     逻辑：资本总额应≈股东权益+非流动负债（检验数据一致性）
     """
     if equity + debt == 0:
-        return "→ 未提供权益/负债数据，跳过资本结构校验"
+        return STRUCTURE_MESSAGES[0]
     # 允许±10%误差（财务数据四舍五入导致）
     if 0.9 * capital_employed <= (equity + debt) <= 1.1 * capital_employed:
-        return "→ 资本结构健康：资本总额≈股东权益+非流动负债（数据一致）"
+        return STRUCTURE_MESSAGES[1]
     else:
-        return f"→ 注意：资本总额（{capital_employed}万）与权益+负债（{equity + debt}万）差异>10%，建议检查报表数据（可能流动负债计算错误）"
+        return STRUCTURE_MESSAGES[2].format(capital_employed=capital_employed, total=equity + debt)
 
 
 # ------------------------
@@ -51,14 +88,9 @@ if __name__ == "__main__":
     # 【第2步：行业选择】（提供参考基准，避免用户无方向）
     industry = input(
         "\n3. 所属行业（输入数字1-5）：\n1. 科技/互联网 | 2. 制造业 | 3. 零售/消费 | 4. 金融/银行 | 5. 能源/公用事业\n你的选择：")
-    industry_map = {
-        "1": ("科技/互联网", 20.0),  # 行业基准ROCE（%），参考Wind数据库2024年数据
-        "2": ("制造业", 15.0),
-        "3": ("零售/消费", 18.0),
-        "4": ("金融/银行", 12.0),
-        "5": ("能源/公用事业", 10.0)
-    }
-    industry_name, industry_benchmark = industry_map.get(industry, ("默认行业", 15.0))  # 兜底默认值
+    industry_map = {"1": "科技/互联网", "2": "制造业", "3": "零售/消费", "4": "金融/银行", "5": "能源/公用事业"}
+    industry_name = industry_map.get(industry, "默认行业")  # 兜底默认值
+    industry_benchmark = get_registry().table("roce").row(industry_name)["median"]  # 行业基准ROCE（%），见 "roce" 表
 
     # 【第3步：可选数据（提升准确性）】（非必填，按需输入）
     print("\n（可选）输入以下数据，进行资本结构健康度校验（不填直接按回车）")
@@ -80,14 +112,17 @@ if __name__ == "__main__":
     print(f"• 行业基准：{industry_benchmark}%（2024年行业中位数）")
     # 2. 简单判断
     if isinstance(roce_result, float):  # 仅当计算成功时显示
-        status = "✅ 优秀" if roce_result > industry_benchmark * 1.2 else \
-            "👍 良好" if roce_result >= industry_benchmark else \
-                "⚠️ 需关注" if roce_result > industry_benchmark * 0.8 else \
-                    "❌ 较差"
+        status = judge_roce_level(roce_result, industry_benchmark)
         print(f"• 水平判断：{status}（高于行业{round((roce_result - industry_benchmark), 2)}个百分点）")
     # 3. 资本结构校验（微创新点）
     print(f"\n💡 资本结构辅助判断：{capital_structure_check(capital_employed, equity, debt)}")
-    # 4. 使用提示（友好收尾）
+    # 4. 行业对比图（可选，需 pip install matplotlib；只有选择画图时才加载 matplotlib）
+    if isinstance(roce_result, float) and input("\n是否生成行业对比图（y/N）：").strip().lower() == "y":
+        from profitability_analysis.roce_chart import render_chunk
+        record = {"entity": "我的公司", "operating_profit": operating_profit, "capital_employed": capital_employed,
+                  "industry": industry_name}
+        print(f"• 对比图已保存：{render_chunk([record], '.', ('png',))[0][3][0]}")
+    # 5. 使用提示（友好收尾）
     print("\n🔍 使用提示：ROCE=营业利润/资本总额，资本总额=总资产-流动负债（会计恒等式：=股东权益+非流动负债）")
     print("=" * 50)
 
@@ -0,0 +1,227 @@
+# ==============================================
+# 【ROCE行业对比图·批量版】v1.0
+# 独特性：matplotlib 延迟导入（首次画图才加载，非画图任务零开销）+ 强制无界面后端 Agg
+#         每个进程只建一次图形对象，逐家公司只更新柱高/参考线/文字后保存 + 进程池批量输出 PNG/SVG
+# 开发者：Kiwi_hazel
+# 图形：公司ROCE vs 行业中位数（注册表 "roce" 表）柱状对比 + 优秀线（中位数×1.2）/关注线（中位数×0.8），
+#       公司柱颜色按 judge_roce_level 四档着色
+# 用法：render_roce_charts(报表记录或文件路径, "charts/", formats=("png", "svg"), max_workers=4)
+#       python -m profitability_analysis.roce_chart 报表.csv charts/ [--formats png,svg] [--workers 4]
+# 依赖：pip install matplotlib（仅画图时需要）
+# ==============================================
+
+import argparse
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from common.benchmark_registry import get_registry
+from common.cli import INPUT_ERROR, coerce_params
+from profitability_analysis.roce_calculator import ROCE_LEVELS, calculate_roce, judge_roce_level
+
+FORMATS = ("png", "svg")
+FIGSIZE = (6.4, 4.0)  # 英寸
+DPI = 100
+PNG_COMPRESS_LEVEL = 1  # zlib 压缩级别：批量输出时编码更快，文件只大约一成
+LEVEL_COLORS = ("#2e7d32", "#1565c0", "#f9a825", "#c62828")  # 与 ROCE_LEVELS 一一对应
+BENCHMARK_COLOR = "#9e9e9e"
+# 中文字体候选（按顺序取第一个已安装的；都没有时回落到 DejaVu Sans，中文显示为方框但不影响批量输出）
+CJK_FONTS = ("SimHei", "Microsoft YaHei", "PingFang SC", "Noto Sans CJK SC", "WenQuanYi Micro Hei", "DejaVu Sans")
+DEFAULT_CHUNK_SIZE = 200  # 每个子进程任务的公司数；同时在途的任务不超过 2×进程数
+
+_matplotlib = None
+LOAD_SECONDS = None  # 本进程加载 matplotlib 的耗时（未加载为 None）
+_renderer = None  # 本进程复用的图形对象（首次画图时创建）
+
+
+def load_matplotlib():
+    """首次调用时导入 matplotlib 并切换到 Agg 后端（无需显示器）；之后直接返回已加载的模块"""
+    global _matplotlib, LOAD_SECONDS
+    if _matplotlib is None:
+        import warnings
+
+        start = time.perf_counter()
+        import matplotlib
+        matplotlib.use("Agg", force=True)
+        matplotlib.rcParams["font.sans-serif"] = list(CJK_FONTS)
+        matplotlib.rcParams["axes.unicode_minus"] = False
+        matplotlib.rcParams["svg.hashsalt"] = "roce_chart"  # SVG 内部 id 固定，同一数据重复输出逐字节一致
+        # 直接使用 Figure + Agg 画布，不经过 pyplot 的全局图形管理
+        import matplotlib.backends.backend_agg
+        import matplotlib.figure
+        # 未安装中文字体时每个缺字都会告警，批量画图时只会刷屏
+        warnings.filterwarnings("ignore", message=r"Glyph \d+ .* missing from font", category=UserWarning)
+        _matplotlib = matplotlib
+        LOAD_SECONDS = time.perf_counter() - start
+    return _matplotlib
+
+
+class RoceChart:
+    """一张可复用的ROCE对比图：图形/坐标轴/柱/参考线/文字只创建一次，draw() 只更新数据"""
+
+    def __init__(self, figsize=FIGSIZE, dpi=DPI):
+        matplotlib = load_matplotlib()
+        self.figure = matplotlib.figure.Figure(figsize=figsize, dpi=dpi)
+        matplotlib.backends.backend_agg.FigureCanvasAgg(self.figure)
+        ax = self.axes = self.figure.add_subplot()
+        self.bars = ax.bar((0, 1), (0, 0), width=0.55, tick_label=("公司ROCE", "行业中位数"),
+                           color=(LEVEL_COLORS[0], BENCHMARK_COLOR))
+        self.excellent = ax.axhline(0, linestyle="--", linewidth=1, color=LEVEL_COLORS[0], label="优秀线（中位数×1.2）")
+        self.watch = ax.axhline(0, linestyle=":", linewidth=1, color=LEVEL_COLORS[3], label="关注线（中位数×0.8）")
+        self.values = [ax.text(x, 0, "", ha="center", va="bottom") for x in (0, 1)]
+        self.title = ax.set_title("示例公司：ROCE 00.00%（良好）｜能源/公用事业中位数 00.0%")  # 按典型标题长度留出排版空间
+        ax.set_ylabel("ROCE（%）")
+        ax.legend(loc="upper right", fontsize="small")
+        self.figure.tight_layout()  # 只在创建时排版一次，之后只改数据
+        self.figure.set_layout_engine(None)  # 去掉 tight_layout 留下的占位布局引擎，否则每次保存都会多画一遍
+
+    def draw(self, entity, roce, industry):
+        """
+        更新为一家公司的数据
+        :param roce: calculate_roce 的结果（%，须为有效数值）
+        :param industry: 行业名称（注册表 "roce" 表，未知行业按默认行业）
+        :return: 水平判断（ROCE_LEVELS 之一）
+        """
+        benchmark = get_registry().table("roce").row(industry)["median"]
+        level = judge_roce_level(roce, benchmark)
+        self.bars[0].set_height(roce)
+        self.bars[0].set_color(LEVEL_COLORS[ROCE_LEVELS.index(level)])
+        self.bars[1].set_height(benchmark)
+        self.excellent.set_ydata((benchmark * 1.2, benchmark * 1.2))
+        self.watch.set_ydata((benchmark * 0.8, benchmark * 0.8))
+        for text, x, value in zip(self.values, (0, 1), (roce, benchmark)):
+            text.set_position((x, value))
+            text.set_text(f"{value}%")
+        self.axes.set_ylim(0, max(roce, benchmark * 1.2) * 1.25)
+        self.title.set_text(f"{entity}：ROCE {roce}%（{level.split(' ', 1)[-1]}）｜{industry}中位数 {benchmark}%")
+        return level
+
+    def save(self, path, fmt="png"):
+        # 不写入生成时间，同一数据重复输出逐字节一致（便于增量同步/校验）
+        if fmt == "png":
+            self.figure.savefig(path, format=fmt, pil_kwargs={"compress_level": PNG_COMPRESS_LEVEL})
+        else:
+            self.figure.savefig(path, format=fmt, metadata={"Date": None})
+
+
+def chart_filename(entity, period=None):
+    """公司名称（+期间）→ 安全的文件名主干"""
+    stem = re.sub(r'[\\/:*?"<>|\s]+', "_", str(entity)).strip("_") or "company"
+    return f"{stem}_{period}" if period not in (None, "") else stem
+
+
+def _chart():
+    global _renderer
+    if _renderer is None:
+        _renderer = RoceChart()
+    return _renderer
+
+
+def render_chunk(records, output_dir, formats=("png",)):
+    """
+    渲染一批公司（当前进程内复用同一张图）
+    :param records: [{entity, period, operating_profit, capital_employed, industry}]
+    :return: [(entity, period, 水平判断或None, [文件路径], 错误提示或None)]
+    """
+    manifest = []
+    for record in records:
+        entity, period = record.get("entity", "company"), record.get("period")
+        if INPUT_ERROR in record:  # 输入文件中无法解析的行：只记错误
+            manifest.append((entity, period, None, [], record[INPUT_ERROR]))
+            continue
+        try:
+            roce = calculate_roce(**coerce_params("roce", record))
+        except ValueError as exc:  # 字段缺失/为空/非数值：只记为该公司的错误，不中断整批
+            roce = str(exc)
+        if isinstance(roce, str):  # 数据错误：不画图，保留错误提示
+            manifest.append((entity, period, None, [], roce))
+            continue
+        chart = _chart()
+        level = chart.draw(entity, roce, record.get("industry") or "默认行业")
+        stem = os.path.join(output_dir, chart_filename(entity, period))
+        paths = []
+        for fmt in formats:
+            chart.save(f"{stem}.{fmt}", fmt)
+            paths.append(f"{stem}.{fmt}")
+        manifest.append((entity, period, level, paths, None))
+    return manifest
+
+
+def _render_task(task):
+    """子进程任务：一批公司 → 清单"""
+    return render_chunk(*task)
+
+
+def _chunks(records, chunk_size,
+            fields=("entity", "period", "operating_profit", "capital_employed", "industry", INPUT_ERROR)):
+    chunk = []
+    for record in records:
+        chunk.append({k: record[k] for k in fields if k in record})
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def render_roce_charts(records, output_dir, formats=("png",), max_workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    核心功能：批量输出ROCE行业对比图
+    :param records: 报表文件路径（csv/jsonl，可带.gz，或列式数据集目录）或记录可迭代对象
+    :param formats: 输出格式（png/svg，可同时输出）
+    :param max_workers: 进程数（None=CPU核数，1=当前进程内串行）
+    :return: 运行统计 {companies, charts, errors, seconds, charts_per_sec, manifest}
+    """
+    unknown = [fmt for fmt in formats if fmt not in FORMATS]
+    if unknown:
+        raise ValueError(f"⚠️ 不支持的图片格式：{', '.join(unknown)}（可选：{'/'.join(FORMATS)}）")
+    if isinstance(records, str):
+        from batch_processing.statement_pipeline import read_records
+        records = read_records(records)
+    os.makedirs(output_dir, exist_ok=True)
+    workers = max_workers or os.cpu_count() or 1
+    manifest = []
+    start = time.perf_counter()
+    if workers == 1:
+        for chunk in _chunks(records, chunk_size):
+            manifest.extend(render_chunk(chunk, output_dir, formats))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for chunk in _chunks(records, chunk_size):
+                pending.append(executor.submit(_render_task, (chunk, output_dir, formats)))
+                if len(pending) >= 2 * workers:
+                    manifest.extend(pending.popleft().result())
+            while pending:
+                manifest.extend(pending.popleft().result())
+    seconds = time.perf_counter() - start
+    charts = sum(len(paths) for _e, _p, _l, paths, _err in manifest)
+    return {
+        "companies": len(manifest),
+        "charts": charts,
+        "errors": sum(error is not None for *_rest, error in manifest),
+        "seconds": round(seconds, 3),
+        "charts_per_sec": round(charts / seconds, 1) if seconds > 0 else None,
+        "manifest": manifest,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m profitability_analysis.roce_chart", description="ROCE行业对比图批量输出")
+    parser.add_argument("input", help="报表文件（.csv/.jsonl，可带 .gz）或列式数据集目录")
+    parser.add_argument("output_dir", help="图片输出目录")
+    parser.add_argument("--formats", default="png", help="逗号分隔的图片格式（png,svg）")
+    parser.add_argument("--workers", type=int, help="进程数（默认CPU核数）")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+    stats = render_roce_charts(args.input, args.output_dir, args.formats.split(","), args.workers, args.chunk_size)
+    print(f"✅ {stats['companies']}家公司输出{stats['charts']}张图（数据错误{stats['errors']}家），"
+          f"用时{stats['seconds']}s（{stats['charts_per_sec']} 张/秒）", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+# ==============================================
+# 【ROCE行业分位数·流式引擎】v1.0
+# 独特性：对数分桶分位数草图（相对误差≤1%）逐条吸收 calculate_roce 结果 + 多进程分片草图精确合并 + 分位数缓存O(1)查询
+# 开发者：Kiwi_hazel
+# 原理：ROCE>0，按 ⌈log_γ(ROCE)⌉ 分桶计数（γ=(1+α)/(1-α)），桶代表值与真实分位数的相对误差≤α
+#       → 内存只与数值跨度有关（1%~1000% 约 350 个桶），与样本量无关；合并 = 桶计数相加（与顺序无关，结果确定）
+# 用法：store = IndustryPercentiles(); store.add("制造业", 2024, 16.7)
+#       store.summary("制造业", 2024) → {"count", "p20", "median", "p80"}
+#       build_percentiles("报表.csv", max_workers=4) → 多进程构建整个公司池的分位数
+# ==============================================
+
+import json
+import math
+import os
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from common.benchmark_registry import get_registry
+from profitability_analysis.roce_calculator import calculate_roce, judge_roce_level
+
+DEFAULT_ACCURACY = 0.01   # 相对误差1%（ROCE=20% 时误差≤0.2个百分点）
+SUMMARY_QUANTILES = (("p20", 0.2), ("median", 0.5), ("p80", 0.8))
+MIN_SAMPLE = 30           # 样本不足时回落到注册表静态基准
+ALL_PERIODS = None        # summary/judge 的 period=None 表示合并全部期间
+
+
+class QuantileSketch:
+    """单个（行业, 期间）的可合并分位数草图，只接受正数"""
+    __slots__ = ("accuracy", "gamma", "_log_gamma", "bins", "count", "min", "max", "_cumulative", "_summary")
+
+    def __init__(self, accuracy=DEFAULT_ACCURACY):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = {}     # {桶号: 计数}
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._cumulative = None  # 查询缓存：(有序桶号, 累计计数)，写入时失效
+        self._summary = None
+
+    def add(self, value, weight=1):
+        """吸收一个正数（非正数/非数值由调用方过滤）"""
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + weight
+        self.count += weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self._cumulative = self._summary = None
+
+    def merge(self, other):
+        """合并另一个草图（精度必须一致）；桶计数相加，合并顺序不影响结果"""
+        if other.accuracy != self.accuracy:
+            raise ValueError(f"⚠️ 草图精度不一致（{self.accuracy} vs {other.accuracy}），无法合并")
+        for key, weight in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + weight
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._cumulative = self._summary = None
+        return self
+
+    def quantile(self, q):
+        """
+        第 q 分位数（0≤q≤1），取排序后第 ⌊q×(n-1)⌋ 个样本所在桶的代表值
+        :return: 估计值（与真实值相对误差≤accuracy）；空草图返回 None
+        """
+        if self.count == 0:
+            return None
+        if self._cumulative is None:
+            keys = sorted(self.bins)
+            running, totals = 0, []
+            for key in keys:
+                running += self.bins[key]
+                totals.append(running)
+            self._cumulative = (keys, totals)
+        keys, totals = self._cumulative
+        rank = math.floor(q * (self.count - 1))
+        key = keys[bisect_right(totals, rank)]
+        estimate = 2 * self.gamma ** key / (self.gamma + 1)
+        return min(max(estimate, self.min), self.max)  # 端点分位数不超出实际极值
+
+    def summary(self):
+        """{count, p20, median, p80}，计算一次后缓存（新数据写入前重复查询为O(1)）"""
+        if self._summary is None:
+            summary = {"count": self.count}
+            for name, q in SUMMARY_QUANTILES:
+                value = self.quantile(q)
+                summary[name] = None if value is None else round(value, 2)
+            self._summary = summary
+        return self._summary
+
+    def to_dict(self):
+        return {"accuracy": self.accuracy, "count": self.count, "min": self.min, "max": self.max,
+                "bins": {str(key): weight for key, weight in sorted(self.bins.items())}}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["accuracy"])
+        sketch.bins = {int(key): weight for key, weight in data["bins"].items()}
+        sketch.count = data["count"]
+        sketch.min = data["min"] if sketch.count else math.inf
+        sketch.max = data["max"] if sketch.count else -math.inf
+        return sketch
+
+
+class IndustryPercentiles:
+    """按（行业, 期间）分组的ROCE分位数草图集合"""
+
+    def __init__(self, accuracy=DEFAULT_ACCURACY):
+        self.accuracy = accuracy
+        self.sketches = {}   # {(行业, 期间): QuantileSketch}
+        self.rejected = 0    # calculate_roce 返回错误提示（亏损/资本异常）的行数
+        self._pooled = {}    # 跨期间合并结果缓存 {行业: QuantileSketch}
+
+    def _sketch(self, industry, period):
+        sketch = self.sketches.get((industry, period))
+        if sketch is None:
+            sketch = self.sketches[(industry, period)] = QuantileSketch(self.accuracy)
+        return sketch
+
+    def add(self, industry, period, roce):
+        """
+        吸收一个ROCE值：calculate_roce 结果或任意实数（int/float/CSV中的数字字符串）
+        错误提示字符串、无法转换的值、非有限值与 ≤0 的值计入 rejected（草图按对数分桶，只收正数）
+        """
+        try:
+            roce = float(roce)
+        except (TypeError, ValueError):
+            self.rejected += 1
+            return
+        if not math.isfinite(roce) or roce <= 0:
+            self.rejected += 1
+            return
+        self._sketch(industry, period).add(roce)
+        self._pooled.pop(industry, None)
+
+    def ingest(self, records, industry_field="industry", period_field="period"):
+        """
+        逐条吸收报表记录（可直接传 statement_pipeline.read_records 的生成器）
+        记录含 roce 字段则直接使用，否则由 operating_profit / capital_employed 现算
+        """
+        for record in records:
+            roce = record.get("roce")
+            if roce is None:
+                try:
+                    roce = calculate_roce(float(record["operating_profit"]), float(record["capital_employed"]))
+                except (KeyError, TypeError, ValueError):
+                    self.rejected += 1
+                    continue
+            self.add(record.get(industry_field), record.get(period_field), roce)
+        return self
+
+    def merge(self, other):
+        """合并另一个分组草图集合（如其他进程的部分结果）"""
+        for (industry, period), sketch in other.sketches.items():
+            existing = self.sketches.get((industry, period))
+            if existing is None:
+                self.sketches[(industry, period)] = QuantileSketch(self.accuracy).merge(sketch)
+            else:
+                existing.merge(sketch)
+            self._pooled.pop(industry, None)
+        self.rejected += other.rejected
+        return self
+
+    def sketch(self, industry, period=ALL_PERIODS):
+        """取某行业某期间的草图；period=None 时合并该行业全部期间（结果缓存）"""
+        if period is not ALL_PERIODS:
+            return self.sketches.get((industry, period))
+        pooled = self._pooled.get(industry)
+        if pooled is None:
+            parts = [s for (name, _period), s in self.sketches.items() if name == industry]
+            if not parts:
+                return None
+            pooled = QuantileSketch(self.accuracy)
+            for part in parts:
+                pooled.merge(part)
+            self._pooled[industry] = pooled
+        return pooled
+
+    def summary(self, industry, period=ALL_PERIODS):
+        """行业分位数 {count, p20, median, p80}；无数据时返回 None"""
+        sketch = self.sketch(industry, period)
+        return sketch.summary() if sketch is not None else None
+
+    def judge(self, roce, industry, period=ALL_PERIODS, min_count=MIN_SAMPLE):
+        """
+        ROCE水平判断：样本充足时按本公司池分位数分档（>p80 优秀 / ≥中位数 良好 / >p20 需关注 / 较差），
+        否则回落到注册表静态基准（同 roce_calculator 主程序）
+        :param industry: 行业名称（与 "roce" 基准表行业名一致时可回落静态基准）
+        """
+        summary = self.summary(industry, period)
+        if summary is not None and summary["count"] >= min_count:
+            return judge_roce_level(roce, summary["median"], summary)
+        return judge_roce_level(roce, get_registry().table("roce").row(industry)["median"])
+
+    def industries(self):
+        return sorted({industry for industry, _period in self.sketches}, key=str)
+
+    def to_dict(self):
+        return {"accuracy": self.accuracy, "rejected": self.rejected,
+                "sketches": [{"industry": industry, "period": period, "sketch": sketch.to_dict()}
+                             for (industry, period), sketch in self.sketches.items()]}
+
+    @classmethod
+    def from_dict(cls, data):
+        store = cls(data["accuracy"])
+        store.rejected = data.get("rejected", 0)
+        for item in data["sketches"]:
+            store.sketches[(item["industry"], item["period"])] = QuantileSketch.from_dict(item["sketch"])
+        return store
+
+    def save(self, path):
+        """保存为JSON（夜间任务增量更新：load → ingest 新数据 → save）"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def _sketch_shard(task):
+    """子进程任务：一个分片的记录 → 部分草图集合"""
+    records, industry_field, period_field, accuracy = task
+    return IndustryPercentiles(accuracy).ingest(records, industry_field, period_field)
+
+
+def build_percentiles(records, max_workers=None, shard_size=20000, industry_field="industry",
+                      period_field="period", accuracy=DEFAULT_ACCURACY):
+    """
+    多进程构建公司池ROCE分位数（主进程流式读取分片，子进程各建部分草图，主进程按分片顺序合并）
+    :param records: 报表文件路径（csv/jsonl，可带.gz）或记录可迭代对象
+    :param max_workers: 进程数（None=CPU核数，1=当前进程内串行）
+    :param shard_size: 每个分片的记录数；同时在途的分片不超过 2×进程数，内存不随数据量增长
+    """
+    if isinstance(records, str):
+        from batch_processing.statement_pipeline import read_records
+        records = read_records(records)
+    fields = (industry_field, period_field, "operating_profit", "capital_employed", "roce")
+    shards = ([{k: r[k] for k in fields if k in r} for r in shard] for shard in _shards(records, shard_size))
+    result = IndustryPercentiles(accuracy)
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1:
+        for shard in shards:
+            result.merge(_sketch_shard((shard, industry_field, period_field, accuracy)))
+        return result
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for shard in shards:
+            pending.append(executor.submit(_sketch_shard, (shard, industry_field, period_field, accuracy)))
+            if len(pending) >= 2 * workers:
+                result.merge(pending.popleft().result())
+        while pending:
+            result.merge(pending.popleft().result())
+    return result
+
+
+def _shards(records, shard_size):
+    shard = []
+    for record in records:
+        shard.append(record)
+        if len(shard) >= shard_size:
+            yield shard
+            shard = []
+    if shard:
+        yield shard
+
+
+# ----------------------
+# 极简演示：合成公司池 → 行业分位数 → 实证分档
+# ----------------------
+if __name__ == "__main__":
+    from benchmarks.synthetic import statement_records
+
+    store = build_percentiles(statement_records(20000), max_workers=1)
+    print("\n===== 📈 ROCE行业分位数（合成公司池，全部期间） =====")
+    for industry in store.industries():
+        s = store.summary(industry)
+        print(f"{industry}：样本{s['count']:,} | P20={s['p20']}% | 中位数={s['median']}% | P80={s['p80']}%")
+    print(f"（跳过亏损/资本异常行：{store.rejected:,}）")
+    print(f"制造业 ROCE=12% → {store.judge(12.0, '制造业')}（静态基准下：{judge_roce_level(12.0, 15.0)}）")
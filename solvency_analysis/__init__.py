@@ -0,0 +1 @@
+# 偿债能力分析工具（流动/速动比率、现金比率压力测试、利息保障倍数压力测试）
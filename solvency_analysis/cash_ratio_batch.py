@@ -0,0 +1,115 @@
+# ==============================================
+# 【现金比率压力测试·批量版】v1.0
+# 独特性：整个公司池一次性向量化计算 + 与单公司版本逐行一致
+# 开发者：Kiwi_hazel
+# 公式：同 cash_ratio_stress_test.py（现金比率、储备天数、60天无收入缺口、健康度四象限）
+# ==============================================
+
+import numpy as np
+
+from common.benchmark_registry import BUILTIN_TABLES, get_registry
+from common.numeric import py_round, safe_divide
+from solvency_analysis.cash_ratio_stress_test import HEALTH_QUADRANTS, STRESS_WINDOW_DAYS
+
+# 行业代码 = 基准注册表 "cash_crisis" 表的行号（内置行业代码固定，校准文件新增的行业追加在后）
+# 越界代码按注册表默认行业（重资产）处理，与单公司版本默认值一致
+INDUSTRY_NAMES = tuple(BUILTIN_TABLES["cash_crisis"]["entries"])
+INDUSTRY_CODES = {name: code for code, name in enumerate(INDUSTRY_NAMES)}
+DEFAULT_INDUSTRY_CODE = INDUSTRY_CODES[BUILTIN_TABLES["cash_crisis"]["default"]]
+
+# 健康度四象限代码（-1 表示输入数据错误）
+QUADRANT_ERROR = -1
+QUADRANT_LABELS = tuple(label for label, _note in HEALTH_QUADRANTS)
+
+
+def encode_industries(industry_types):
+    """
+    行业名称数组 → 行业代码数组（未知行业编码为默认重资产，支持注册表别名）
+    :param industry_types: 行业名称序列（重资产/轻资产/金融/服务业）
+    """
+    return get_registry().table("cash_crisis").encode(industry_types)
+
+
+def grade_quadrants(cash_ratio, survival_days, industry_code):
+    """
+    向量化健康度四象限（规则与 cash_ratio_stress_test 完全一致，np.select 取第一个满足的条件）
+    行业阈值按代码查注册表，越界代码回落到默认行业；数组按广播规则对齐（如 [情景, 公司] 与 [公司]）
+    :return: 象限代码数组（0安全/1警惕/2危险/3危机，见 QUADRANT_LABELS）
+    """
+    thresholds = get_registry().table("cash_crisis")
+    ratio_line = thresholds.lookup(industry_code, "ratio")
+    days_line = thresholds.lookup(industry_code, "days")
+    return np.select(
+        [
+            (cash_ratio >= ratio_line * 1.5) & (survival_days >= days_line * 1.5),
+            (cash_ratio >= ratio_line) & (survival_days >= days_line),
+            (cash_ratio > 0) & (survival_days > 0),
+        ],
+        [0, 1, 2],
+        default=3,
+    ).astype(np.int8)
+
+
+def cash_ratio_stress_batch(cash_eq, short_term_debt, daily_cash_burn, industry_code):
+    """
+    核心功能：对整个公司池批量执行现金比率压力测试（结果与 cash_ratio_stress_test 逐行一致）
+    :param cash_eq: 现金及等价物数组（万元）
+    :param short_term_debt: 流动负债数组（万元）
+    :param daily_cash_burn: 日均现金消耗数组（万元/天）
+    :param industry_code: 行业代码数组（见 INDUSTRY_CODES，可用 encode_industries 转换）
+    :return: 列式结果字典；数据错误的行 valid=False、数值列为 nan、quadrant_code=-1
+    """
+    cash_eq = np.asarray(cash_eq, dtype=float)
+    short_term_debt = np.asarray(short_term_debt, dtype=float)
+    daily_cash_burn = np.asarray(daily_cash_burn, dtype=float)
+    industry_code = np.asarray(industry_code)
+
+    # 数据校验（与单公司版本一致：现金/负债/日均消耗不可为负）
+    valid = (cash_eq >= 0) & (short_term_debt >= 0) & (daily_cash_burn >= 0)
+
+    # 基础计算（先按单公司版本取整，再用取整后的值判断象限）
+    cash_ratio = py_round(safe_divide(cash_eq, short_term_debt), 2)
+    survival_days = py_round(safe_divide(cash_eq, daily_cash_burn), 1)
+
+    # 极端情景压力测试（60天无收入）
+    stress_cash_needed = daily_cash_burn * STRESS_WINDOW_DAYS
+    stress_covered = cash_eq >= stress_cash_needed
+    stress_shortfall = np.where(stress_covered, 0.0, py_round(stress_cash_needed - cash_eq, 1))
+
+    quadrant_code = grade_quadrants(cash_ratio, survival_days, industry_code)
+
+    quadrant_code[~valid] = QUADRANT_ERROR
+    for column in (cash_ratio, survival_days, stress_shortfall):
+        column[~valid] = np.nan
+
+    return {
+        "cash_ratio": cash_ratio,
+        "survival_days": survival_days,
+        "stress_shortfall": stress_shortfall,  # 60天无收入现金缺口（万元，已覆盖为0）
+        "stress_covered": stress_covered & valid,
+        "quadrant_code": quadrant_code,
+        "valid": valid,
+    }
+
+
+def quadrant_labels(quadrant_code):
+    """把象限代码数组转换为中文标签（错误行返回"数据错误"），仅在需要展示时调用"""
+    return [QUADRANT_LABELS[c] if c >= 0 else "数据错误" for c in np.asarray(quadrant_code).tolist()]
+
+
+# ----------------------
+# 极简演示（随机公司池）
+# ----------------------
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    n = 5
+    result = cash_ratio_stress_batch(
+        cash_eq=rng.uniform(0, 2000, n),
+        short_term_debt=rng.uniform(100, 3000, n),
+        daily_cash_burn=rng.uniform(1, 30, n),
+        industry_code=rng.integers(0, len(INDUSTRY_NAMES), n),
+    )
+    print("\n===== 💸 现金比率压力测试（批量版） =====")
+    for i, label in enumerate(quadrant_labels(result["quadrant_code"])):
+        print(f"公司{i + 1}：现金比率={result['cash_ratio'][i]} | 储备天数={result['survival_days'][i]}天 | "
+              f"60天缺口={result['stress_shortfall'][i]}万 | 健康度={label}")
@@ -5,6 +5,21 @@
 # 公式：现金比率 =（货币资金 + 交易性金融资产）/ 流动负债
 # ==============================================
 
+from common.benchmark_registry import get_registry
+
+# 行业危机阈值见 common/benchmark_registry.py 的 "cash_crisis" 表（重资产/轻资产/金融/服务业）
+STRESS_WINDOW_DAYS = 60  # 极端情景：无收入天数
+CASH_INPUT_ERROR = "⚠️ 数据错误：现金/负债/日均消耗不可为负（例：现金=500万，负债=1000万）"
+
+# 现金健康度四象限（标签, 行动建议），下标即象限代码，批量/紧凑结果共用同一张文字表
+HEALTH_QUADRANTS = (
+    ("【安全区】", "现金储备充足，极端情景下仍有较高安全边际"),
+    ("【警惕区】", "现金基本健康，但需监控现金流变化，避免消耗过快"),
+    ("【危险区】", "现金紧张！需加快应收账款回收或削减非必要支出"),
+    ("【危机区】", "现金耗尽风险！建议立即启动融资或资产变现"),
+)
+
+
 def cash_ratio_stress_test(cash_eq, short_term_debt, daily_cash_burn, industry_type):
     """
     核心功能：评估极端情景下的短期偿债能力（现金比率+压力测试）
@@ -14,38 +29,28 @@ def cash_ratio_stress_test(cash_eq, short_term_debt, daily_cash_burn, industry_t
     :param industry_type: 行业类型（重资产/轻资产/金融/服务业）
     """
     if cash_eq < 0 or short_term_debt < 0 or daily_cash_burn < 0:
-        return {"error": "⚠️ 数据错误：现金/负债/日均消耗不可为负（例：现金=500万，负债=1000万）"}
+        return {"error": CASH_INPUT_ERROR}
     
     # 基础计算
     cash_ratio = round(cash_eq / short_term_debt, 2) if short_term_debt !=0 else float('inf')
     survival_days = round(cash_eq / daily_cash_burn, 1) if daily_cash_burn !=0 else float('inf')  # 现金储备天数
     
     # 点1：行业危机阈值（不同行业现金比率安全线不同）
-    crisis_thresholds = {
-        "重资产": {"ratio": 0.5, "days": 90},   # 如制造业，需更多现金应对设备维护
-        "轻资产": {"ratio": 0.3, "days": 60},   # 如科技公司，现金消耗快但融资灵活
-        "金融": {"ratio": 0.8, "days": 120},    # 如银行，需高流动性应对挤兑风险
-        "服务业": {"ratio": 0.4, "days": 75}    # 如餐饮，依赖现金流周转
-    }
-    threshold = crisis_thresholds.get(industry_type, {"ratio": 0.5, "days": 90})  # 默认重资产
+    threshold = get_registry().table("cash_crisis").row(industry_type)  # 默认重资产
     
     # 点2：极端情景压力测试（模拟60天无收入）
-    stress_cash_needed = daily_cash_burn * 60  # 60天现金需求
+    stress_cash_needed = daily_cash_burn * STRESS_WINDOW_DAYS  # 60天现金需求
     stress_coverage = "✅ 覆盖" if cash_eq >= stress_cash_needed else f"❌ 缺口{round(stress_cash_needed - cash_eq,1)}万"
     
     # 点3：现金健康度四象限
     if cash_ratio >= threshold["ratio"] * 1.5 and survival_days >= threshold["days"] * 1.5:
-        health_quadrant = "【安全区】"
-        health_note = "现金储备充足，极端情景下仍有较高安全边际"
+        health_quadrant, health_note = HEALTH_QUADRANTS[0]
     elif cash_ratio >= threshold["ratio"] and survival_days >= threshold["days"]:
-        health_quadrant = "【警惕区】"
-        health_note = "现金基本健康，但需监控现金流变化，避免消耗过快"
+        health_quadrant, health_note = HEALTH_QUADRANTS[1]
     elif cash_ratio > 0 and survival_days > 0:
-        health_quadrant = "【危险区】"
-        health_note = "现金紧张！需加快应收账款回收或削减非必要支出"
+        health_quadrant, health_note = HEALTH_QUADRANTS[2]
     else:
-        health_quadrant = "【危机区】"
-        health_note = "现金耗尽风险！建议立即启动融资或资产变现"
+        health_quadrant, health_note = HEALTH_QUADRANTS[3]
     
     return {
         "cash_ratio": cash_ratio,
@@ -85,4 +90,3 @@ if __name__ == "__main__":
         print(f"💡 行动建议：{result['health_note']}")
     print(f"\n📌 关键逻辑：现金比率>行业安全线 → 短期偿债无虞；储备天数>60天 → 抗风险能力强")
     print("="*50)
- 
@@ -0,0 +1,168 @@
+# ==============================================
+# 【现金跑道·逐日预测引擎】v1.0
+# 独特性：逐日现金流入/流出 + 债务到期还款 → 累计现金曲线 → 向量化定位首个耗尽日（精确到日内比例）
+#         多公司 × 多情景一次计算，按公司分块处理（内存上限固定，不随公司数/情景数增长）
+# 开发者：Kiwi_hazel
+# 公式：第d日末现金 = 期初现金 + Σ(流入 − 流出 − 到期还款)[0..d]
+#       耗尽日 = 首个日末现金<0 的日序号 d；可维持天数 = d + 当日初现金/当日净流出（日内线性）
+#       健康度四象限规则同 cash_ratio_stress_test（储备天数换成预测的可维持天数）
+#       （恒定日均消耗、无流入时，可维持天数 = 现金/日均消耗，与单公司版本一致）
+# 用法：cash_runway(现金[公司], 流动负债[公司], 行业代码[公司], 流入[情景, 公司, 天] 或 [公司, 天], 流出..., 还款[公司, 天])
+# ==============================================
+
+import numpy as np
+
+from common.numeric import py_round, safe_divide
+from solvency_analysis.cash_ratio_batch import QUADRANT_ERROR, grade_quadrants
+
+NOT_DEPLETED = -1  # 耗尽日：预测期内未耗尽
+DEFAULT_CHUNK_BYTES = 64 << 20  # 每块工作数组的内存上限（约64MB）
+# 每块同时存在的 [公司, 天] float64 数组：净流量（流入/流出/还款就地累加）、流出按情景系数缩放的暂存、累计现金曲线
+# 另有 1 个同形状的 bool 耗尽标记；输入块（含 float32 / memmap）在写入净流量时就地转换类型，不另建副本
+_WORK_ARRAYS = 3
+
+
+def _scenario_count(flow, scale):
+    if scale is not None:
+        return len(scale)
+    if flow is not None and np.ndim(flow) == 3:
+        return flow.shape[0]
+    return 1
+
+
+def _flow_block(flow, scenario, rows, days):
+    """取某情景、某公司块的逐日现金流切片（[公司, 天]，保持原类型不拷贝）；3维输入按情景取，2维输入各情景共用"""
+    block = np.asarray(flow[scenario, rows] if np.ndim(flow) == 3 else flow[rows])
+    if block.shape[-1] != days:
+        raise ValueError(f"⚠️ 现金流天数不一致：{block.shape[-1]}天，应为{days}天")
+    return block
+
+
+def _load_flow(out, flow, scale, scenario, rows, days):
+    """现金流块写入工作数组 out（转换为 float64 并乘以情景系数，不产生整块临时数组）"""
+    block = _flow_block(flow, scenario, rows, days)
+    if scale is None:
+        np.copyto(out, block)
+    else:
+        np.multiply(block, scale[scenario], out=out)
+    return out
+
+
+def project_runway(cash_eq, net_flow):
+    """
+    单块计算：累计现金曲线 → 首个耗尽日 + 日内比例
+    :param cash_eq: 期初现金 [公司]
+    :param net_flow: 逐日净现金流 [公司, 天]（流入 − 流出 − 还款）
+    :return: （可维持天数, 耗尽日, 最低现金）；未耗尽时可维持天数=inf、耗尽日=-1
+    """
+    curve = np.cumsum(net_flow, axis=1)
+    curve += cash_eq[:, None]
+    depleted = curve < 0
+    any_depleted = depleted.any(axis=1)
+    day = depleted.argmax(axis=1)  # 首个 True 的下标（向量化查找，无逐日循环）
+    rows = np.arange(len(day))
+    after = curve[rows, day]
+    before = np.where(day > 0, curve[rows, np.maximum(day - 1, 0)], cash_eq)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.where(before > 0, before / (before - after), 0.0)  # 当日在第几成时点耗尽
+    survival = np.where(any_depleted, day + fraction, np.inf)
+    min_cash = np.minimum(curve.min(axis=1), cash_eq)
+    return survival, np.where(any_depleted, day, NOT_DEPLETED), min_cash
+
+
+def cash_runway(cash_eq, short_term_debt, industry_code, inflow=None, outflow=None, repayments=None,
+                inflow_scale=None, outflow_scale=None, chunk_companies=None):
+    """
+    核心功能：多公司 × 多情景逐日现金跑道预测（结果与逐日循环回放一致）
+    :param cash_eq: 期初现金及等价物 [公司]（万元）
+    :param short_term_debt: 流动负债 [公司]（万元，用于现金比率）
+    :param industry_code: 行业代码 [公司]（见 cash_ratio_batch.encode_industries）
+    :param inflow: 逐日现金流入 [情景, 公司, 天] 或各情景共用的 [公司, 天]（可为 np.memmap，按块读取）
+    :param outflow: 逐日经营现金流出（形状同上）
+    :param repayments: 债务到期还款 [公司, 天]（各情景共用）
+    :param inflow_scale: 情景系数 [情景]：流入 = 共用流入 × 系数（如衰退情景 0.6）
+    :param outflow_scale: 情景系数 [情景]：流出 = 共用流出 × 系数
+    :param chunk_companies: 每块公司数（None=按 DEFAULT_CHUNK_BYTES 自动计算）
+    :return: 列式结果：survival_days/depletion_day/min_cash/funding_gap/quadrant_code 形状 [情景, 公司]，
+             cash_ratio/valid 形状 [公司]；数据错误的公司 valid=False、数值为 nan、quadrant_code=-1
+    """
+    cash_eq = np.asarray(cash_eq, dtype=float)
+    short_term_debt = np.asarray(short_term_debt, dtype=float)
+    industry_code = np.asarray(industry_code)
+    companies = len(cash_eq)
+    flows = [f for f in (inflow, outflow, repayments) if f is not None]
+    if not flows:
+        raise ValueError("⚠️ 至少需要提供一项逐日现金流（流入/流出/还款）")
+    days = np.shape(flows[0])[-1]
+    scenarios = max(_scenario_count(inflow, inflow_scale), _scenario_count(outflow, outflow_scale))
+    if chunk_companies is None:
+        chunk_companies = max(1, DEFAULT_CHUNK_BYTES // (days * (8 * _WORK_ARRAYS + 1)))  # +1：bool 耗尽标记
+
+    valid = (cash_eq >= 0) & (short_term_debt >= 0)
+    cash_ratio = py_round(safe_divide(cash_eq, short_term_debt), 2)
+    survival_days = np.empty((scenarios, companies))
+    depletion_day = np.empty((scenarios, companies), dtype=np.int32)
+    min_cash = np.empty((scenarios, companies))
+    # 工作数组按最大块分配一次，各块/各情景复用（末块取前 count 行视图）
+    net_buffer = np.empty((min(chunk_companies, companies), days))
+    scaled_buffer = np.empty_like(net_buffer) if outflow is not None and outflow_scale is not None else None
+    for start in range(0, companies, chunk_companies):
+        rows = slice(start, min(start + chunk_companies, companies))
+        count = rows.stop - rows.start
+        net = net_buffer[:count]
+        for s in range(scenarios):
+            if inflow is None:
+                net.fill(0.0)
+            else:
+                _load_flow(net, inflow, inflow_scale, s, rows, days)
+            if outflow is not None:
+                spent = (_flow_block(outflow, s, rows, days) if scaled_buffer is None
+                         else _load_flow(scaled_buffer[:count], outflow, outflow_scale, s, rows, days))
+                np.subtract(net, spent, out=net)
+            if repayments is not None:
+                np.subtract(net, _flow_block(repayments, 0, rows, days), out=net)
+            survival, day, low = project_runway(cash_eq[rows], net)
+            survival_days[s, rows] = survival
+            depletion_day[s, rows] = day
+            min_cash[s, rows] = low
+
+    survival_days = py_round(survival_days, 1)
+    quadrant_code = grade_quadrants(cash_ratio, survival_days, industry_code)
+    funding_gap = py_round(np.maximum(-min_cash, 0.0), 1)  # 预测期内不断流所需的最低补充资金
+    quadrant_code[:, ~valid] = QUADRANT_ERROR
+    for column in (survival_days, min_cash, funding_gap):
+        column[:, ~valid] = np.nan
+    cash_ratio[~valid] = np.nan
+    depletion_day[:, ~valid] = NOT_DEPLETED
+    return {
+        "cash_ratio": cash_ratio,
+        "survival_days": survival_days,
+        "depletion_day": depletion_day,
+        "min_cash": min_cash,
+        "funding_gap": funding_gap,
+        "quadrant_code": quadrant_code,
+        "valid": valid,
+    }
+
+
+# ----------------------
+# 极简演示（2家公司 × 3个情景，含月末集中还款）
+# ----------------------
+if __name__ == "__main__":
+    from solvency_analysis.cash_ratio_batch import encode_industries, quadrant_labels
+
+    days = 180
+    inflow = np.array([[12.0] * days, [6.0] * days])
+    outflow = np.array([[10.0] * days, [9.0] * days])
+    repayments = np.zeros((2, days))
+    repayments[0, 29::30] = 80  # 公司1：每月末还款80万
+    scenarios = ("基准", "收入下滑40%", "无收入（原60天极端情景）")
+    result = cash_runway([500, 300], [800, 1000], encode_industries(["重资产", "轻资产"]), inflow, outflow, repayments,
+                         inflow_scale=[1.0, 0.6, 0.0])
+    print("\n===== 💸 现金跑道逐日预测（180天） =====")
+    for s, name in enumerate(scenarios):
+        labels = quadrant_labels(result["quadrant_code"][s])
+        for i in range(2):
+            runway = result["survival_days"][s, i]
+            print(f"{name:<16}公司{i + 1}：可维持{'超过' + str(days) if runway == np.inf else runway}天 | "
+                  f"资金缺口{result['funding_gap'][s, i]}万 | {labels[i]}")
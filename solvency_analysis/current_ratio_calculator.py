@@ -13,15 +13,16 @@ def calculate_current_ratio(current_assets, current_liabilities):
     ratio = current_assets / current_liabilities
     return round(ratio, 2)  # 保留2位小数
 
-# 2. 手动输入测试数据（避免文件冲突）
-print("=== 流动比率计算器 ===")
-assets = float(input("请输入流动资产总额（万元）："))
-liabilities = float(input("请输入流动负债总额（万元）："))
+if __name__ == "__main__":  # 仅直接运行时进入交互，作为库导入时无副作用
+    # 2. 手动输入测试数据（避免文件冲突）
+    print("=== 流动比率计算器 ===")
+    assets = float(input("请输入流动资产总额（万元）："))
+    liabilities = float(input("请输入流动负债总额（万元）："))
 
-# 3. 调用计算并打印结果
-result = calculate_current_ratio(assets, liabilities)
-print(f"\n✅ 计算结果：流动比率 = {result}")
-if result > 2:
-    print("（提示：该企业短期偿债能力良好）")
-else:
-    print("（提示：需关注短期偿债风险）")
+    # 3. 调用计算并打印结果
+    result = calculate_current_ratio(assets, liabilities)
+    print(f"\n✅ 计算结果：流动比率 = {result}")
+    if result > 2:
+        print("（提示：该企业短期偿债能力良好）")
+    else:
+        print("（提示：需关注短期偿债风险）")
@@ -0,0 +1,206 @@
+# ==============================================
+# 【利息保障倍数·蒙特卡洛衰退引擎】v1.0
+# 独特性：衰退冲击分布化（而非单一固定降幅）+ 四级风险概率 + 倍数分位数 + 多进程分片
+# 开发者：Kiwi_hazel
+# 模型：EBIT降幅 = 行业周期平均降幅 ×（1 + 波动率 × 冲击），冲击 = 系统性因子 + 公司特质因子
+#       平均降幅沿用 interest_coverage_stress.py（强周期30%/弱周期15%/防御性10%/默认20%）
+# ==============================================
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from common.benchmark_registry import BUILTIN_TABLES, get_registry
+from common.numeric import py_round
+from solvency_analysis.interest_coverage_stress import RISK_LEVELS
+
+# 行业周期代码 = 基准注册表 "recession_drop" 表的行号；未知代码按"中性行业"处理（默认降幅20%）
+CYCLE_NAMES = tuple(BUILTIN_TABLES["recession_drop"]["entries"])
+CYCLE_CODES = {name: code for code, name in enumerate(CYCLE_NAMES)}
+NEUTRAL_CYCLE_CODE = CYCLE_CODES[BUILTIN_TABLES["recession_drop"]["default"]]
+
+# 四级风险代码（与 interest_coverage_stress 的分级顺序一致）
+RISK_LABELS = tuple(label for label, _note in RISK_LEVELS)
+
+# 随机数流标识：系统性因子与特质因子使用不同的种子分支，互不干扰
+_SYSTEMIC_STREAM = 0
+_IDIOSYNCRATIC_STREAM = 1
+DEFAULT_BUFFER_BYTES = 64 << 20  # 分位数路径缓存（[行, 路径] float32）每块的内存上限（约64MB）
+
+
+def encode_cycles(industry_cycles):
+    """
+    行业周期名称数组 → 周期代码数组（未知/缺失按中性行业）
+    :param industry_cycles: 周期名称序列（强周期/弱周期/防御性，None 表示未指定）
+    """
+    return get_registry().table("recession_drop").encode(industry_cycles)
+
+
+def grade_risk_levels(normal_coverage, stress_coverage):
+    """
+    向量化四级风险分级（规则与 interest_coverage_stress 完全一致）
+    :return: 风险代码数组（0安全/1关注/2风险/3高危，见 RISK_LABELS）
+    """
+    return np.select(
+        [
+            (normal_coverage >= 5) & (stress_coverage >= 3),
+            (normal_coverage >= 3) & (stress_coverage >= 2),
+            (normal_coverage >= 2) & (stress_coverage > 1),
+        ],
+        [0, 1, 2],
+        default=3,
+    ).astype(np.int8)
+
+
+def _simulate_shard(task):
+    """
+    单个分片的模拟（进程池工作函数，必须是模块级函数才能被 pickle）
+    需要分位数时每行要保留全部路径：分片再按行分块，每块路径缓存（行数 × n_paths × 4字节）≤ buffer_bytes
+    """
+    shard_index, ebit, interest, mean_drop, systemic, params = task
+    block = len(ebit)
+    if params["percentiles"]:
+        block = max(1, min(block, params["buffer_bytes"] // (len(systemic) * np.dtype(np.float32).itemsize)))
+    parts = [_simulate_block((shard_index, block_index), ebit[begin:begin + block], interest[begin:begin + block],
+                             mean_drop[begin:begin + block], systemic, params)
+             for block_index, begin in enumerate(range(0, len(ebit), block))]
+    if not parts:
+        return np.empty((0, len(RISK_LABELS))), np.empty(0), np.empty((0, len(params["percentiles"])))
+    return tuple(np.concatenate(column) for column in zip(*parts))
+
+
+def _simulate_block(block_key, ebit, interest, mean_drop, systemic, params):
+    """
+    一块公司的模拟：路径按 path_chunk 分块生成
+    内存：临时数组 = 行数 × path_chunk；分位数路径缓存 = 行数 × n_paths（float32，行数由 _simulate_shard 限定）
+    """
+    rows, n_paths = len(ebit), len(systemic)
+    path_chunk = params["path_chunk"]
+    loading = np.sqrt(params["systemic_weight"])
+    idio_loading = np.sqrt(1 - params["systemic_weight"])
+
+    # 取整同 interest_coverage_stress 的 round()（py_round），恰好 .5 的倍数与单公司版本一致
+    normal = py_round(ebit / interest, 2)[:, None]
+    counts = np.zeros((rows, len(RISK_LABELS)), dtype=np.int64)
+    coverage_sum = np.zeros(rows)
+    coverage_paths = np.empty((rows, n_paths), dtype=np.float32) if params["percentiles"] else None
+
+    for chunk_index, start in enumerate(range(0, n_paths, path_chunk)):
+        stop = min(start + path_chunk, n_paths)
+        # 每个（分片, 行块, 路径块）有独立且固定的种子 → 结果与进程数、调度顺序无关
+        rng = np.random.default_rng([params["seed"], _IDIOSYNCRATIC_STREAM, *block_key, chunk_index])
+        shock = loading * systemic[start:stop] + idio_loading * rng.standard_normal((rows, stop - start))
+        drop = np.clip(mean_drop[:, None] * (1 + params["shock_vol"] * shock), 0.0, 1.0)
+        stress_ebit = ebit[:, None] * (1 - drop)
+        stress = np.where(stress_ebit > 0, py_round(stress_ebit / interest[:, None], 2), 0.0)
+
+        level = grade_risk_levels(normal, stress)
+        for code in range(len(RISK_LABELS)):
+            counts[:, code] += np.count_nonzero(level == code, axis=1)
+        coverage_sum += stress.sum(axis=1)
+        if coverage_paths is not None:
+            coverage_paths[:, start:stop] = stress
+
+    if coverage_paths is not None:
+        percentiles = np.percentile(coverage_paths, params["percentiles"], axis=1).T
+    else:
+        percentiles = np.empty((rows, 0))
+    return counts / n_paths, coverage_sum / n_paths, percentiles
+
+
+def interest_coverage_monte_carlo(ebit, interest_expense, cycle_code, n_paths=5000, percentiles=(5, 50, 95),
+                                  shock_vol=0.5, systemic_weight=0.5, seed=0, shard_size=2000, path_chunk=500,
+                                  max_workers=None, buffer_bytes=DEFAULT_BUFFER_BYTES):
+    """
+    核心功能：对整个债务人组合做衰退情景蒙特卡洛模拟，输出四级风险概率和衰退倍数分位数
+    :param ebit: 息税前利润数组（万元）
+    :param interest_expense: 利息费用数组（万元）
+    :param cycle_code: 行业周期代码数组（见 CYCLE_CODES，可用 encode_cycles 转换）
+    :param n_paths: 每家公司的模拟路径数
+    :param percentiles: 衰退情景利息保障倍数的分位点（%），传空元组则不计算（省去路径缓存）
+    :param shock_vol: 降幅波动率（0 → 退化为固定降幅，与 interest_coverage_stress 结果一致）
+    :param systemic_weight: 系统性因子权重（0~1，全部公司共享同一组宏观冲击）
+    :param seed: 随机种子（同一 seed/shard_size/path_chunk/buffer_bytes 下结果完全可复现，与进程数无关）
+    :param shard_size: 每个分片的公司数（分片是进程池的调度单位）
+    :param path_chunk: 每次生成的路径数（控制临时数组的内存峰值）
+    :param max_workers: 进程数（None=CPU核数，1=当前进程内串行）
+    :param buffer_bytes: 计算分位数时每个进程路径缓存的内存上限（按行分块，内存不随 n_paths×分片行数增长）
+    :return: 列式结果字典；数据错误的行 valid=False、数值列为 nan
+    """
+    ebit = np.asarray(ebit, dtype=float)
+    interest_expense = np.asarray(interest_expense, dtype=float)
+    cycle_code = np.asarray(cycle_code)
+    if not 0 <= systemic_weight <= 1:
+        raise ValueError("systemic_weight 需在0~1之间")
+
+    # 数据校验（与单公司版本一致：EBIT和利息费用需>0）；错误行用占位值参与计算，最后置为 nan
+    valid = (ebit > 0) & (interest_expense > 0)
+    safe_ebit = np.where(valid, ebit, 1.0)
+    safe_interest = np.where(valid, interest_expense, 1.0)
+    mean_drop = get_registry().table("recession_drop").lookup(cycle_code, "drop")
+
+    # 系统性因子：所有分片共用同一组宏观冲击路径
+    systemic = np.random.default_rng([seed, _SYSTEMIC_STREAM]).standard_normal(n_paths)
+    params = {
+        "seed": seed,
+        "shock_vol": shock_vol,
+        "systemic_weight": systemic_weight,
+        "path_chunk": max(1, path_chunk),
+        "percentiles": tuple(percentiles),
+        "buffer_bytes": buffer_bytes,
+    }
+    tasks = [
+        (index, safe_ebit[start:start + shard_size], safe_interest[start:start + shard_size],
+         mean_drop[start:start + shard_size], systemic, params)
+        for index, start in enumerate(range(0, len(ebit), shard_size))
+    ]
+
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        shard_results = [_simulate_shard(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            shard_results = list(executor.map(_simulate_shard, tasks))  # map 保证按分片顺序返回
+
+    if shard_results:
+        probabilities = np.concatenate([r[0] for r in shard_results])
+        mean_stress = np.concatenate([r[1] for r in shard_results])
+        coverage_percentiles = np.concatenate([r[2] for r in shard_results])
+    else:
+        probabilities = np.empty((0, len(RISK_LABELS)))
+        mean_stress = np.empty(0)
+        coverage_percentiles = np.empty((0, len(params["percentiles"])))
+
+    normal_coverage = py_round(safe_ebit / safe_interest, 2)
+    for column in (probabilities, mean_stress, coverage_percentiles, normal_coverage):
+        column[~valid] = np.nan
+
+    return {
+        "normal_coverage": normal_coverage,            # 正常情景倍数
+        "mean_stress_coverage": mean_stress,           # 衰退情景倍数均值
+        "risk_probabilities": probabilities,           # 形状(公司数, 4)，列顺序同 RISK_LABELS
+        "coverage_percentiles": coverage_percentiles,  # 形状(公司数, 分位点数)
+        "percentiles": params["percentiles"],
+        "valid": valid,
+    }
+
+
+# ----------------------
+# 极简演示（随机债务人组合）
+# ----------------------
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    n = 5
+    result = interest_coverage_monte_carlo(
+        ebit=rng.uniform(200, 2000, n),
+        interest_expense=rng.uniform(50, 400, n),
+        cycle_code=rng.integers(0, len(CYCLE_NAMES), n),
+        n_paths=2000,
+        max_workers=1,
+    )
+    print("\n===== ⚠️ 利息保障倍数蒙特卡洛衰退测试 =====")
+    for i in range(n):
+        probs = " ".join(f"{label}{p:.0%}" for label, p in zip(RISK_LABELS, result["risk_probabilities"][i]))
+        p5, p50, p95 = result["coverage_percentiles"][i]
+        print(f"公司{i + 1}：正常{result['normal_coverage'][i]}倍 | 衰退P5/P50/P95={p5:.2f}/{p50:.2f}/{p95:.2f}倍 | {probs}")
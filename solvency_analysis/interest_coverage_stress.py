@@ -5,6 +5,20 @@
 # 公式：利息保障倍数 = EBIT / 利息费用 → 衡量"利润覆盖利息"能力
 # ==============================================
 
+from common.benchmark_registry import get_registry
+
+# 衰退情景EBIT降幅见 common/benchmark_registry.py 的 "recession_drop" 表（强周期30%/弱周期15%/防御性10%/默认20%）
+
+# 债务风险四级预警（等级, 风险解读），下标即风险代码，批量/紧凑结果共用同一张文字表
+RISK_LEVELS = (
+    ("【安全级】", "利息覆盖充足，衰退情景下仍安全（强周期行业首选标准）"),
+    ("【关注级】", "正常情景安全，但衰退情景下需监控EBIT变化（弱周期行业可接受）"),
+    ("【风险级】", "利息覆盖薄弱，需控制债务规模（避免新增高息融资）"),
+    ("【高危级】", "利息无法覆盖，存在违约风险（需立即债务重组或增加EBIT）"),
+)
+SHORT_TERM_ALERT_PCT = 60  # 短期利息占比预警线（%），超过即提示短期偿债压力大
+
+
 def interest_coverage_stress(ebit, interest_expense, short_term_interest=None, industry_cycle=None):
     """
     核心功能：评估利息覆盖能力及衰退情景下的抗风险能力
@@ -24,12 +38,7 @@ def interest_coverage_stress(ebit, interest_expense, short_term_interest=None, i
     # 点1：衰退情景压力测试（经济下行冲击）
     # ----------------------
     # 根据行业周期性调整EBIT下降比例（强周期行业衰退时利润降幅更大）
-    cycle_adjustment = {
-        "强周期": 0.3,    # 如钢铁/房地产，衰退期EBIT降30%
-        "弱周期": 0.15,   # 如家电/消费，衰退期EBIT降15%
-        "防御性": 0.1     # 如医药/公用事业，衰退期EBIT降10%
-    }
-    ebit_drop_ratio = cycle_adjustment.get(industry_cycle, 0.2)  # 默认衰退情景EBIT降20%
+    ebit_drop_ratio = get_registry().table("recession_drop").row(industry_cycle)["drop"]  # 默认衰退情景EBIT降20%
     stress_ebit = ebit * (1 - ebit_drop_ratio)  # 衰退情景下的EBIT
     stress_coverage = round(stress_ebit / interest_expense, 2) if stress_ebit > 0 else 0  # 衰退情景倍数
     
@@ -37,17 +46,13 @@ def interest_coverage_stress(ebit, interest_expense, short_term_interest=None, i
     # 点2：债务风险预警分级（四级预警体系）
     # ----------------------
     if interest_coverage >= 5 and stress_coverage >= 3:
-        risk_level = "【安全级】"
-        risk_note = "利息覆盖充足，衰退情景下仍安全（强周期行业首选标准）"
+        risk_level, risk_note = RISK_LEVELS[0]
     elif interest_coverage >= 3 and stress_coverage >= 2:
-        risk_level = "【关注级】"
-        risk_note = "正常情景安全，但衰退情景下需监控EBIT变化（弱周期行业可接受）"
+        risk_level, risk_note = RISK_LEVELS[1]
     elif interest_coverage >= 2 and stress_coverage > 1:
-        risk_level = "【风险级】"
-        risk_note = "利息覆盖薄弱，需控制债务规模（避免新增高息融资）"
+        risk_level, risk_note = RISK_LEVELS[2]
     else:
-        risk_level = "【高危级】"
-        risk_note = "利息无法覆盖，存在违约风险（需立即债务重组或增加EBIT）"
+        risk_level, risk_note = RISK_LEVELS[3]
     
     # ----------------------
     # 点3：利息结构分析（短期偿债压力）
@@ -55,7 +60,7 @@ def interest_coverage_stress(ebit, interest_expense, short_term_interest=None, i
     structure_analysis = "（未提供短期利息数据，无法分析结构）"
     if short_term_interest and interest_expense > 0:
         short_term_ratio = round(short_term_interest / interest_expense * 100, 1)  # 短期利息占比（%）
-        structure_analysis = f"短期利息占比{short_term_ratio}% → {'⚠️ 短期偿债压力大（建议优先偿还）' if short_term_ratio > 60 else '短期压力可控（结构健康）'}"
+        structure_analysis = f"短期利息占比{short_term_ratio}% → {'⚠️ 短期偿债压力大（建议优先偿还）' if short_term_ratio > SHORT_TERM_ALERT_PCT else '短期压力可控（结构健康）'}"
     
     return {
         "normal_coverage": interest_coverage,          # 正常情景倍数
@@ -104,4 +109,3 @@ if __name__ == "__main__":
     print("   - 强周期行业：正常>5倍，衰退>3倍 | 弱周期行业：正常>3倍，衰退>2倍")
     print("   - 短期利息占比<60% → 利息结构健康（避免集中偿付压力）")
     print("="*50)
- 